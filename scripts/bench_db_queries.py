@@ -0,0 +1,246 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-locals
+"""Benchmark the CPU per query of the hot database lookups.
+
+Runs each hot lookup at a fixed rate, once with a statement built on
+every call (as they used to be) and once with the service's prebuilt
+statement, and reports the process CPU time per query (including the
+driver's thread) and the latency. Uses a temporary SQLite database
+unless a database URL is given.
+
+Usage:
+    python scripts/bench_db_queries.py --rate 1000 --duration 5
+    python scripts/bench_db_queries.py --db-url postgresql+psycopg://...
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.future import select
+
+ROOT_DIR = Path(__file__).parent.parent.resolve()
+
+try:
+    from waldiez_runner.models import Client, Task
+except ImportError:
+    sys.path.append(str(ROOT_DIR))
+    from waldiez_runner.models import Client, Task
+
+# pylint: disable=wrong-import-position
+from waldiez_runner.models.common import Base  # noqa: E402
+from waldiez_runner.services import ClientService, TaskService  # noqa: E402
+
+Query = Callable[[AsyncSession, Task], Awaitable[Any]]
+
+
+async def _rebuilt_get_task(session: AsyncSession, task: Task) -> Any:
+    result = await session.execute(
+        select(Task).where(Task.id == task.id, Task.deleted_at.is_(None))
+    )
+    return result.scalar_one_or_none()
+
+
+async def _rebuilt_trigger(session: AsyncSession, task: Task) -> None:
+    await session.execute(
+        update(Task)
+        .where(Task.id == task.id)
+        .values(triggered_at=datetime.now(timezone.utc))
+    )
+    await session.commit()
+
+
+async def _rebuilt_get_client(session: AsyncSession, task: Task) -> Any:
+    result = await session.execute(
+        select(Client).where(Client.client_id == task.client_id)
+    )
+    return result.scalars().first()
+
+
+QUERIES: dict[str, tuple[Query, Query]] = {
+    # name: (built per call, prebuilt)
+    "get_task": (
+        _rebuilt_get_task,
+        lambda session, task: TaskService.get_task(session, task.id),
+    ),
+    "trigger": (
+        _rebuilt_trigger,
+        lambda session, task: TaskService.trigger(session, task.id),
+    ),
+    "get_client_in_db": (
+        _rebuilt_get_client,
+        lambda session, task: ClientService.get_client_in_db(
+            session, None, task.client_id
+        ),
+    ),
+}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Get a percentile of the values.
+
+    Parameters
+    ----------
+    values : list[float]
+        The values.
+    pct : float
+        The percentile (0-100).
+
+    Returns
+    -------
+    float
+        The percentile, 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+async def run_query(
+    session_maker: async_sessionmaker[AsyncSession],
+    task: Task,
+    query: Query,
+    rate: int,
+    duration: float,
+) -> dict[str, float]:
+    """Run a query at a fixed rate.
+
+    Parameters
+    ----------
+    session_maker : async_sessionmaker[AsyncSession]
+        The session maker.
+    task : Task
+        The task to look up.
+    query : Query
+        The query to run.
+    rate : int
+        The queries per second.
+    duration : float
+        For how long (seconds).
+
+    Returns
+    -------
+    dict[str, float]
+        The results.
+    """
+    async with session_maker() as session:
+        # warm up (connections and the compiled cache)
+        for _ in range(50):
+            await query(session, task)
+        latencies: list[float] = []
+        total = int(rate * duration)
+        interval = 1 / rate
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        for index in range(total):
+            delay = started + index * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            before = time.perf_counter()
+            await query(session, task)
+            latencies.append(time.perf_counter() - before)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+    return {
+        "queries": total,
+        "rate": round(total / elapsed, 1),
+        "cpu_us_per_query": round(cpu / total * 1e6, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run_benchmark(
+    db_url: str | None, rate: int, duration: float
+) -> list[dict[str, Any]]:
+    """Run all the queries in both ways.
+
+    Parameters
+    ----------
+    db_url : str | None
+        The database URL (None: a temporary SQLite database).
+    rate : int
+        The queries per second.
+    duration : float
+        For how long (seconds) each run lasts.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The results.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = db_url or f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.db'}"
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_maker() as session:
+            client = Client(
+                client_id=f"bench-{time.time_ns()}",
+                client_secret="not-a-secret",
+                audience="tasks-api",
+            )
+            task = Task(
+                client_id=client.client_id, flow_id="bench", filename="x"
+            )
+            session.add_all([client, task])
+            await session.commit()
+        results: list[dict[str, Any]] = []
+        for name, (rebuilt, prebuilt) in QUERIES.items():
+            for kind, query in (
+                ("built per call", rebuilt),
+                ("prebuilt", prebuilt),
+            ):
+                result = await run_query(
+                    session_maker, task, query, rate=rate, duration=duration
+                )
+                results.append({"query": name, "statement": kind, **result})
+        async with session_maker() as session:
+            await session.delete(task)
+            await session.delete(client)
+            await session.commit()
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--db-url", default=None, help="An async database URL")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+    results = asyncio.run(
+        run_benchmark(args.db_url, rate=args.rate, duration=args.duration)
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(f"[{result['query']}, {result['statement']}]")
+        for key, value in result.items():
+            if key not in ("query", "statement"):
+                print(f"  {key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-locals,too-many-try-statements
+"""Benchmark the WebSocket fan-out of task output to many viewers.
+
+Feeds a task manager with stream entries at a fixed rate and reports
+the event loop overhead (lag, created tasks, CPU time), the delivery
+latency and the ordering as seen by each (fake) viewer, as well as the
+socket writes and bytes per viewer (raw and with permessage-deflate).
+
+Usage:
+    python scripts/bench_ws_fanout.py --rate 1000 --viewers 10
+    python scripts/bench_ws_fanout.py --mode both --duration 10
+    python scripts/bench_ws_fanout.py --mode pipeline --batch
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Coroutine
+
+ROOT_DIR = Path(__file__).parent.parent.resolve()
+
+try:
+    from waldiez_runner.routes.ws.manager import WsClient, WsTaskManager
+except ImportError:
+    sys.path.append(str(ROOT_DIR))
+    from waldiez_runner.routes.ws.manager import WsClient, WsTaskManager
+
+MODES = ("pipeline", "task")
+
+
+class FakeViewer(WsClient):
+    """A viewer (a task manager's client) that records what it receives."""
+
+    def __init__(self, sent_at: dict[str, float], delay: float) -> None:
+        """Initialize the viewer.
+
+        Parameters
+        ----------
+        sent_at : dict[str, float]
+            When each entry id was produced.
+        delay : float
+            Seconds each send takes.
+        """
+        self.sent_at = sent_at
+        self.delay = delay
+        self.received = 0
+        self.out_of_order = 0
+        self.last_seq = 0
+        self.latencies: list[float] = []
+        self.writes = 0
+        self.raw_bytes = 0
+        self.deflated_bytes = 0
+        # permessage-deflate (with context takeover)
+        self._deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+
+    async def send_text(self, data: str) -> None:
+        """Receive a frame.
+
+        Parameters
+        ----------
+        data : str
+            The frame.
+        """
+        # yield like a real socket write would
+        await asyncio.sleep(self.delay)
+        self.writes += 1
+        encoded = data.encode()
+        self.raw_bytes += len(encoded)
+        deflated = self._deflate.compress(encoded)
+        deflated += self._deflate.flush(zlib.Z_SYNC_FLUSH)
+        self.deflated_bytes += len(deflated) - 4  # without 00 00 ff ff
+        payload = json.loads(data)
+        messages = payload if isinstance(payload, list) else [payload]
+        for message in messages:
+            self._receive(message["id"])
+
+    def _receive(self, entry_id: str) -> None:
+        seq = int(entry_id.split("-")[0])
+        if seq <= self.last_seq:
+            self.out_of_order += 1
+        self.last_seq = max(self.last_seq, seq)
+        self.received += 1
+        self.latencies.append(time.perf_counter() - self.sent_at[entry_id])
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        """Close the (fake) connection.
+
+        Parameters
+        ----------
+        code : int
+            The close code.
+        reason : str
+            The reason.
+        """
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Get a percentile of the values.
+
+    Parameters
+    ----------
+    values : list[float]
+        The values.
+    pct : float
+        The percentile (0-100).
+
+    Returns
+    -------
+    float
+        The percentile, 0 if there are no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+async def monitor_loop_lag(
+    interval: float, lags: list[float], stop: asyncio.Event
+) -> None:
+    """Record how late the event loop wakes up a sleeping coroutine.
+
+    Parameters
+    ----------
+    interval : float
+        The sleep interval in seconds.
+    lags : list[float]
+        Where to record the lags.
+    stop : asyncio.Event
+        Set to stop monitoring.
+    """
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - start - interval))
+
+
+async def run_benchmark(
+    mode: str,
+    rate: int,
+    viewers: int,
+    duration: float,
+    send_delay: float,
+    queue_size: int,
+    batch: bool = False,
+) -> dict[str, Any]:
+    """Run the benchmark once.
+
+    Parameters
+    ----------
+    mode : str
+        "pipeline" (ordered append to the clients' queues) or "task"
+        (a task per entry, sending directly to each viewer).
+    rate : int
+        Entries per second.
+    viewers : int
+        The number of viewers.
+    duration : float
+        How long to produce entries, in seconds.
+    send_delay : float
+        Seconds each send takes.
+    queue_size : int
+        The per client queue size.
+    batch : bool, optional
+        Whether the viewers get batched frames (pipeline mode only).
+
+    Returns
+    -------
+    dict[str, Any]
+        The results.
+    """
+    loop = asyncio.get_running_loop()
+    created_tasks = 0
+    default_factory = loop.get_task_factory()
+
+    def counting_factory(
+        the_loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[Any, Any, Any],
+        **kwargs: Any,
+    ) -> "asyncio.Future[Any]":
+        """Count the created tasks.
+
+        Parameters
+        ----------
+        the_loop : asyncio.AbstractEventLoop
+            The event loop.
+        coro : Coroutine[Any, Any, Any]
+            The task's coroutine.
+        **kwargs : Any
+            The task's keyword arguments.
+
+        Returns
+        -------
+        asyncio.Future[Any]
+            The created task.
+        """
+        nonlocal created_tasks
+        created_tasks += 1
+        if default_factory is not None:  # pragma: no cover
+            return default_factory(the_loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=the_loop, **kwargs)
+
+    manager = WsTaskManager("bench", max_clients=viewers, queue_size=queue_size)
+    sent_at: dict[str, float] = {}
+    clients = [FakeViewer(sent_at, send_delay) for _ in range(viewers)]
+    for client in clients:
+        manager.add_client(client, batch=batch and mode == "pipeline")
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_loop_lag(0.005, lags, stop))
+    loop.set_task_factory(counting_factory)  # type: ignore[arg-type]
+    pending: set[asyncio.Task[None]] = set()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    produced = 0
+    total = int(rate * duration)
+    try:
+        while produced < total:
+            due = min(total, int((time.perf_counter() - start) * rate) + 1)
+            while produced < due:
+                produced += 1
+                entry_id = f"{produced}-0"
+                message = {"type": "print", "id": entry_id, "data": "x" * 64}
+                sent_at[entry_id] = time.perf_counter()
+                if mode == "pipeline":
+                    manager.enqueue(message)
+                else:
+                    task = asyncio.create_task(
+                        manager.broadcast(message, skip_queue=True)
+                    )
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            await asyncio.sleep(0.001)
+        # let the viewers catch up
+        deadline = time.perf_counter() + 5
+        while time.perf_counter() < deadline and (
+            pending
+            or any(c.received + _dropped(manager, c) < total for c in clients)
+        ):
+            await asyncio.sleep(0.01)
+    finally:
+        loop.set_task_factory(default_factory)
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        stop.set()
+        await monitor
+        for client in clients:
+            manager.remove_client(client)
+
+    latencies = [lat for c in clients for lat in c.latencies]
+    return {
+        "mode": mode,
+        "rate": rate,
+        "viewers": viewers,
+        "produced": produced,
+        "delivered": sum(c.received for c in clients),
+        "dropped": sum(_dropped(manager, c) for c in clients),
+        "out_of_order": sum(c.out_of_order for c in clients),
+        "batched": batch and mode == "pipeline",
+        "writes_per_viewer": round(sum(c.writes for c in clients) / viewers),
+        "kb_per_viewer": round(
+            sum(c.raw_bytes for c in clients) / viewers / 1024, 1
+        ),
+        "deflated_kb_per_viewer": round(
+            sum(c.deflated_bytes for c in clients) / viewers / 1024, 1
+        ),
+        "tasks_created": created_tasks,
+        "elapsed_s": round(elapsed, 3),
+        "cpu_s": round(cpu, 3),
+        "loop_lag_p50_ms": round(percentile(lags, 50) * 1000, 3),
+        "loop_lag_p99_ms": round(percentile(lags, 99) * 1000, 3),
+        "loop_lag_max_ms": round(max(lags, default=0) * 1000, 3),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def _dropped(manager: WsTaskManager, client: FakeViewer) -> int:
+    queue = manager.client_queues.get(client)
+    return queue.dropped if queue is not None else 0
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=(*MODES, "both"), default="both")
+    parser.add_argument("--rate", type=int, default=1000)
+    parser.add_argument("--viewers", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument(
+        "--send-delay-ms",
+        type=float,
+        default=0.0,
+        help=(
+            "Simulated time per socket write (the 'task' mode writes to"
+            " the same viewer concurrently, which real sockets do not)"
+        ),
+    )
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Batch the frames of each viewer (pipeline mode)",
+    )
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    modes = MODES if args.mode == "both" else (args.mode,)
+    results = [
+        asyncio.run(
+            run_benchmark(
+                mode,
+                rate=args.rate,
+                viewers=args.viewers,
+                duration=args.duration,
+                send_delay=args.send_delay_ms / 1000,
+                queue_size=args.queue_size,
+                batch=args.batch,
+            )
+        )
+        for mode in modes
+    ]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(f"[{result['mode']}]")
+        for key, value in result.items():
+            if key != "mode":
+                print(f"  {key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -64,6 +64,69 @@ def test_list_tasks(httpx_mock: HTTPXMock, tasks_client: TasksClient) -> None:
     assert tasks_client.list_tasks().model_dump() == response_dict
 
 
+def _task_item(task_id: str) -> dict[str, Any]:
+    """Get a task of a listing."""
+    return {
+        "id": task_id,
+        "created_at": "2023-10-01T00:00:00Z",
+        "updated_at": "2023-10-01T00:00:00Z",
+        "client_id": "client_id",
+        "flow_id": "flow_id",
+        "filename": "file.txt",
+        "status": "COMPLETED",
+        "input_timeout": 10,
+        "input_request_id": None,
+        "results": None,
+    }
+
+
+def _add_cursor_pages(httpx_mock: HTTPXMock, base_url: str) -> None:
+    """Mock a listing of two pages."""
+    url = f"{base_url}/api/v1/tasks?pagination=cursor&size=2"
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{url}&order_type=desc",
+        json={
+            "items": [_task_item("t3"), _task_item("t2")],
+            "next_cursor": "c2",
+            "prev_cursor": None,
+            "size": 2,
+        },
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{url}&order_type=desc&after=c2",
+        json={
+            "items": [_task_item("t1")],
+            "next_cursor": None,
+            "prev_cursor": "c1",
+            "size": 2,
+        },
+    )
+
+
+def test_iter_tasks(httpx_mock: HTTPXMock, tasks_client: TasksClient) -> None:
+    """Test iterating over the tasks with the listing's cursors."""
+    _add_cursor_pages(httpx_mock, str(tasks_client.base_url))
+    tasks = tasks_client.iter_tasks({"size": 2, "order_type": "desc"})
+    assert [task.id for task in tasks] == ["t3", "t2", "t1"]
+
+
+@pytest.mark.anyio
+async def test_a_iter_tasks(
+    httpx_mock: HTTPXMock, tasks_client: TasksClient
+) -> None:
+    """Test iterating over the tasks asynchronously."""
+    _add_cursor_pages(httpx_mock, str(tasks_client.base_url))
+    tasks = [
+        task.id
+        async for task in tasks_client.a_iter_tasks(
+            {"size": 2, "order_type": "desc"}
+        )
+    ]
+    assert tasks == ["t3", "t2", "t1"]
+
+
 def test_delete_all_tasks(
     httpx_mock: HTTPXMock, tasks_client: TasksClient
 ) -> None:
@@ -3,7 +3,7 @@
 #
 # flake8: noqa: E501
 # pylint: disable=missing-param-doc,missing-return-doc
-# pylint: disable=missing-raises-doc,unused-argument
+# pylint: disable=missing-raises-doc,unused-argument,protected-access
 """Test waldiez_runner.client._websockets.*."""
 
 import asyncio
@@ -19,6 +19,8 @@ from websockets import ConnectionClosed, InvalidStatus
 from waldiez_runner.client._websockets import (
     AsyncWebSocketClient,
     SyncWebSocketClient,
+    get_listen_url,
+    track_event_id,
 )
 from waldiez_runner.client.auth import Auth
 
@@ -481,3 +483,66 @@ async def test_async_already_listening_skips_listen(auth: Auth) -> None:
         await client.listener_task
     except asyncio.CancelledError:
         pass
+
+
+def test_track_event_id() -> None:
+    """Test remembering the last received stream id."""
+    ids: dict[str, str] = {}
+    track_event_id(ids, "task1", '{"type":"print","id":"1-0"}')
+    assert ids == {"task1": "1-0"}
+    track_event_id(ids, "task1", '{"type":"history","data":[],"id":"0-1"}')
+    track_event_id(ids, "task1", '{"type":"status"}')
+    track_event_id(ids, "task1", "not json")
+    track_event_id(ids, "task1", "[1, 2]")
+    assert ids == {"task1": "1-0"}
+    assert get_listen_url("ws://host/ws", "task1", ids) == (
+        "ws://host/ws/task1?last_event_id=1-0"
+    )
+    assert get_listen_url("ws://host/ws", "task2", ids) == "ws://host/ws/task2"
+
+
+@patch("websockets.sync.client.connect")
+def test_sync_listen_resumes_on_reconnect(
+    mock_connect: MagicMock, auth: Auth
+) -> None:
+    """Test that a reconnecting sync client sends the last event id."""
+    ws_mock = MagicMock()
+    ws_mock.recv.side_effect = ['{"type":"print","id":"5-0"}', Exception("x")]
+    mock_connect.return_value.__enter__.return_value = ws_mock
+
+    client = SyncWebSocketClient(auth=auth, reconnect=False)
+    client._connect_and_receive("task123", lambda msg: None)
+    assert client.last_event_ids == {"task123": "5-0"}
+
+    ws_mock.recv.side_effect = [Exception("x")]
+    client._connect_and_receive("task123", lambda msg: None)
+    assert mock_connect.call_args.args[0].endswith(
+        "/ws/task123?last_event_id=5-0"
+    )
+
+
+@pytest.mark.asyncio
+@patch("websockets.asyncio.client.connect")
+async def test_async_listen_resumes_on_reconnect(
+    mock_connect: AsyncMock, auth: Auth
+) -> None:
+    """Test that a reconnecting async client sends the last event id."""
+    ws_mock = AsyncMock()
+    ws_mock.recv = AsyncMock(
+        side_effect=['{"type":"print","id":"7-1"}', Exception("done")]
+    )
+    mock_connect.return_value.__aenter__.return_value = ws_mock
+
+    async def on_msg(msg: str) -> None:
+        """Handle incoming messages."""
+
+    client = AsyncWebSocketClient(auth=auth, reconnect=False)
+    await client.listen("task123", on_msg, in_task=False)
+    assert client.last_event_ids == {"task123": "7-1"}
+
+    ws_mock.recv = AsyncMock(side_effect=[Exception("done")])
+    client.stop_event.clear()
+    await client.listen("task123", on_msg, in_task=False)
+    assert mock_connect.call_args.args[0].endswith(
+        "/ws/task123?last_event_id=7-1"
+    )
@@ -86,3 +86,115 @@ def test_get_local_client_secret_with_env() -> None:
     """Test get_local_client_secret with environment variables."""
     os.environ[f"{ENV_PREFIX}LOCAL_CLIENT_SECRET"] = "test-client-secret"
     assert _auth.get_local_client_secret() == "test-client-secret"
+
+
+def test_get_auth_token_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the verified token cache settings."""
+    monkeypatch.delenv(f"{ENV_PREFIX}AUTH_TOKEN_CACHE_SIZE", raising=False)
+    monkeypatch.delenv(f"{ENV_PREFIX}AUTH_TOKEN_CACHE_TTL", raising=False)
+    assert (
+        _auth.get_auth_token_cache_size() == _auth.DEFAULT_AUTH_TOKEN_CACHE_SIZE
+    )
+    assert (
+        _auth.get_auth_token_cache_ttl() == _auth.DEFAULT_AUTH_TOKEN_CACHE_TTL
+    )
+    monkeypatch.setenv(f"{ENV_PREFIX}AUTH_TOKEN_CACHE_SIZE", "0")
+    monkeypatch.setenv(f"{ENV_PREFIX}AUTH_TOKEN_CACHE_TTL", "-1")
+    assert _auth.get_auth_token_cache_size() == 0
+    assert _auth.get_auth_token_cache_ttl() == 0.0
+
+
+def test_get_external_auth_http_and_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the external verification client and cache settings."""
+    names = (
+        "EXTERNAL_AUTH_MAX_CONNECTIONS",
+        "EXTERNAL_AUTH_MAX_KEEPALIVE",
+        "EXTERNAL_AUTH_CACHE_SIZE",
+        "EXTERNAL_AUTH_CACHE_TTL",
+        "EXTERNAL_AUTH_NEGATIVE_CACHE_TTL",
+    )
+    for name in names:
+        monkeypatch.delenv(f"{ENV_PREFIX}{name}", raising=False)
+    assert (
+        _auth.get_external_auth_max_connections()
+        == _auth.DEFAULT_EXTERNAL_AUTH_MAX_CONNECTIONS
+    )
+    assert (
+        _auth.get_external_auth_max_keepalive()
+        == _auth.DEFAULT_EXTERNAL_AUTH_MAX_KEEPALIVE
+    )
+    assert (
+        _auth.get_external_auth_cache_size()
+        == _auth.DEFAULT_EXTERNAL_AUTH_CACHE_SIZE
+    )
+    assert (
+        _auth.get_external_auth_cache_ttl()
+        == _auth.DEFAULT_EXTERNAL_AUTH_CACHE_TTL
+    )
+    assert (
+        _auth.get_external_auth_negative_cache_ttl()
+        == _auth.DEFAULT_EXTERNAL_AUTH_NEGATIVE_CACHE_TTL
+    )
+    for name in names:
+        monkeypatch.setenv(f"{ENV_PREFIX}{name}", "-1")
+    assert _auth.get_external_auth_max_connections() == 1
+    assert _auth.get_external_auth_max_keepalive() == 0
+    assert _auth.get_external_auth_cache_size() == -1
+    assert _auth.get_external_auth_cache_ttl() == 0.0
+    assert _auth.get_external_auth_negative_cache_ttl() == 0.0
+
+
+def test_get_hashing_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the hashing pool settings."""
+    monkeypatch.delenv(f"{ENV_PREFIX}HASHING_POOL_WORKERS", raising=False)
+    monkeypatch.delenv(f"{ENV_PREFIX}HASHING_POOL_MAX_PENDING", raising=False)
+    assert (
+        _auth.get_hashing_pool_workers() == _auth.DEFAULT_HASHING_POOL_WORKERS
+    )
+    assert (
+        _auth.get_hashing_pool_max_pending()
+        == _auth.DEFAULT_HASHING_POOL_MAX_PENDING
+    )
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_POOL_WORKERS", "2")
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_POOL_MAX_PENDING", "0")
+    assert _auth.get_hashing_pool_workers() == 2
+    assert _auth.get_hashing_pool_max_pending() == 1
+
+
+def test_get_hashing_cost(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the secret hashing cost settings."""
+    names = [
+        "HASHING_ARGON2_TIME_COST",
+        "HASHING_ARGON2_MEMORY_COST",
+        "HASHING_ARGON2_PARALLELISM",
+        "HASHING_SCRYPT_N",
+        "HASHING_SCRYPT_R",
+        "HASHING_SCRYPT_P",
+    ]
+    for name in names:
+        monkeypatch.delenv(f"{ENV_PREFIX}{name}", raising=False)
+    assert (
+        _auth.get_hashing_argon2_time_cost()
+        == _auth.DEFAULT_HASHING_ARGON2_TIME_COST
+    )
+    assert (
+        _auth.get_hashing_argon2_memory_cost()
+        == _auth.DEFAULT_HASHING_ARGON2_MEMORY_COST
+    )
+    assert _auth.get_hashing_scrypt_n() == _auth.DEFAULT_HASHING_SCRYPT_N
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_ARGON2_TIME_COST", "3")
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_ARGON2_PARALLELISM", "2")
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_ARGON2_MEMORY_COST", "4")
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_SCRYPT_N", "20000")
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_SCRYPT_R", "0")
+    monkeypatch.setenv(f"{ENV_PREFIX}HASHING_SCRYPT_P", "2")
+    assert _auth.get_hashing_argon2_time_cost() == 3
+    assert _auth.get_hashing_argon2_parallelism() == 2
+    # at least 8 KiB per lane
+    assert _auth.get_hashing_argon2_memory_cost() == 16
+    # rounded up to a power of 2
+    assert _auth.get_hashing_scrypt_n() == 32768
+    assert _auth.get_hashing_scrypt_r() == 1
+    assert _auth.get_hashing_scrypt_p() == 2
@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Test waldiez_runner.config._postgres."""
+
+# pylint: disable=missing-return-doc,missing-param-doc,missing-yield-doc
+
+import os
+import sys
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+# noinspection PyProtectedMember
+from waldiez_runner.config import ENV_PREFIX, _postgres
+
+THIS_FILE = Path(__file__).resolve()
+
+ENV_KEYS = (
+    f"{ENV_PREFIX}POSTGRES_API_POOL_SIZE",
+    f"{ENV_PREFIX}POSTGRES_WORKER_POOL_SIZE",
+    f"{ENV_PREFIX}POSTGRES_WORKER_MAX_OVERFLOW",
+    f"{ENV_PREFIX}POSTGRES_POOL_TIMEOUT",
+    f"{ENV_PREFIX}POSTGRES_PGBOUNCER",
+)
+
+
+@pytest.fixture(autouse=True, name="clear_env")
+def clear_env_and_args() -> Generator[None, None, None]:
+    """Clear environment variables and command-line arguments."""
+    original_envs = {
+        key: os.environ.pop(key) for key in ENV_KEYS if key in os.environ
+    }
+    original_argv = sys.argv[:]
+    sys.argv = [str(THIS_FILE)]
+    yield
+    for key in ENV_KEYS:
+        os.environ.pop(key, None)
+    for key, value in original_envs.items():
+        os.environ[key] = value
+    sys.argv = original_argv
+
+
+def test_get_db_pool_size() -> None:
+    """Test the pool's size and overflow per role."""
+    assert _postgres.get_db_pool_size("api") == 10
+    assert _postgres.get_db_max_overflow("worker") == 20
+    os.environ[f"{ENV_PREFIX}POSTGRES_WORKER_POOL_SIZE"] = "2"
+    os.environ[f"{ENV_PREFIX}POSTGRES_WORKER_MAX_OVERFLOW"] = "0"
+    assert _postgres.get_db_pool_size("worker") == 2
+    assert _postgres.get_db_max_overflow("worker") == 0
+    assert _postgres.get_db_pool_size("api") == 10
+    sys.argv.extend(["--postgres-api-pool-size", "4"])
+    assert _postgres.get_db_pool_size("api") == 4
+
+
+def test_get_db_pool_timeout() -> None:
+    """Test get_db_pool_timeout."""
+    assert _postgres.get_db_pool_timeout() == 30.0
+    os.environ[f"{ENV_PREFIX}POSTGRES_POOL_TIMEOUT"] = "2.5"
+    assert _postgres.get_db_pool_timeout() == 2.5
+
+
+def test_get_db_pgbouncer() -> None:
+    """Test get_db_pgbouncer."""
+    assert _postgres.get_db_pgbouncer() is False
+    os.environ[f"{ENV_PREFIX}POSTGRES_PGBOUNCER"] = "true"
+    assert _postgres.get_db_pgbouncer() is True
+    sys.argv.append("--no-postgres-pgbouncer")
+    assert _postgres.get_db_pgbouncer() is False
@@ -127,3 +127,28 @@ def test_get_skip_deps_from_cli_off() -> None:
     """Test get_skip_deps from faulty cli arg."""
     sys.argv.extend(["--no-skip-deps"])
     assert _tasks.get_skip_deps() is False
+
+
+def test_get_task_results_inline_max_size() -> None:
+    """Test get_task_results_inline_max_size."""
+    os.environ.pop(f"{ENV_PREFIX}TASK_RESULTS_INLINE_MAX_SIZE", None)
+    assert (
+        _tasks.get_task_results_inline_max_size()
+        == _tasks.DEFAULT_TASK_RESULTS_INLINE_MAX_SIZE
+    )
+    os.environ[f"{ENV_PREFIX}TASK_RESULTS_INLINE_MAX_SIZE"] = "1024"
+    assert _tasks.get_task_results_inline_max_size() == 1024
+    sys.argv.extend(["--task-results-inline-max-size", "0"])
+    assert _tasks.get_task_results_inline_max_size() == 0
+    os.environ.pop(f"{ENV_PREFIX}TASK_RESULTS_INLINE_MAX_SIZE", None)
+
+
+def test_get_tasks_partitioned() -> None:
+    """Test get_tasks_partitioned."""
+    os.environ.pop(f"{ENV_PREFIX}TASKS_PARTITIONED", None)
+    assert _tasks.get_tasks_partitioned() is _tasks.DEFAULT_TASKS_PARTITIONED
+    os.environ[f"{ENV_PREFIX}TASKS_PARTITIONED"] = "true"
+    assert _tasks.get_tasks_partitioned() is True
+    sys.argv.extend(["--no-tasks-partitioned"])
+    assert _tasks.get_tasks_partitioned() is False
+    os.environ.pop(f"{ENV_PREFIX}TASKS_PARTITIONED", None)
@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Test waldiez_runner.config._ws."""
+
+# pylint: disable=missing-return-doc,missing-param-doc,missing-yield-doc
+
+import sys
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+# noinspection PyProtectedMember
+from waldiez_runner.config import ENV_PREFIX, _ws
+
+THIS_FILE = Path(__file__).resolve()
+
+
+@pytest.fixture(autouse=True, name="clear_args")
+def clear_args_fixture() -> Generator[None, None, None]:
+    """Clear the command-line arguments."""
+    original_argv = sys.argv[:]
+    sys.argv = [str(THIS_FILE)]
+    yield
+    sys.argv = original_argv
+
+
+def test_get_ws_ping_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the ping and reaper defaults."""
+    for key in ("WS_PING_INTERVAL", "WS_PING_TIMEOUT", "WS_IDLE_GRACE"):
+        monkeypatch.delenv(f"{ENV_PREFIX}{key}", raising=False)
+    assert _ws.get_ws_ping_interval() == _ws.DEFAULT_WS_PING_INTERVAL
+    assert _ws.get_ws_ping_timeout() == _ws.DEFAULT_WS_PING_TIMEOUT
+    assert _ws.get_ws_idle_grace() == _ws.DEFAULT_WS_IDLE_GRACE
+
+
+def test_get_ws_ping_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test disabling the pings."""
+    monkeypatch.setenv(f"{ENV_PREFIX}WS_PING_INTERVAL", "0")
+    monkeypatch.setenv(f"{ENV_PREFIX}WS_PING_TIMEOUT", "-1")
+    assert _ws.get_ws_ping_interval() is None
+    assert _ws.get_ws_ping_timeout() is None
+
+
+def test_get_ws_reaper(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the reaper settings."""
+    monkeypatch.setenv(f"{ENV_PREFIX}WS_REAP_INTERVAL", "5.5")
+    monkeypatch.setenv(f"{ENV_PREFIX}WS_IDLE_GRACE", "-3")
+    assert _ws.get_ws_reap_interval() == 5.5
+    assert _ws.get_ws_idle_grace() == 0.0
@@ -125,6 +125,21 @@ def reset_settings_and_env() -> Generator[None, None, None]:
     os.environ[f"{ENV_KEY_PREFIX}TESTING"] = "1"
 
 
+@pytest.fixture(autouse=True)
+def reset_verification_caches() -> Generator[None, None, None]:
+    """Forget the external verification results of other tests."""
+    from waldiez_runner.routes.v1.task_permission import permission_results
+    from waldiez_runner.services.external_token_service import (
+        external_token_results,
+    )
+
+    external_token_results.clear()
+    permission_results.clear()
+    yield
+    external_token_results.clear()
+    permission_results.clear()
+
+
 def _ensure_keys() -> None:
     """Ensure secret_key, client_id and client_secret are set."""
     # in case a .env does not exist, or the keys are not set
@@ -18,6 +18,7 @@ from waldiez_runner.dependencies.auth import (
     decode_oidc_jwt,
     verify_external_auth_token,
 )
+from waldiez_runner.dependencies.jwks import JWKey
 from waldiez_runner.services.external_token_service import ExternalTokenResponse
 
 
@@ -88,9 +89,7 @@ async def test_decode_oidc_jwt_valid() -> None:
         oidc_audience = "tasks-api"
 
     jwks_cache = AsyncMock()
-    jwks_cache.get_keys.return_value = {
-        "keys": [{"kid": "test-key", "alg": "RS256"}]
-    }
+    jwks_cache.get_key.return_value = JWKey({"public_key": "key"}, "RS256")
 
     with (
         patch("jwt.decode", return_value=mock_payload) as mock_decode,
@@ -98,10 +97,6 @@ async def test_decode_oidc_jwt_valid() -> None:
             "jwt.get_unverified_header",
             return_value={"kid": "test-key", "alg": "RS256"},
         ),
-        patch(
-            "jwt.algorithms.RSAAlgorithm.from_jwk",
-            return_value={"public_key": "key"},
-        ),
     ):
         decoded = await decode_oidc_jwt(
             token,
@@ -111,6 +106,7 @@ async def test_decode_oidc_jwt_valid() -> None:
 
     assert decoded == mock_payload
     mock_decode.assert_called_once()
+    jwks_cache.get_key.assert_awaited_once_with("test-key")
 
 
 @pytest.mark.asyncio
@@ -136,9 +132,7 @@ async def test_decode_oidc_jwt_key_not_found() -> None:
         oidc_audience = "tasks-api"
 
     jwks_cache = AsyncMock()
-    jwks_cache.get_keys.return_value = {
-        "keys": [{"kid": "wrong", "alg": "HS256"}]
-    }
+    jwks_cache.get_key.return_value = None
     mock_payload = {"sub": "client_123", "aud": "tasks-api", "alg": "HS256"}
     with (
         patch("jwt.decode", return_value=mock_payload),
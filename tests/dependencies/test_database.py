@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+
+"""Test waldiez_runner.dependencies.database."""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from waldiez_runner.config import DB_PREPARED_STATEMENTS, Settings
+from waldiez_runner.dependencies.database import (
+    DatabaseManager,
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+    PoolStats,
+    _set_psycopg_prepared_max,
+    prepared_statements_connect_args,
+)
+
+
+async def _database_file(session: AsyncSession) -> str:
+    """Get the file of a session's (SQLite) database."""
+    result = await session.execute(text("PRAGMA database_list"))
+    return Path(str(result.all()[0][2])).name
+
+
+@pytest.mark.anyio
+async def test_no_replica(settings: Settings) -> None:
+    """Test that without a replica every session uses the primary."""
+    db = DatabaseManager(settings)
+    assert db.replica_engine is None
+    primary = Path(settings.get_database_url().split("///")[-1]).name
+    async with db.session(readonly=True, client_id="client") as session:
+        assert await _database_file(session) == primary
+    db.pin_to_primary("client")
+    assert db.is_pinned("client") is False
+    await db.close()
+
+
+@pytest.mark.anyio
+async def test_read_replica_routing(settings: Settings, tmp_path: Path) -> None:
+    """Test routing the read only sessions to the replica."""
+    db = DatabaseManager(
+        settings,
+        replica_url=f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}",
+        pin_seconds=0.2,
+    )
+    assert db.replica_engine is not None
+    primary = Path(settings.get_database_url().split("///")[-1]).name
+    async with db.session(readonly=True, client_id="client") as session:
+        assert await _database_file(session) == "replica.db"
+    async with db.session(client_id="client") as session:
+        assert await _database_file(session) == primary
+        # not pinned without a commit
+        assert db.is_pinned("client") is False
+        await session.commit()
+    assert db.is_pinned("client")
+    # the client that wrote reads its writes, the others use the replica
+    async with db.session(readonly=True, client_id="client") as session:
+        assert await _database_file(session) == primary
+    async with db.session(readonly=True, client_id="other") as session:
+        assert await _database_file(session) == "replica.db"
+    async with db.session(readonly=True) as session:
+        assert await _database_file(session) == "replica.db"
+    await asyncio.sleep(0.3)
+    async with db.session(readonly=True, client_id="client") as session:
+        assert await _database_file(session) == "replica.db"
+    await db.close()
+    assert db.replica_engine is None
+
+
+def test_prepared_statements_connect_args() -> None:
+    """Test the drivers' prepared statements' args."""
+    psycopg = "postgresql+psycopg://user:pass@db/db"
+    asyncpg = "postgresql+asyncpg://user:pass@db/db"
+    assert prepared_statements_connect_args(psycopg, 5, 256) == {
+        "prepare_threshold": 5
+    }
+    assert prepared_statements_connect_args(psycopg, -1, 256) == {
+        "prepare_threshold": None
+    }
+    assert prepared_statements_connect_args(asyncpg, 5, 256) == {
+        "prepared_statement_cache_size": 256
+    }
+    assert not prepared_statements_connect_args(asyncpg, 5, 0)
+    assert not prepared_statements_connect_args("sqlite+aiosqlite://", 5, 1)
+    # behind PgBouncer: never prepared
+    assert prepared_statements_connect_args(
+        psycopg, 5, 256, pgbouncer=True
+    ) == {"prepare_threshold": None}
+    assert prepared_statements_connect_args(
+        asyncpg, 5, 256, pgbouncer=True
+    ) == {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+
+
+def test_set_psycopg_prepared_max() -> None:
+    """Test setting the max prepared statements of a connection."""
+    driver = SimpleNamespace(prepared_max=100)
+    connection: Any = SimpleNamespace(driver_connection=driver)
+    record: Any = None
+    _set_psycopg_prepared_max(connection, record)
+    assert driver.prepared_max == DB_PREPARED_STATEMENTS
+    # not a psycopg connection
+    other: Any = SimpleNamespace()
+    _set_psycopg_prepared_max(other, record)
+
+
+@pytest.mark.anyio
+async def test_pool_metrics(settings: Settings, tmp_path: Path) -> None:
+    """Test the pools' checkouts, connections in use and waits."""
+    db = DatabaseManager(
+        settings, replica_url=f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    )
+    assert db.engine is not None
+    assert isinstance(db.engine.sync_engine.pool, InstrumentedQueuePool)
+    async with db.session() as session:
+        await session.execute(text("SELECT 1"))
+        assert db.pool_metrics()["primary"]["in_use"] == 1
+    async with db.session(readonly=True) as session:
+        await session.execute(text("SELECT 1"))
+    metrics = db.pool_metrics()
+    assert metrics["primary"]["in_use"] == 0
+    assert metrics["primary"]["max_in_use"] == 1
+    assert metrics["primary"]["checkouts"] == 1
+    assert metrics["primary"]["timeouts"] == 0
+    assert (
+        metrics["primary"]["wait_max_ms"] >= metrics["primary"]["wait_avg_ms"]
+    )
+    assert metrics["primary"]["idle"] == 1
+    assert metrics["replica"]["checkouts"] == 1
+    # kept when the pool is recreated
+    await db.engine.dispose()
+    assert db.pool_metrics()["primary"]["checkouts"] == 1
+    await db.close()
+    assert not db.pool_metrics()
+
+
+@pytest.mark.anyio
+async def test_pool_overflow_and_timeout(tmp_path: Path) -> None:
+    """Test counting the overflow connections and the timeouts."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, InstrumentedQueuePool)
+    first = await engine.connect()
+    second = await engine.connect()
+    assert pool.stats.overflows == 1
+    with pytest.raises(PoolTimeoutError):
+        await engine.connect()
+    assert pool.stats.timeouts == 1
+    assert pool.stats.wait_max >= 0.1
+    await first.close()
+    await second.close()
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_null_pool(tmp_path: Path) -> None:
+    """Test the (PgBouncer mode's) pool that keeps no connections."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedNullPool,
+    )
+    pool = engine.sync_engine.pool
+    assert isinstance(pool, InstrumentedNullPool)
+    stats = pool.stats
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    assert stats.waits == 1
+    await engine.dispose()
+    new_pool = engine.sync_engine.pool
+    assert isinstance(new_pool, InstrumentedNullPool)
+    assert new_pool.stats is stats
+
+
+def test_pool_stats() -> None:
+    """Test the pool's counters."""
+    stats = PoolStats()
+    assert stats.metrics()["wait_avg_ms"] == 0
+    record: Any = None
+    stats.on_checkout(record, record, record)
+    stats.on_checkout(record, record, record)
+    stats.on_checkin(None, record)
+    stats.on_checkin(None, record)
+    stats.on_checkin(None, record)
+    metrics = stats.metrics()
+    assert metrics["checkouts"] == 2
+    assert metrics["max_in_use"] == 2
+    assert metrics["in_use"] == 0
@@ -3,8 +3,10 @@
 
 """Test the getters dependencies."""
 
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import jwt
 import pytest
 from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
@@ -16,6 +18,7 @@ from waldiez_runner.dependencies.getters import (
     get_client_id,
     get_user_info,
 )
+from waldiez_runner.dependencies.token_cache import VerifiedTokenCache
 from waldiez_runner.services.external_token_service import ExternalTokenResponse
 
 
@@ -445,3 +448,101 @@ async def test_get_admin_client_id_with_external_auth_admin_isadmin_field(
         assert result == "user123"
         mock_get_client_id.assert_awaited_once()
         mock_verify_external.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("waldiez_runner.dependencies.getters.get_client_id_from_token")
+async def test_get_client_id_uses_verified_token_cache(
+    mock_get_client_id: AsyncMock,
+) -> None:
+    """Test that a verified token needs no more checks or db queries.
+
+    Parameters
+    ----------
+    mock_get_client_id : AsyncMock
+        Mock for the get_client_id_from_token function
+    """
+    token = jwt.encode(
+        {"sub": "client123", "aud": "tasks-api", "exp": time.time() + 60},
+        "secret",
+        algorithm="HS256",
+    )
+    mock_get_client_id.return_value = ("client123", "tasks-api", None)
+    mock_client_service = AsyncMock()
+    mock_client_service.get_client_in_db.return_value = MagicMock(id="db_1")
+    cache = VerifiedTokenCache()
+    mock_app_state = MagicMock()
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=token
+    )
+    with (
+        patch(
+            "waldiez_runner.dependencies.getters.ClientService",
+            mock_client_service,
+        ),
+        patch("waldiez_runner.dependencies.getters.app_state", mock_app_state),
+        patch("waldiez_runner.dependencies.getters.verified_tokens", cache),
+    ):
+        dependency_fn = get_client_id("tasks-api")
+        for _ in range(3):
+            result = await dependency_fn(credentials, MagicMock(), MagicMock())
+            assert result == "db_1"
+        mock_get_client_id.assert_awaited_once()
+        mock_client_service.get_client_in_db.assert_awaited_once()
+
+        # another audience is verified again
+        admin_fn = get_admin_client_id("admin-api", allow_external_auth=False)
+        mock_get_client_id.return_value = (None, None, Exception("aud"))
+        with pytest.raises(HTTPException):
+            await admin_fn(credentials, MagicMock(), MagicMock())
+
+        # and so is the token of an invalidated client
+        cache.invalidate(["db_1"])
+        mock_get_client_id.return_value = ("client123", "tasks-api", None)
+        assert await dependency_fn(credentials, MagicMock(), MagicMock())
+        assert mock_get_client_id.await_count == 3
+
+
+@pytest.mark.asyncio
+@patch("waldiez_runner.dependencies.getters.get_client_id_from_token")
+async def test_get_client_id_caches_oidc_tokens(
+    mock_get_client_id: AsyncMock,
+) -> None:
+    """Test that OIDC tokens (with the provider's audience) are cached.
+
+    Parameters
+    ----------
+    mock_get_client_id : AsyncMock
+        Mock for the get_client_id_from_token function
+    """
+    idp_audience = "https://idp.example.com"
+    token = jwt.encode(
+        {"sub": "client123", "aud": idp_audience, "exp": time.time() + 60},
+        "secret",
+        algorithm="HS256",
+    )
+    mock_get_client_id.return_value = ("client123", idp_audience, None)
+    mock_client_service = AsyncMock()
+    mock_client_service.get_client_in_db.return_value = MagicMock(id="db_1")
+    cache = VerifiedTokenCache()
+    mock_app_state = MagicMock()
+    mock_app_state.settings.use_local_auth = False
+    mock_app_state.settings.use_oidc_auth = True
+    credentials = HTTPAuthorizationCredentials(
+        scheme="Bearer", credentials=token
+    )
+    with (
+        patch(
+            "waldiez_runner.dependencies.getters.ClientService",
+            mock_client_service,
+        ),
+        patch("waldiez_runner.dependencies.getters.app_state", mock_app_state),
+        patch("waldiez_runner.dependencies.getters.verified_tokens", cache),
+    ):
+        dependency_fn = get_client_id("tasks-api")
+        for _ in range(3):
+            result = await dependency_fn(credentials, MagicMock(), MagicMock())
+            assert result == "db_1"
+        mock_get_client_id.assert_awaited_once()
+        mock_client_service.get_client_in_db.assert_awaited_once()
+        assert cache.stats()["hits"] == 2
@@ -2,21 +2,26 @@
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
 
 # pylint: disable=missing-param-doc,missing-return-doc,missing-yield-doc
-# pylint: disable=too-few-public-methods,protected-access
+# pylint: disable=too-few-public-methods,protected-access,unused-argument
 # pyright: reportPrivateUsage=false
 
 """Test waldiez_runner.dependencies.auth.jwks*."""
 
 import asyncio
+import json
 import time
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
+import jwt
+import jwt.algorithms
 import pytest
 import pytest_asyncio
+from cryptography.hazmat.primitives.asymmetric import rsa
 from pytest_httpx import HTTPXMock
 
-from waldiez_runner.dependencies.jwks import JWKSCache
+from waldiez_runner.dependencies.jwks import JWKSCache, parse_jwks
 
 
 # pylint: disable=too-few-public-methods
@@ -129,3 +134,114 @@ async def test_jwks_cache_concurrent_requests(
     assert len(httpx_mock.get_requests()) == 1
     # Ensure only one HTTP request was made
     # mock_get.assert_awaited_once_with(jwks_cache.jwks_url)
+
+
+def _jwk(kid: str) -> dict[str, Any]:
+    """Create a public RSA JWK."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(
+        jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key())
+    )
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return jwk
+
+
+def test_parse_jwks() -> None:
+    """Test parsing the keys once per key set."""
+    keys = parse_jwks(
+        {
+            "keys": [
+                _jwk("key-1"),
+                {"kid": "bad", "kty": "RSA"},
+                {"kty": "RSA"},
+                "not-a-key",
+            ]
+        }
+    )
+    assert list(keys) == ["key-1"]
+    assert keys["key-1"].alg == "RS256"
+    assert isinstance(keys["key-1"].key, rsa.RSAPublicKey)
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_get_key(
+    jwks_cache: JWKSCache, httpx_mock: HTTPXMock
+) -> None:
+    """Test looking keys up by kid."""
+    httpx_mock.add_response(json={"keys": [_jwk("key-1")]})
+    key = await jwks_cache.get_key("key-1")
+    assert key is not None and key.alg == "RS256"
+    # cached
+    assert await jwks_cache.get_key("key-1") is key
+    assert len(httpx_mock.get_requests()) == 1
+    assert await jwks_cache.get_key(None) is None
+    await jwks_cache.close()
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_unknown_kid_refresh_is_rate_limited(
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that an unknown kid forces a refresh at most once per interval."""
+    cache = JWKSCache(MockSettings(), min_refresh_interval=0.2)  # type: ignore
+    httpx_mock.add_response(json={"keys": [_jwk("key-1")]})
+    httpx_mock.add_response(json={"keys": [_jwk("key-1"), _jwk("key-2")]})
+    assert await cache.get_key("key-1") is not None
+    # fetched less than the interval ago
+    assert await cache.get_key("key-2") is None
+    assert len(httpx_mock.get_requests()) == 1
+    await asyncio.sleep(0.2)
+    # rotated key
+    assert await cache.get_key("key-2") is not None
+    assert len(httpx_mock.get_requests()) == 2
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_refreshes_in_background(
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test serving the current keys while refreshing ahead of expiry."""
+    cache = JWKSCache(MockSettings(), refresh_ahead=0.5)  # type: ignore
+    cache._cache = {"keys": []}
+    cache._cache_expiry = time.time() + 10  # within the last half of 60s
+    release = asyncio.Event()
+
+    async def slow_response(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return httpx.Response(200, json={"keys": [_jwk("key-1")]})
+
+    httpx_mock.add_callback(slow_response)
+    # served without waiting for the provider
+    assert await asyncio.wait_for(cache.get_keys(), timeout=1) == {"keys": []}
+    assert await cache.get_keys() == {"keys": []}
+    release.set()
+    assert cache._refresh_task is not None
+    await cache._refresh_task
+    assert "key-1" in cache._keys
+    assert cache._cache_expiry > time.time() + 50
+    assert len(httpx_mock.get_requests()) == 1
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_jwks_cache_serves_stale_keys_on_failure(
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that expired keys are served while the provider fails."""
+    cache = JWKSCache(MockSettings(), max_stale=30)  # type: ignore
+    cache._cache = {"keys": ["stale"]}
+    cache._cache_expiry = time.time() - 1
+    httpx_mock.add_response(status_code=503, is_reusable=True)
+    assert await cache.get_keys() == {"keys": ["stale"]}
+    assert cache._refresh_task is not None
+    await cache._refresh_task
+    # the failed refresh is not retried on every call
+    assert await cache.get_keys() == {"keys": ["stale"]}
+    assert cache._refresh_task.done()
+    assert len(httpx_mock.get_requests()) == 1
+    # too stale: wait for the provider
+    cache._cache_expiry = time.time() - 31
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get_keys()
+    await cache.close()
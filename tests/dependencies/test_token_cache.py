@@ -0,0 +1,163 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-return-doc,missing-param-doc,missing-yield-doc
+# pylint: disable=unused-argument,protected-access,too-few-public-methods
+# pyright: reportPrivateUsage=false
+"""Test waldiez_runner.dependencies.token_cache.*."""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import fakeredis
+import jwt
+import pytest
+
+from waldiez_runner.dependencies.token_cache import (
+    TOKEN_INVALIDATION_CHANNEL,
+    VerifiedTokenCache,
+    audience_matches,
+    invalidate_client_tokens,
+    token_expiry,
+)
+
+
+class FakeRedisManager:
+    """Fake Redis manager yielding a fakeredis client."""
+
+    def __init__(self, redis: fakeredis.aioredis.FakeRedis) -> None:
+        """Initialize the fake manager."""
+        self.redis = redis
+
+    @asynccontextmanager
+    async def contextual_client(
+        self, use_single_connection: bool = False
+    ) -> AsyncIterator[fakeredis.aioredis.FakeRedis]:
+        """Yield the fake client."""
+        yield self.redis
+
+
+def _token(sub: str = "client_1", expires_in: float | None = 60) -> str:
+    """Create a signed token."""
+    payload: dict[str, Any] = {"sub": sub, "aud": "tasks-api"}
+    if expires_in is not None:
+        payload["exp"] = int(time.time() + expires_in)
+    return jwt.encode(payload, "secret", algorithm="HS256")
+
+
+def test_token_expiry() -> None:
+    """Test reading the expiry of a token."""
+    token = _token(expires_in=60)
+    expiry = token_expiry(token)
+    assert expiry is not None and expiry > time.time()
+    assert token_expiry(_token(expires_in=None)) is None
+    assert token_expiry("not-a-token") is None
+
+
+def test_audience_matches() -> None:
+    """Test checking the audience like jwt.decode does."""
+    assert audience_matches("tasks-api", None)
+    assert audience_matches("tasks-api", "tasks-api")
+    assert audience_matches(["a", "tasks-api"], "tasks-api")
+    assert audience_matches("admin-api", ["tasks-api", "admin-api"])
+    assert not audience_matches("clients-api", "tasks-api")
+    assert not audience_matches(None, ["tasks-api"])
+
+
+def test_get_and_put() -> None:
+    """Test caching a verified token."""
+    cache = VerifiedTokenCache(max_size=10, max_ttl=300)
+    token = _token()
+    assert cache.get(token, "tasks-api") is None
+    entry = cache.put(token, "client_1", "tasks-api", "db_1")
+    assert entry is not None
+    assert entry.expires_at <= token_expiry(token)  # type: ignore
+    cached = cache.get(token, "tasks-api")
+    assert cached == entry
+    # not for another audience
+    assert cache.get(token, "clients-api") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2}
+
+
+def test_put_skips_tokens_without_expiry() -> None:
+    """Test that tokens without an expiry are verified every time."""
+    cache = VerifiedTokenCache()
+    assert cache.put(_token(expires_in=None), "c", "tasks-api", "d") is None
+    assert cache.put(_token(expires_in=-5), "c", "tasks-api", "d") is None
+    disabled = VerifiedTokenCache(max_size=0)
+    assert disabled.put(_token(), "c", "tasks-api", "d") is None
+    assert not cache and not disabled
+
+
+def test_entries_expire() -> None:
+    """Test that an entry is kept at most max_ttl."""
+    cache = VerifiedTokenCache(max_ttl=0.05)
+    token = _token()
+    cache.put(token, "client_1", "tasks-api", "db_1")
+    assert cache.get(token, "tasks-api") is not None
+    time.sleep(0.06)
+    assert cache.get(token, "tasks-api") is None
+    assert not cache
+
+
+def test_least_recently_used_is_evicted() -> None:
+    """Test the size bound."""
+    cache = VerifiedTokenCache(max_size=2)
+    tokens = [_token(f"client_{index}") for index in range(3)]
+    cache.put(tokens[0], "client_0", "tasks-api", "db_0")
+    cache.put(tokens[1], "client_1", "tasks-api", "db_1")
+    cache.get(tokens[0], "tasks-api")
+    cache.put(tokens[2], "client_2", "tasks-api", "db_2")
+    assert len(cache) == 2
+    assert cache.get(tokens[1], "tasks-api") is None
+    assert cache.get(tokens[0], "tasks-api") is not None
+
+
+def test_invalidate() -> None:
+    """Test dropping the tokens of clients."""
+    cache = VerifiedTokenCache()
+    token_1, token_2 = _token("client_1"), _token("client_2")
+    cache.put(token_1, "client_1", "tasks-api", "db_1")
+    cache.put(token_2, "client_2", "tasks-api", "db_2")
+    assert cache.invalidate(["db_1"]) == 1
+    assert cache.invalidate(["client_2", "other"]) == 1
+    assert not cache
+    cache.put(token_1, "client_1", "tasks-api", "db_1")
+    cache.clear()
+    assert not cache
+
+
+@pytest.mark.asyncio
+async def test_invalidation_listener(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that invalidations of other processes are applied."""
+    redis = FakeRedisManager(a_fake_redis)
+    local = VerifiedTokenCache(redis=redis)  # type: ignore
+    other = VerifiedTokenCache(redis=redis)  # type: ignore
+    token = _token()
+    for cache in (local, other):
+        cache.put(token, "client_1", "tasks-api", "db_1")
+    other.start_listener()
+    other.start_listener()  # already started
+
+    async def invalidate_until_applied() -> None:
+        while other:
+            await invalidate_client_tokens(
+                ["db_1"], cache=local, redis=redis  # type: ignore
+            )
+            await asyncio.sleep(0.02)
+
+    await asyncio.wait_for(invalidate_until_applied(), timeout=2)
+    assert not local
+
+    # ignored
+    await a_fake_redis.publish(TOKEN_INVALIDATION_CHANNEL, "not json")
+    await a_fake_redis.publish(TOKEN_INVALIDATION_CHANNEL, json.dumps({}))
+    await asyncio.sleep(0.05)
+    await other.stop_listener()
+    await other.stop_listener()  # no-op
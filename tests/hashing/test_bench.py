@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc
+
+"""Tests for the hashing cost calibration."""
+
+from pathlib import Path
+
+from waldiez_runner.hashing._argon_hasher import Argon2Hasher
+from waldiez_runner.hashing._scrypt_hasher import ScryptHasher
+from waldiez_runner.hashing.bench import (
+    BenchResult,
+    argon2_candidates,
+    describe,
+    format_results,
+    measure,
+    recommend,
+    run_bench,
+    scrypt_candidates,
+    write_env,
+)
+
+
+def test_candidates() -> None:
+    """Test the candidate grids."""
+    argon2 = argon2_candidates(memory_costs=(16384, 8192), time_costs=(2, 1))
+    assert [[h.memory_cost for h in group] for group in argon2] == [
+        [8192, 8192],
+        [16384, 16384],
+    ]
+    assert [h.time_cost for h in argon2[0]] == [1, 2]
+    scrypt = scrypt_candidates(ns=(2048, 1024))
+    assert [h.n for h in scrypt[0]] == [1024, 2048]
+
+
+def test_describe() -> None:
+    """Test the parameters and memory of a hasher."""
+    algorithm, params, memory = describe(Argon2Hasher(memory_cost=65536))
+    assert algorithm == "argon2"
+    assert params["HASHING_ARGON2_MEMORY_COST"] == 65536
+    assert memory == 64
+    algorithm, params, memory = describe(ScryptHasher(n=2**14, r=8))
+    assert algorithm == "scrypt"
+    assert params == {
+        "HASHING_SCRYPT_N": 16384,
+        "HASHING_SCRYPT_R": 8,
+        "HASHING_SCRYPT_P": 1,
+    }
+    assert memory == 16
+
+
+def test_measure() -> None:
+    """Test timing a cheap hasher."""
+    assert measure(ScryptHasher(n=1024, r=1), rounds=2) > 0
+
+
+def test_run_bench_respects_the_limits() -> None:
+    """Test skipping candidates that are too slow or too large."""
+    candidates = scrypt_candidates(ns=(1024, 2048, 4096), r=8)
+    # 1 MiB + 2 MiB, 4 MiB is over the limit
+    results = run_bench(candidates, target_ms=10_000, max_memory_mib=3)
+    assert [r.params["HASHING_SCRYPT_N"] for r in results] == [1024, 2048]
+    # the first one is already too slow: the others are skipped
+    results = run_bench(candidates, target_ms=0, max_memory_mib=100)
+    assert len(results) == 1
+    assert recommend(results, target_ms=0) is None
+
+
+def test_recommend() -> None:
+    """Test picking the strongest parameters within the target."""
+    small = BenchResult("argon2", {}, 19.0, 90.0)
+    medium = BenchResult("argon2", {}, 64.0, 120.0)
+    slow = BenchResult("argon2", {}, 64.0, 260.0)
+    large = BenchResult("argon2", {}, 128.0, 400.0)
+    results = [small, medium, slow, large]
+    assert recommend(results, target_ms=250) is medium
+    assert recommend(results, target_ms=100) is small
+    table = format_results(results, medium)
+    assert table.count("*") == 1
+    assert "* argon2" in table
+
+
+def test_env_and_write_env(tmp_path: Path) -> None:
+    """Test updating the .env file with the recommendation."""
+    _, params, _ = describe(ScryptHasher(n=2**15))
+    values = BenchResult("scrypt", params, 32.0, 100.0).env()
+    assert values["WALDIEZ_RUNNER_HASHING_SCRYPT_N"] == "32768"
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "WALDIEZ_RUNNER_PORT=8000\nWALDIEZ_RUNNER_HASHING_SCRYPT_N=16384\n",
+        encoding="utf-8",
+    )
+    write_env(values, env_file)
+    lines = env_file.read_text(encoding="utf-8").splitlines()
+    assert lines == [
+        "WALDIEZ_RUNNER_PORT=8000",
+        "WALDIEZ_RUNNER_HASHING_SCRYPT_N=32768",
+        "WALDIEZ_RUNNER_HASHING_SCRYPT_R=8",
+        "WALDIEZ_RUNNER_HASHING_SCRYPT_P=1",
+    ]
+    new_file = tmp_path / "new" / ".env"
+    write_env(values, new_file)
+    assert len(new_file.read_text(encoding="utf-8").splitlines()) == 3
@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=protected-access
+# pyright: reportPrivateUsage=false
+
+"""Tests for the password hasher dispatcher."""
+
+from waldiez_runner.config import (
+    HASHING_ARGON2_MEMORY_COST,
+    HASHING_ARGON2_TIME_COST,
+    HASHING_SCRYPT_N,
+)
+from waldiez_runner.hashing._argon_hasher import Argon2Hasher
+from waldiez_runner.hashing._scrypt_hasher import ScryptHasher
+from waldiez_runner.hashing.dispatcher import PasswordHasherDispatcher
+
+
+def test_uses_the_configured_parameters() -> None:
+    """Test that new hashes use the configured cost."""
+    dispatcher = PasswordHasherDispatcher()
+    assert dispatcher._argon2 is not None
+    assert dispatcher._argon2.time_cost == HASHING_ARGON2_TIME_COST
+    assert dispatcher._argon2.memory_cost == HASHING_ARGON2_MEMORY_COST
+    assert dispatcher._scrypt.n == HASHING_SCRYPT_N
+
+
+def test_needs_rehash_after_a_parameter_change() -> None:
+    """Test that old hashes still verify but get upgraded."""
+    old = PasswordHasherDispatcher(
+        argon2=Argon2Hasher(time_cost=1, memory_cost=8192)
+    )
+    new = PasswordHasherDispatcher(
+        argon2=Argon2Hasher(time_cost=2, memory_cost=8192)
+    )
+    stored = old.hash("secret")
+    assert not old.needs_rehash(stored)
+    assert new.verify("secret", stored)
+    assert new.needs_rehash(stored)
+    upgraded = new.hash("secret")
+    assert "t=2" in upgraded
+    assert not new.needs_rehash(upgraded)
+
+
+def test_scrypt_hashes_are_upgraded_to_argon2() -> None:
+    """Test that scrypt hashes are upgraded if argon2 is available."""
+    dispatcher = PasswordHasherDispatcher(scrypt=ScryptHasher(n=1024))
+    stored = ScryptHasher(n=1024).hash("secret")
+    assert dispatcher.verify("secret", stored)
+    assert dispatcher.needs_rehash(stored)
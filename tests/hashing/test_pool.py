@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,protected-access
+# pylint: disable=too-many-try-statements
+# pyright: reportPrivateUsage=false
+
+"""Tests for the hashing process pool."""
+
+import asyncio
+
+import pytest
+
+from waldiez_runner.hashing import HashingPool, HashingPoolBusy
+from waldiez_runner.hashing.pool import default_workers
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_in_workers() -> None:
+    """Test hashing and verifying in the worker processes."""
+    pool = HashingPool(max_workers=1, max_pending=4)
+    try:
+        stored = await pool.hash("secret")
+        assert stored != "secret"
+        assert await pool.verify("secret", stored) == (True, False)
+        assert await pool.verify("wrong", stored) == (False, False)
+        # bcrypt hashes are upgraded after verifying them
+        assert await pool.verify("secret", "$2b$12$invalid") == (False, False)
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert stats["completed"] == 4
+    assert stats["pending"] == 0
+    assert stats["rejected"] == 0
+    assert stats["queue_time_max"] >= stats["queue_time_avg"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_overload_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test rejecting jobs once max_pending are running or queued."""
+    pool = HashingPool(max_workers=1, max_pending=1)
+    release = asyncio.Event()
+
+    async def blocked(*_: object) -> tuple[str, float]:
+        await release.wait()
+        return "hashed", 0.5
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "run_in_executor", blocked)
+    first = asyncio.create_task(pool.hash("secret"))
+    await asyncio.sleep(0)
+    with pytest.raises(HashingPoolBusy):
+        await pool.verify("secret", "stored")
+    release.set()
+    assert await first == "hashed"
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["queue_time_max"] == 0.5
+
+
+def test_default_workers() -> None:
+    """Test the default pool size."""
+    assert 1 <= default_workers() <= 4
+    assert HashingPool().max_workers == default_workers()
+    assert HashingPool(max_workers=2, max_pending=0).max_pending == 1
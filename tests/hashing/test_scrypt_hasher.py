@@ -253,3 +253,13 @@ class TestScryptHasher:
         assert hasher.verify(password, hashed)
         assert not hasher.verify("testpassword", hashed)
         assert not hasher.verify("TESTPASSWORD", hashed)
+
+    def test_memory_above_the_default_limit(self) -> None:
+        """Test costs that need more than hashlib's 32 MiB default."""
+        hasher = ScryptHasher(n=2**15)
+        password = "test_password"  # nosemgrep # nosec
+        hashed = hasher.hash(password)
+
+        assert "n=32768" in hashed
+        assert hasher.verify(password, hashed)
+        assert not hasher.verify("wrong", hashed)
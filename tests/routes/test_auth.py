@@ -16,6 +16,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from waldiez_runner.config import Settings, SettingsManager
+from waldiez_runner.hashing import HashingPoolBusy
 from waldiez_runner.main import get_app
 from waldiez_runner.schemas.client import ClientCreateResponse
 
@@ -107,6 +108,27 @@ async def test_get_token_with_invalid_credentials(
     assert response.status_code == 401
 
 
+@pytest.mark.anyio
+async def test_get_token_when_hashing_pool_is_busy(
+    client: AsyncClient,
+    clients_api_client: ClientCreateResponse,
+) -> None:
+    """Test rejecting token requests while the hashing pool is full."""
+    with patch(
+        f"{ROOT_MODULE}.services._client_service.hashing_pool.verify",
+        side_effect=HashingPoolBusy("busy"),
+    ):
+        response = await client.post(
+            "/auth/token/",
+            data={
+                "client_id": clients_api_client.client_id,
+                "client_secret": clients_api_client.client_secret,
+            },
+        )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
 @pytest.mark.anyio
 async def test_refresh_a_token(
     client: AsyncClient,
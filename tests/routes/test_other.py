@@ -15,6 +15,7 @@ from httpx import ASGITransport, AsyncClient
 
 from waldiez_runner.config import Settings, SettingsManager
 from waldiez_runner.main import get_app
+from waldiez_runner.models import TaskStatus
 from waldiez_runner.routes.other import validate_clients_audience
 from waldiez_runner.schemas.client import ClientCreateResponse
 
@@ -96,6 +97,38 @@ async def test_status_unauthorized(client: AsyncClient) -> None:
         assert isinstance(status_dict["max_capacity"], int)
         assert isinstance(status_dict["cpu_percent"], float)
         assert isinstance(status_dict["memory_percent"], float)
+        assert status_dict["websockets"]["active_tasks"] >= 0
+        assert "evicted_tasks" in status_dict["websockets"]
+        pool = status_dict["database"]["primary"]
+        assert pool["checkouts"] >= 1
+        assert pool["timeouts"] == 0
+        assert pool["wait_max_ms"] >= pool["wait_avg_ms"] >= 0
+
+
+@pytest.mark.anyio
+async def test_status_from_the_task_counters(client: AsyncClient) -> None:
+    """Test that the status uses the task counters (not the database)."""
+    counts = {
+        TaskStatus.PENDING: 2,
+        TaskStatus.RUNNING: 3,
+        TaskStatus.WAITING_FOR_INPUT: 1,
+    }
+    with (
+        patch(
+            f"{ROOT_MODULE}.routes.other.TaskService.get_task_counts",
+            new_callable=AsyncMock,
+            return_value=counts,
+        ),
+        patch(
+            f"{ROOT_MODULE}.routes.other.TaskService.count_active_tasks",
+            new_callable=AsyncMock,
+        ) as mock_count,
+    ):
+        response = await client.get("/status")
+    assert response.status_code == 200
+    assert response.json()["active_tasks"] == 6
+    assert response.json()["pending_tasks"] == 2
+    mock_count.assert_not_awaited()
 
 
 @pytest.mark.anyio
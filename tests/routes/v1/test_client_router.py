@@ -6,7 +6,7 @@
 """Test client routes."""
 
 from collections.abc import AsyncGenerator
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from asgi_lifespan import LifespanManager
@@ -236,8 +236,14 @@ async def test_get_client(
     client: AsyncClient, clients_api_client: ClientCreateResponse
 ) -> None:
     """Test get client."""
-    response = await client.get(f"/api/v1/clients/{clients_api_client.id}")
+    with patch(
+        "waldiez_runner.routes.v1.client_router.invalidate_client_tokens",
+        new_callable=AsyncMock,
+    ) as invalidate:
+        response = await client.get(f"/api/v1/clients/{clients_api_client.id}")
     assert response.status_code == 200
+    # a read keeps the client's cached tokens
+    invalidate.assert_not_called()
     response_data = response.json()
     assert "id" in response_data
     assert "client_id" in response_data
@@ -258,11 +264,16 @@ async def test_update_client(
     client: AsyncClient, clients_api_client: ClientCreateResponse
 ) -> None:
     """Test update client."""
-    response = await client.patch(
-        f"/api/v1/clients/{clients_api_client.id}",
-        json={"description": "Updated Client"},
-    )
+    with patch(
+        "waldiez_runner.routes.v1.client_router.invalidate_client_tokens",
+        new_callable=AsyncMock,
+    ) as invalidate:
+        response = await client.patch(
+            f"/api/v1/clients/{clients_api_client.id}",
+            json={"description": "Updated Client"},
+        )
     assert response.status_code == 200
+    invalidate.assert_awaited_once_with([clients_api_client.id])
     response_data = response.json()
     assert "id" in response_data
     assert "client_id" in response_data
@@ -15,7 +15,7 @@ from waldiez_runner.routes.v1.task_permission import check_user_can_run_task
 
 TASK_PERMISSION = "waldiez_runner.routes.v1.task_permission"
 APP_STATE = f"{TASK_PERMISSION}.app_state"
-HTTPX_ASYNC_CLIENT = f"{TASK_PERMISSION}.httpx.AsyncClient"
+HTTP_CLIENT = f"{TASK_PERMISSION}.get_http_client"
 
 
 @pytest.mark.asyncio
@@ -166,17 +166,17 @@ async def test_check_user_can_run_task_invalid_user_id(
 
 @pytest.mark.asyncio
 @patch(APP_STATE)
-@patch(HTTPX_ASYNC_CLIENT)
+@patch(HTTP_CLIENT)
 async def test_check_user_can_run_task_permission_granted(
-    mock_client_class: AsyncMock,
+    mock_get_client: MagicMock,
     mock_app_state: AsyncMock,
 ) -> None:
     """Test permission check when permission is granted.
 
     Parameters
     ----------
-    mock_client_class : AsyncMock
-        Mock for the httpx.AsyncClient class.
+    mock_get_client : MagicMock
+        Mock for the shared HTTP client getter.
     mock_app_state : AsyncMock
         Mock for the app_state fixture.
     """
@@ -194,7 +194,7 @@ async def test_check_user_can_run_task_permission_granted(
     mock_response.raise_for_status.return_value = None
     mock_response.json.return_value = {"can_run": True}
     mock_client.get.return_value = mock_response
-    mock_client_class.return_value.__aenter__.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     # Create context with user info
     context = RequestContext()
@@ -214,17 +214,17 @@ async def test_check_user_can_run_task_permission_granted(
 
 @pytest.mark.asyncio
 @patch(APP_STATE)
-@patch(HTTPX_ASYNC_CLIENT)
+@patch(HTTP_CLIENT)
 async def test_check_user_can_run_task_permission_denied(
-    mock_client_class: AsyncMock,
+    mock_get_client: MagicMock,
     mock_app_state: AsyncMock,
 ) -> None:
     """Test permission check when permission is denied.
 
     Parameters
     ----------
-    mock_client_class : AsyncMock
-        Mock for the httpx.AsyncClient class.
+    mock_get_client : MagicMock
+        Mock for the shared HTTP client getter.
     mock_app_state : AsyncMock
         Mock for the app_state fixture.
     """
@@ -248,7 +248,7 @@ async def test_check_user_can_run_task_permission_denied(
     mock_client.get.side_effect = HTTPStatusError(
         "429 Client Error", request=MagicMock(), response=mock_response
     )
-    mock_client_class.return_value.__aenter__.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     # Create context with user info
     context = RequestContext()
@@ -264,17 +264,17 @@ async def test_check_user_can_run_task_permission_denied(
 
 @pytest.mark.asyncio
 @patch(APP_STATE)
-@patch(HTTPX_ASYNC_CLIENT)
+@patch(HTTP_CLIENT)
 async def test_check_user_can_run_task_http_error(
-    mock_client_class: AsyncMock,
+    mock_get_client: MagicMock,
     mock_app_state: AsyncMock,
 ) -> None:
     """Test permission check when HTTP request fails.
 
     Parameters
     ----------
-    mock_client_class : AsyncMock
-        Mock for the httpx.AsyncClient class.
+    mock_get_client : MagicMock
+        Mock for the shared HTTP client getter.
     mock_app_state : AsyncMock
         Mock for the app_state fixture.
     """
@@ -289,7 +289,7 @@ async def test_check_user_can_run_task_http_error(
     # Mock HTTP client to raise HTTPStatusError
     mock_client = AsyncMock()
     mock_client.get.side_effect = Exception("HTTP Error")
-    mock_client_class.return_value.__aenter__.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     # Create context with user info
     context = RequestContext()
@@ -305,17 +305,17 @@ async def test_check_user_can_run_task_http_error(
 
 @pytest.mark.asyncio
 @patch(APP_STATE)
-@patch(HTTPX_ASYNC_CLIENT)
+@patch(HTTP_CLIENT)
 async def test_check_user_can_run_task_invalid_json(
-    mock_client_class: AsyncMock,
+    mock_get_client: MagicMock,
     mock_app_state: AsyncMock,
 ) -> None:
     """Test permission check when response is not valid JSON.
 
     Parameters
     ----------
-    mock_client_class : AsyncMock
-        Mock for the httpx.AsyncClient class.
+    mock_get_client : MagicMock
+        Mock for the shared HTTP client getter.
     mock_app_state : AsyncMock
         Mock for the app_state fixture.
     """
@@ -333,7 +333,7 @@ async def test_check_user_can_run_task_invalid_json(
     mock_response.raise_for_status.return_value = None
     mock_response.json.side_effect = ValueError("Invalid JSON")
     mock_client.get.return_value = mock_response
-    mock_client_class.return_value.__aenter__.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     # Create context with user info
     context = RequestContext()
@@ -349,17 +349,17 @@ async def test_check_user_can_run_task_invalid_json(
 
 @pytest.mark.asyncio
 @patch(APP_STATE)
-@patch(HTTPX_ASYNC_CLIENT)
+@patch(HTTP_CLIENT)
 async def test_check_user_can_run_task_user_id_from_id_field(
-    mock_client_class: AsyncMock,
+    mock_get_client: MagicMock,
     mock_app_state: AsyncMock,
 ) -> None:
     """Test permission check when user_id comes from 'id' field.
 
     Parameters
     ----------
-    mock_client_class : AsyncMock
-        Mock for the httpx.AsyncClient class.
+    mock_get_client : MagicMock
+        Mock for the shared HTTP client getter.
     mock_app_state : AsyncMock
         Mock for the app_state fixture.
     """
@@ -377,7 +377,7 @@ async def test_check_user_can_run_task_user_id_from_id_field(
     mock_response.raise_for_status.return_value = None
     mock_response.json.return_value = {"can_run": True}
     mock_client.get.return_value = mock_response
-    mock_client_class.return_value.__aenter__.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     # Create context with user info using 'id' field
     context = RequestContext()
@@ -397,17 +397,17 @@ async def test_check_user_can_run_task_user_id_from_id_field(
 
 @pytest.mark.asyncio
 @patch(APP_STATE)
-@patch(HTTPX_ASYNC_CLIENT)
+@patch(HTTP_CLIENT)
 async def test_check_user_can_run_task_sub_takes_precedence(
-    mock_client_class: AsyncMock,
+    mock_get_client: MagicMock,
     mock_app_state: AsyncMock,
 ) -> None:
     """Test that 'sub' field takes precedence over 'id' field.
 
     Parameters
     ----------
-    mock_client_class : AsyncMock
-        Mock for the httpx.AsyncClient class.
+    mock_get_client : MagicMock
+        Mock for the shared HTTP client getter.
     mock_app_state : AsyncMock
         Mock for the app_state fixture.
     """
@@ -425,7 +425,7 @@ async def test_check_user_can_run_task_sub_takes_precedence(
     mock_response.raise_for_status.return_value = None
     mock_response.json.return_value = {"can_run": True}
     mock_client.get.return_value = mock_response
-    mock_client_class.return_value.__aenter__.return_value = mock_client
+    mock_get_client.return_value = mock_client
 
     # Create context with both 'sub' and 'id' fields
     context = RequestContext()
@@ -441,3 +441,54 @@ async def test_check_user_can_run_task_sub_takes_precedence(
         headers={"X-Runner-Secret-Key": "test-secret"},
         timeout=10.0,
     )
+
+
+@pytest.mark.asyncio
+@patch(APP_STATE)
+@patch(HTTP_CLIENT)
+async def test_check_user_can_run_task_results_are_cached(
+    mock_get_client: MagicMock,
+    mock_app_state: AsyncMock,
+) -> None:
+    """Test that a recent permission result is reused.
+
+    Parameters
+    ----------
+    mock_get_client : MagicMock
+        Mock for the shared HTTP client getter.
+    mock_app_state : AsyncMock
+        Mock for the app_state fixture.
+    """
+    mock_settings = AsyncMock()
+    mock_settings.enable_external_auth = True
+    mock_settings.task_permission_verify_url = "https://api.example.com/check"
+    mock_settings.task_permission_secret = "test-secret"  # nosec
+    mock_app_state.settings = mock_settings
+
+    mock_client = AsyncMock()
+    allowed_response = MagicMock()
+    allowed_response.raise_for_status.return_value = None
+    allowed_response.json.return_value = {"can_run": True}
+    denied_response = MagicMock()
+    denied_response.status_code = 429
+    denied_response.json.return_value = {"reason": "User quota exceeded"}
+    mock_client.get.side_effect = [
+        allowed_response,
+        HTTPStatusError(
+            "429 Client Error", request=MagicMock(), response=denied_response
+        ),
+    ]
+    mock_get_client.return_value = mock_client
+
+    allowed = RequestContext()
+    allowed.external_user_info = {"sub": "user123"}
+    denied = RequestContext()
+    denied.external_user_info = {"sub": "user456"}
+
+    for _ in range(2):
+        await check_user_can_run_task(allowed)
+        with pytest.raises(HTTPException) as exc_info:
+            await check_user_can_run_task(denied)
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.detail == "User quota exceeded"
+    assert mock_client.get.await_count == 2
@@ -22,7 +22,11 @@ from httpx import ASGITransport, AsyncClient
 from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.expression import delete
-from starlette.status import HTTP_200_OK, HTTP_204_NO_CONTENT
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
+)
 
 # Local imports
 from tests.types import CreateTaskCallable
@@ -39,7 +43,7 @@ from waldiez_runner.routes.v1.task_router import (  # type: ignore
     validate_tasks_audience,
 )
 from waldiez_runner.schemas.client import ClientCreate, ClientCreateResponse
-from waldiez_runner.services import ClientService
+from waldiez_runner.services import ClientService, TaskService
 
 VALID_EXTENSION = ".waldiez"
 VALID_CONTENT_TYPE = "application/json"
@@ -295,6 +299,84 @@ async def test_get_tasks_sorted_asc(
     assert task2_index > task1_index
 
 
+@pytest.mark.anyio
+async def test_get_tasks_by_cursor(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    client_id: str,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test following the cursors of the tasks listing."""
+    tasks = [
+        (
+            await create_task(
+                async_session, client_id=client_id, filename=f"cursor_{i}"
+            )
+        )[0]
+        for i in range(3)
+    ]
+    params: dict[str, str | int] = {
+        "pagination": "cursor",
+        "size": 2,
+        "search": "cursor_",
+        "order_by": "filename",
+        "order_type": "desc",
+        "include_total": "true",
+    }
+    response = await client.get("/tasks", params=params)
+    assert response.status_code == HTTP_200_OK
+    first = response.json()
+    assert [item["id"] for item in first["items"]] == [
+        tasks[2].id,
+        tasks[1].id,
+    ]
+    assert first["total"] == 3
+    assert first["prev_cursor"] is None
+    params.pop("pagination")
+    params.pop("include_total")
+    response = await client.get(
+        "/tasks", params={**params, "after": first["next_cursor"]}
+    )
+    assert response.status_code == HTTP_200_OK
+    second = response.json()
+    assert [item["id"] for item in second["items"]] == [tasks[0].id]
+    assert second["next_cursor"] is None
+    assert second["total"] is None
+    response = await client.get(
+        "/tasks", params={**params, "before": second["prev_cursor"]}
+    )
+    assert [item["id"] for item in response.json()["items"]] == [
+        tasks[2].id,
+        tasks[1].id,
+    ]
+    # another ordering's cursor
+    response = await client.get(
+        "/tasks", params={"after": first["next_cursor"]}
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.anyio
+async def test_get_all_tasks_by_cursor(
+    admin_client: AsyncClient,
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test the cursor mode of the admin tasks listing."""
+    task, _ = await create_task(async_session, client_id="another_client")
+    response = await admin_client.get(
+        "/admin/tasks", params={"pagination": "cursor", "size": 100}
+    )
+    assert response.status_code == HTTP_200_OK
+    data = response.json()
+    assert task.id in [item["id"] for item in data["items"]]
+    assert "page" not in data
+    response = await admin_client.get(
+        "/admin/tasks", params={"after": "x", "before": "y"}
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize("kiq", ["run_task_job"], indirect=True)
 async def test_create_task(
@@ -501,6 +583,44 @@ async def test_get_task(
     assert data["id"] == str(task.id)
 
 
+@pytest.mark.anyio
+async def test_get_task_with_large_results(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    client_id: str,
+) -> None:
+    """Test that a task's out of row results are loaded."""
+    task = Task(
+        client_id=client_id,
+        flow_id="flow123",
+        status=TaskStatus.RUNNING,
+        filename="test",
+    )
+    async_session.add(task)
+    await async_session.commit()
+    await async_session.refresh(task)
+    results = [{"content": "x" * 100_000}]
+    await TaskService.update_task_status(
+        async_session,
+        task_id=task.id,
+        status=TaskStatus.COMPLETED,
+        results=results,
+    )
+    assert task.results is None
+    assert task.results_ref is not None
+
+    response = await client.get(f"/tasks/{task.id}")
+
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["results"] == results
+    # not in the listings
+    response = await client.get("/tasks", params={"search": "test"})
+    assert response.status_code == HTTP_200_OK
+    items = response.json()["items"]
+    assert task.id in [item["id"] for item in items]
+    assert all(item["results"] is None for item in items)
+
+
 @pytest.mark.anyio
 async def test_get_task_regular_user_cannot_get_others_task(
     client: AsyncClient,
@@ -563,6 +683,80 @@ async def test_get_task_not_found(
     assert response.status_code == 404
 
 
+@pytest.mark.anyio
+async def test_stream_task_events(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    client_id: str,
+) -> None:
+    """Test streaming a task's output as Server-Sent Events."""
+    task = Task(
+        client_id=client_id,
+        flow_id="flow123",
+        status=TaskStatus.RUNNING,
+        filename="test",
+    )
+    async_session.add(task)
+    await async_session.commit()
+    await async_session.refresh(task)
+    calls: list[str | None] = []
+
+    async def event_stream(
+        _task: Task, last_event_id: str | None = None
+    ) -> AsyncGenerator[str, None]:
+        calls.append(last_event_id)
+        yield "data: {}\n\n"
+
+    with patch(f"{ROOT_MODULE}.task_router.task_event_stream", event_stream):
+        response = await client.get(
+            f"/tasks/{task.id}/events/stream",
+            headers={"Last-Event-ID": "1-0"},
+        )
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.text == "data: {}\n\n"
+        response = await client.get(
+            f"/tasks/{task.id}/events/stream?last_event_id=invalid"
+        )
+        assert response.status_code == HTTP_200_OK
+    assert calls == ["1-0", None]
+
+
+@pytest.mark.anyio
+async def test_stream_task_events_errors(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    client_id: str,
+) -> None:
+    """Test the errors when streaming a task's output."""
+    response = await client.get("/tasks/123/events/stream")
+    assert response.status_code == 404
+
+    others = Task(
+        client_id="other-client-123",
+        flow_id="flow123",
+        status=TaskStatus.RUNNING,
+        filename="test",
+    )
+    done = Task(
+        client_id=client_id,
+        flow_id="flow123",
+        status=TaskStatus.COMPLETED,
+        filename="test",
+    )
+    async_session.add_all([others, done])
+    await async_session.commit()
+    await async_session.refresh(others)
+    await async_session.refresh(done)
+
+    response = await client.get(f"/tasks/{others.id}/events/stream")
+    assert response.status_code == 404
+    response = await client.get(f"/tasks/{done.id}/events/stream")
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Task is not active"}
+
+
 @pytest.mark.anyio
 async def test_update_task_regular_user_cannot_update_others_task(
     client: AsyncClient,
@@ -622,6 +816,35 @@ async def test_update_task_admin_can_update_any_task(
     assert task.status == TaskStatus.COMPLETED
 
 
+@pytest.mark.anyio
+async def test_update_task_with_large_results(
+    client: AsyncClient,
+    async_session: AsyncSession,
+    client_id: str,
+) -> None:
+    """Test that the update's response has the out of row results."""
+    task = Task(
+        client_id=client_id,
+        flow_id="flow123",
+        status=TaskStatus.RUNNING,
+        filename="test",
+    )
+    async_session.add(task)
+    await async_session.commit()
+    await async_session.refresh(task)
+    results = [{"content": "x" * 100_000}]
+
+    response = await client.patch(
+        f"/tasks/{task.id}", json={"results": results}
+    )
+
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["results"] == results
+    await async_session.refresh(task)
+    assert task.results is None
+    assert task.results_ref is not None
+
+
 @pytest.mark.anyio
 async def test_cancel_task(
     client: AsyncClient,
@@ -6,13 +6,16 @@
 # pyright: reportPrivateUsage=false
 """Test waldiez_runner.routes.ws.auth.*."""
 
+import time
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import jwt
 import pytest
 from fastapi import WebSocket
 
 from waldiez_runner.config import Settings
+from waldiez_runner.dependencies.token_cache import VerifiedTokenCache
 
 # noinspection PyProtectedMember
 from waldiez_runner.routes.ws.auth import (
@@ -237,6 +240,7 @@ def test_get_jwt_from_subprotocol(
 async def test_get_ws_client_id_with_external_auth_success() -> None:
     """Test get_ws_client_id with successful external auth."""
     settings = MagicMock(spec=Settings)
+    settings.use_local_auth = True
     settings.enable_external_auth = True
 
     websocket = MagicMock(spec=WebSocket)
@@ -280,6 +284,7 @@ async def test_get_ws_client_id_with_external_auth_success() -> None:
 async def test_get_ws_client_id_with_external_auth_disabled() -> None:
     """Test get_ws_client_id with external auth disabled."""
     settings = MagicMock(spec=Settings)
+    settings.use_local_auth = True
     settings.enable_external_auth = False
 
     websocket = MagicMock(spec=WebSocket)
@@ -314,6 +319,7 @@ async def test_get_ws_client_id_with_external_auth_disabled() -> None:
 async def test_get_ws_client_id_with_external_auth_failure() -> None:
     """Test get_ws_client_id with external auth failure."""
     settings = MagicMock(spec=Settings)
+    settings.use_local_auth = True
     settings.enable_external_auth = True
 
     websocket = MagicMock(spec=WebSocket)
@@ -353,6 +359,7 @@ async def test_get_ws_client_id_with_external_auth_failure() -> None:
 async def test_get_ws_client_id_external_auth_exception() -> None:
     """Test get_ws_client_id handling external auth exceptions."""
     settings = MagicMock(spec=Settings)
+    settings.use_local_auth = True
     settings.enable_external_auth = True
 
     websocket = MagicMock(spec=WebSocket)
@@ -401,6 +408,7 @@ async def test_get_ws_client_id_external_auth_from_different_sources(
 ) -> None:
     """Test get_ws_client_id with external auth from different sources."""
     settings = MagicMock(spec=Settings)
+    settings.use_local_auth = True
     settings.enable_external_auth = True
 
     websocket = MagicMock(spec=WebSocket)
@@ -445,3 +453,30 @@ async def test_get_ws_client_id_external_auth_from_different_sources(
     assert websocket.state.external_user_info == {
         "key": "value",
     }
+
+
+@pytest.mark.asyncio
+async def test_get_ws_client_id_with_cached_oidc_token() -> None:
+    """Test that a verified OIDC token (not for "tasks-api") is reused."""
+    settings = MagicMock(spec=Settings)
+    settings.use_local_auth = False
+    token = jwt.encode(
+        {"sub": "client123", "aud": "idp", "exp": time.time() + 60},
+        "secret",
+        algorithm="HS256",
+    )
+    cache = VerifiedTokenCache()
+    cache.put(token, "client123", "idp", "db_1")
+    websocket = MockWebSocket(headers={"Authorization": f"Bearer {token}"})
+    mock_get_client_id = AsyncMock()
+    with (
+        patch(f"{MODULE_TO_PATCH}.verified_tokens", cache),
+        patch(
+            f"{MODULE_TO_PATCH}.get_client_id_from_token", mock_get_client_id
+        ),
+    ):
+        client_id, _ = await get_ws_client_id(
+            websocket, settings  # type: ignore
+        )
+    assert client_id == "client123"
+    mock_get_client_id.assert_not_called()
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-return-doc,missing-param-doc
+"""Test waldiez_runner.routes.ws.client_queue.*."""
+
+import pytest
+
+from waldiez_runner.routes.ws.client_queue import (
+    WsClientQueue,
+    WsFrame,
+    is_slow_client_policy,
+    stream_id_after,
+)
+
+
+def _frame(index: int, msg_type: str = "print") -> WsFrame:
+    """Create a frame."""
+    return WsFrame(msg_type, f'{{"type":"{msg_type}","data":{index}}}')
+
+
+def test_is_slow_client_policy() -> None:
+    """Test is_slow_client_policy."""
+    assert is_slow_client_policy("drop_oldest")
+    assert is_slow_client_policy("coalesce")
+    assert is_slow_client_policy("disconnect")
+    assert not is_slow_client_policy("block")
+
+
+def test_stream_id_after() -> None:
+    """Test comparing stream ids."""
+    assert stream_id_after("2-0", "1-5")
+    assert stream_id_after("10-0", "9-0")
+    assert stream_id_after("1-10", "1-9")
+    assert not stream_id_after("1-0", "1-0")
+    assert not stream_id_after("1-0", "1")
+    assert stream_id_after("1-1", "1")
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest() -> None:
+    """Test the drop_oldest policy."""
+    queue = WsClientQueue(maxsize=2)
+    for index in range(4):
+        assert queue.offer(_frame(index))
+
+    assert queue.stats() == {"lag": 2, "dropped": 2, "coalesced": 0}
+    assert (await queue.get()).text.endswith("2}")
+    assert (await queue.get()).text.endswith("3}")
+
+
+@pytest.mark.asyncio
+async def test_coalesce_status_frames() -> None:
+    """Test the coalesce policy."""
+    queue = WsClientQueue(maxsize=3, policy="coalesce")
+    assert queue.offer(_frame(0, "status"))
+    assert queue.offer(_frame(1))
+    assert queue.offer(_frame(2, "status"))
+    # full: the queued status frames are superseded by the new one
+    assert queue.offer(_frame(3, "status"))
+
+    assert queue.stats() == {"lag": 2, "dropped": 0, "coalesced": 2}
+    assert queue.get_nowait() == _frame(1)
+    assert queue.get_nowait() == _frame(3, "status")
+
+
+@pytest.mark.asyncio
+async def test_coalesce_without_status_frames() -> None:
+    """Test the coalesce policy falls back to dropping the oldest."""
+    queue = WsClientQueue(maxsize=2, policy="coalesce")
+    for index in range(3):
+        assert queue.offer(_frame(index))
+    assert queue.offer(_frame(3, "status"))
+
+    assert queue.stats() == {"lag": 2, "dropped": 2, "coalesced": 0}
+    assert queue.get_nowait() == _frame(2)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_after_lag() -> None:
+    """Test the disconnect policy."""
+    queue = WsClientQueue(maxsize=10, policy="disconnect", max_lag=2)
+    assert queue.offer(_frame(0))
+    assert queue.offer(_frame(1))
+    assert not queue.offer(_frame(2))
+    assert queue.dropped == 1
+
+    # without max_lag, the queue size is the limit
+    queue = WsClientQueue(maxsize=1, policy="disconnect")
+    assert queue.offer(_frame(0))
+    assert not queue.offer(_frame(1))
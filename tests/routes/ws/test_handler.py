@@ -40,10 +40,13 @@ async def test_build_status_payload() -> None:
         status=MagicMock(value="RUNNING"),
         created_at=now,
         updated_at=now,
-        results={"a": "b"},
+        results=None,
+        results_ref="ref-1",
         input_request_id="req-1",
     )
     payload = build_status_payload(task)
+    assert payload["data"]["results"] is None
+    assert payload["data"]["results_ref"] == "ref-1"
     assert payload["type"] == "status"
     assert payload["data"]["task_id"] == "task123"
     assert payload["data"]["status"] == "RUNNING"
@@ -128,6 +131,7 @@ class FakeTask:
         self.created_at = datetime.now(timezone.utc)
         self.updated_at = datetime.now(timezone.utc)
         self.results = {}  # type: ignore
+        self.results_ref = None
         self.input_request_id = "req1"
 
 
@@ -244,6 +248,7 @@ async def test_ws_handler_run_success(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(handler, "validate", AsyncMock())
     monkeypatch.setattr(handler, "_accept", AsyncMock())
     monkeypatch.setattr(handler, "_send_initial_status", AsyncMock())
+    monkeypatch.setattr(handler, "_resolve_last_event_id", AsyncMock())
     monkeypatch.setattr(handler, "_start_task_listeners", AsyncMock())
     monkeypatch.setattr(handler, "_cleanup", MagicMock())
 
@@ -251,6 +256,7 @@ async def test_ws_handler_run_success(monkeypatch: pytest.MonkeyPatch) -> None:
     handler.validate.assert_awaited_once()  # type: ignore
     handler._accept.assert_awaited_once()  # type: ignore
     handler._send_initial_status.assert_awaited_once()  # type: ignore
+    handler._resolve_last_event_id.assert_awaited_once()  # type: ignore
     handler._start_task_listeners.assert_awaited_once()  # type: ignore
     handler._cleanup.assert_called_once()  # type: ignore
 
@@ -350,3 +356,85 @@ async def test_ws_handler_start_task_listeners_missing_manager() -> None:
 
     with pytest.raises(WebSocketException, match="Task manager not found"):
         await handler._start_task_listeners()
+
+
+@pytest.mark.asyncio
+async def test_ws_handler_resolve_last_event_id_query() -> None:
+    """Test getting the last event id from the query params."""
+    websocket = AsyncMock()
+    websocket.query_params = {"last_event_id": "5-1"}
+    handler = TaskWebSocketHandler(
+        websocket,
+        "task1",
+        FakeSettings(),  # type: ignore
+        AsyncMock(),
+    )
+    await handler._resolve_last_event_id()
+    assert handler.last_event_id == "5-1"
+    websocket.receive_text.assert_not_called()
+
+    websocket.query_params = {"last_event_id": "invalid"}
+    await handler._resolve_last_event_id()
+    assert handler.last_event_id is None
+
+
+@pytest.mark.asyncio
+async def test_ws_handler_resolve_last_event_id_message() -> None:
+    """Test getting the last event id from the first message."""
+    websocket = AsyncMock()
+    websocket.query_params = {}
+    websocket.receive_text = AsyncMock(
+        return_value=json.dumps({"type": "resume", "last_event_id": "7-0"})
+    )
+    handler = TaskWebSocketHandler(
+        websocket,
+        "task1",
+        FakeSettings(),  # type: ignore
+        AsyncMock(),
+    )
+    # not waited for by default
+    await handler._resolve_last_event_id()
+    assert handler.last_event_id is None
+    websocket.receive_text.assert_not_called()
+
+    # the client signals that it will resume
+    websocket.query_params = {"resume": "1"}
+    await handler._resolve_last_event_id()
+    assert handler.last_event_id == "7-0"
+    assert handler.first_message is None
+
+    # or a wait is configured
+    websocket.query_params = {}
+    user_input = json.dumps({"request_id": "abc", "data": "hi"})
+    websocket.receive_text = AsyncMock(return_value=user_input)
+    with patch(f"{MODULE_TO_PATCH}.WS_RESUME_WAIT_MS", 100):
+        await handler._resolve_last_event_id()
+    assert handler.last_event_id is None
+    assert handler.first_message == user_input
+
+
+@pytest.mark.asyncio
+async def test_ws_handler_resolve_last_event_id_timeout() -> None:
+    """Test connecting without resuming."""
+    websocket = AsyncMock()
+    websocket.query_params = {}
+
+    async def never() -> str:
+        await asyncio.sleep(10)
+        return ""  # pragma: no cover
+
+    websocket.receive_text = never
+    handler = TaskWebSocketHandler(
+        websocket,
+        "task1",
+        FakeSettings(),  # type: ignore
+        AsyncMock(),
+    )
+    with patch(f"{MODULE_TO_PATCH}.WS_RESUME_WAIT_MS", 10):
+        await handler._resolve_last_event_id()
+    assert handler.last_event_id is None
+    assert handler.first_message is None
+
+    with patch(f"{MODULE_TO_PATCH}.WS_RESUME_WAIT_MS", 0):
+        await handler._resolve_last_event_id()
+    assert handler.last_event_id is None
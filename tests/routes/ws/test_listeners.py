@@ -7,20 +7,24 @@
 
 import asyncio
 import json
-from collections.abc import Coroutine
-from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
+import fakeredis
 import pytest
 from fastapi import WebSocket
 from starlette.websockets import WebSocketDisconnect
 
 from waldiez_runner.routes.ws.listeners import (
     decode_stream_msg,
+    is_history_request,
+    is_stream_id,
     listen_for_ws_input,
+    parse_resume_request,
+    read_history_page,
     stream_history_and_live,
     valid_user_input,
 )
+from waldiez_runner.routes.ws.manager import WsTaskManager
 
 MODULE_TO_PATCH = "waldiez_runner.routes.ws.listeners"
 
@@ -107,57 +111,253 @@ async def test_listen_for_ws_input_unexpected_error() -> None:
 
 
 @pytest.mark.asyncio
-async def test_stream_history_and_live(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_stream_history_and_live() -> None:
     """Test stream_history_and_live."""
     redis = AsyncMock()
-    manager = MagicMock()
+    websocket = AsyncMock()
+    manager = WsTaskManager("task1")
+    manager.start_writer = MagicMock()  # type: ignore
+
+    redis.xrevrange.return_value = [
+        ("2-0", {b"type": b"log", b"data": b"second"}),
+        ("1-0", {b"type": b"log", b"data": b"first"}),
+    ]
+    reader: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    reader.set_exception(RuntimeError("the shared reader failed"))
+    hub = MagicMock()
+    hub.add.return_value = reader
+
+    # no writer started: nothing to wait for (the reader is not awaited)
+    await stream_history_and_live(redis, "stream", manager, hub, websocket)
+
+    sent = [json.loads(c.args[0]) for c in websocket.send_text.call_args_list]
+    assert [m["data"] for m in sent] == ["first", "second"]
+    manager.start_writer.assert_called_once_with(websocket, after_id="2-0")
+    hub.add.assert_called_once_with(manager, "2-0")
+
 
-    calls: list[dict[str, Any]] = []
+@pytest.mark.asyncio
+async def test_stream_history_and_live_batches(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test sending the history in batches to a batching client."""
+    for index in range(5):
+        await a_fake_redis.xadd("stream", {"data": f"msg{index}"})
+    websocket = AsyncMock()
+    manager = WsTaskManager("task1", batch_max_frames=2)
+    manager.add_client(websocket, start_writer=False, batch=True)
+    manager.start_writer = MagicMock()  # type: ignore
+    reader: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    reader.set_result(None)
+    hub = MagicMock()
+    hub.add.return_value = reader
+
+    await stream_history_and_live(
+        a_fake_redis, "stream", manager, hub, websocket
+    )
 
-    async def fake_broadcast(
-        msg: dict[str, Any], skip_queue: bool = False
-    ) -> None:
-        calls.append(msg)
+    batches = [
+        json.loads(c.args[0]) for c in websocket.send_text.call_args_list
+    ]
+    assert [[m["data"] for m in batch] for batch in batches] == [
+        ["msg0", "msg1"],
+        ["msg2", "msg3"],
+        ["msg4"],
+    ]
 
-    manager.broadcast = fake_broadcast
 
-    scheduled_tasks: list[Coroutine[None, None, None]] = []
+@pytest.mark.asyncio
+async def test_stream_history_and_live_no_history() -> None:
+    """Test stream_history_and_live without history."""
+    redis = AsyncMock()
+    redis.xrevrange.return_value = []
+    manager = MagicMock()
+    manager.client_tasks = {}
+    reader: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    reader.set_result(None)
+    hub = MagicMock()
+    hub.add.return_value = reader
 
-    # Instead of returning the coroutine, we store it to run it ourselves
-    def fake_create_task(
-        coro: Coroutine[None, None, None],
-    ) -> Coroutine[None, None, None]:
-        """Fake create_task to store the coroutine."""
-        scheduled_tasks.append(coro)
-        return coro  # not awaited here! we await it later
+    await stream_history_and_live(redis, "stream", manager, hub, AsyncMock())
 
-    monkeypatch.setattr(
-        f"{MODULE_TO_PATCH}.asyncio.create_task", fake_create_task
+    hub.add.assert_called_once_with(manager, "0")
+
+
+@pytest.mark.asyncio
+async def test_stream_history_and_live_waits_for_its_writer() -> None:
+    """Test that the output ends with the client's writer only."""
+    redis = AsyncMock()
+    redis.xrevrange.return_value = []
+    websocket = AsyncMock()
+    websocket.send_text = AsyncMock(side_effect=RuntimeError("closed"))
+    manager = WsTaskManager("task1")
+    manager.add_client(websocket, start_writer=False)
+    reader: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    reader.set_exception(RuntimeError("the shared reader failed"))
+    hub = MagicMock()
+    hub.add.return_value = reader
+
+    output = asyncio.create_task(
+        stream_history_and_live(redis, "stream", manager, hub, websocket)
     )
+    await asyncio.sleep(0.05)
+    # a failed shared reader does not end (or fail) the output
+    assert not output.done()
+    # the writer stops on a failed send
+    manager.enqueue({"id": "1-0", "type": "print", "data": "hello"})
+    await asyncio.wait_for(output, timeout=2)
+    assert output.exception() is None
+    assert websocket not in manager.clients
+
+    # a client removed by the manager (its writer cancelled)
+    other = AsyncMock()
+    manager.add_client(other, start_writer=False)
+    output = asyncio.create_task(
+        stream_history_and_live(redis, "stream", manager, hub, other)
+    )
+    await asyncio.sleep(0.05)
+    manager.remove_client(other)
+    await asyncio.wait_for(output, timeout=2)
+    assert output.exception() is None
 
-    # Setup
-    redis.xrevrange.return_value = [
-        ("1-0", {b"type": b"log", b"data": b"history"})
+
+@pytest.mark.asyncio
+async def test_stream_history_and_live_resume(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test resuming after a last event id."""
+    ids = [
+        await a_fake_redis.xadd("stream", {"data": f"msg{index}"})
+        for index in range(250)
     ]
-    redis.xread.side_effect = [
-        [
-            (
-                "stream",
-                [
-                    ("1-0", {b"type": b"log", b"data": b"dupe"}),  # skip
-                    ("2-0", {b"type": b"log", b"data": b"live"}),
-                ],
-            )
-        ],
-        asyncio.CancelledError(),
+    websocket = AsyncMock()
+    manager = WsTaskManager("task1")
+    manager.start_writer = MagicMock()  # type: ignore
+    reader: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    reader.set_result(None)
+    hub = MagicMock()
+    hub.add.return_value = reader
+
+    await stream_history_and_live(
+        a_fake_redis, "stream", manager, hub, websocket, last_event_id=ids[9]
+    )
+
+    sent = [json.loads(c.args[0]) for c in websocket.send_text.call_args_list]
+    assert len(sent) == 240
+    assert sent[0]["id"] == ids[10]
+    assert sent[-1]["id"] == ids[-1]
+    manager.start_writer.assert_called_once_with(websocket, after_id=ids[-1])
+    hub.add.assert_called_once_with(manager, ids[-1])
+
+
+@pytest.mark.asyncio
+async def test_stream_history_and_live_resume_up_to_date(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test resuming with nothing missed or with a future id."""
+    last_id = await a_fake_redis.xadd("stream", {"data": "msg"})
+    reader: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    reader.set_result(None)
+    hub = MagicMock()
+    hub.add.return_value = reader
+    websocket = AsyncMock()
+    manager = MagicMock()
+    manager.client_tasks = {}
+
+    await stream_history_and_live(
+        a_fake_redis, "stream", manager, hub, websocket, last_event_id=last_id
+    )
+    hub.add.assert_called_with(manager, last_id)
+
+    await stream_history_and_live(
+        a_fake_redis,
+        "stream",
+        manager,
+        hub,
+        websocket,
+        last_event_id="99999999999999-0",
+    )
+    hub.add.assert_called_with(manager, last_id)
+
+    await stream_history_and_live(
+        a_fake_redis, "empty", manager, hub, websocket, last_event_id="5-0"
+    )
+    hub.add.assert_called_with(manager, "0")
+    websocket.send_text.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_read_history_page(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test reading pages of older entries."""
+    ids = [
+        await a_fake_redis.xadd("stream", {"data": f"msg{index}"})
+        for index in range(5)
     ]
+    entries, has_more = await read_history_page(a_fake_redis, "stream", count=2)
+    assert [e["id"] for e in entries] == ids[3:]
+    assert has_more
 
-    with pytest.raises(asyncio.CancelledError):
-        await stream_history_and_live(redis, "stream", manager)
+    entries, has_more = await read_history_page(
+        a_fake_redis, "stream", before=ids[3], count=10
+    )
+    assert [e["data"] for e in entries] == ["msg0", "msg1", "msg2"]
+    assert not has_more
 
-    for task in scheduled_tasks:
-        await task
 
-    assert len(calls) == 2
-    assert any(msg["data"] == "history" for msg in calls)
-    assert any(msg["data"] == "live" for msg in calls)
+@pytest.mark.asyncio
+async def test_listen_for_ws_input_history_request(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test answering a history request."""
+    ids = [
+        await a_fake_redis.xadd("stream", {"type": "print", "data": f"{i}"})
+        for i in range(3)
+    ]
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.receive_text = AsyncMock(
+        side_effect=[
+            json.dumps({"type": "history", "before": ids[2], "count": 1}),
+            WebSocketDisconnect(),
+        ]
+    )
+    await listen_for_ws_input(
+        websocket, "chan", "task1", a_fake_redis, stream_key="stream"
+    )
+    page = json.loads(websocket.send_text.call_args.args[0])
+    assert page["type"] == "history"
+    assert page["task_id"] == "task1"
+    assert page["has_more"] is True
+    assert [e["id"] for e in page["data"]] == [ids[1]]
+
+
+@pytest.mark.asyncio
+async def test_listen_for_ws_input_first_message() -> None:
+    """Test that an already received message is handled first."""
+    websocket = AsyncMock(spec=WebSocket)
+    websocket.receive_text = AsyncMock(side_effect=WebSocketDisconnect())
+    redis_mock = AsyncMock()
+    first = json.dumps({"request_id": "abc", "data": "ok"})
+    await listen_for_ws_input(
+        websocket, "chan", "task1", redis_mock, first_message=first
+    )
+    redis_mock.publish.assert_awaited_once_with("chan", first)
+
+
+def test_control_messages() -> None:
+    """Test validating the control messages."""
+    assert is_stream_id("1712345678901-0")
+    assert is_stream_id("5")
+    assert not is_stream_id("abc")
+    assert not is_stream_id(1)
+    assert is_history_request({"type": "history"})
+    assert is_history_request({"type": "history", "before": "1-0"})
+    assert not is_history_request({"type": "history", "before": "x"})
+    assert not is_history_request({"type": "history", "count": "1"})
+    assert not is_history_request({"request_id": "1", "data": "x"})
+    assert parse_resume_request({"type": "resume", "last_event_id": "1-1"}) == (
+        "1-1"
+    )
+    assert parse_resume_request({"type": "resume"}) is None
+    assert parse_resume_request("resume") is None
@@ -1,18 +1,23 @@
 # SPDX-License-Identifier: Apache-2.0.
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
 
-# pylint: disable=missing-return-doc,missing-param-doc,unused-argument
+# pylint: disable=missing-return-doc,missing-param-doc,unused-argument,no-member
 
 """Test waldiez_runner.routes.ws.manager.*."""
 
-from unittest.mock import AsyncMock
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import WebSocket
+from starlette.websockets import WebSocketState
 
+from waldiez_runner.routes.ws.client_queue import WsClientQueue, WsFrame
 from waldiez_runner.routes.ws.manager import (
     TooManyClientsException,
     WsTaskManager,
+    collect_batch,
 )
 
 
@@ -38,6 +43,137 @@ async def test_remove_client() -> None:
     assert len(manager.clients) == 0
 
 
+@pytest.mark.anyio
+async def test_start_writer_skips_sent_entries() -> None:
+    """Test that queued entries already sent as history are skipped."""
+    manager = WsTaskManager(task_id="task_1")
+    ws1 = AsyncMock(spec=WebSocket)
+    manager.add_client(ws1, start_writer=False)
+    assert ws1 not in manager.client_tasks
+
+    for index in range(1, 4):
+        await manager.broadcast(
+            {"type": "print", "data": index, "id": f"{index}-0"}
+        )
+    await manager.broadcast({"type": "status", "data": "ok"})
+
+    manager.start_writer(ws1, after_id="2-0")
+    manager.start_writer(ws1, after_id="0")  # already started
+    await asyncio.sleep(0.05)
+
+    sent = [call.args[0] for call in ws1.send_text.await_args_list]
+    assert sent == [
+        '{"type":"print","data":3,"id":"3-0"}',
+        '{"type":"status","data":"ok"}',
+    ]
+    manager.remove_client(ws1)
+
+
+@pytest.mark.anyio
+async def test_batching_client() -> None:
+    """Test sending the queued frames of a batching client at once."""
+    manager = WsTaskManager(task_id="task_1", batch_window=0.02)
+    batching = AsyncMock(spec=WebSocket)
+    single = AsyncMock(spec=WebSocket)
+    manager.add_client(batching, start_writer=False, batch=True)
+    manager.add_client(single, start_writer=False)
+    for index in range(1, 4):
+        manager.enqueue({"type": "print", "data": index, "id": f"{index}-0"})
+
+    manager.start_writer(batching, after_id="1-0")
+    manager.start_writer(single)
+    await asyncio.sleep(0)
+    # arrives within the window: same batch
+    manager.enqueue({"type": "print", "data": 4, "id": "4-0"})
+    await asyncio.sleep(0.05)
+
+    batches = [
+        json.loads(call.args[0]) for call in batching.send_text.await_args_list
+    ]
+    assert batches == [
+        [
+            {"type": "print", "data": 2, "id": "2-0"},
+            {"type": "print", "data": 3, "id": "3-0"},
+            {"type": "print", "data": 4, "id": "4-0"},
+        ]
+    ]
+    assert single.send_text.await_count == 4
+    manager.remove_client(batching)
+    assert not manager.batching
+    manager.remove_client(single)
+
+
+@pytest.mark.anyio
+async def test_close_clients() -> None:
+    """Test closing the clients after their queued frames."""
+    manager = WsTaskManager(task_id="task_1")
+    ws1 = AsyncMock(spec=WebSocket)
+    ws2 = AsyncMock(spec=WebSocket)
+    manager.add_client(ws1)
+    manager.add_client(ws2, start_writer=False, batch=True)
+    manager.enqueue({"type": "status", "data": "COMPLETED"})
+    manager.close_clients("Task completed")
+    manager.enqueue({"type": "print", "data": "late"})
+    manager.start_writer(ws2)
+    writers = list(manager.client_tasks.values())
+    assert len(writers) == 2
+    await asyncio.wait_for(asyncio.gather(*writers), 1)
+
+    ws1.send_text.assert_awaited_once_with(
+        '{"type":"status","data":"COMPLETED"}'
+    )
+    ws2.send_text.assert_awaited_once_with(
+        '[{"type":"status","data":"COMPLETED"}]'
+    )
+    for websocket in (ws1, ws2):
+        websocket.close.assert_awaited_once_with(
+            code=1000, reason="Task completed"
+        )
+    assert manager.is_empty()
+    assert not manager.client_tasks
+
+
+@pytest.mark.anyio
+async def test_collect_batch_max_frames() -> None:
+    """Test that a batch has at most max_frames frames."""
+    queue = WsClientQueue(maxsize=10)
+    for index in range(5):
+        queue.offer(WsFrame("print", str(index)))
+    first = await queue.get()
+    batch = await collect_batch(queue, first, window=0, max_frames=3)
+    assert [frame.text for frame in batch] == ["0", "1", "2"]
+    batch = await collect_batch(queue, first, window=0, max_frames=10)
+    assert [frame.text for frame in batch] == ["0", "3", "4"]
+
+
+@pytest.mark.anyio
+async def test_enqueue_in_order() -> None:
+    """Test that entries are delivered in order, without a task each."""
+    manager = WsTaskManager(task_id="task_1", queue_size=1000)
+    clients = [AsyncMock(spec=WebSocket) for _ in range(3)]
+    for client in clients:
+        manager.add_client(client)
+    tasks_before = len(asyncio.all_tasks())
+
+    for index in range(1, 201):
+        assert manager.enqueue({"type": "print", "id": f"{index}-0"})
+    assert len(asyncio.all_tasks()) == tasks_before
+    # a repeated or older entry is skipped
+    assert not manager.enqueue({"type": "print", "id": "200-0"})
+    assert not manager.enqueue({"type": "print", "id": "5-0"})
+    assert manager.enqueue({"type": "status"})
+    assert manager.enqueued == 201
+    assert manager.last_id == "200-0"
+
+    await asyncio.sleep(0.05)
+    for client in clients:
+        sent = [call.args[0] for call in client.send_text.await_args_list]
+        assert len(sent) == 201
+        assert sent[0] == '{"type":"print","id":"1-0"}'
+        assert sent[199] == '{"type":"print","id":"200-0"}'
+        manager.remove_client(client)
+
+
 @pytest.mark.anyio
 async def test_broadcast() -> None:
     """Test broadcast."""
@@ -49,8 +185,101 @@ async def test_broadcast() -> None:
 
     await manager.broadcast({"type": "print", "data": "Hello"}, skip_queue=True)
 
-    ws1.send_json.assert_awaited_once_with({"type": "print", "data": "Hello"})
-    ws2.send_json.assert_awaited_once_with({"type": "print", "data": "Hello"})
+    ws1.send_text.assert_awaited_once_with('{"type":"print","data":"Hello"}')
+    ws2.send_text.assert_awaited_once_with('{"type":"print","data":"Hello"}')
+
+
+@pytest.mark.anyio
+async def test_broadcast_serializes_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that all queues get the same serialized frame."""
+    manager = WsTaskManager(task_id="task_1")
+    ws1, ws2 = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+    manager.add_client(ws1)
+    manager.add_client(ws2)
+    serialize = MagicMock(wraps=WsTaskManager.serialize)
+    monkeypatch.setattr(manager, "serialize", serialize)
+
+    # keep the frames in the queues
+    for task in manager.client_tasks.values():
+        task.cancel()
+    await manager.broadcast({"type": "print", "data": '{"a": 1}'})
+
+    serialize.assert_called_once()
+    frame1 = manager.client_queues[ws1].get_nowait()
+    frame2 = manager.client_queues[ws2].get_nowait()
+    assert frame1 is frame2
+    assert frame1.type == "print"
+    assert frame1.text == '{"type":"print","data":{"a":1}}'
+
+
+@pytest.mark.anyio
+async def test_slow_client_does_not_block_others() -> None:
+    """Test that a full queue does not block the other clients."""
+    manager = WsTaskManager(task_id="task_1", queue_size=2)
+    slow, fast = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+    manager.add_client(slow)
+    manager.add_client(fast)
+    manager.client_tasks[slow].cancel()
+
+    for index in range(5):
+        await asyncio.wait_for(
+            manager.broadcast({"type": "print", "data": str(index)}),
+            timeout=1,
+        )
+    await asyncio.sleep(0.01)
+
+    assert fast.send_text.await_count == 5
+    stats = manager.client_stats()
+    assert stats[0] == {"lag": 2, "dropped": 3, "coalesced": 0}
+    assert stats[1]["dropped"] == 0
+
+
+@pytest.mark.anyio
+async def test_slow_client_disconnect_policy() -> None:
+    """Test that a lagging client is disconnected."""
+    manager = WsTaskManager(
+        task_id="task_1",
+        queue_size=10,
+        slow_client_policy="disconnect",
+        max_client_lag=2,
+    )
+    slow = AsyncMock(spec=WebSocket)
+    manager.add_client(slow)
+    manager.client_tasks[slow].cancel()
+
+    for index in range(3):
+        await manager.broadcast({"type": "print", "data": str(index)})
+    await asyncio.sleep(0.01)
+
+    assert manager.is_empty()
+    assert manager.slow_disconnects == 1
+    slow.close.assert_awaited_once()
+    assert slow.close.call_args.kwargs["code"] == 1013
+
+
+def test_serialize() -> None:
+    """Test serialize."""
+    assert (
+        WsTaskManager.serialize({"type": "print", "data": '{"a": [1, 2]}'})
+        == '{"type":"print","data":{"a":[1,2]}}'
+    )
+    # not double dumped
+    assert (
+        WsTaskManager.serialize({"type": "print", "data": "plain"})
+        == '{"type":"print","data":"plain"}'
+    )
+    # a scalar json string is kept as is
+    assert (
+        WsTaskManager.serialize({"type": "print", "data": "1"})
+        == '{"type":"print","data":"1"}'
+    )
+    # only print messages are parsed
+    assert (
+        WsTaskManager.serialize({"type": "input_request", "data": "[1]"})
+        == '{"type":"input_request","data":"[1]"}'
+    )
 
 
 @pytest.mark.anyio
@@ -65,3 +294,27 @@ async def test_is_empty() -> None:
 
     manager.remove_client(ws1)
     assert manager.is_empty() is True
+
+
+@pytest.mark.anyio
+async def test_remove_dead_clients() -> None:
+    """Test removing clients with a stopped writer or a closed socket."""
+    manager = WsTaskManager(task_id="task_1")
+    live = AsyncMock(spec=WebSocket)
+    closed = AsyncMock(spec=WebSocket)
+    closed.application_state = WebSocketState.DISCONNECTED
+    stopped = AsyncMock(spec=WebSocket)
+    manager.add_client(live, start_writer=False)
+    manager.add_client(closed, start_writer=False)
+    manager.add_client(stopped, start_writer=False)
+    # a writer that stopped without removing its client
+    writer = asyncio.get_running_loop().create_future()
+    writer.cancel()
+    manager.client_tasks[stopped] = writer  # type: ignore[assignment]
+
+    used = manager.last_used
+    assert manager.remove_dead_clients() == 2
+    assert manager.clients == [live]
+    assert manager.dead_clients == 2
+    assert manager.last_used >= used
+    assert manager.remove_dead_clients() == 0
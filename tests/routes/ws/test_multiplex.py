@@ -0,0 +1,350 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-return-doc,missing-param-doc,missing-yield-doc
+# pylint: disable=unused-argument,protected-access
+# pyright: reportPrivateUsage=false
+"""Test waldiez_runner.routes.ws.multiplex.*."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis
+import pytest
+from fastapi import WebSocket
+from starlette.websockets import WebSocketDisconnect
+
+from waldiez_runner.routes.ws.multiplex import (
+    MultiplexWebSocketHandler,
+    tag_frame,
+)
+from waldiez_runner.routes.ws.registry import WsTaskRegistry
+
+MODULE_TO_PATCH = "waldiez_runner.routes.ws.multiplex"
+
+
+def _task(
+    task_id: str, active: bool = True, client_id: str = "client_1"
+) -> MagicMock:
+    """Create a fake task."""
+    now = datetime.now(timezone.utc)
+    return MagicMock(
+        id=task_id,
+        client_id=client_id,
+        is_active=lambda: active,
+        status=MagicMock(value="RUNNING" if active else "COMPLETED"),
+        created_at=now,
+        updated_at=now,
+        results=None,
+        input_request_id=None,
+    )
+
+
+@pytest.fixture(name="registry")
+def registry_fixture(monkeypatch: pytest.MonkeyPatch) -> WsTaskRegistry:
+    """Use a registry with a hub that never reads."""
+    hub = MagicMock()
+    hub.add.side_effect = (
+        lambda *args: asyncio.get_running_loop().create_future()
+    )
+    registry = WsTaskRegistry(hub=hub)
+    monkeypatch.setattr(f"{MODULE_TO_PATCH}.ws_task_registry", registry)
+    return registry
+
+
+@pytest.fixture(name="tasks")
+def tasks_fixture(monkeypatch: pytest.MonkeyPatch) -> dict[str, MagicMock]:
+    """Fake the tasks in the database."""
+    tasks = {"task_1": _task("task_1"), "task_2": _task("task_2")}
+
+    @asynccontextmanager
+    async def session() -> AsyncIterator[MagicMock]:
+        yield MagicMock()
+
+    async def get_task(_session: Any, task_id: str) -> MagicMock | None:
+        return tasks.get(task_id)
+
+    monkeypatch.setattr(f"{MODULE_TO_PATCH}.app_state.db", MagicMock())
+    monkeypatch.setattr(f"{MODULE_TO_PATCH}.app_state.db.session", session)
+    monkeypatch.setattr(f"{MODULE_TO_PATCH}.TaskService.get_task", get_task)
+    return tasks
+
+
+def _handler(
+    redis: Any, max_subscriptions: int = 10
+) -> tuple[MultiplexWebSocketHandler, list[dict[str, Any]]]:
+    """Create a handler that records the sent frames."""
+    websocket = AsyncMock(spec=WebSocket)
+    sent: list[dict[str, Any]] = []
+
+    async def send_text(data: str) -> None:
+        sent.append(json.loads(data))
+
+    websocket.send_text = send_text
+    handler = MultiplexWebSocketHandler(
+        websocket,
+        MagicMock(),
+        redis,
+        max_subscriptions=max_subscriptions,
+    )
+    handler.client_id = "client_1"
+    return handler, sent
+
+
+def test_tag_frame() -> None:
+    """Test tagging a frame with its task id."""
+    tagged = tag_frame('ta"sk', '{"type":"print","data":"hi"}')
+    assert json.loads(tagged) == {
+        "task_id": 'ta"sk',
+        "message": {"type": "print", "data": "hi"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_subscribe_and_receive(
+    registry: WsTaskRegistry,
+    tasks: dict[str, MagicMock],
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test subscribing to many tasks and receiving tagged frames."""
+    handler, sent = _handler(a_fake_redis)
+    await handler.handle_message(
+        json.dumps({"type": "subscribe", "task_ids": ["task_1", "task_2"]})
+    )
+    assert set(handler.subscriptions) == {"task_1", "task_2"}
+    assert sent[0] == {"type": "subscribed", "task_id": "task_1"}
+    assert sent[1]["task_id"] == "task_1"
+    assert sent[1]["message"]["type"] == "status"
+    assert len(registry.tasks) == 2
+
+    await asyncio.sleep(0.05)  # let the (empty) history be read
+    await registry.tasks["task_2"].broadcast(
+        {"type": "print", "data": "hello", "id": "1-0"}
+    )
+    await asyncio.sleep(0.05)
+    assert sent[-1] == {
+        "task_id": "task_2",
+        "message": {"type": "print", "data": "hello", "id": "1-0"},
+    }
+
+    # subscribing again is a no-op
+    await handler.handle_message(
+        json.dumps({"type": "subscribe", "task_id": "task_1"})
+    )
+    assert sent[-1] == {"type": "subscribed", "task_id": "task_1"}
+    assert len(registry.tasks["task_1"].clients) == 1
+
+    await handler.handle_message(
+        json.dumps({"type": "unsubscribe", "task_id": "task_1"})
+    )
+    assert sent[-1] == {"type": "unsubscribed", "task_id": "task_1"}
+    assert set(registry.tasks) == {"task_2"}
+
+    handler.cleanup()
+    assert not handler.subscriptions
+    assert not registry.tasks
+
+
+@pytest.mark.asyncio
+async def test_subscribe_errors(
+    registry: WsTaskRegistry,
+    tasks: dict[str, MagicMock],
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test the subscription errors."""
+    tasks["done"] = _task("done", active=False)
+    handler, sent = _handler(a_fake_redis, max_subscriptions=1)
+    await handler.handle_message(
+        json.dumps(
+            {
+                "type": "subscribe",
+                "task_ids": ["missing", "done", "task_1", "task_2"],
+            }
+        )
+    )
+    errors = {
+        m["task_id"]: m["error"] for m in sent if m.get("type") == "error"
+    }
+    assert errors == {
+        "missing": "Task not found",
+        "done": "Task is not active",
+        "task_2": "Too many subscriptions",
+    }
+    assert set(registry.tasks) == {"task_1"}
+
+    await handler.handle_message("not json")
+    assert sent[-1]["error"] == "Invalid JSON"
+    await handler.handle_message("[]")
+    assert sent[-1]["error"] == "Invalid message"
+    await handler.handle_message(
+        json.dumps({"task_id": "task_2", "request_id": "1", "data": "x"})
+    )
+    assert sent[-1]["error"] == "Not subscribed"
+    await handler.handle_message(json.dumps({"task_id": "task_1"}))
+    assert sent[-1] == {
+        "type": "error",
+        "task_id": "task_1",
+        "error": "Invalid input payload",
+    }
+    handler.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_cannot_subscribe_to_others_task(
+    registry: WsTaskRegistry,
+    tasks: dict[str, MagicMock],
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that another client's task is not found."""
+    tasks["others"] = _task("others", client_id="client_2")
+    handler, sent = _handler(a_fake_redis)
+    await handler.handle_message(
+        json.dumps({"type": "subscribe", "task_id": "others"})
+    )
+    assert sent == [
+        {"type": "error", "task_id": "others", "error": "Task not found"}
+    ]
+    assert not handler.subscriptions
+    assert not registry.tasks
+    # so no input can be sent to it
+    await handler.handle_message(
+        json.dumps({"task_id": "others", "request_id": "1", "data": "x"})
+    )
+    assert sent[-1] == {
+        "type": "error",
+        "task_id": None,
+        "error": "Not subscribed",
+    }
+
+
+@pytest.mark.asyncio
+async def test_input_and_history(
+    registry: WsTaskRegistry,
+    tasks: dict[str, MagicMock],
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test sending input and requesting older entries of a task."""
+    for index in range(3):
+        await a_fake_redis.xadd("task:task_1:output", {"data": f"{index}"})
+    handler, sent = _handler(a_fake_redis)
+    await handler.subscribe(["task_1"])
+    await asyncio.sleep(0.05)
+    assert [m["message"].get("data") for m in sent[2:]] == ["0", "1", "2"]
+
+    await handler.handle_message(
+        json.dumps({"type": "history", "task_id": "task_1", "count": 2})
+    )
+    page = sent[-1]
+    assert page["task_id"] == "task_1"
+    assert page["message"]["type"] == "history"
+    assert [e["data"] for e in page["message"]["data"]] == ["1", "2"]
+    assert page["message"]["has_more"] is True
+
+    pubsub = a_fake_redis.pubsub()
+    await pubsub.subscribe("task:task_1:input_response")
+    await pubsub.get_message(timeout=0.1)
+    user_input = {"task_id": "task_1", "request_id": "r1", "data": "yes"}
+    await handler.handle_message(json.dumps(user_input))
+    message = await pubsub.get_message(timeout=1)
+    assert message is not None
+    assert json.loads(message["data"]) == user_input
+    await pubsub.aclose()  # type: ignore[attr-defined]
+    handler.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscription_is_unsubscribed(
+    registry: WsTaskRegistry,
+    tasks: dict[str, MagicMock],
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that a slow subscription ends without closing the socket."""
+    handler, sent = _handler(a_fake_redis)
+    await handler.subscribe(["task_1"])
+    subscription = handler.subscriptions["task_1"]
+    await subscription.close(reason="Client too slow")
+    assert sent[-1] == {
+        "type": "unsubscribed",
+        "task_id": "task_1",
+        "reason": "Client too slow",
+    }
+    assert not handler.subscriptions
+    handler.websocket.close.assert_not_called()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_terminal_status_ends_subscription(
+    registry: WsTaskRegistry,
+    tasks: dict[str, MagicMock],
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that a task's final status ends only its subscription."""
+    handler, sent = _handler(a_fake_redis)
+    await handler.subscribe(["task_1", "task_2"])
+    await asyncio.sleep(0.05)
+    manager = registry.tasks["task_1"]
+    manager.enqueue({"type": "status", "data": {"status": "COMPLETED"}})
+    manager.close_clients("Task completed")
+    await asyncio.sleep(0.05)
+    assert sent[-2] == {
+        "task_id": "task_1",
+        "message": {"type": "status", "data": {"status": "COMPLETED"}},
+    }
+    assert sent[-1] == {
+        "type": "unsubscribed",
+        "task_id": "task_1",
+        "reason": "Task completed",
+    }
+    assert set(handler.subscriptions) == {"task_2"}
+    assert set(registry.tasks) == {"task_2"}
+    handler.websocket.close.assert_not_called()  # type: ignore
+    handler.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_run(
+    monkeypatch: pytest.MonkeyPatch,
+    registry: WsTaskRegistry,
+    tasks: dict[str, MagicMock],
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test serving a connection until it disconnects."""
+    monkeypatch.setattr(
+        f"{MODULE_TO_PATCH}.get_ws_client_id",
+        AsyncMock(return_value=("client_1", "tasks-api")),
+    )
+    handler, sent = _handler(a_fake_redis)
+    handler.websocket.receive_text = AsyncMock(  # type: ignore
+        side_effect=[
+            json.dumps({"type": "subscribe", "task_id": "task_1"}),
+            WebSocketDisconnect(),
+        ]
+    )
+    await handler.run()
+    handler.websocket.accept.assert_awaited_once_with(  # type: ignore
+        subprotocol="tasks-api"
+    )
+    assert sent[0] == {"type": "subscribed", "task_id": "task_1"}
+    assert not handler.subscriptions
+    assert not registry.tasks
+
+
+@pytest.mark.asyncio
+async def test_run_invalid_client(
+    monkeypatch: pytest.MonkeyPatch,
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test rejecting a connection without a valid token."""
+    monkeypatch.setattr(
+        f"{MODULE_TO_PATCH}.get_ws_client_id",
+        AsyncMock(return_value=(None, None)),
+    )
+    handler, _ = _handler(a_fake_redis)
+    await handler.run()
+    handler.websocket.close.assert_awaited_once()  # type: ignore
+    handler.websocket.accept.assert_not_called()  # type: ignore
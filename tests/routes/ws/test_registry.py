@@ -1,15 +1,19 @@
 # SPDX-License-Identifier: Apache-2.0.
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
 
-# pylint: disable=missing-return-doc,missing-param-doc,unused-argument
+# pylint: disable=missing-return-doc,missing-param-doc,unused-argument,no-member
+# pylint: disable=protected-access
+# pyright: reportPrivateUsage=false
 
 """Test waldiez_runner.routes.ws.registry.*."""
 
+import asyncio
 import time
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi import WebSocket
+from starlette.websockets import WebSocketState
 
 from waldiez_runner.routes.ws.manager import WsTaskManager
 from waldiez_runner.routes.ws.registry import (
@@ -60,6 +64,11 @@ def test_stats() -> None:
         "active_tasks": 2,
         "connected_clients": 0,
         "per_task": {"task_1": 0, "task_2": 0},
+        "per_client": {"task_1": [], "task_2": []},
+        "slow_client_policy": "drop_oldest",
+        "slow_disconnects": 0,
+        "evicted_tasks": 0,
+        "dead_clients": 0,
     }
 
 
@@ -79,6 +88,63 @@ def test_expire_idle_tasks() -> None:
     assert "task_2" in registry.tasks
 
 
+def test_reap() -> None:
+    """Test removing dead clients and evicting tasks without clients."""
+    registry = WsTaskRegistry(hub=MagicMock())
+    live = AsyncMock(spec=WebSocket)
+    live.client_state = WebSocketState.CONNECTED
+    live.application_state = WebSocketState.CONNECTED
+    dead = AsyncMock(spec=WebSocket)
+    dead.client_state = WebSocketState.DISCONNECTED
+    dead.application_state = WebSocketState.CONNECTED
+    registry.get_or_create_task_manager("live").add_client(
+        live, start_writer=False
+    )
+    registry.get_or_create_task_manager("dead").add_client(
+        dead, start_writer=False
+    )
+    registry.get_or_create_task_manager("new")
+
+    # within the grace period: only the dead client is removed
+    assert registry.reap(grace_seconds=60) == 0
+    assert set(registry.tasks) == {"live", "dead", "new"}
+    assert registry.tasks["dead"].is_empty()
+
+    time.sleep(0.01)
+    assert registry.reap(grace_seconds=0) == 2
+    assert set(registry.tasks) == {"live"}
+    assert registry.metrics() == {
+        "active_tasks": 1,
+        "connected_clients": 1,
+        "evicted_tasks": 2,
+        "dead_clients": 1,
+        "slow_disconnects": 0,
+    }
+    registry.hub.remove.assert_any_call("dead")  # type: ignore
+
+
+@pytest.mark.anyio
+async def test_reaper() -> None:
+    """Test the periodic reaper."""
+    registry = WsTaskRegistry(hub=MagicMock())
+    registry.get_or_create_task_manager("task_1")
+    registry.start_reaper(interval=0, grace_seconds=0)
+    assert registry._reaper is None
+
+    registry.start_reaper(interval=0.01, grace_seconds=0)
+    reaper = registry._reaper
+    registry.start_reaper(interval=0.01, grace_seconds=0)
+    assert registry._reaper is reaper
+    await asyncio.sleep(0.05)
+    assert not registry.tasks
+    assert registry.evicted_tasks == 1
+
+    await registry.stop_reaper()
+    assert registry._reaper is None
+    assert reaper is not None and reaper.cancelled()
+    await registry.stop_reaper()
+
+
 @pytest.mark.anyio
 async def test_broadcast_to() -> None:
     """Test broadcast_to."""
@@ -92,4 +158,4 @@ async def test_broadcast_to() -> None:
     await registry.broadcast_to(
         "task_1", {"type": "print", "data": "World"}, skip_queue=True
     )
-    ws.send_json.assert_awaited_once_with({"type": "print", "data": "World"})
+    ws.send_text.assert_awaited_once_with('{"type":"print","data":"World"}')
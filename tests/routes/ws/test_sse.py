@@ -0,0 +1,214 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-return-doc,missing-param-doc,missing-yield-doc
+# pylint: disable=unused-argument,protected-access,too-few-public-methods
+# pyright: reportPrivateUsage=false
+"""Test waldiez_runner.routes.ws.sse.*."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+
+from waldiez_runner.routes.ws.manager import TooManyClientsException
+from waldiez_runner.routes.ws.registry import (
+    TooManyTasksException,
+    WsTaskRegistry,
+)
+from waldiez_runner.routes.ws.sse import (
+    SseClient,
+    check_sse_capacity,
+    format_sse_event,
+    task_event_stream,
+)
+
+STREAM_KEY = "task:task_1:output"
+
+
+class FakeRedisManager:
+    """Fake Redis manager yielding a fakeredis client."""
+
+    def __init__(self, redis: fakeredis.aioredis.FakeRedis) -> None:
+        """Initialize the fake manager."""
+        self.redis = redis
+
+    @asynccontextmanager
+    async def contextual_client(
+        self, use_single_connection: bool = False
+    ) -> AsyncIterator[fakeredis.aioredis.FakeRedis]:
+        """Yield the fake client."""
+        yield self.redis
+
+
+def _task(task_id: str = "task_1") -> MagicMock:
+    """Create a fake task."""
+    now = datetime.now(timezone.utc)
+    return MagicMock(
+        id=task_id,
+        status=MagicMock(value="RUNNING"),
+        created_at=now,
+        updated_at=now,
+        results=None,
+        input_request_id=None,
+    )
+
+
+def _registry(max_active_tasks: int = 10) -> WsTaskRegistry:
+    """Create a registry with a hub that never reads."""
+    registry = WsTaskRegistry(
+        max_active_tasks=max_active_tasks, hub=MagicMock()
+    )
+    return registry
+
+
+def _parse(event: str) -> tuple[str | None, dict[str, Any]]:
+    """Get the id and the data of an event."""
+    event_id = None
+    data: list[str] = []
+    for line in event.strip("\n").splitlines():
+        if line.startswith("id: "):
+            event_id = line[4:]
+        elif line.startswith("data: "):
+            data.append(line[6:])
+    return event_id, json.loads("\n".join(data))
+
+
+def test_format_sse_event() -> None:
+    """Test formatting events."""
+    assert format_sse_event('{"a":1}') == 'data: {"a":1}\n\n'
+    assert format_sse_event('{"a":1}', "1-0") == 'id: 1-0\ndata: {"a":1}\n\n'
+    assert format_sse_event("a\nb") == "data: a\ndata: b\n\n"
+    assert format_sse_event("") == "data: \n\n"
+
+
+def test_check_sse_capacity() -> None:
+    """Test checking the capacity before streaming."""
+    registry = _registry(max_active_tasks=1)
+    check_sse_capacity("task_1", registry)
+    manager = registry.get_or_create_task_manager("task_1")
+    with pytest.raises(TooManyTasksException):
+        check_sse_capacity("task_2", registry)
+    manager.max_clients = 1
+    check_sse_capacity("task_1", registry)
+    manager.add_client(SseClient(), start_writer=False)
+    with pytest.raises(TooManyClientsException):
+        check_sse_capacity("task_1", registry)
+
+
+@pytest.mark.asyncio
+async def test_task_event_stream(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test streaming the status, the history and the live output."""
+    ids = [
+        await a_fake_redis.xadd(STREAM_KEY, {"type": "print", "data": f"{i}"})
+        for i in range(3)
+    ]
+    registry = _registry()
+    stream = task_event_stream(
+        _task(),
+        keepalive=0.05,
+        registry=registry,
+        redis=FakeRedisManager(a_fake_redis),  # type: ignore
+    )
+    assert await anext(stream) == "retry: 3000\n\n"
+    _, payload = _parse(await anext(stream))
+    assert payload["type"] == "status"
+    history = [_parse(await anext(stream)) for _ in range(3)]
+    assert [event_id for event_id, _ in history] == ids
+    assert [data["data"] for _, data in history] == ["0", "1", "2"]
+
+    manager = registry.tasks["task_1"]
+    # the viewer is in the manager without any writer task
+    assert len(manager.clients) == 1
+    assert not manager.client_tasks
+    next_event = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    registry.hub.add.assert_called_once_with(manager, ids[-1])  # type: ignore
+
+    # already sent as history
+    manager.enqueue({"type": "print", "data": "2", "id": ids[-1]})
+    manager.enqueue({"type": "print", "data": "3", "id": "9999999999999-0"})
+    event_id, payload = _parse(await next_event)
+    assert event_id == "9999999999999-0"
+    assert payload["data"] == "3"
+
+    assert await anext(stream) == ": keepalive\n\n"
+
+    client = manager.clients[0]
+    await client.close()
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert not registry.tasks
+
+
+@pytest.mark.asyncio
+async def test_task_event_stream_resume(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test resuming after the last received event."""
+    ids = [
+        await a_fake_redis.xadd(STREAM_KEY, {"type": "print", "data": f"{i}"})
+        for i in range(5)
+    ]
+    registry = _registry()
+    stream = task_event_stream(
+        _task(),
+        last_event_id=ids[2],
+        registry=registry,
+        redis=FakeRedisManager(a_fake_redis),  # type: ignore
+    )
+    events = [await anext(stream) for _ in range(4)]
+    assert [_parse(event)[0] for event in events[2:]] == ids[3:]
+    await stream.aclose()
+    assert not registry.tasks
+
+
+@pytest.mark.asyncio
+async def test_task_event_stream_too_many_viewers(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test the error event if the task cannot get more viewers."""
+    registry = _registry(max_active_tasks=1)
+    registry.get_or_create_task_manager("other")
+    stream = task_event_stream(
+        _task(),
+        registry=registry,
+        redis=FakeRedisManager(a_fake_redis),  # type: ignore
+    )
+    events = [event async for event in stream]
+    assert len(events) == 1
+    assert _parse(events[0])[1] == {"type": "error", "data": "Too many viewers"}
+    assert set(registry.tasks) == {"other"}
+
+
+@pytest.mark.asyncio
+async def test_task_event_stream_ends_on_final_status(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test ending the stream after the task's final status."""
+    registry = _registry()
+    stream = task_event_stream(
+        _task(),
+        registry=registry,
+        redis=FakeRedisManager(a_fake_redis),  # type: ignore
+    )
+    events = [await anext(stream) for _ in range(2)]
+    next_event = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    manager = registry.tasks["task_1"]
+    manager.enqueue({"type": "status", "data": {"status": "FAILED"}})
+    manager.close_clients("Task failed")
+    _, payload = _parse(await next_event)
+    assert payload == {"type": "status", "data": {"status": "FAILED"}}
+    assert len(events) == 2
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert not registry.tasks
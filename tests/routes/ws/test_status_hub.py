@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-return-doc,missing-param-doc,missing-yield-doc
+# pylint: disable=unused-argument,protected-access,too-few-public-methods
+# pyright: reportPrivateUsage=false
+"""Test waldiez_runner.routes.ws.status_hub.*."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+
+from waldiez_runner.models import TaskStatus
+from waldiez_runner.routes.ws.manager import WsTaskManager
+from waldiez_runner.routes.ws.status_hub import (
+    WsStatusHub,
+    build_status_update,
+    task_status_channel,
+)
+from waldiez_runner.routes.ws.stream_hub import WsStreamHub
+
+
+class FakeRedisManager:
+    """Fake Redis manager yielding a fakeredis client."""
+
+    def __init__(self, redis: fakeredis.aioredis.FakeRedis) -> None:
+        """Initialize the fake manager."""
+        self.redis = redis
+
+    @asynccontextmanager
+    async def contextual_client(
+        self, use_single_connection: bool = False
+    ) -> AsyncIterator[fakeredis.aioredis.FakeRedis]:
+        """Yield the fake client."""
+        yield self.redis
+
+
+class RecordingManager(WsTaskManager):
+    """Task manager that records the enqueued messages and closes."""
+
+    def __init__(self, task_id: str) -> None:
+        """Initialize the recording manager."""
+        super().__init__(task_id)
+        self.received: list[dict[str, Any]] = []
+        self.closed: list[str] = []
+
+    def enqueue(self, message: dict[str, Any]) -> bool:
+        """Record the message."""
+        self.received.append(message)
+        return True
+
+    def close_clients(self, reason: str = "") -> None:
+        """Record the close."""
+        self.closed.append(reason)
+
+
+async def _wait_for(condition: Any, timeout: float = 2.0) -> None:
+    """Wait until the condition is true."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:  # pragma: no cover
+            raise TimeoutError("Condition not met")
+        await asyncio.sleep(0.01)
+
+
+def _status(status: str, data: Any = None) -> str:
+    """Create a published status message."""
+    return json.dumps({"task_id": "task_1", "status": status, "data": data})
+
+
+def test_task_status_channel() -> None:
+    """Test task_status_channel."""
+    assert task_status_channel("abc") == "task:abc:status"
+
+
+def test_build_status_update() -> None:
+    """Test building the status frame of a transition."""
+    payload = build_status_update(
+        "task_1",
+        {"status": TaskStatus.WAITING_FOR_INPUT, "input_request_id": "r1"},
+    )
+    assert payload["type"] == "status"
+    assert payload["data"]["task_id"] == "task_1"
+    assert payload["data"]["status"] == "WAITING_FOR_INPUT"
+    assert payload["data"]["input_request_id"] == "r1"
+    assert payload["data"]["results"] is None
+    assert payload["data"]["updated_at"].endswith("Z")
+
+
+@pytest.mark.asyncio
+async def test_dispatch() -> None:
+    """Test forwarding the transitions and closing on a terminal one."""
+    hub = WsStatusHub(close_delay=0)
+    manager = RecordingManager("task_1")
+    hub.managers[task_status_channel("task_1")] = manager
+
+    hub.dispatch("task:other:status", _status("RUNNING"))
+    hub.dispatch("task:task_1:status", "not json")
+    hub.dispatch("task:task_1:status", _status("UNKNOWN"))
+    hub.dispatch("task:task_1:status", '{"status": "CANCELLED", "data": null}')
+    assert not manager.received
+
+    hub.dispatch(
+        "task:task_1:status",
+        _status("WAITING_FOR_INPUT", {"request_id": "r1", "prompt": "?"}),
+    )
+    hub.dispatch("task:task_1:status", _status("RUNNING"))
+    assert [m["data"]["status"] for m in manager.received] == [
+        "WAITING_FOR_INPUT",
+        "RUNNING",
+    ]
+    assert manager.received[0]["data"]["input_request_id"] == "r1"
+    assert not manager.closed
+
+    hub.dispatch("task:task_1:status", _status("COMPLETED", {"ok": True}))
+    assert manager.received[-1]["data"]["results"] == {"ok": True}
+    assert manager.closed == ["Task completed"]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_closes_after_delay() -> None:
+    """Test waiting for the last output before closing."""
+    hub = WsStatusHub(close_delay=0.05)
+    manager = RecordingManager("task_1")
+    hub.managers[task_status_channel("task_1")] = manager
+    hub.dispatch("task:task_1:status", _status("FAILED", "boom"))
+    assert manager.received[-1]["data"]["results"] == {"error": "boom"}
+    assert not manager.closed
+    await asyncio.sleep(0.1)
+    assert manager.closed == ["Task failed"]
+
+
+@pytest.mark.asyncio
+async def test_listener(a_fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+    """Test that one listener forwards the published transitions."""
+    hub = WsStatusHub(
+        poll_timeout=0.05,
+        close_delay=0,
+        redis=FakeRedisManager(a_fake_redis),  # type: ignore
+    )
+    manager1 = RecordingManager("task_1")
+    manager2 = RecordingManager("task_2")
+    listener = hub.add(manager1)
+    assert hub.add(manager2) is listener
+    assert hub.has("task_1") and hub.is_running()
+
+    async def publish_until_received() -> None:
+        while not manager1.received:
+            await a_fake_redis.publish("task:task_1:status", _status("RUNNING"))
+            await asyncio.sleep(0.02)
+
+    await asyncio.wait_for(publish_until_received(), timeout=2)
+    await a_fake_redis.publish(
+        "task:task_2:status", _status("CANCELLED", {"data": "by user"})
+    )
+    await _wait_for(lambda: manager2.closed)
+    assert manager2.received[-1]["data"]["status"] == "CANCELLED"
+    assert manager2.closed == ["Task cancelled"]
+
+    hub.remove("task_1")
+    hub.remove("task_2")
+    assert not hub.has("task_1")
+    # stops once there is nothing left to watch
+    await asyncio.wait_for(listener, timeout=2)
+    assert not hub.is_running()
+
+
+@pytest.mark.asyncio
+async def test_stop(a_fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+    """Test stopping the listener."""
+    hub = WsStatusHub(
+        poll_timeout=0.05,
+        redis=FakeRedisManager(a_fake_redis),  # type: ignore
+    )
+    hub.add(RecordingManager("task_1"))
+    await asyncio.sleep(0.01)
+    await hub.stop()
+    assert not hub.managers
+    assert not hub.is_running()
+    await hub.stop()  # no-op
+
+
+@pytest.mark.asyncio
+async def test_stream_hub_adds_the_watched_tasks() -> None:
+    """Test that the stream hub adds and removes its tasks."""
+    status_hub = MagicMock(spec=WsStatusHub)
+    hub = WsStreamHub(redis=MagicMock(), status_hub=status_hub)
+    hub._ensure_reader = MagicMock()  # type: ignore
+    manager = RecordingManager("task_1")
+    hub.add(manager)
+    status_hub.add.assert_called_once_with(manager)
+    hub.remove("task_1")
+    status_hub.remove.assert_called_once_with("task_1")
+    await hub.stop()
+    status_hub.stop.assert_awaited_once()
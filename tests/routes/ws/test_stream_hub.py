@@ -0,0 +1,217 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-return-doc,missing-param-doc,missing-yield-doc
+# pylint: disable=unused-argument,protected-access,too-few-public-methods
+# pyright: reportPrivateUsage=false
+"""Test waldiez_runner.routes.ws.stream_hub.*."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+
+from waldiez_runner.routes.ws.manager import WsTaskManager
+from waldiez_runner.routes.ws.registry import WsTaskRegistry
+from waldiez_runner.routes.ws.stream_hub import WsStreamHub, task_stream_key
+
+
+class FakeRedisManager:
+    """Fake Redis manager yielding a fakeredis client."""
+
+    def __init__(self, redis: fakeredis.aioredis.FakeRedis) -> None:
+        """Initialize the fake manager."""
+        self.redis = redis
+        self.opened = 0
+
+    @asynccontextmanager
+    async def contextual_client(
+        self, use_single_connection: bool = False
+    ) -> AsyncIterator[fakeredis.aioredis.FakeRedis]:
+        """Yield the fake client."""
+        self.opened += 1
+        yield self.redis
+
+
+class RecordingManager(WsTaskManager):
+    """Task manager that records broadcast messages."""
+
+    def __init__(self, task_id: str) -> None:
+        """Initialize the recording manager."""
+        super().__init__(task_id)
+        self.received: list[dict[str, Any]] = []
+
+    def enqueue(self, message: dict[str, Any]) -> bool:
+        """Record the message."""
+        self.received.append(message)
+        return True
+
+
+async def _wait_for(condition: Any, timeout: float = 2.0) -> None:
+    """Wait until the condition is true."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:  # pragma: no cover
+            raise TimeoutError("Condition not met")
+        await asyncio.sleep(0.01)
+
+
+def test_task_stream_key() -> None:
+    """Test task_stream_key."""
+    assert task_stream_key("abc") == "task:abc:output"
+
+
+@pytest.mark.asyncio
+async def test_hub_dispatches_to_managers(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that one reader dispatches entries of many streams."""
+    redis_manager = FakeRedisManager(a_fake_redis)
+    hub = WsStreamHub(block_ms=50, redis=redis_manager)  # type: ignore
+    manager1 = RecordingManager("task_1")
+    manager2 = RecordingManager("task_2")
+
+    reader1 = hub.add(manager1)
+    reader2 = hub.add(manager2)
+    assert reader1 is reader2
+    assert hub.is_running()
+
+    await a_fake_redis.xadd(task_stream_key("task_1"), {"data": "one"})
+    await a_fake_redis.xadd(task_stream_key("task_2"), {"data": "two"})
+    await a_fake_redis.xadd(task_stream_key("task_1"), {"data": "three"})
+
+    await _wait_for(
+        lambda: len(manager1.received) == 2 and len(manager2.received) == 1
+    )
+    assert [m["data"] for m in manager1.received] == ["one", "three"]
+    assert manager2.received[0]["data"] == "two"
+    assert manager1.received[0]["id"]
+    assert redis_manager.opened == 1
+
+    await hub.stop()
+    assert not hub.is_running()
+
+
+@pytest.mark.asyncio
+async def test_hub_resumes_after_last_id(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that entries up to the given id are skipped."""
+    first_id = await a_fake_redis.xadd(
+        task_stream_key("task_1"), {"data": "old"}
+    )
+    hub = WsStreamHub(
+        block_ms=50, redis=FakeRedisManager(a_fake_redis)  # type: ignore
+    )
+    manager = RecordingManager("task_1")
+    hub.add(manager, first_id)
+    # adding again keeps the current position
+    hub.add(manager, "0")
+    await a_fake_redis.xadd(task_stream_key("task_1"), {"data": "new"})
+
+    await _wait_for(lambda: len(manager.received) == 1)
+    await asyncio.sleep(0.1)
+    assert [m["data"] for m in manager.received] == ["new"]
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_hub_stops_when_empty(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that the reader stops after the last stream is removed."""
+    hub = WsStreamHub(
+        block_ms=20, redis=FakeRedisManager(a_fake_redis)  # type: ignore
+    )
+    manager = RecordingManager("task_1")
+    reader = hub.add(manager)
+    assert hub.has("task_1")
+
+    hub.remove("task_1")
+    assert not hub.has("task_1")
+    await asyncio.wait_for(reader, timeout=1)
+    assert not hub.is_running()
+
+    # a new stream restarts it
+    new_reader = hub.add(manager)
+    assert new_reader is not reader
+    assert hub.is_running()
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_hub_retries_on_read_error() -> None:
+    """Test that a failed read does not stop the reader."""
+    redis = MagicMock()
+    calls = 0
+
+    async def failing_xread(*args: Any, **kwargs: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        raise OSError("connection lost")
+
+    redis.xread = failing_xread
+    hub = WsStreamHub(
+        block_ms=10,
+        retry_delay=0.01,
+        redis=FakeRedisManager(redis),  # type: ignore
+    )
+    hub.add(RecordingManager("task_1"))
+    await _wait_for(lambda: calls >= 2)
+    assert hub.is_running()
+    await hub.stop()
+
+
+@pytest.mark.asyncio
+async def test_hub_restarts_after_unexpected_error(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that an unexpected reader error does not stop the hub."""
+    redis_manager = FakeRedisManager(a_fake_redis)
+    real_xread = a_fake_redis.xread
+    calls = 0
+
+    async def flaky_xread(*args: Any, **kwargs: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("unexpected")
+        return await real_xread(*args, **kwargs)
+
+    a_fake_redis.xread = flaky_xread  # type: ignore[method-assign]
+    hub = WsStreamHub(
+        block_ms=10,
+        retry_delay=0.01,
+        redis=redis_manager,  # type: ignore
+    )
+    manager = RecordingManager("task_1")
+    reader = hub.add(manager)
+    await a_fake_redis.xadd(task_stream_key("task_1"), {"data": "hello"})
+    await _wait_for(lambda: len(manager.received) == 1)
+    # the same reader, with a new connection
+    assert hub.is_running()
+    assert hub.add(manager) is reader
+    assert redis_manager.opened == 2
+    await hub.stop()
+
+
+def test_registry_removes_streams_from_hub() -> None:
+    """Test that removing a task from the registry stops its stream."""
+    hub = MagicMock(spec=WsStreamHub)
+    registry = WsTaskRegistry(hub=hub)
+    registry.get_or_create_task_manager("task_1")
+    registry.remove_task_if_empty("task_1")
+    hub.remove.assert_called_once_with("task_1")
+
+
+def test_registry_without_task_limit() -> None:
+    """Test that a non-positive limit disables the active tasks ceiling."""
+    registry = WsTaskRegistry(max_active_tasks=0)
+    for index in range(100):
+        registry.get_or_create_task_manager(f"task_{index}")
+    assert len(registry.tasks) == 100
@@ -18,6 +18,7 @@ from waldiez_runner.routes.ws.registry import TooManyTasksException
 from waldiez_runner.routes.ws.validation import (
     _validate_ws_connection,
     validate_websocket_connection,
+    wants_batches,
     ws_task_registry,
 )
 from waldiez_runner.services import TaskService
@@ -107,6 +108,7 @@ async def test__validate_ws_connection_success(
 ) -> None:
     """Test _validate_ws_connection."""
     websocket = AsyncMock(spec=WebSocket)
+    websocket.query_params = {"batch": "1"}
     fake_task = MagicMock(spec=Task)
     fake_manager = MagicMock()
     fake_manager.add_client = MagicMock()
@@ -124,7 +126,9 @@ async def test__validate_ws_connection_success(
         websocket, MagicMock(), "taskX"
     )
     assert task is fake_task
-    fake_manager.add_client.assert_called_once_with(websocket)
+    fake_manager.add_client.assert_called_once_with(
+        websocket, start_writer=False, batch=True
+    )
 
 
 @pytest.mark.asyncio
@@ -176,5 +180,18 @@ async def test__validate_ws_connection_too_many_clients(
     )
 
     with pytest.raises(WebSocketException) as err:
-        await _validate_ws_connection(AsyncMock(), MagicMock(), "taskZ")
+        await _validate_ws_connection(
+            MagicMock(query_params={}), MagicMock(), "taskZ"
+        )
     assert "Too many clients" in err.value.reason
+
+
+def test_wants_batches() -> None:
+    """Test checking if a client asked for batched messages."""
+    websocket = MagicMock(spec=WebSocket)
+    websocket.query_params = {"batch": "true"}
+    assert wants_batches(websocket) is True
+    websocket.query_params = {"batch": "0"}
+    assert wants_batches(websocket) is False
+    websocket.query_params = {}
+    assert wants_batches(websocket) is False
@@ -10,6 +10,7 @@ from fastapi_pagination import Params
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tests.types import CreateClientCallable
+from waldiez_runner.hashing._scrypt_hasher import ScryptHasher
 from waldiez_runner.schemas.client import ClientCreate, ClientUpdate
 from waldiez_runner.services import ClientService
 
@@ -291,6 +292,48 @@ async def test_verify_client(async_session: AsyncSession) -> None:
     assert verified_client is None
 
 
+@pytest.mark.anyio
+async def test_verify_client_defers_rehash(
+    async_session: AsyncSession,
+) -> None:
+    """Test upgrading an outdated hash after verifying a client."""
+    client_create = ClientCreate()
+    created = await ClientService.create_client(async_session, client_create)
+    client_in_db = await ClientService.get_client_in_db(
+        async_session, created.id
+    )
+    assert client_in_db is not None
+    outdated = ScryptHasher().hash(client_create.plain_secret)
+    client_in_db.client_secret = outdated
+    await async_session.commit()
+
+    deferred: list[tuple[str, str, str]] = []
+    verified = await ClientService.verify_client(
+        async_session,
+        created.client_id,
+        client_create.plain_secret,
+        defer_rehash=lambda *args: deferred.append(args),
+    )
+    assert verified is not None
+    assert deferred == [
+        (created.client_id, client_create.plain_secret, outdated)
+    ]
+    await async_session.refresh(client_in_db)
+    assert client_in_db.client_secret == outdated
+
+    assert await ClientService.rehash_client_secret(async_session, *deferred[0])
+    await async_session.refresh(client_in_db)
+    assert client_in_db.client_secret.startswith("$argon2")
+    # already upgraded
+    assert not await ClientService.rehash_client_secret(
+        async_session, *deferred[0]
+    )
+    verified = await ClientService.verify_client(
+        async_session, created.client_id, client_create.plain_secret
+    )
+    assert verified is not None
+
+
 @pytest.mark.anyio
 async def test_verify_nonexistent_client(async_session: AsyncSession) -> None:
     """Test verifying a non-existent client."""
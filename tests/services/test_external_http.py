@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-return-doc,missing-param-doc
+"""Test the shared external verification client and cache."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+
+from waldiez_runner.services import (
+    VerificationCache,
+    close_http_client,
+    get_http_client,
+    verification_key,
+)
+
+
+def _is_positive(result: str) -> bool | None:
+    """Classify the test results."""
+    if result == "error":
+        return None
+    return result == "ok"
+
+
+@pytest.mark.asyncio
+async def test_get_http_client_is_shared() -> None:
+    """Test that the verifications share one client."""
+    client = get_http_client()
+    assert get_http_client() is client
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()
+    await close_http_client()  # no-op
+
+
+def test_verification_key() -> None:
+    """Test that the key identifies the parts without keeping them."""
+    key = verification_key("https://example.com", "token")
+    assert key == verification_key("https://example.com", "token")
+    assert key != verification_key("https://example.com", "other")
+    assert "token" not in key
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_by_kind() -> None:
+    """Test the positive, negative and non cacheable results."""
+    cache: VerificationCache[str] = VerificationCache(
+        _is_positive, ttl=60, negative_ttl=0.05
+    )
+    calls: list[str] = []
+
+    def loader(result: str) -> Callable[[], Awaitable[str]]:
+        async def load() -> str:
+            calls.append(result)
+            return result
+
+        return load
+
+    assert await cache.get_or_load("a", loader("ok")) == "ok"
+    assert await cache.get_or_load("a", loader("other")) == "ok"
+    assert await cache.get_or_load("b", loader("denied")) == "denied"
+    assert await cache.get_or_load("b", loader("other")) == "denied"
+    assert await cache.get_or_load("c", loader("error")) == "error"
+    assert await cache.get_or_load("c", loader("ok")) == "ok"
+    assert calls == ["ok", "denied", "error", "ok"]
+    await asyncio.sleep(0.06)
+    # the negative result expired
+    assert await cache.get_or_load("b", loader("ok")) == "ok"
+    assert cache.stats() == {"size": 3, "hits": 2, "misses": 5}
+    cache.clear()
+    assert not cache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced() -> None:
+    """Test that concurrent identical verifications share one call."""
+    cache: VerificationCache[str] = VerificationCache(_is_positive)
+    calls = 0
+    release = asyncio.Event()
+
+    async def load() -> str:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "ok"
+
+    waiters = [
+        asyncio.create_task(cache.get_or_load("a", load)) for _ in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await asyncio.gather(*waiters) == ["ok"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached() -> None:
+    """Test that a failed load is shared but retried afterwards."""
+    cache: VerificationCache[str] = VerificationCache(_is_positive)
+
+    async def fail() -> str:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def load() -> str:
+        return "ok"
+
+    results = await asyncio.gather(
+        cache.get_or_load("a", fail),
+        cache.get_or_load("a", fail),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert not cache
+    assert await cache.get_or_load("a", load) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_size_bound_and_disabled_cache() -> None:
+    """Test the least recently used eviction and disabling the cache."""
+    cache: VerificationCache[str] = VerificationCache(_is_positive, max_size=2)
+
+    async def load() -> str:
+        return "ok"
+
+    for key in ("a", "b", "c"):
+        await cache.get_or_load(key, load)
+    assert len(cache) == 2
+    disabled: VerificationCache[str] = VerificationCache(
+        _is_positive, max_size=0
+    )
+    await disabled.get_or_load("a", load)
+    assert not disabled
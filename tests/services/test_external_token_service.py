@@ -3,6 +3,8 @@
 
 """Test the external token verification service."""
 
+import asyncio
+
 import pytest
 from fastapi import HTTPException
 from httpx import RequestError
@@ -97,3 +99,67 @@ async def test_verify_external_token_service_unavailable(
     assert isinstance(exception, HTTPException)
     assert exception.status_code == 500
     assert "External verification service unavailable" in str(exception.detail)
+
+
+@pytest.mark.asyncio
+async def test_verify_external_token_results_are_cached(
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that accepted tokens are verified once while cached.
+
+    Parameters
+    ----------
+    httpx_mock : HTTPXMock
+        The mock for HTTP requests
+    """
+    httpx_mock.add_response(
+        url="https://example.com/verify",
+        method="POST",
+        json={"valid": True, "user": {"id": "ext-123"}},
+        status_code=200,
+    )
+    results = await asyncio.gather(
+        *(
+            ExternalTokenService.verify_external_token(
+                "test-token", "https://example.com/verify"
+            )
+            for _ in range(3)
+        )
+    )
+    response, _ = await ExternalTokenService.verify_external_token(
+        "test-token", "https://example.com/verify"
+    )
+    assert response is not None and response.id == "ext-123"
+    assert all(result == results[0] for result in results)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_external_token_unavailable_is_not_cached(
+    httpx_mock: HTTPXMock,
+) -> None:
+    """Test that a failing verification service is asked again.
+
+    Parameters
+    ----------
+    httpx_mock : HTTPXMock
+        The mock for HTTP requests
+    """
+    httpx_mock.add_exception(
+        url="https://example.com/verify",
+        exception=RequestError("Connection error"),
+    )
+    httpx_mock.add_response(
+        url="https://example.com/verify",
+        method="POST",
+        json={"error": "Invalid token"},
+        status_code=401,
+    )
+    for status_code in (500, 401, 401):
+        _, exception = await ExternalTokenService.verify_external_token(
+            "test-token", "https://example.com/verify"
+        )
+        assert isinstance(exception, HTTPException)
+        assert exception.status_code == status_code
+    # the rejection is cached
+    assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+
+"""Tests for the set based checks of the stuck tasks."""
+
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.types import CreateTaskCallable
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_status import TaskStatus
+from waldiez_runner.services import TaskService
+
+
+async def _stuck_task(
+    session: AsyncSession,
+    create_task: CreateTaskCallable,
+    client_id: str,
+    results: Any,
+) -> Task:
+    """Create a running task with results."""
+    task, _ = await create_task(session, client_id, status=TaskStatus.RUNNING)
+    task.results = results
+    await session.commit()
+    await session.refresh(task)
+    return task
+
+
+@pytest.mark.anyio
+async def test_classify_stuck_tasks(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test that the obvious failures are classified in the query."""
+    client_id = "test_classify_stuck_tasks"
+    with_error = await _stuck_task(
+        async_session, create_task, client_id, {"error": "boom"}
+    )
+    with_results = await _stuck_task(
+        async_session, create_task, client_id, [{"content": "done"}]
+    )
+    # a None set on update: a JSON null
+    json_null = await _stuck_task(
+        async_session, create_task, client_id, {"content": "done"}
+    )
+    json_null.results = None
+    await async_session.commit()
+    running, _ = await create_task(
+        async_session, client_id, status=TaskStatus.RUNNING
+    )
+    failed, to_check = await TaskService.classify_stuck_tasks(async_session)
+    assert with_error.id in failed
+    assert (with_results.id, client_id) in to_check
+    assert running.id not in failed
+    assert running.id not in [task_id for task_id, _ in to_check]
+    assert json_null.id in failed
+
+
+@pytest.mark.anyio
+async def test_update_tasks_status(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test the bulk status update of the still active tasks."""
+    client_id = "test_update_tasks_status"
+    waiting, _ = await create_task(
+        async_session, client_id, status=TaskStatus.WAITING_FOR_INPUT
+    )
+    waiting.input_request_id = "request"
+    await async_session.commit()
+    cancelled, _ = await create_task(
+        async_session, client_id, status=TaskStatus.CANCELLED
+    )
+    assert not await TaskService.update_tasks_status(
+        async_session, [], TaskStatus.FAILED
+    )
+    updated = await TaskService.update_tasks_status(
+        async_session, [waiting.id, cancelled.id], TaskStatus.FAILED
+    )
+    assert updated == 1
+    for task in (waiting, cancelled):
+        await async_session.refresh(task)
+    assert waiting.status == TaskStatus.FAILED
+    assert waiting.input_request_id is None
+    assert cancelled.status == TaskStatus.CANCELLED
@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+
+"""Tests for the task counters kept in Redis."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.types import CreateTaskCallable
+from waldiez_runner.models.task_status import TaskStatus
+from waldiez_runner.services import TaskService
+from waldiez_runner.services._task_counters import (
+    CLIENT_ACTIVE_TASKS_KEY,
+    acquire_task_slot,
+    count_tasks_by_status,
+)
+
+
+async def _client_active(
+    redis: fakeredis.aioredis.FakeRedis, client_id: str
+) -> int:
+    """Get a client's active tasks' counter."""
+    return int(await redis.hget(CLIENT_ACTIVE_TASKS_KEY, client_id) or 0)
+
+
+@pytest.mark.anyio
+async def test_counters_are_not_used_before_reconciling(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that the counters are not used before they are synced."""
+    assert await TaskService.get_task_counts(a_fake_redis) is None
+    assert await acquire_task_slot(a_fake_redis, "client", 3) is None
+    await TaskService.record_task_transition(
+        a_fake_redis, "client", TaskStatus.PENDING, TaskStatus.RUNNING
+    )
+    assert await a_fake_redis.keys("tasks:*") == []
+
+
+@pytest.mark.anyio
+async def test_reconcile_task_counters(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test resetting the counters to the database's counts."""
+    client_id = "test_reconcile_task_counters"
+    await create_task(async_session, client_id)
+    await create_task(async_session, client_id, status=TaskStatus.RUNNING)
+    await create_task(async_session, client_id, status=TaskStatus.COMPLETED)
+    counts = await TaskService.reconcile_task_counters(
+        async_session, a_fake_redis
+    )
+    assert counts == await count_tasks_by_status(async_session)
+    assert await TaskService.get_task_counts(a_fake_redis) == counts
+    assert await _client_active(a_fake_redis, client_id) == 2
+
+
+@pytest.mark.anyio
+async def test_admit_task(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test taking and releasing a client's slots."""
+    client_id = "test_admit_task"
+    await create_task(async_session, client_id, status=TaskStatus.RUNNING)
+    # not synced yet: reconciled first
+    assert await TaskService.admit_task(
+        async_session, a_fake_redis, client_id=client_id, max_jobs=3
+    )
+    counts = await TaskService.get_task_counts(a_fake_redis)
+    assert counts is not None
+    assert await TaskService.admit_task(
+        async_session, a_fake_redis, client_id=client_id, max_jobs=3
+    )
+    assert (
+        await TaskService.admit_task(
+            async_session, a_fake_redis, client_id=client_id, max_jobs=3
+        )
+        is False
+    )
+    # no limit: still counted
+    assert await TaskService.admit_task(
+        async_session, a_fake_redis, client_id=client_id, max_jobs=0
+    )
+    assert await _client_active(a_fake_redis, client_id) == 4
+    await TaskService.release_task_slot(a_fake_redis, client_id)
+    await TaskService.release_task_slot(a_fake_redis, client_id)
+    assert await _client_active(a_fake_redis, client_id) == 2
+    after = await TaskService.get_task_counts(a_fake_redis)
+    assert after is not None
+    assert after[TaskStatus.PENDING] == counts[TaskStatus.PENDING]
+
+
+@pytest.mark.anyio
+async def test_concurrent_admissions(
+    async_session: AsyncSession,
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that concurrent requests cannot take the same slot."""
+    client_id = "test_concurrent_admissions"
+    await TaskService.reconcile_task_counters(async_session, a_fake_redis)
+    results = await asyncio.gather(
+        *(acquire_task_slot(a_fake_redis, client_id, 3) for _ in range(10))
+    )
+    assert results.count(True) == 3
+    assert results.count(False) == 7
+    assert await _client_active(a_fake_redis, client_id) == 3
+
+
+@pytest.mark.anyio
+async def test_status_updates_move_the_counters(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that the status updates keep the counters."""
+    client_id = "test_status_updates_move_the_counters"
+    task, _ = await create_task(async_session, client_id)
+    before = await TaskService.reconcile_task_counters(
+        async_session, a_fake_redis
+    )
+    assert before is not None
+    await TaskService.update_task_status(
+        async_session,
+        task_id=task.id,
+        status=TaskStatus.RUNNING,
+        redis=a_fake_redis,
+    )
+    counts = await TaskService.get_task_counts(a_fake_redis)
+    assert counts is not None
+    assert counts[TaskStatus.PENDING] == before[TaskStatus.PENDING] - 1
+    assert counts[TaskStatus.RUNNING] == before[TaskStatus.RUNNING] + 1
+    assert await _client_active(a_fake_redis, client_id) == 1
+    await TaskService.update_task_status(
+        async_session,
+        task_id=task.id,
+        status=TaskStatus.COMPLETED,
+        redis=a_fake_redis,
+    )
+    counts = await TaskService.get_task_counts(a_fake_redis)
+    assert counts is not None
+    assert counts[TaskStatus.RUNNING] == before[TaskStatus.RUNNING]
+    assert await _client_active(a_fake_redis, client_id) == 0
+    assert counts == await count_tasks_by_status(async_session)
+
+
+@pytest.mark.anyio
+async def test_admit_task_without_the_counters(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test the admission counted in the database."""
+    client_id = "test_admit_task_without_the_counters"
+    await create_task(async_session, client_id)
+    await create_task(async_session, client_id, status=TaskStatus.COMPLETED)
+    broken = MagicMock()
+    broken.eval = AsyncMock(side_effect=RedisConnectionError("down"))
+    broken.pipeline.side_effect = RedisConnectionError("down")
+    for redis in (None, broken):
+        assert (
+            await TaskService.admit_task(
+                async_session, redis, client_id=client_id, max_jobs=2
+            )
+            is None
+        )
+        assert (
+            await TaskService.admit_task(
+                async_session, redis, client_id=client_id, max_jobs=1
+            )
+            is False
+        )
+    active = await TaskService.count_active_client_tasks(
+        async_session, client_id
+    )
+    assert active == 1
@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+
+"""Tests for the cursor (keyset) based task listing."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.types import CreateTaskCallable
+from waldiez_runner.models.task_status import TaskStatus
+from waldiez_runner.services import TaskService
+from waldiez_runner.services._task_cursor import (
+    decode_task_cursor,
+    encode_task_cursor,
+)
+
+
+@pytest.mark.anyio
+async def test_get_tasks_by_cursor(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test following the cursors of a keyset listing."""
+    client_id = "test_get_tasks_by_cursor"
+    tasks = [
+        (await create_task(async_session, client_id, filename=f"f{i}"))[0]
+        for i in range(5)
+    ]
+    # same filename: the id breaks the tie
+    tasks.append(
+        (await create_task(async_session, client_id, filename="f4"))[0]
+    )
+    expected = [
+        task.id for task in sorted(tasks, key=lambda t: (t.filename, t.id))
+    ]
+    for descending in (False, True):
+        order = expected[::-1] if descending else expected
+        seen: list[str] = []
+        after: str | None = None
+        pages = 0
+        while True:
+            page = await TaskService.get_tasks_by_cursor(
+                async_session,
+                size=2,
+                client_id=client_id,
+                after=after,
+                order_by="filename",
+                descending=descending,
+                include_total=pages == 0,
+            )
+            assert page.total == (6 if pages == 0 else None)
+            assert all(item.results is None for item in page.items)
+            seen.extend(item.id for item in page.items)
+            pages += 1
+            if page.next_cursor is None:
+                break
+            after = page.next_cursor
+        assert seen == order
+        assert pages == 3
+        # and back
+        back = await TaskService.get_tasks_by_cursor(
+            async_session,
+            size=2,
+            client_id=client_id,
+            before=page.prev_cursor,
+            order_by="filename",
+            descending=descending,
+        )
+        assert [item.id for item in back.items] == order[2:4]
+        assert back.next_cursor is not None
+        assert back.prev_cursor is not None
+        first = await TaskService.get_tasks_by_cursor(
+            async_session,
+            size=2,
+            client_id=client_id,
+            before=back.prev_cursor,
+            order_by="filename",
+            descending=descending,
+        )
+        assert [item.id for item in first.items] == order[:2]
+        assert first.prev_cursor is None
+    await TaskService.delete_client_tasks(async_session, client_id=client_id)
+
+
+@pytest.mark.anyio
+async def test_get_tasks_by_cursor_default_order(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test the keyset listing by creation time and by status."""
+    client_id = "test_get_tasks_by_cursor_default_order"
+    first, _ = await create_task(async_session, client_id)
+    second, _ = await create_task(
+        async_session, client_id, status=TaskStatus.RUNNING
+    )
+    page = await TaskService.get_tasks_by_cursor(
+        async_session, size=1, client_id=client_id
+    )
+    assert [item.id for item in page.items] == [first.id]
+    page = await TaskService.get_tasks_by_cursor(
+        async_session, size=1, client_id=client_id, after=page.next_cursor
+    )
+    assert [item.id for item in page.items] == [second.id]
+    assert page.next_cursor is None
+    page = await TaskService.get_tasks_by_cursor(
+        async_session,
+        size=1,
+        client_id=client_id,
+        order_by="status",
+        status=TaskStatus.RUNNING,
+    )
+    assert [item.id for item in page.items] == [second.id]
+    await TaskService.delete_client_tasks(async_session, client_id=client_id)
+
+
+@pytest.mark.anyio
+async def test_get_tasks_by_cursor_invalid_cursor(
+    async_session: AsyncSession,
+) -> None:
+    """Test rejecting invalid or mismatched cursors."""
+    cursor = encode_task_cursor("filename", False, "f1", "task-id")
+    assert decode_task_cursor(cursor, "filename", False) == ("f1", "task-id")
+    for invalid, order_by in [
+        ("not-a-cursor", "filename"),
+        (cursor, "flow_id"),
+        (encode_task_cursor("created_at", False, "x", "id"), "created_at"),
+    ]:
+        with pytest.raises(ValueError):
+            await TaskService.get_tasks_by_cursor(
+                async_session, size=2, after=invalid, order_by=order_by
+            )
+    with pytest.raises(ValueError):
+        await TaskService.get_tasks_by_cursor(
+            async_session, size=2, after=cursor, before=cursor
+        )
@@ -0,0 +1,277 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+# pylint: disable=missing-yield-doc
+
+"""Check that the hot task queries use the tasks' indexes.
+
+The queries the services actually run are captured and their
+``EXPLAIN QUERY PLAN`` is checked, so changing a query (or an index)
+in a way that turns it into a full table scan (or an in memory sort
+of the whole listing) fails here. The plans are SQLite's, PostgreSQL
+gets the same (partial) indexes.
+"""
+
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi_pagination import Params
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from waldiez_runner.models.common import Base
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_status import TaskStatus
+from waldiez_runner.services import TaskService
+
+LONG_AGO = datetime(2000, 1, 1, tzinfo=timezone.utc)
+PARAMS = Params(page=1, size=20)
+
+HotQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+# equally good for the queries that do not need the order
+CLIENT_INDEXES = ("ix_tasks_live_client_created", "ix_tasks_client_id")
+SEEDED_TASKS = 2000
+
+HOT_QUERIES: dict[str, tuple[HotQuery, tuple[str, ...], bool]] = {
+    # name: (the service call, the indexes it may use, ordered by them)
+    "client_tasks": (
+        lambda s: TaskService.get_client_tasks(s, client_id="c", params=PARAMS),
+        ("ix_tasks_live_client_created",),
+        True,
+    ),
+    "client_tasks_desc": (
+        lambda s: TaskService.get_client_tasks(
+            s,
+            client_id="c",
+            params=PARAMS,
+            status=TaskStatus.RUNNING,
+            descending=True,
+        ),
+        ("ix_tasks_live_client_created",),
+        True,
+    ),
+    "client_tasks_by_cursor": (
+        lambda s: TaskService.get_tasks_by_cursor(
+            s, size=20, client_id="c", include_total=True
+        ),
+        ("ix_tasks_live_client_created",),
+        True,
+    ),
+    "count_client_tasks": (
+        lambda s: TaskService.count_client_tasks(s, client_id="c"),
+        CLIENT_INDEXES,
+        False,
+    ),
+    "active_client_tasks": (
+        lambda s: TaskService.get_active_client_tasks(s, client_id="c"),
+        CLIENT_INDEXES,
+        False,
+    ),
+    "all_tasks": (
+        lambda s: TaskService.get_all_tasks(s, params=PARAMS),
+        ("ix_tasks_created_at",),
+        True,
+    ),
+    "pending_tasks": (
+        lambda s: TaskService.get_pending_tasks(s, params=PARAMS),
+        ("ix_tasks_live_status_created",),
+        True,
+    ),
+    "active_tasks": (
+        lambda s: TaskService.get_active_tasks(s, params=PARAMS),
+        ("ix_tasks_created_at",),
+        True,
+    ),
+    "waiting_for_input_timeouts": (
+        lambda s: TaskService.update_waiting_for_input_tasks(
+            s, older_than=LONG_AGO
+        ),
+        ("ix_tasks_live_status_updated",),
+        False,
+    ),
+    "old_tasks": (
+        lambda s: TaskService.get_old_tasks(
+            s, older_than=LONG_AGO, deleted=False, batch_size=10
+        ),
+        ("ix_tasks_created_at",),
+        True,
+    ),
+    "old_deleted_tasks": (
+        lambda s: TaskService.get_old_tasks(
+            s, older_than=LONG_AGO, deleted=True, batch_size=10
+        ),
+        ("ix_tasks_deleted_at", "ix_tasks_created_at"),
+        False,
+    ),
+}
+
+
+@pytest.fixture(name="explain_session")
+async def explain_session_fixture(
+    tmp_path: Path,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get a session of a new database (with the model's indexes)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'x.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture(name="analyzed_session")
+async def analyzed_session_fixture(
+    tmp_path: Path,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get a session of a new database with analyzed (seeded) tasks.
+
+    Without statistics, SQLite picks any index on ``status`` and breaks
+    the ties by the indexes' creation order (``create_all`` follows a
+    set's order, which varies between runs). So the indexes are created
+    in a fixed order and ``ANALYZE`` runs over tasks of many statuses,
+    a fifth of them deleted.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'x.db'}")
+    table = Base.metadata.tables["tasks"]
+    indexes = sorted(table.indexes, key=lambda index: str(index.name))
+    statuses = list(TaskStatus)
+    now = datetime.now(timezone.utc)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for index in indexes:
+            await conn.run_sync(index.drop)
+        for index in indexes:
+            await conn.run_sync(index.create)
+        await conn.execute(
+            insert(Task),
+            [
+                {
+                    "id": f"task-{index}",
+                    "client_id": f"client-{index % 20}",
+                    "flow_id": "flow",
+                    "filename": f"flow-{index}.waldiez",
+                    "status": statuses[index % len(statuses)],
+                    "created_at": now - timedelta(minutes=index),
+                    "updated_at": now - timedelta(minutes=index // 2),
+                    "deleted_at": now if index % 5 == 0 else None,
+                }
+                for index in range(SEEDED_TASKS)
+            ],
+        )
+        await conn.exec_driver_sql("ANALYZE")
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def _run_captured(
+    session: AsyncSession, hot_query: HotQuery
+) -> list[tuple[str, Any]]:
+    """Run a service call and get the statements it sent."""
+    statements: list[tuple[str, Any]] = []
+
+    # pylint: disable=unused-argument,too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    def _before_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        await hot_query(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+    return statements
+
+
+async def _query_plan(
+    session: AsyncSession, statement: str, parameters: Any
+) -> list[str]:
+    """Get the plan's details of a statement."""
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}", parameters
+    )
+    return [str(row[-1]) for row in result.all()]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+async def test_hot_query_uses_index(
+    explain_session: AsyncSession, name: str
+) -> None:
+    """Test that a hot query is served by its index."""
+    hot_query, indexes, ordered = HOT_QUERIES[name]
+    statements = await _run_captured(explain_session, hot_query)
+    assert statements
+    plans = [
+        await _query_plan(explain_session, statement, parameters)
+        for statement, parameters in statements
+    ]
+    for plan in plans:
+        # no full table scan
+        assert "SCAN tasks" not in plan, plan
+        if ordered:
+            assert "USE TEMP B-TREE FOR ORDER BY" not in plan, plan
+    assert any(
+        f"INDEX {index}" in detail
+        for plan in plans
+        for detail in plan
+        for index in indexes
+    ), plans
+
+
+@pytest.mark.anyio
+async def test_count_pending_tasks_uses_a_live_status_index(
+    analyzed_session: AsyncSession,
+) -> None:
+    """Test that counting the pending tasks skips the deleted ones."""
+    statements = await _run_captured(
+        analyzed_session, TaskService.count_pending_tasks
+    )
+    assert len(statements) == 1
+    plan = await _query_plan(analyzed_session, *statements[0])
+    # (status) only: both live status indexes cost the same and SQLite
+    # keeps the last one created
+    assert plan == [
+        "SEARCH tasks USING INDEX ix_tasks_live_status_updated (status=?)"
+    ], plan
+
+
+def test_partial_indexes_match_the_filters() -> None:
+    """Test that the listing indexes skip the deleted tasks."""
+    table = Base.metadata.tables["tasks"]
+    partial = {
+        str(index.name): str(index.dialect_options["postgresql"]["where"])
+        for index in table.indexes
+        if index.dialect_options["postgresql"]["where"] is not None
+    }
+    assert partial == {
+        "ix_tasks_live_client_created": "deleted_at IS NULL",
+        "ix_tasks_live_status_created": "deleted_at IS NULL",
+        "ix_tasks_live_status_updated": "deleted_at IS NULL",
+        "ix_tasks_deleted_at": "deleted_at IS NOT NULL",
+    }
+    for index in table.indexes:
+        assert (
+            index.dialect_options["sqlite"]["where"] is None
+            or str(index.dialect_options["sqlite"]["where"])
+            == partial[str(index.name)]
+        )
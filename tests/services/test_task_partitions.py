@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+
+"""Tests for the monthly partitions of the tasks table."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from tests.types import CreateTaskCallable
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_result import TaskResult
+from waldiez_runner.services import TaskService
+from waldiez_runner.services._task_partitions import (
+    month_start,
+    next_month,
+    partition_bounds,
+    partition_name,
+)
+from waldiez_runner.services._task_results import store_task_results
+
+LARGE_RESULTS = [{"content": "waldiez " * 20_000}]
+
+
+def test_partition_months() -> None:
+    """Test the partitions' names and bounds."""
+    moment = datetime(2026, 12, 31, 23, 59, tzinfo=timezone.utc)
+    assert month_start(moment) == datetime(2026, 12, 1, tzinfo=timezone.utc)
+    assert next_month(moment) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    # naive: UTC, others: converted
+    assert month_start(datetime(2026, 3, 5)) == datetime(
+        2026, 3, 1, tzinfo=timezone.utc
+    )
+    athens = timezone(timedelta(hours=2))
+    assert partition_name(datetime(2026, 4, 1, 1, tzinfo=athens)) == (
+        "tasks_p202603"
+    )
+    assert partition_bounds("tasks_p202612") == (
+        datetime(2026, 12, 1, tzinfo=timezone.utc),
+        datetime(2027, 1, 1, tzinfo=timezone.utc),
+    )
+    for name in ("tasks_default", "tasks_p202613", "tasks_p2026", "tasks"):
+        assert partition_bounds(name) is None
+
+
+@pytest.mark.anyio
+async def test_not_partitioned_on_sqlite(async_session: AsyncSession) -> None:
+    """Test that the tasks table is only partitioned on PostgreSQL."""
+    assert await TaskService.is_tasks_partitioned(async_session) is False
+
+
+@pytest.mark.anyio
+async def test_partition_names_are_checked(
+    async_session: AsyncSession,
+) -> None:
+    """Test that only the monthly partitions can be read or dropped."""
+    with pytest.raises(ValueError):
+        await TaskService.drop_task_partition(async_session, "tasks")
+    with pytest.raises(ValueError):
+        async for _ in TaskService.stream_partition_tasks(
+            async_session, 'tasks_p202601"; DROP TABLE tasks; --'
+        ):
+            pass  # pragma: no cover
+
+
+@pytest.mark.anyio
+async def test_deleting_tasks_deletes_their_results(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test that the out of row results go with their tasks."""
+    client_id = "test_deleting_tasks_deletes_their_results"
+    task, _ = await create_task(async_session, client_id)
+    other, _ = await create_task(async_session, client_id)
+    for item in (task, other):
+        _, ref = await store_task_results(async_session, item.id, LARGE_RESULTS)
+        assert ref is not None
+    await async_session.commit()
+    await TaskService.delete_task(async_session, task.id)
+    await TaskService.delete_client_tasks(async_session, client_id)
+    result = await async_session.execute(
+        select(func.count())  # pylint: disable=not-callable
+        .select_from(TaskResult)
+        .where(TaskResult.task_id.in_([task.id, other.id]))
+    )
+    assert result.scalar_one() == 0
+    result = await async_session.execute(
+        select(Task.id).where(Task.client_id == client_id)
+    )
+    assert not result.all()
@@ -0,0 +1,207 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+
+"""Tests for the out of row storage of large task results."""
+
+import re
+from typing import Any
+
+import pytest
+from fastapi_pagination import Params
+from sqlalchemy import event, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from tests.types import CreateTaskCallable
+from waldiez_runner.models.task_result import TaskResult
+from waldiez_runner.models.task_status import TaskStatus
+from waldiez_runner.schemas.task import TaskUpdate
+from waldiez_runner.services import TaskService
+from waldiez_runner.services._task_results import store_task_results
+
+LARGE_RESULTS = [{"content": "waldiez " * 20_000}]
+
+
+async def _stored_results(session: AsyncSession, task_id: str) -> int:
+    """Count a task's out of row results."""
+    result = await session.execute(
+        select(func.count())  # pylint: disable=not-callable
+        .select_from(TaskResult)
+        .where(TaskResult.task_id == task_id)
+    )
+    return int(result.scalar_one())
+
+
+@pytest.mark.anyio
+async def test_store_task_results(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test that only the large results are stored out of the row."""
+    task, _ = await create_task(async_session, "test_store_task_results")
+    small = {"content": "done"}
+    assert await store_task_results(async_session, task.id, small) == (
+        small,
+        None,
+    )
+    assert await store_task_results(async_session, task.id, None) == (
+        None,
+        None,
+    )
+    results, ref = await store_task_results(
+        async_session, task.id, LARGE_RESULTS
+    )
+    assert results is None
+    assert ref is not None
+    stored = await async_session.get(TaskResult, ref)
+    assert stored is not None
+    assert stored.size > len(stored.data) * 10
+    # <=0: always in the row
+    assert await store_task_results(
+        async_session, task.id, LARGE_RESULTS, inline_max_size=0
+    ) == (LARGE_RESULTS, None)
+    await async_session.rollback()
+
+
+@pytest.mark.anyio
+async def test_update_task_status_with_large_results(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test updating, loading and replacing large results."""
+    task, _ = await create_task(
+        async_session,
+        "test_update_task_status_with_large_results",
+        status=TaskStatus.RUNNING,
+    )
+    await TaskService.update_task_status(
+        async_session,
+        task_id=task.id,
+        status=TaskStatus.RUNNING,
+        results=LARGE_RESULTS,
+    )
+    assert task.results is None
+    assert task.results_ref is not None
+    assert task.is_stuck()
+    assert await TaskService.get_task_results(async_session, task) == (
+        LARGE_RESULTS
+    )
+    stuck = await TaskService.get_stuck_tasks(
+        async_session, params=Params(page=1, size=100)
+    )
+    assert task.id in [item.id for item in stuck.items]
+    # replaced by small ones: the stored ones are dropped
+    await TaskService.update_task_status(
+        async_session,
+        task_id=task.id,
+        status=TaskStatus.COMPLETED,
+        results={"content": "done"},
+    )
+    assert task.results_ref is None
+    assert await TaskService.get_task_results(async_session, task) == {
+        "content": "done"
+    }
+    assert await _stored_results(async_session, task.id) == 0
+
+
+@pytest.mark.anyio
+async def test_update_task_with_large_results(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test that a task update stores large results out of the row."""
+    task, _ = await create_task(
+        async_session, "test_update_task_with_large_results"
+    )
+    updated = await TaskService.update_task(
+        async_session,
+        task_id=task.id,
+        task_update=TaskUpdate(results=LARGE_RESULTS),
+    )
+    assert updated is not None
+    assert updated.results is None
+    assert updated.results_ref is not None
+    assert await _stored_results(async_session, task.id) == 1
+    assert (
+        await TaskService.get_task_results(async_session, updated)
+        == LARGE_RESULTS
+    )
+
+
+@pytest.mark.anyio
+async def test_update_deleted_task_with_large_results(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test that no results are stored for a deleted or missing task."""
+    task, _ = await create_task(
+        async_session, "test_update_deleted_task_with_large_results"
+    )
+    await TaskService.soft_delete_client_tasks(
+        async_session, client_id=task.client_id, inactive_only=False
+    )
+    for task_id in (task.id, "missing"):
+        assert (
+            await TaskService.update_task(
+                async_session,
+                task_id=task_id,
+                task_update=TaskUpdate(results=LARGE_RESULTS),
+            )
+            is None
+        )
+        assert await _stored_results(async_session, task_id) == 0
+
+
+@pytest.mark.anyio
+async def test_listings_do_not_load_results(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test that the task listings do not select the results."""
+    client_id = "test_listings_do_not_load_results"
+    task, _ = await create_task(
+        async_session, client_id, status=TaskStatus.RUNNING
+    )
+    await TaskService.update_task_status(
+        async_session,
+        task_id=task.id,
+        status=TaskStatus.RUNNING,
+        results={"content": "inline"},
+    )
+    # a new identity map, nothing loaded yet
+    async_session.expunge_all()
+    statements: list[str] = []
+
+    # pylint: disable=unused-argument,too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    def _before_execute(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    engine = async_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_execute)
+    try:
+        page = await TaskService.get_client_tasks(
+            async_session, client_id=client_id, params=Params(page=1, size=10)
+        )
+        cursor_page = await TaskService.get_tasks_by_cursor(
+            async_session, size=10, client_id=client_id
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_execute)
+    assert task.id in [item.id for item in page.items]
+    assert task.id in [item.id for item in cursor_page.items]
+    assert all(item.results is None for item in page.items)
+    # (the counts' subqueries list it, but do not read it)
+    fetched = [sql for sql in statements if not sql.startswith("SELECT count(")]
+    results_column = re.compile(r"tasks\.results\b(?!_)")
+    assert fetched
+    assert not [sql for sql in fetched if results_column.search(sql)]
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+
+"""Tests for the task search condition."""
+
+import pytest
+from fastapi_pagination import Params
+from sqlalchemy import Connection, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from tests.types import CreateTaskCallable
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_status import TaskStatus
+from waldiez_runner.services import TaskService
+from waldiez_runner.services._task_service import task_search_filter
+
+
+def _compile(search: str) -> tuple[str, list[object]]:
+    """Compile a search for PostgreSQL."""
+    query = select(Task.id).where(task_search_filter(search))
+    dialect = postgresql.dialect()  # type: ignore[no-untyped-call]
+    compiled = query.compile(dialect=dialect)
+    return str(compiled), list(compiled.params.values())
+
+
+def test_search_condition() -> None:
+    """Test that the search needs no cast of the status."""
+    sql, params = _compile("run")
+    assert "CAST" not in sql.upper()
+    assert "tasks.filename ILIKE" in sql
+    assert "tasks.status IN" in sql
+    assert params == ["%run%", [TaskStatus.RUNNING]]
+    # not a status: filename only
+    sql, params = _compile("report")
+    assert "status" not in sql
+    # LIKE wildcards are literal
+    _, params = _compile("50%_off")
+    assert params == ["%50\\%\\_off%"]
+
+
+@pytest.mark.anyio
+async def test_search_tasks(
+    async_session: AsyncSession,
+    create_task: CreateTaskCallable,
+) -> None:
+    """Test searching by filename and by (part of the) status."""
+    client_id = "test_search_tasks"
+    running, _ = await create_task(
+        async_session,
+        client_id,
+        filename="a.waldiez",
+        status=TaskStatus.RUNNING,
+    )
+    percent, _ = await create_task(
+        async_session, client_id, filename="100%_done.waldiez"
+    )
+    waiting, _ = await create_task(
+        async_session,
+        client_id,
+        filename="b.waldiez",
+        status=TaskStatus.WAITING_FOR_INPUT,
+    )
+    params = Params(page=1, size=100)
+
+    async def _search(term: str) -> set[str]:
+        page = await TaskService.get_client_tasks(
+            async_session, client_id=client_id, params=params, search=term
+        )
+        return {task.id for task in page.items}
+
+    assert await _search("Running") == {running.id}
+    assert await _search("input") == {waiting.id}
+    assert await _search("%_") == {percent.id}
+    assert await _search("WALDIEZ") == {running.id, percent.id, waiting.id}
+    assert await _search("nothing") == set()
+    assert (
+        await TaskService.count_client_tasks(
+            async_session, client_id, search="run"
+        )
+        == 1
+    )
+    await TaskService.delete_client_tasks(async_session, client_id=client_id)
+
+
+@pytest.mark.anyio
+async def test_trigram_index_is_postgresql_only(
+    async_session: AsyncSession,
+) -> None:
+    """Test that SQLite databases get no trigram index."""
+
+    def _index_names(connection: Connection) -> list[str]:
+        return [
+            index["name"] or ""
+            for index in inspect(connection).get_indexes("tasks")
+        ]
+
+    connection = await async_session.connection()
+    names = await connection.run_sync(_index_names)
+    assert "ix_tasks_status" in names
+    assert "ix_tasks_filename_trgm" not in names
@@ -2,23 +2,23 @@
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
 
 # pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
-# pylint: disable=unused-argument,line-too-long
+# pylint: disable=unused-argument,line-too-long,missing-yield-doc
 """Test waldiez_runner.tasks.schedule module."""
 
 import os
-from datetime import datetime, timezone
+from collections.abc import AsyncGenerator
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import fakeredis
 import pytest
-from fastapi_pagination import Page, Params
 
 from waldiez_runner.dependencies import AsyncRedis
-from waldiez_runner.models import Task
+from waldiez_runner.models import TaskStatus
 from waldiez_runner.tasks.schedule import (
     check_stuck_tasks,
     cleanup_old_deleted_tasks,
+    cleanup_old_tasks,
     cleanup_processed_requests,
     heartbeat,
     trim_old_stream_entries,
@@ -81,63 +81,113 @@ async def test_cleanup_old_deleted_tasks(
 
 
 @pytest.mark.asyncio
+@patch(f"{SCHEDULE_MODULE}._purge_tasks", new_callable=AsyncMock)
 @patch(
-    f"{SCHEDULE_MODULE}.TaskService.update_task_status", new_callable=AsyncMock
+    f"{SCHEDULE_MODULE}.TaskService.drop_task_partition",
+    new_callable=AsyncMock,
+)
+@patch(
+    f"{SCHEDULE_MODULE}.TaskService.detach_old_task_partitions",
+    new_callable=AsyncMock,
+)
+@patch(
+    f"{SCHEDULE_MODULE}.TaskService.ensure_task_partitions",
+    new_callable=AsyncMock,
+)
+@patch(
+    f"{SCHEDULE_MODULE}.TaskService.is_tasks_partitioned",
+    new_callable=AsyncMock,
+)
+async def test_cleanup_old_tasks_by_partition(
+    mock_is_partitioned: AsyncMock,
+    mock_ensure_partitions: AsyncMock,
+    mock_detach_partitions: AsyncMock,
+    mock_drop_partition: AsyncMock,
+    mock_purge_tasks: AsyncMock,
+) -> None:
+    """Test dropping the old partitions of a partitioned tasks table."""
+    mock_is_partitioned.return_value = True
+    mock_detach_partitions.return_value = ["tasks_p202601", "tasks_p202602"]
+    batches = {
+        "tasks_p202601": [[("task1", "client1"), ("task2", "client2")]],
+        "tasks_p202602": [[("task3", "client1")], [("task4", "client2")]],
+    }
+
+    async def stream_partition_tasks(
+        session: Any, name: str
+    ) -> AsyncGenerator[list[tuple[str, str]], None]:
+        for batch in batches[name]:
+            yield batch
+
+    mock_storage = MagicMock()
+    mock_storage.delete_folder = AsyncMock()
+    settings = MagicMock()
+    settings.keep_task_for_days = 30
+    with patch(
+        f"{SCHEDULE_MODULE}.TaskService.stream_partition_tasks",
+        new=stream_partition_tasks,
+    ):
+        # noinspection PyTypeChecker
+        await cleanup_old_tasks(
+            db_manager=MagicMock(),
+            storage=mock_storage,
+            settings=settings,
+        )
+    mock_ensure_partitions.assert_awaited_once()
+    mock_detach_partitions.assert_awaited_once()
+    assert mock_drop_partition.await_count == 2
+    assert mock_storage.delete_folder.await_count == 4
+    mock_storage.delete_folder.assert_any_await(
+        os.path.join("client2", "task4")
+    )
+    mock_purge_tasks.assert_not_awaited()
+    # no retention: only the next partitions
+    settings.keep_task_for_days = 0
+    # noinspection PyTypeChecker
+    await cleanup_old_tasks(
+        db_manager=MagicMock(), storage=mock_storage, settings=settings
+    )
+    assert mock_ensure_partitions.await_count == 2
+    mock_detach_partitions.assert_awaited_once()
+    # not partitioned: the rows are deleted in batches
+    mock_is_partitioned.return_value = False
+    settings.keep_task_for_days = 30
+    # noinspection PyTypeChecker
+    await cleanup_old_tasks(
+        db_manager=MagicMock(), storage=mock_storage, settings=settings
+    )
+    mock_purge_tasks.assert_awaited_once()
+    assert mock_ensure_partitions.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch(
+    f"{SCHEDULE_MODULE}.TaskService.reconcile_task_counters",
+    new_callable=AsyncMock,
+)
+@patch(
+    f"{SCHEDULE_MODULE}.TaskService.update_tasks_status", new_callable=AsyncMock
+)
+@patch(
+    f"{SCHEDULE_MODULE}.TaskService.classify_stuck_tasks",
+    new_callable=AsyncMock,
 )
-@patch(f"{SCHEDULE_MODULE}.TaskService.get_stuck_tasks", new_callable=AsyncMock)
 async def test_check_stuck_tasks(
-    mock_get_stuck_tasks: AsyncMock,
-    mock_update_task_status: AsyncMock,
+    mock_classify_stuck_tasks: AsyncMock,
+    mock_update_tasks_status: AsyncMock,
+    mock_reconcile: AsyncMock,
 ) -> None:
     """Test checking stuck tasks."""
     mock_storage = MagicMock()
     mock_db_manager = MagicMock()
-
-    # noinspection PyUnusedLocal
-    async def get_stuck_tasks(*args: Any, **kwargs: Any) -> Page[Task]:
-        """Return tasks to check."""
-        default_params = Params(page=1, size=100)
-        params = kwargs.get("params", default_params)
-        if not isinstance(params, Params):
-            params = default_params
-        if params.page == 1:
-            return Page(
-                items=[
-                    Task(
-                        id="test_check_stuck_tasks1",
-                        client_id="client1",
-                        created_at=datetime.now(tz=timezone.utc),
-                        updated_at=datetime.now(tz=timezone.utc),
-                        results={"key": "value"},
-                    ),
-                    Task(
-                        id="test_check_stuck_tasks2",
-                        client_id="client2",
-                        created_at=datetime.now(tz=timezone.utc),
-                        updated_at=datetime.now(tz=timezone.utc),
-                        results=None,
-                    ),
-                    Task(
-                        id="test_check_stuck_tasks3",
-                        client_id="client3",
-                        created_at=datetime.now(tz=timezone.utc),
-                        updated_at=datetime.now(tz=timezone.utc),
-                        results={"key": "value"},
-                    ),
-                    Task(
-                        id="test_check_stuck_tasks4",
-                        client_id="client4",
-                        created_at=datetime.now(tz=timezone.utc),
-                        updated_at=datetime.now(tz=timezone.utc),
-                        results={"error": "Something went wrong"},
-                    ),
-                ],
-                page=1,
-                size=100,
-                total=3,
-                pages=3,
-            )
-        return Page(items=[], page=1, size=100, total=0, pages=1)
+    mock_classify_stuck_tasks.return_value = (
+        ["test_check_stuck_tasks4"],
+        [
+            ("test_check_stuck_tasks1", "client1"),
+            ("test_check_stuck_tasks3", "client3"),
+        ],
+    )
+    mock_update_tasks_status.side_effect = lambda _s, ids, _status: len(ids)
 
     async def list_files(folder_path: str) -> list[str]:
         """List files in a folder."""
@@ -147,19 +197,39 @@ async def test_check_stuck_tasks(
 
     mock_list_files = AsyncMock(side_effect=list_files)
     mock_storage.list_files = mock_list_files
-    mock_get_stuck_tasks.side_effect = get_stuck_tasks
 
     # noinspection PyTypeChecker
-    await check_stuck_tasks(db_manager=mock_db_manager, storage=mock_storage)
+    metrics = await check_stuck_tasks(
+        db_manager=mock_db_manager,
+        storage=mock_storage,
+        redis_manager=MagicMock(client=AsyncMock()),
+        max_concurrency=1,
+    )
 
-    assert mock_get_stuck_tasks.await_count == 2
-    assert mock_update_task_status.await_count == 4
+    # only the not obvious ones are checked in the storage
     assert mock_list_files.await_count == 2
-    # the other two tasks return early (before listing files)
     task1_path = os.path.join("client1", "test_check_stuck_tasks1")
     task3_path = os.path.join("client3", "test_check_stuck_tasks3")
     mock_list_files.assert_any_await(task1_path)
     mock_list_files.assert_any_await(task3_path)
+    # one update per status
+    assert mock_update_tasks_status.await_count == 2
+    updates = {
+        call.args[2]: call.args[1]
+        for call in mock_update_tasks_status.await_args_list
+    }
+    assert updates == {
+        TaskStatus.FAILED: [
+            "test_check_stuck_tasks4",
+            "test_check_stuck_tasks1",
+        ],
+        TaskStatus.COMPLETED: ["test_check_stuck_tasks3"],
+    }
+    mock_reconcile.assert_awaited_once()
+    assert metrics["checked"] == 3
+    assert metrics["failed"] == 2
+    assert metrics["completed"] == 1
+    assert metrics["duration"] >= 0
 
 
 @pytest.mark.asyncio
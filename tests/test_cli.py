@@ -7,13 +7,15 @@
 
 import subprocess  # nosemgrep # nosec
 import sys
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from typer.testing import CliRunner
 
 # noinspection PyProtectedMember
 from waldiez_runner._version import __version__
-from waldiez_runner.cli import app
+from waldiez_runner.cli import app, bench_app, main
+from waldiez_runner.hashing._scrypt_hasher import ScryptHasher
 
 MODULE_TO_PATCH = "waldiez_runner.cli"
 
@@ -160,3 +162,64 @@ def test_trusted_origins_empty(mock_start_uvicorn: MagicMock) -> None:
     """Test trusted origins."""
     result = runner.invoke(app, ["--trusted-origins", ""] + get_valid_args())
     assert result.exit_code == 0
+
+
+def _small_candidates() -> list[list[ScryptHasher]]:
+    """Get cheap candidates to calibrate."""
+    return [[ScryptHasher(n=1024, r=1), ScryptHasher(n=2048, r=1)]]
+
+
+@patch(
+    "waldiez_runner.hashing.bench.argon2_candidates",
+    side_effect=_small_candidates,
+)
+def test_hashing_bench(mock_candidates: MagicMock, tmp_path: Path) -> None:
+    """Test calibrating and saving the hashing cost."""
+    env_file = tmp_path / ".env"
+    result = runner.invoke(
+        bench_app,
+        [
+            "--target-ms",
+            "10000",
+            "--rounds",
+            "1",
+            "--write-env",
+            "--env-file",
+            str(env_file),
+        ],
+    )
+    assert result.exit_code == 0
+    assert "WALDIEZ_RUNNER_HASHING_SCRYPT_N=2048" in result.output
+    assert "WALDIEZ_RUNNER_HASHING_SCRYPT_N=2048" in env_file.read_text()
+
+
+@patch(
+    "waldiez_runner.hashing.bench.scrypt_candidates",
+    side_effect=_small_candidates,
+)
+def test_hashing_bench_without_a_match(mock_candidates: MagicMock) -> None:
+    """Test that nothing is recommended if no candidate is fast enough."""
+    result = runner.invoke(
+        bench_app, ["--scrypt", "--target-ms", "0", "--rounds", "1"]
+    )
+    assert result.exit_code == 1
+    assert "No parameters" in result.output
+
+
+def test_main_dispatches_hashing_bench() -> None:
+    """Test that main runs the tool named in the first argument."""
+    with (
+        patch.object(sys, "argv", ["waldiez-runner", "hashing-bench", "-x"]),
+        patch(f"{MODULE_TO_PATCH}.bench_app") as mock_bench,
+        patch(f"{MODULE_TO_PATCH}.app") as mock_app,
+    ):
+        main()
+    mock_bench.assert_called_once()
+    assert mock_bench.call_args.kwargs["args"] == ["-x"]
+    mock_app.assert_not_called()
+    with (
+        patch.object(sys, "argv", ["waldiez-runner", "--version"]),
+        patch(f"{MODULE_TO_PATCH}.app") as mock_app,
+    ):
+        main()
+    mock_app.assert_called_once()
@@ -12,6 +12,11 @@ from unittest.mock import MagicMock, patch
 
 # noinspection PyProtectedMember
 from waldiez_runner._logging import LogLevel
+from waldiez_runner.config import (
+    WS_PER_MESSAGE_DEFLATE,
+    WS_PING_INTERVAL,
+    WS_PING_TIMEOUT,
+)
 from waldiez_runner.start import (
     get_module_and_cwd,
     run_process,
@@ -142,3 +147,7 @@ def test_start_uvicorn(mock_uvicorn_run: MagicMock) -> None:
         logging_config={},
     )
     mock_uvicorn_run.assert_called_once()
+    kwargs = mock_uvicorn_run.call_args.kwargs
+    assert kwargs["ws_ping_interval"] == WS_PING_INTERVAL
+    assert kwargs["ws_ping_timeout"] == WS_PING_TIMEOUT
+    assert kwargs["ws_per_message_deflate"] == WS_PER_MESSAGE_DEFLATE
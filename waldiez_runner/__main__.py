@@ -3,7 +3,7 @@
 
 """Runner entry point module."""
 
-from .cli import app
+from .cli import main
 
 if __name__ == "__main__":
-    app()
+    main()
@@ -30,6 +30,7 @@ except ImportError:
 
 from waldiez_runner._logging import LogLevel, get_log_level, get_logging_config
 from waldiez_runner.config import RedisScheme, Settings
+from waldiez_runner.config._common import DOT_ENV_PATH
 from waldiez_runner.start import (
     start_all,
     start_broker,
@@ -354,5 +355,89 @@ def check_secrets(
     )
 
 
+bench_app = typer.Typer(
+    name="hashing-bench",
+    help="Calibrate the client secret hashing cost on this host",
+    add_completion=False,
+    no_args_is_help=False,
+    pretty_exceptions_short=True,
+)
+
+
+@bench_app.command()
+def hashing_bench(
+    target_ms: float = typer.Option(
+        250.0,
+        help="The target verify latency (ms) of a client secret",
+    ),
+    max_memory_mib: float = typer.Option(
+        128.0,
+        help="The maximum memory (MiB) of a verification",
+    ),
+    rounds: int = typer.Option(
+        5,
+        min=1,
+        help="The verifications to time per candidate",
+    ),
+    scrypt: bool = typer.Option(
+        False,
+        "--scrypt",
+        help="Calibrate scrypt (used only if argon2 is not available)",
+    ),
+    write_env: bool = typer.Option(
+        False,
+        "--write-env",
+        help="Write the recommended parameters to the .env file",
+    ),
+    env_file: Path = typer.Option(
+        DOT_ENV_PATH,
+        help="The .env file to write to",
+    ),
+) -> None:
+    """Measure the hashing cost and recommend parameters."""
+    from waldiez_runner.hashing import bench
+
+    candidates = (
+        bench.argon2_candidates() if not scrypt else []
+    ) or bench.scrypt_candidates()
+    typer.echo(
+        f"Measuring {sum(len(group) for group in candidates)} candidates "
+        f"(target: {target_ms:g} ms, max memory: {max_memory_mib:g} MiB)"
+    )
+    results = bench.run_bench(
+        candidates,
+        target_ms=target_ms,
+        max_memory_mib=max_memory_mib,
+        rounds=rounds,
+    )
+    chosen = bench.recommend(results, target_ms)
+    typer.echo(bench.format_results(results, chosen))
+    if chosen is None:
+        typer.secho(
+            "No parameters verify within the target, keeping the current ones",
+            fg=typer.colors.YELLOW,
+        )
+        raise typer.Exit(code=1)
+    values = chosen.env()
+    typer.echo("Recommended:")
+    for key, value in values.items():
+        typer.echo(f"{key}={value}")
+    if write_env:
+        bench.write_env(values, env_file)
+        typer.secho(
+            f"Saved to {env_file}, existing secrets are upgraded "
+            "on their next login after a restart",
+            fg=typer.colors.GREEN,
+        )
+
+
+def main() -> None:
+    """Run the server, or a tool if its name is the first argument."""
+    if sys.argv[1:2] == ["hashing-bench"]:
+        bench_app(args=sys.argv[2:], prog_name=f"{APP_NAME} hashing-bench")
+    else:
+        app()
+
+
 if __name__ == "__main__":
-    app()
+    main()
@@ -15,10 +15,13 @@ from .models import (
     ClientItemsRequest,
     ClientItemsResponse,
     ClientResponse,
+    CursorPaginatedResponse,
     PaginatedRequest,
     PaginatedResponse,
     RefreshTokenRequest,
     TaskCreateRequest,
+    TaskCursorRequest,
+    TaskCursorResponse,
     TaskItemsRequest,
     TaskItemsResponse,
     TaskResponse,
@@ -39,10 +42,13 @@ __all__ = [
     "ClientItemsRequest",
     "ClientItemsResponse",
     "ClientResponse",
+    "CursorPaginatedResponse",
     "PaginatedRequest",
     "PaginatedResponse",
     "TaskItemsRequest",
     "TaskItemsResponse",
+    "TaskCursorRequest",
+    "TaskCursorResponse",
     "TaskCreateRequest",
     "TaskResponse",
     "TaskStatus",
@@ -8,11 +8,13 @@
 """Waldiez serve WebSocket clients."""
 
 import asyncio
+import json
 import logging
 import threading
 import time
 from collections.abc import Coroutine
 from typing import Any, Callable
+from urllib.parse import quote
 
 import websockets.asyncio.client
 import websockets.sync.client
@@ -53,6 +55,8 @@ class SyncWebSocketClient:
             else "/ws"
         )
         self.listener_thread: threading.Thread | None = None
+        # the last received stream id per task, to resume on reconnect
+        self.last_event_ids: dict[str, str] = {}
 
     def _get_headers(self) -> dict[str, str]:
         """Get the headers to use for the WebSocket connection.
@@ -168,13 +172,14 @@ class SyncWebSocketClient:
         """
         headers = self._get_headers()
         with websockets.sync.client.connect(
-            f"{self.ws_url}/{task_id}",
+            get_listen_url(self.ws_url, task_id, self.last_event_ids),
             additional_headers=headers,
         ) as websocket:
             while not self.stop_event.is_set():
                 try:
                     message = websocket.recv(timeout=1, decode=True)
                     message_str = ensure_str(message)
+                    track_event_id(self.last_event_ids, task_id, message_str)
                     on_message(message_str)
                 except ConnectionClosed:  # pragma: no cover
                     LOG.debug("Connection closed, stopping listener.")
@@ -286,6 +291,8 @@ class AsyncWebSocketClient:
             else "/ws"
         )
         self.listener_task: asyncio.Task[Any] | None = None
+        # the last received stream id per task, to resume on reconnect
+        self.last_event_ids: dict[str, str] = {}
 
     async def _get_headers(self) -> dict[str, str]:
         """Get the headers to use for the WebSocket connection."""
@@ -389,7 +396,7 @@ class AsyncWebSocketClient:
         """
         headers = await self._get_headers()
         async with websockets.asyncio.client.connect(
-            f"{self.ws_url}/{task_id}",
+            get_listen_url(self.ws_url, task_id, self.last_event_ids),
             extra_headers=headers,
         ) as websocket:
             while not self.stop_event.is_set():  # pragma: no branch
@@ -398,7 +405,11 @@ class AsyncWebSocketClient:
                         websocket.recv(), timeout=1
                     )
                     if message:  # pragma: no branch
-                        await on_message(ensure_str(message))
+                        message_str = ensure_str(message)
+                        track_event_id(
+                            self.last_event_ids, task_id, message_str
+                        )
+                        await on_message(message_str)
                 except ConnectionClosed:
                     self.stop_event.set()
                 except asyncio.TimeoutError:
@@ -506,3 +517,53 @@ def ensure_str(msg: str | bytes) -> str:
         The formatted message
     """
     return str(msg) if not isinstance(msg, str) else msg
+
+
+def get_listen_url(
+    ws_url: str, task_id: str, last_event_ids: dict[str, str]
+) -> str:
+    """Get the url to listen to a task, resuming after the last event.
+
+    Parameters
+    ----------
+    ws_url : str
+        The base WebSocket url
+    task_id : str
+        The task ID
+    last_event_ids : dict[str, str]
+        The last received stream id per task
+    Returns
+    -------
+    str
+        The url to connect to
+    """
+    url = f"{ws_url}/{task_id}"
+    last_event_id = last_event_ids.get(task_id)
+    if last_event_id:
+        url += f"?last_event_id={quote(last_event_id)}"
+    return url
+
+
+def track_event_id(
+    last_event_ids: dict[str, str], task_id: str, message: str
+) -> None:
+    """Remember the stream id of a received message.
+
+    Parameters
+    ----------
+    last_event_ids : dict[str, str]
+        The last received stream id per task
+    task_id : str
+        The task ID
+    message : str
+        The received message
+    """
+    try:
+        payload = json.loads(message)
+    except (json.JSONDecodeError, TypeError):
+        return
+    if not isinstance(payload, dict) or payload.get("type") == "history":
+        return
+    event_id = payload.get("id")
+    if isinstance(event_id, str) and event_id:
+        last_event_ids[task_id] = event_id
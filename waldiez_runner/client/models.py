@@ -58,6 +58,27 @@ class StatusResponse(ModelBase):
         int,
         Field(..., description="The used memory in percentage on the host."),
     ]
+    websockets: Annotated[
+        dict[str, int] | None,
+        Field(
+            None,
+            description=(
+                "WebSocket viewers: active tasks, connected clients and "
+                "eviction counters (of the API process that replied)."
+            ),
+        ),
+    ] = None
+    database: Annotated[
+        dict[str, dict[str, float]] | None,
+        Field(
+            None,
+            description=(
+                "Database connection pools (primary and read replica): "
+                "checkouts, connections in use, overflows, timeouts and "
+                "checkout waits (of the API process that replied)."
+            ),
+        ),
+    ] = None
 
 
 class TokensResponse(ModelBase):
@@ -123,6 +144,22 @@ class PaginatedResponse(ModelBase, Generic[Items]):
     pages: int = Field(..., description="Total number of pages")
 
 
+class CursorPaginatedResponse(ModelBase, Generic[Items]):
+    """Cursor (keyset) paginated response structure."""
+
+    items: list[Items] = Field(..., description="List of returned items")
+    next_cursor: str | None = Field(
+        None, description="Cursor of the next page (None on the last one)"
+    )
+    prev_cursor: str | None = Field(
+        None, description="Cursor of the previous page (None on the first)"
+    )
+    size: int = Field(..., description="Page size")
+    total: int | None = Field(
+        None, description="Total number of items (if requested)"
+    )
+
+
 # noinspection Pydantic
 class PaginatedRequest(ModelBase):
     """Generic pagination request model."""
@@ -361,6 +398,30 @@ TaskItemsResponse = PaginatedResponse[TaskResponse]
 """List of tasks with pagination."""
 
 
+# noinspection Pydantic
+class TaskCursorRequest(OrderSearchRequest):
+    """Request model for listing tasks with cursors."""
+
+    pagination: Literal["cursor"] = "cursor"
+    size: Annotated[int, Field(50, ge=1, le=100, description="Page size")] = 50
+    after: Annotated[
+        str | None,
+        Field(None, description="The next_cursor of the previous page"),
+    ] = None
+    before: Annotated[
+        str | None,
+        Field(None, description="The prev_cursor of the next page"),
+    ] = None
+    include_total: Annotated[
+        bool | None,
+        Field(None, description="Also count all the matching tasks"),
+    ] = None
+
+
+TaskCursorResponse = CursorPaginatedResponse[TaskResponse]
+"""A page of tasks with the cursors of its neighbours."""
+
+
 class ClientItemsRequest(PaginatedRequest, OrderSearchRequest):
     """Request model for listing clients."""
 
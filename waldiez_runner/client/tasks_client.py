@@ -7,7 +7,7 @@
 
 import asyncio
 import json
-from collections.abc import Coroutine
+from collections.abc import AsyncIterator, Coroutine, Iterator
 from io import BytesIO
 from typing import Any, Callable
 
@@ -16,6 +16,8 @@ from ._websockets import AsyncWebSocketClient, SyncWebSocketClient
 from .client_base import BaseClient
 from .models import (
     TaskCreateRequest,
+    TaskCursorRequest,
+    TaskCursorResponse,
     TaskItemsRequest,
     TaskItemsResponse,
     TaskResponse,
@@ -192,6 +194,47 @@ class TasksClient(BaseClient):
         response = self.tasks.list_tasks(params_dict)  # type: ignore
         return TaskItemsResponse.model_validate(response)
 
+    def iter_tasks(
+        self,
+        params: TaskCursorRequest | dict[str, Any] | None = None,
+    ) -> Iterator[TaskResponse]:
+        """Iterate over all the tasks, following the listing's cursors.
+
+        Each page is requested when the previous one is consumed. Unlike
+        page numbers, the cursors are not affected by tasks created or
+        deleted while iterating, and deep pages are as fast as the first.
+
+        Parameters
+        ----------
+        params : TaskCursorRequest | dict[str, Any] | None, optional
+            The page size, ordering, search and the cursor to start
+            after, by default None (see TaskCursorRequest for details)
+
+        Yields
+        ------
+        TaskResponse
+            The tasks.
+
+        Raises
+        ------
+        ValueError
+            If the client is not configured
+        """
+        self._ensure_configured()
+        request = _cursor_request(params)
+        while True:
+            response = TaskCursorResponse.model_validate(
+                self.tasks.list_tasks(  # type: ignore
+                    request.model_dump(exclude_none=True)
+                )
+            )
+            yield from response.items
+            if not response.next_cursor or not response.items:
+                return
+            request = request.model_copy(
+                update={"after": response.next_cursor, "before": None}
+            )
+
     def create_task(
         self,
         task_data: TaskCreateRequest | dict[str, Any],
@@ -505,6 +548,44 @@ class TasksClient(BaseClient):
         response = await self.tasks.a_list_tasks(params_dict)  # type: ignore
         return TaskItemsResponse.model_validate(response)
 
+    async def a_iter_tasks(
+        self,
+        params: TaskCursorRequest | dict[str, Any] | None = None,
+    ) -> AsyncIterator[TaskResponse]:
+        """Iterate over all the tasks asynchronously, following the cursors.
+
+        Parameters
+        ----------
+        params : TaskCursorRequest | dict[str, Any] | None, optional
+            The page size, ordering, search and the cursor to start
+            after, by default None (see TaskCursorRequest for details)
+
+        Yields
+        ------
+        TaskResponse
+            The tasks.
+
+        Raises
+        ------
+        ValueError
+            If the client is not configured
+        """
+        self._ensure_configured()
+        request = _cursor_request(params)
+        while True:
+            response = TaskCursorResponse.model_validate(
+                await self.tasks.a_list_tasks(  # type: ignore
+                    request.model_dump(exclude_none=True)
+                )
+            )
+            for item in response.items:
+                yield item
+            if not response.next_cursor or not response.items:
+                return
+            request = request.model_copy(
+                update={"after": response.next_cursor, "before": None}
+            )
+
     async def a_create_task(
         self,
         task_data: TaskCreateRequest | dict[str, Any],
@@ -787,3 +868,14 @@ class TasksClient(BaseClient):
         if self.ws_async:  # pragma: no branch
             await self.ws_async.stop()
             self.ws_async = None
+
+
+def _cursor_request(
+    params: TaskCursorRequest | dict[str, Any] | None,
+) -> TaskCursorRequest:
+    """Get the request of the first page of a cursor listing."""
+    if params is None:
+        return TaskCursorRequest()
+    if isinstance(params, dict):
+        return TaskCursorRequest.model_validate(params)
+    return params
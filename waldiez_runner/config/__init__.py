@@ -2,14 +2,107 @@
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
 """Configuration module for Waldiez runner."""
 
+from ._auth import (
+    get_auth_token_cache_size,
+    get_auth_token_cache_ttl,
+    get_external_auth_cache_size,
+    get_external_auth_cache_ttl,
+    get_external_auth_max_connections,
+    get_external_auth_max_keepalive,
+    get_external_auth_negative_cache_ttl,
+    get_hashing_argon2_memory_cost,
+    get_hashing_argon2_parallelism,
+    get_hashing_argon2_time_cost,
+    get_hashing_pool_max_pending,
+    get_hashing_pool_workers,
+    get_hashing_scrypt_n,
+    get_hashing_scrypt_p,
+    get_hashing_scrypt_r,
+)
 from ._common import ENV_PREFIX, FALSY, ROOT_DIR, TRUTHY, in_container
+from ._postgres import (
+    get_db_max_overflow,
+    get_db_pgbouncer,
+    get_db_pool_recycle,
+    get_db_pool_size,
+    get_db_pool_timeout,
+    get_db_prepare_threshold,
+    get_db_prepared_statements,
+    get_db_replica_pin_seconds,
+    get_db_replica_url,
+)
 from ._redis import RedisScheme
 from ._server import ServerStatus
+from ._tasks import get_task_results_inline_max_size, get_tasks_partitioned
+from ._ws import (
+    get_sse_keepalive_seconds,
+    get_ws_batch_max_frames,
+    get_ws_batch_window_ms,
+    get_ws_idle_grace,
+    get_ws_max_active_tasks,
+    get_ws_max_client_lag,
+    get_ws_max_clients_per_task,
+    get_ws_max_queue,
+    get_ws_max_size,
+    get_ws_max_subscriptions,
+    get_ws_per_message_deflate,
+    get_ws_ping_interval,
+    get_ws_ping_timeout,
+    get_ws_queue_size,
+    get_ws_reap_interval,
+    get_ws_resume_wait_ms,
+    get_ws_slow_client_policy,
+    get_ws_stream_block_ms,
+)
 from .settings import Settings
 from .settings_manager import SettingsManager
 
-MAX_ACTIVE_TASKS = 50
-MAX_CLIENTS_PER_TASK = 5
+AUTH_TOKEN_CACHE_SIZE = get_auth_token_cache_size()
+AUTH_TOKEN_CACHE_TTL = get_auth_token_cache_ttl()
+EXTERNAL_AUTH_MAX_CONNECTIONS = get_external_auth_max_connections()
+EXTERNAL_AUTH_MAX_KEEPALIVE = get_external_auth_max_keepalive()
+EXTERNAL_AUTH_CACHE_SIZE = get_external_auth_cache_size()
+EXTERNAL_AUTH_CACHE_TTL = get_external_auth_cache_ttl()
+EXTERNAL_AUTH_NEGATIVE_CACHE_TTL = get_external_auth_negative_cache_ttl()
+HASHING_POOL_WORKERS = get_hashing_pool_workers()
+HASHING_POOL_MAX_PENDING = get_hashing_pool_max_pending()
+HASHING_ARGON2_TIME_COST = get_hashing_argon2_time_cost()
+HASHING_ARGON2_MEMORY_COST = get_hashing_argon2_memory_cost()
+HASHING_ARGON2_PARALLELISM = get_hashing_argon2_parallelism()
+HASHING_SCRYPT_N = get_hashing_scrypt_n()
+HASHING_SCRYPT_R = get_hashing_scrypt_r()
+HASHING_SCRYPT_P = get_hashing_scrypt_p()
+DB_REPLICA_URL = get_db_replica_url()
+DB_REPLICA_PIN_SECONDS = get_db_replica_pin_seconds()
+DB_POOL_RECYCLE = get_db_pool_recycle()
+DB_PREPARE_THRESHOLD = get_db_prepare_threshold()
+DB_PREPARED_STATEMENTS = get_db_prepared_statements()
+DB_API_POOL_SIZE = get_db_pool_size("api")
+DB_API_MAX_OVERFLOW = get_db_max_overflow("api")
+DB_WORKER_POOL_SIZE = get_db_pool_size("worker")
+DB_WORKER_MAX_OVERFLOW = get_db_max_overflow("worker")
+DB_POOL_TIMEOUT = get_db_pool_timeout()
+DB_PGBOUNCER = get_db_pgbouncer()
+TASK_RESULTS_INLINE_MAX_SIZE = get_task_results_inline_max_size()
+TASKS_PARTITIONED = get_tasks_partitioned()
+MAX_ACTIVE_TASKS = get_ws_max_active_tasks()
+MAX_CLIENTS_PER_TASK = get_ws_max_clients_per_task()
+WS_STREAM_BLOCK_MS = get_ws_stream_block_ms()
+WS_QUEUE_SIZE = get_ws_queue_size()
+WS_SLOW_CLIENT_POLICY = get_ws_slow_client_policy()
+WS_MAX_CLIENT_LAG = get_ws_max_client_lag()
+WS_RESUME_WAIT_MS = get_ws_resume_wait_ms()
+WS_MAX_SUBSCRIPTIONS = get_ws_max_subscriptions()
+SSE_KEEPALIVE_SECONDS = get_sse_keepalive_seconds()
+WS_PING_INTERVAL = get_ws_ping_interval()
+WS_PING_TIMEOUT = get_ws_ping_timeout()
+WS_REAP_INTERVAL = get_ws_reap_interval()
+WS_IDLE_GRACE = get_ws_idle_grace()
+WS_BATCH_WINDOW_MS = get_ws_batch_window_ms()
+WS_BATCH_MAX_FRAMES = get_ws_batch_max_frames()
+WS_PER_MESSAGE_DEFLATE = get_ws_per_message_deflate()
+WS_MAX_SIZE = get_ws_max_size()
+WS_MAX_QUEUE = get_ws_max_queue()
 
 __all__ = [
     "RedisScheme",
@@ -21,6 +114,50 @@ __all__ = [
     "TRUTHY",
     "FALSY",
     "in_container",
+    "AUTH_TOKEN_CACHE_SIZE",
+    "AUTH_TOKEN_CACHE_TTL",
+    "EXTERNAL_AUTH_MAX_CONNECTIONS",
+    "EXTERNAL_AUTH_MAX_KEEPALIVE",
+    "EXTERNAL_AUTH_CACHE_SIZE",
+    "EXTERNAL_AUTH_CACHE_TTL",
+    "EXTERNAL_AUTH_NEGATIVE_CACHE_TTL",
+    "HASHING_POOL_WORKERS",
+    "HASHING_POOL_MAX_PENDING",
+    "HASHING_ARGON2_TIME_COST",
+    "HASHING_ARGON2_MEMORY_COST",
+    "HASHING_ARGON2_PARALLELISM",
+    "HASHING_SCRYPT_N",
+    "HASHING_SCRYPT_R",
+    "HASHING_SCRYPT_P",
+    "DB_REPLICA_URL",
+    "DB_REPLICA_PIN_SECONDS",
+    "DB_POOL_RECYCLE",
+    "DB_PREPARE_THRESHOLD",
+    "DB_PREPARED_STATEMENTS",
+    "DB_API_POOL_SIZE",
+    "DB_API_MAX_OVERFLOW",
+    "DB_WORKER_POOL_SIZE",
+    "DB_WORKER_MAX_OVERFLOW",
+    "DB_POOL_TIMEOUT",
+    "DB_PGBOUNCER",
+    "TASK_RESULTS_INLINE_MAX_SIZE",
+    "TASKS_PARTITIONED",
     "MAX_ACTIVE_TASKS",
     "MAX_CLIENTS_PER_TASK",
+    "WS_STREAM_BLOCK_MS",
+    "WS_QUEUE_SIZE",
+    "WS_SLOW_CLIENT_POLICY",
+    "WS_MAX_CLIENT_LAG",
+    "WS_RESUME_WAIT_MS",
+    "WS_MAX_SUBSCRIPTIONS",
+    "SSE_KEEPALIVE_SECONDS",
+    "WS_PING_INTERVAL",
+    "WS_PING_TIMEOUT",
+    "WS_REAP_INTERVAL",
+    "WS_IDLE_GRACE",
+    "WS_BATCH_WINDOW_MS",
+    "WS_BATCH_MAX_FRAMES",
+    "WS_PER_MESSAGE_DEFLATE",
+    "WS_MAX_SIZE",
+    "WS_MAX_QUEUE",
 ]
@@ -13,6 +13,21 @@ OIDC_ISSUER_URL (str) # default: None
 OIDC_JWKS_URL (str) # default: None
 OIDC_AUDIENCE (str) # default: None
 OIDC_JWKS_CACHE_TTL (int) # default: 900
+AUTH_TOKEN_CACHE_SIZE (int) # default: 1024 (<=0: no cache)
+AUTH_TOKEN_CACHE_TTL (float) # default: 300
+EXTERNAL_AUTH_MAX_CONNECTIONS (int) # default: 100
+EXTERNAL_AUTH_MAX_KEEPALIVE (int) # default: 20
+EXTERNAL_AUTH_CACHE_SIZE (int) # default: 1024 (<=0: no cache)
+EXTERNAL_AUTH_CACHE_TTL (float) # default: 30
+EXTERNAL_AUTH_NEGATIVE_CACHE_TTL (float) # default: 5
+HASHING_POOL_WORKERS (int) # default: 0 (min(4, CPUs))
+HASHING_POOL_MAX_PENDING (int) # default: 32
+HASHING_ARGON2_TIME_COST (int) # default: 2
+HASHING_ARGON2_MEMORY_COST (int) # default: 65536 (KiB)
+HASHING_ARGON2_PARALLELISM (int) # default: 1
+HASHING_SCRYPT_N (int) # default: 16384
+HASHING_SCRYPT_R (int) # default: 8
+HASHING_SCRYPT_P (int) # default: 1
 
 Command line arguments (no prefix)
 ----------------------------------
@@ -24,6 +39,21 @@ Command line arguments (no prefix)
 --oidc-jwks-url (str)
 --oidc-audience (str)
 --oidc-jwks-cache-ttl (int)
+--auth-token-cache-size (int)
+--auth-token-cache-ttl (float)
+--external-auth-max-connections (int)
+--external-auth-max-keepalive (int)
+--external-auth-cache-size (int)
+--external-auth-cache-ttl (float)
+--external-auth-negative-cache-ttl (float)
+--hashing-pool-workers (int)
+--hashing-pool-max-pending (int)
+--hashing-argon2-time-cost (int)
+--hashing-argon2-memory-cost (int)
+--hashing-argon2-parallelism (int)
+--hashing-scrypt-n (int)
+--hashing-scrypt-r (int)
+--hashing-scrypt-p (int)
 """
 
 # LOCAL_CLIENT_ID=
@@ -34,9 +64,40 @@ Command line arguments (no prefix)
 # OIDC_JWKS_URL=
 # OIDC_AUDIENCE=
 # OIDC_JWKS_CACHE_TTL=
+# AUTH_TOKEN_CACHE_SIZE=
+# AUTH_TOKEN_CACHE_TTL=
+# EXTERNAL_AUTH_MAX_CONNECTIONS=
+# EXTERNAL_AUTH_MAX_KEEPALIVE=
+# EXTERNAL_AUTH_CACHE_SIZE=
+# EXTERNAL_AUTH_CACHE_TTL=
+# EXTERNAL_AUTH_NEGATIVE_CACHE_TTL=
+# HASHING_POOL_WORKERS=
+# HASHING_POOL_MAX_PENDING=
+# HASHING_ARGON2_TIME_COST=
+# HASHING_ARGON2_MEMORY_COST=
+# HASHING_ARGON2_PARALLELISM=
+# HASHING_SCRYPT_N=
+# HASHING_SCRYPT_R=
+# HASHING_SCRYPT_P=
 
 from ._common import get_value
 
+DEFAULT_AUTH_TOKEN_CACHE_SIZE = 1024
+DEFAULT_AUTH_TOKEN_CACHE_TTL = 300.0
+DEFAULT_EXTERNAL_AUTH_MAX_CONNECTIONS = 100
+DEFAULT_EXTERNAL_AUTH_MAX_KEEPALIVE = 20
+DEFAULT_EXTERNAL_AUTH_CACHE_SIZE = 1024
+DEFAULT_EXTERNAL_AUTH_CACHE_TTL = 30.0
+DEFAULT_EXTERNAL_AUTH_NEGATIVE_CACHE_TTL = 5.0
+DEFAULT_HASHING_POOL_WORKERS = 0
+DEFAULT_HASHING_POOL_MAX_PENDING = 32
+DEFAULT_HASHING_ARGON2_TIME_COST = 2
+DEFAULT_HASHING_ARGON2_MEMORY_COST = 65536
+DEFAULT_HASHING_ARGON2_PARALLELISM = 1
+DEFAULT_HASHING_SCRYPT_N = 16384
+DEFAULT_HASHING_SCRYPT_R = 8
+DEFAULT_HASHING_SCRYPT_P = 1
+
 
 def get_use_local_auth() -> bool:
     """Get whether to use local authentication.
@@ -135,3 +196,253 @@ def get_oidc_jwks_cache_ttl() -> int:
         The OIDC JWKS cache TTL
     """
     return get_value("--oidc-jwks-cache-ttl", "OIDC_JWKS_CACHE_TTL", int, 900)
+
+
+def get_auth_token_cache_size() -> int:
+    """Get the max verified tokens to cache per API process.
+
+    Returns
+    -------
+    int
+        The max cached tokens (<=0 means no cache).
+    """
+    return get_value(
+        "--auth-token-cache-size",
+        "AUTH_TOKEN_CACHE_SIZE",
+        int,
+        DEFAULT_AUTH_TOKEN_CACHE_SIZE,
+    )
+
+
+def get_auth_token_cache_ttl() -> float:
+    """Get the max seconds a verified token is cached.
+
+    Tokens are never cached past their expiry.
+
+    Returns
+    -------
+    float
+        The max time to cache a token in seconds (at least 0).
+    """
+    value = get_value(
+        "--auth-token-cache-ttl",
+        "AUTH_TOKEN_CACHE_TTL",
+        float,
+        DEFAULT_AUTH_TOKEN_CACHE_TTL,
+    )
+    return max(value, 0.0)
+
+
+def get_external_auth_max_connections() -> int:
+    """Get the max connections to the external verification services.
+
+    Returns
+    -------
+    int
+        The max concurrent connections (at least 1).
+    """
+    value = get_value(
+        "--external-auth-max-connections",
+        "EXTERNAL_AUTH_MAX_CONNECTIONS",
+        int,
+        DEFAULT_EXTERNAL_AUTH_MAX_CONNECTIONS,
+    )
+    return max(value, 1)
+
+
+def get_external_auth_max_keepalive() -> int:
+    """Get the max idle connections kept to the verification services.
+
+    Returns
+    -------
+    int
+        The max keep-alive connections (at least 0).
+    """
+    value = get_value(
+        "--external-auth-max-keepalive",
+        "EXTERNAL_AUTH_MAX_KEEPALIVE",
+        int,
+        DEFAULT_EXTERNAL_AUTH_MAX_KEEPALIVE,
+    )
+    return max(value, 0)
+
+
+def get_external_auth_cache_size() -> int:
+    """Get the max external verification results to cache per process.
+
+    Returns
+    -------
+    int
+        The max cached results (<=0 means no cache).
+    """
+    return get_value(
+        "--external-auth-cache-size",
+        "EXTERNAL_AUTH_CACHE_SIZE",
+        int,
+        DEFAULT_EXTERNAL_AUTH_CACHE_SIZE,
+    )
+
+
+def get_external_auth_cache_ttl() -> float:
+    """Get the seconds a successful external verification is cached.
+
+    Returns
+    -------
+    float
+        The time to cache an accepted token or permission (at least 0).
+    """
+    value = get_value(
+        "--external-auth-cache-ttl",
+        "EXTERNAL_AUTH_CACHE_TTL",
+        float,
+        DEFAULT_EXTERNAL_AUTH_CACHE_TTL,
+    )
+    return max(value, 0.0)
+
+
+def get_external_auth_negative_cache_ttl() -> float:
+    """Get the seconds a rejected external verification is cached.
+
+    Returns
+    -------
+    float
+        The time to cache a rejected token or permission (at least 0).
+    """
+    value = get_value(
+        "--external-auth-negative-cache-ttl",
+        "EXTERNAL_AUTH_NEGATIVE_CACHE_TTL",
+        float,
+        DEFAULT_EXTERNAL_AUTH_NEGATIVE_CACHE_TTL,
+    )
+    return max(value, 0.0)
+
+
+def get_hashing_pool_workers() -> int:
+    """Get the worker processes that verify and hash client secrets.
+
+    Returns
+    -------
+    int
+        The worker processes (<=0 means min(4, CPUs)).
+    """
+    return get_value(
+        "--hashing-pool-workers",
+        "HASHING_POOL_WORKERS",
+        int,
+        DEFAULT_HASHING_POOL_WORKERS,
+    )
+
+
+def get_hashing_pool_max_pending() -> int:
+    """Get the max running and queued secret verifications.
+
+    Further requests are rejected (429) until some complete.
+
+    Returns
+    -------
+    int
+        The max pending hashing jobs (at least 1).
+    """
+    value = get_value(
+        "--hashing-pool-max-pending",
+        "HASHING_POOL_MAX_PENDING",
+        int,
+        DEFAULT_HASHING_POOL_MAX_PENDING,
+    )
+    return max(value, 1)
+
+
+def get_hashing_argon2_time_cost() -> int:
+    """Get the argon2 iterations of new secret hashes.
+
+    Returns
+    -------
+    int
+        The argon2 time cost (at least 1).
+    """
+    value = get_value(
+        "--hashing-argon2-time-cost",
+        "HASHING_ARGON2_TIME_COST",
+        int,
+        DEFAULT_HASHING_ARGON2_TIME_COST,
+    )
+    return max(value, 1)
+
+
+def get_hashing_argon2_memory_cost() -> int:
+    """Get the argon2 memory of new secret hashes.
+
+    Returns
+    -------
+    int
+        The argon2 memory cost in KiB (at least 8 per lane).
+    """
+    value = get_value(
+        "--hashing-argon2-memory-cost",
+        "HASHING_ARGON2_MEMORY_COST",
+        int,
+        DEFAULT_HASHING_ARGON2_MEMORY_COST,
+    )
+    return max(value, 8 * get_hashing_argon2_parallelism())
+
+
+def get_hashing_argon2_parallelism() -> int:
+    """Get the argon2 lanes of new secret hashes.
+
+    Returns
+    -------
+    int
+        The argon2 parallelism (at least 1).
+    """
+    value = get_value(
+        "--hashing-argon2-parallelism",
+        "HASHING_ARGON2_PARALLELISM",
+        int,
+        DEFAULT_HASHING_ARGON2_PARALLELISM,
+    )
+    return max(value, 1)
+
+
+def get_hashing_scrypt_n() -> int:
+    """Get the scrypt CPU/memory cost of new secret hashes.
+
+    Returns
+    -------
+    int
+        The scrypt N (a power of 2, rounded up, at least 2).
+    """
+    value = get_value(
+        "--hashing-scrypt-n",
+        "HASHING_SCRYPT_N",
+        int,
+        DEFAULT_HASHING_SCRYPT_N,
+    )
+    return 1 << max(value - 1, 1).bit_length()
+
+
+def get_hashing_scrypt_r() -> int:
+    """Get the scrypt block size of new secret hashes.
+
+    Returns
+    -------
+    int
+        The scrypt r (at least 1).
+    """
+    value = get_value(
+        "--hashing-scrypt-r", "HASHING_SCRYPT_R", int, DEFAULT_HASHING_SCRYPT_R
+    )
+    return max(value, 1)
+
+
+def get_hashing_scrypt_p() -> int:
+    """Get the scrypt parallelism of new secret hashes.
+
+    Returns
+    -------
+    int
+        The scrypt p (at least 1).
+    """
+    value = get_value(
+        "--hashing-scrypt-p", "HASHING_SCRYPT_P", int, DEFAULT_HASHING_SCRYPT_P
+    )
+    return max(value, 1)
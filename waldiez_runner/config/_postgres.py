@@ -12,6 +12,17 @@ POSTGRES_DB (str) # default: db_name
 POSTGRES_USER (str) # default: db_user
 POSTGRES_PASSWORD (str) # default: db_password
 POSTGRES_URL (str) # default: None (auto-generated)
+POSTGRES_REPLICA_URL (str) # default: None (no read replica)
+POSTGRES_REPLICA_PIN_SECONDS (float) # default: 5
+POSTGRES_POOL_RECYCLE (int) # default: 1800
+POSTGRES_PREPARE_THRESHOLD (int) # default: 5
+POSTGRES_PREPARED_STATEMENTS (int) # default: 256
+POSTGRES_API_POOL_SIZE (int) # default: 10
+POSTGRES_API_MAX_OVERFLOW (int) # default: 20
+POSTGRES_WORKER_POOL_SIZE (int) # default: 10
+POSTGRES_WORKER_MAX_OVERFLOW (int) # default: 20
+POSTGRES_POOL_TIMEOUT (float) # default: 30
+POSTGRES_PGBOUNCER (bool) # default: False
 
 Command line arguments (no prefix)
 ----------------------------------
@@ -22,6 +33,17 @@ Command line arguments (no prefix)
 --postgres-user (str)
 --postgres-password (str)
 --postgres-url (str)
+--postgres-replica-url (str)
+--postgres-replica-pin-seconds (float)
+--postgres-pool-recycle (int)
+--postgres-prepare-threshold (int)
+--postgres-prepared-statements (int)
+--postgres-api-pool-size (int)
+--postgres-api-max-overflow (int)
+--postgres-worker-pool-size (int)
+--postgres-worker-max-overflow (int)
+--postgres-pool-timeout (float)
+--postgres-pgbouncer|--no-postgres-pgbouncer (bool)
 """
 
 from ._common import get_value, in_container
@@ -106,3 +128,149 @@ def get_db_url() -> str | None:
     """
     value = get_value("--postgres-url", "POSTGRES_URL", str, "")
     return value if value else None
+
+
+def get_db_replica_url() -> str | None:
+    """Get the URL of a read replica.
+
+    Returns
+    -------
+    str | None
+        The read replica's URL (None: no replica).
+    """
+    value = get_value("--postgres-replica-url", "POSTGRES_REPLICA_URL", str, "")
+    return value if value else None
+
+
+def get_db_replica_pin_seconds() -> float:
+    """Get how long a client reads from the primary after writing.
+
+    It should exceed the replica's usual replication lag.
+
+    Returns
+    -------
+    float
+        The seconds (<=0: never pinned).
+    """
+    return get_value(
+        "--postgres-replica-pin-seconds",
+        "POSTGRES_REPLICA_PIN_SECONDS",
+        float,
+        5.0,
+    )
+
+
+def get_db_pool_recycle() -> int:
+    """Get the age after which a pooled connection is replaced.
+
+    A replaced connection loses its prepared statements.
+
+    Returns
+    -------
+    int
+        The seconds (<=0: never replaced).
+    """
+    return get_value(
+        "--postgres-pool-recycle", "POSTGRES_POOL_RECYCLE", int, 1800
+    )
+
+
+def get_db_prepare_threshold() -> int:
+    """Get after how many executions a statement is prepared (psycopg).
+
+    Returns
+    -------
+    int
+        The executions (0: prepare on the first, <0: never prepare).
+    """
+    return get_value(
+        "--postgres-prepare-threshold", "POSTGRES_PREPARE_THRESHOLD", int, 5
+    )
+
+
+def get_db_prepared_statements() -> int:
+    """Get the max prepared statements kept per connection.
+
+    The psycopg ``prepared_max`` or the asyncpg statement cache's size.
+
+    Returns
+    -------
+    int
+        The max prepared statements per connection
+        (<=0: the driver's default).
+    """
+    return get_value(
+        "--postgres-prepared-statements",
+        "POSTGRES_PREPARED_STATEMENTS",
+        int,
+        256,
+    )
+
+
+def get_db_pool_size(role: str) -> int:
+    """Get the connections kept in a process' pool.
+
+    Parameters
+    ----------
+    role : str
+        The process' role ("api" or "worker").
+
+    Returns
+    -------
+    int
+        The pool's size.
+    """
+    return get_value(
+        f"--postgres-{role}-pool-size",
+        f"POSTGRES_{role.upper()}_POOL_SIZE",
+        int,
+        10,
+    )
+
+
+def get_db_max_overflow(role: str) -> int:
+    """Get the connections a process can open beyond its pool's size.
+
+    Parameters
+    ----------
+    role : str
+        The process' role ("api" or "worker").
+
+    Returns
+    -------
+    int
+        The max overflow (<0: no limit).
+    """
+    return get_value(
+        f"--postgres-{role}-max-overflow",
+        f"POSTGRES_{role.upper()}_MAX_OVERFLOW",
+        int,
+        20,
+    )
+
+
+def get_db_pool_timeout() -> float:
+    """Get how long to wait for a pooled connection.
+
+    Returns
+    -------
+    float
+        The seconds to wait before failing.
+    """
+    return get_value(
+        "--postgres-pool-timeout", "POSTGRES_POOL_TIMEOUT", float, 30.0
+    )
+
+
+def get_db_pgbouncer() -> bool:
+    """Get whether the database is behind PgBouncer (transaction pooling).
+
+    The prepared statements are disabled and every session opens its
+    own connection (PgBouncer does the pooling).
+
+    Returns
+    -------
+    bool
+        True if the database is behind PgBouncer.
+    """
+    return get_value("--postgres-pgbouncer", "POSTGRES_PGBOUNCER", bool, False)
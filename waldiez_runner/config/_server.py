@@ -47,6 +47,8 @@ class ServerStatus(TypedDict):
     total_memory: int
     used_memory: int
     memory_percent: float
+    websockets: dict[str, int]
+    database: dict[str, dict[str, float]]
 
 
 def get_trusted_hosts(domain_name: str, host: str) -> list[str]:
@@ -9,6 +9,8 @@ INPUT_TIMEOUT (int) # default: 180
 MAX_TASK_DURATION (int) # default: 60 * 60
 KEEP_TASKS_FOR_DAYS (int) # default: 0
 WALDIEZ_RUNNER_SKIP_DEPS (bool)  # default: False
+TASK_RESULTS_INLINE_MAX_SIZE (int) # default: 65536
+TASKS_PARTITIONED (bool) # default: False
 
 Command line arguments (no prefix)
 --------------------------------------------------
@@ -17,6 +19,8 @@ Command line arguments (no prefix)
 --max-task-duration (int)  # default: 3600
 --keep-tasks-for-days (int)  # default: 0
 --skip-deps | --no-skip-deps  # default: --no-skip-deps
+--task-results-inline-max-size (int)  # default: 65536
+--tasks-partitioned | --no-tasks-partitioned  # default: --no-tasks-partitioned
 """
 
 from ._common import get_value
@@ -26,6 +30,8 @@ DEFAULT_DAYS_TO_KEEP_TASKS = 0
 DEFAULT_MAX_DURATION_SECS = 3600
 DEFAULT_MAX_JOBS = 5
 DEFAULT_SKIP_DEPS = False
+DEFAULT_TASK_RESULTS_INLINE_MAX_SIZE = 65536
+DEFAULT_TASKS_PARTITIONED = False
 
 
 def get_max_jobs() -> int:
@@ -99,3 +105,41 @@ def get_skip_deps() -> bool:
         bool,
         DEFAULT_SKIP_DEPS,
     )
+
+
+def get_task_results_inline_max_size() -> int:
+    """Get the max size of the results kept in a task's row.
+
+    Larger results are stored compressed in a separate table.
+
+    Returns
+    -------
+    int
+        The max size of the serialized results in bytes
+        (<=0 means always in the row).
+    """
+    return get_value(
+        "--task-results-inline-max-size",
+        "TASK_RESULTS_INLINE_MAX_SIZE",
+        int,
+        DEFAULT_TASK_RESULTS_INLINE_MAX_SIZE,
+    )
+
+
+def get_tasks_partitioned() -> bool:
+    """Get whether the tasks table is partitioned by month (PostgreSQL).
+
+    Only read by the database migrations: it must be set before the
+    migration that partitions the table runs.
+
+    Returns
+    -------
+    bool
+        Whether the tasks table is range partitioned by its creation month.
+    """
+    return get_value(
+        "--tasks-partitioned",
+        "TASKS_PARTITIONED",
+        bool,
+        DEFAULT_TASKS_PARTITIONED,
+    )
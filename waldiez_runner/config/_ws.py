@@ -0,0 +1,374 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+"""WebSocket (and Server-Sent Events) streaming configuration.
+
+Environment variables (with prefix WALDIEZ_RUNNER_)
+---------------------------------------------------
+WS_MAX_ACTIVE_TASKS (int) # default: 1000 (<=0: no limit)
+WS_MAX_CLIENTS_PER_TASK (int) # default: 5
+WS_STREAM_BLOCK_MS (int) # default: 1000
+WS_QUEUE_SIZE (int) # default: 100
+WS_SLOW_CLIENT_POLICY (str) # default: drop_oldest
+WS_MAX_CLIENT_LAG (int) # default: 0 (use WS_QUEUE_SIZE)
+WS_RESUME_WAIT_MS (int) # default: 0 (<=0: only with ?resume=1)
+WS_MAX_SUBSCRIPTIONS (int) # default: 200
+SSE_KEEPALIVE_SECONDS (int) # default: 15
+WS_PING_INTERVAL (float) # default: 20 (<=0: no pings)
+WS_PING_TIMEOUT (float) # default: 20 (<=0: no timeout)
+WS_REAP_INTERVAL (float) # default: 30 (<=0: no reaper)
+WS_IDLE_GRACE (float) # default: 60
+WS_BATCH_WINDOW_MS (int) # default: 10
+WS_BATCH_MAX_FRAMES (int) # default: 100
+WS_PER_MESSAGE_DEFLATE (bool) # default: True
+WS_MAX_SIZE (int) # default: 16777216
+WS_MAX_QUEUE (int) # default: 32
+
+Command line arguments (no prefix)
+--------------------------------------------------
+--ws-max-active-tasks (int)  # default: 1000
+--ws-max-clients-per-task (int)  # default: 5
+--ws-stream-block-ms (int)  # default: 1000
+--ws-queue-size (int)  # default: 100
+--ws-slow-client-policy (drop_oldest|coalesce|disconnect)
+--ws-max-client-lag (int)  # default: 0
+--ws-resume-wait-ms (int)  # default: 0
+--ws-max-subscriptions (int)  # default: 200
+--sse-keepalive-seconds (int)  # default: 15
+--ws-ping-interval (float)  # default: 20
+--ws-ping-timeout (float)  # default: 20
+--ws-reap-interval (float)  # default: 30
+--ws-idle-grace (float)  # default: 60
+--ws-batch-window-ms (int)  # default: 10
+--ws-batch-max-frames (int)  # default: 100
+--ws-per-message-deflate | --no-ws-per-message-deflate
+--ws-max-size (int)  # default: 16777216
+--ws-max-queue (int)  # default: 32
+"""
+
+from ._common import get_value
+
+DEFAULT_WS_MAX_ACTIVE_TASKS = 1000
+DEFAULT_WS_MAX_CLIENTS_PER_TASK = 5
+DEFAULT_WS_STREAM_BLOCK_MS = 1000
+DEFAULT_WS_QUEUE_SIZE = 100
+DEFAULT_WS_SLOW_CLIENT_POLICY = "drop_oldest"
+WS_SLOW_CLIENT_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+DEFAULT_WS_MAX_CLIENT_LAG = 0
+DEFAULT_WS_RESUME_WAIT_MS = 0
+DEFAULT_WS_MAX_SUBSCRIPTIONS = 200
+DEFAULT_SSE_KEEPALIVE_SECONDS = 15
+DEFAULT_WS_PING_INTERVAL = 20.0
+DEFAULT_WS_PING_TIMEOUT = 20.0
+DEFAULT_WS_REAP_INTERVAL = 30.0
+DEFAULT_WS_IDLE_GRACE = 60.0
+DEFAULT_WS_BATCH_WINDOW_MS = 10
+DEFAULT_WS_BATCH_MAX_FRAMES = 100
+DEFAULT_WS_MAX_SIZE = 16 * 1024 * 1024
+DEFAULT_WS_MAX_QUEUE = 32
+
+
+def get_ws_max_active_tasks() -> int:
+    """Get the max tasks with WebSocket viewers per API process.
+
+    Returns
+    -------
+    int
+        The max active tasks (<=0 means no limit).
+    """
+    return get_value(
+        "--ws-max-active-tasks",
+        "WS_MAX_ACTIVE_TASKS",
+        int,
+        DEFAULT_WS_MAX_ACTIVE_TASKS,
+    )
+
+
+def get_ws_max_clients_per_task() -> int:
+    """Get the max WebSocket clients per task.
+
+    Returns
+    -------
+    int
+        The max clients per task.
+    """
+    return get_value(
+        "--ws-max-clients-per-task",
+        "WS_MAX_CLIENTS_PER_TASK",
+        int,
+        DEFAULT_WS_MAX_CLIENTS_PER_TASK,
+    )
+
+
+def get_ws_stream_block_ms() -> int:
+    """Get how long the shared stream reader blocks on XREAD.
+
+    Returns
+    -------
+    int
+        The block time in milliseconds.
+    """
+    return get_value(
+        "--ws-stream-block-ms",
+        "WS_STREAM_BLOCK_MS",
+        int,
+        DEFAULT_WS_STREAM_BLOCK_MS,
+    )
+
+
+def get_ws_queue_size() -> int:
+    """Get the max queued messages per WebSocket client.
+
+    Returns
+    -------
+    int
+        The queue size.
+    """
+    return get_value(
+        "--ws-queue-size",
+        "WS_QUEUE_SIZE",
+        int,
+        DEFAULT_WS_QUEUE_SIZE,
+    )
+
+
+def get_ws_slow_client_policy() -> str:
+    """Get what to do with WebSocket clients that fall behind.
+
+    Returns
+    -------
+    str
+        One of "drop_oldest", "coalesce" or "disconnect".
+    """
+    value = get_value(
+        "--ws-slow-client-policy",
+        "WS_SLOW_CLIENT_POLICY",
+        str,
+        DEFAULT_WS_SLOW_CLIENT_POLICY,
+    ).lower()
+    if value not in WS_SLOW_CLIENT_POLICIES:
+        return DEFAULT_WS_SLOW_CLIENT_POLICY
+    return value
+
+
+def get_ws_max_client_lag() -> int:
+    """Get the lag after which a slow WebSocket client is disconnected.
+
+    Returns
+    -------
+    int
+        The max queued messages (<=0: the queue size).
+    """
+    return get_value(
+        "--ws-max-client-lag",
+        "WS_MAX_CLIENT_LAG",
+        int,
+        DEFAULT_WS_MAX_CLIENT_LAG,
+    )
+
+
+def get_ws_resume_wait_ms() -> int:
+    """Get how long to wait for a resume message after connecting.
+
+    Connections without a ``last_event_id`` query param wait this long
+    for a ``resume`` first message before any history is sent.
+
+    Returns
+    -------
+    int
+        The wait in milliseconds (<=0: only the clients that connect
+        with ``?resume=1`` are waited for).
+    """
+    return get_value(
+        "--ws-resume-wait-ms",
+        "WS_RESUME_WAIT_MS",
+        int,
+        DEFAULT_WS_RESUME_WAIT_MS,
+    )
+
+
+def get_ws_max_subscriptions() -> int:
+    """Get the max tasks one multiplexed WebSocket can subscribe to.
+
+    Returns
+    -------
+    int
+        The max subscriptions per connection.
+    """
+    return get_value(
+        "--ws-max-subscriptions",
+        "WS_MAX_SUBSCRIPTIONS",
+        int,
+        DEFAULT_WS_MAX_SUBSCRIPTIONS,
+    )
+
+
+def get_sse_keepalive_seconds() -> int:
+    """Get how often to send a comment to idle Server-Sent Events streams.
+
+    Returns
+    -------
+    int
+        The keepalive interval in seconds (at least 1).
+    """
+    value = get_value(
+        "--sse-keepalive-seconds",
+        "SSE_KEEPALIVE_SECONDS",
+        int,
+        DEFAULT_SSE_KEEPALIVE_SECONDS,
+    )
+    return max(1, value)
+
+
+def get_ws_ping_interval() -> float | None:
+    """Get how often the server pings the WebSocket clients.
+
+    Returns
+    -------
+    float | None
+        The ping interval in seconds, None to not send pings.
+    """
+    value = get_value(
+        "--ws-ping-interval",
+        "WS_PING_INTERVAL",
+        float,
+        DEFAULT_WS_PING_INTERVAL,
+    )
+    return value if value > 0 else None
+
+
+def get_ws_ping_timeout() -> float | None:
+    """Get how long to wait for a pong before closing a connection.
+
+    Returns
+    -------
+    float | None
+        The pong timeout in seconds, None to wait forever.
+    """
+    value = get_value(
+        "--ws-ping-timeout",
+        "WS_PING_TIMEOUT",
+        float,
+        DEFAULT_WS_PING_TIMEOUT,
+    )
+    return value if value > 0 else None
+
+
+def get_ws_reap_interval() -> float:
+    """Get how often idle task managers and dead clients are reaped.
+
+    Returns
+    -------
+    float
+        The interval in seconds (<=0: no reaper).
+    """
+    return get_value(
+        "--ws-reap-interval",
+        "WS_REAP_INTERVAL",
+        float,
+        DEFAULT_WS_REAP_INTERVAL,
+    )
+
+
+def get_ws_idle_grace() -> float:
+    """Get how long a task manager can stay without live clients.
+
+    Returns
+    -------
+    float
+        The grace period in seconds.
+    """
+    return max(
+        0.0,
+        get_value(
+            "--ws-idle-grace",
+            "WS_IDLE_GRACE",
+            float,
+            DEFAULT_WS_IDLE_GRACE,
+        ),
+    )
+
+
+def get_ws_batch_window_ms() -> int:
+    """Get how long a batching client's writer waits for more frames.
+
+    Returns
+    -------
+    int
+        The window in milliseconds (<=0: only the already queued frames).
+    """
+    return max(
+        0,
+        get_value(
+            "--ws-batch-window-ms",
+            "WS_BATCH_WINDOW_MS",
+            int,
+            DEFAULT_WS_BATCH_WINDOW_MS,
+        ),
+    )
+
+
+def get_ws_batch_max_frames() -> int:
+    """Get the max frames sent together to a batching client.
+
+    Returns
+    -------
+    int
+        The max frames per batch (at least 1).
+    """
+    return max(
+        1,
+        get_value(
+            "--ws-batch-max-frames",
+            "WS_BATCH_MAX_FRAMES",
+            int,
+            DEFAULT_WS_BATCH_MAX_FRAMES,
+        ),
+    )
+
+
+def get_ws_per_message_deflate() -> bool:
+    """Get whether to negotiate permessage-deflate with WebSocket clients.
+
+    Returns
+    -------
+    bool
+        True to offer compression (if the client asks for it).
+    """
+    return get_value(
+        "--ws-per-message-deflate",
+        "WS_PER_MESSAGE_DEFLATE",
+        bool,
+        True,
+    )
+
+
+def get_ws_max_size() -> int:
+    """Get the max size of an incoming WebSocket message.
+
+    Returns
+    -------
+    int
+        The max message size in bytes.
+    """
+    return get_value(
+        "--ws-max-size",
+        "WS_MAX_SIZE",
+        int,
+        DEFAULT_WS_MAX_SIZE,
+    )
+
+
+def get_ws_max_queue() -> int:
+    """Get the max incoming WebSocket messages buffered per connection.
+
+    Returns
+    -------
+    int
+        The max queued incoming messages.
+    """
+    return get_value(
+        "--ws-max-queue",
+        "WS_MAX_QUEUE",
+        int,
+        DEFAULT_WS_MAX_QUEUE,
+    )
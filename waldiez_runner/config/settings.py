@@ -24,6 +24,12 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing_extensions import Annotated, Self
 
 from ._auth import (
+    get_hashing_argon2_memory_cost,
+    get_hashing_argon2_parallelism,
+    get_hashing_argon2_time_cost,
+    get_hashing_scrypt_n,
+    get_hashing_scrypt_p,
+    get_hashing_scrypt_r,
     get_local_client_id,
     get_local_client_secret,
     get_oidc_audience,
@@ -160,6 +166,19 @@ class Settings(BaseSettings):
     oidc_jwks_cache_ttl: Annotated[int, Field(ge=1, le=3600)] = (
         get_oidc_jwks_cache_ttl()
     )
+    # Cost of new client secret hashes (see: hashing-bench)
+    hashing_argon2_time_cost: Annotated[int, Field(ge=1)] = (
+        get_hashing_argon2_time_cost()
+    )
+    hashing_argon2_memory_cost: Annotated[int, Field(ge=8)] = (
+        get_hashing_argon2_memory_cost()
+    )
+    hashing_argon2_parallelism: Annotated[int, Field(ge=1)] = (
+        get_hashing_argon2_parallelism()
+    )
+    hashing_scrypt_n: Annotated[int, Field(ge=2)] = get_hashing_scrypt_n()
+    hashing_scrypt_r: Annotated[int, Field(ge=1)] = get_hashing_scrypt_r()
+    hashing_scrypt_p: Annotated[int, Field(ge=1)] = get_hashing_scrypt_p()
     # External authentication settings
     enable_external_auth: bool = get_enable_external_auth()
     external_auth_verify_url: str = get_external_auth_verify_url()
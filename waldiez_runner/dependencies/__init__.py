@@ -36,6 +36,11 @@ from .storage import (
     get_filename_from_url,
     get_storage_backend,
 )
+from .token_cache import (
+    VerifiedTokenCache,
+    invalidate_client_tokens,
+    verified_tokens,
+)
 
 __all__ = [
     "app_state",
@@ -73,4 +78,7 @@ __all__ = [
     "RequestContext",
     "get_request_context",
     "get_filename_from_url",
+    "VerifiedTokenCache",
+    "invalidate_client_tokens",
+    "verified_tokens",
 ]
@@ -9,7 +9,6 @@ import logging
 from typing import TYPE_CHECKING, Any, Literal
 
 import jwt
-import jwt.algorithms
 from fastapi import HTTPException
 
 from ..services.external_token_service import (
@@ -112,26 +111,15 @@ async def decode_oidc_jwt(
     HTTPException
         If the token is invalid.
     """
-    jwks = await jwks_cache.get_keys()
-    keys = jwks.get("keys", [])
-    if not keys:  # pragma: no cover
-        raise HTTPException(status_code=500, detail="No keys found in JWKS.")
     header = jwt.get_unverified_header(token)
-
-    rsa_jwk = None
-    rsa_alg = "RS256"
     kid = header.get("kid")
     alg = header.get("alg")
-    for key in keys:  # pragma: no branch
-        if key.get("kid") == kid:
-            rsa_jwk = key
-            rsa_alg = key.get("alg", rsa_alg)
-            break
-
-    if rsa_jwk is None:
+    jwk = await jwks_cache.get_key(kid)
+    if jwk is None:
         raise HTTPException(
             status_code=401, detail="Unable to find appropriate key."
         )
+    public_key, rsa_alg = jwk
 
     if alg != rsa_alg:  # pragma: no cover
         raise HTTPException(status_code=401, detail="JWT algorithm mismatch.")
@@ -141,10 +129,9 @@ async def decode_oidc_jwt(
         raise HTTPException(
             status_code=500, detail="OIDC issuer URL is not set."
         )
-    public_key = jwt.algorithms.RSAAlgorithm.from_jwk(rsa_jwk)
     return jwt.decode(
         token,
-        public_key,  # type: ignore
+        public_key,
         algorithms=[rsa_alg],
         issuer=str(issuer_url),
         audience=settings.oidc_audience,
@@ -157,6 +144,30 @@ async def decode_oidc_jwt(
     )
 
 
+def checked_audience(
+    expected_audience: str | list[str] | None,
+    settings: "Settings",
+) -> str | list[str] | None:
+    """Get the audience the token verification checks.
+
+    Only local tokens are checked against the route's audience (OIDC
+    ones against the provider's audience, if configured).
+
+    Parameters
+    ----------
+    expected_audience : str | list[str] | None
+        The route's expected audience(s).
+    settings : Settings
+        The settings instance.
+
+    Returns
+    -------
+    str | list[str] | None
+        The checked audience(s), None for any.
+    """
+    return expected_audience if settings.use_local_auth else None
+
+
 async def get_client_id_from_token(
     expected_audience: str | list[str] | None,
     token: str,
@@ -3,15 +3,31 @@
 
 # pyright: reportUnusedParameter=false
 
-"""Database connection manager."""
+"""Database connection manager.
+
+With a read replica configured (``POSTGRES_REPLICA_URL``), the
+``session(readonly=True)`` sessions use it. A client that has just
+written (committed in a ``session(client_id=...)``) reads from the
+primary for ``POSTGRES_REPLICA_PIN_SECONDS`` (in this process), so it
+sees its own writes despite the replication lag.
+
+The pools' sizes are per role (``POSTGRES_API_*`` for the API,
+``POSTGRES_WORKER_*`` for each taskiq worker process). Behind PgBouncer
+(``POSTGRES_PGBOUNCER``) no connections are kept (``NullPool``) and no
+statements are prepared. The pools' checkout waits, connections in use
+and overflows are counted (``pool_metrics()``, in ``/status``).
+"""
 
 import contextlib
 import json
 import logging
+import time
 from asyncio import Lock
-from collections.abc import AsyncIterator
-from typing import TYPE_CHECKING, Any
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING, Any, Literal
 
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import pool as sa_pool
 from sqlalchemy.engine import Connection as ConnectionPoolEntry
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.event import listen
@@ -22,28 +38,276 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+from waldiez_runner.config import (
+    DB_API_MAX_OVERFLOW,
+    DB_API_POOL_SIZE,
+    DB_PGBOUNCER,
+    DB_POOL_RECYCLE,
+    DB_POOL_TIMEOUT,
+    DB_PREPARE_THRESHOLD,
+    DB_PREPARED_STATEMENTS,
+    DB_REPLICA_PIN_SECONDS,
+    DB_REPLICA_URL,
+    DB_WORKER_MAX_OVERFLOW,
+    DB_WORKER_POOL_SIZE,
+)
+
 if TYPE_CHECKING:
     from waldiez_runner.config import Settings
 
 LOG = logging.getLogger(__name__)
 
+MAX_PINNED_CLIENTS = 10_000
+
+DatabaseRole = Literal["api", "worker"]
+POOL_SIZES: dict[DatabaseRole, tuple[int, int]] = {
+    # role: (pool size, max overflow)
+    "api": (DB_API_POOL_SIZE, DB_API_MAX_OVERFLOW),
+    "worker": (DB_WORKER_POOL_SIZE, DB_WORKER_MAX_OVERFLOW),
+}
+
+
+class PoolStats:
+    """The counters of a connection pool (kept across its recreations)."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.checkouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.overflows = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def timed_get(
+        self, do_get: Callable[[], sa_pool.ConnectionPoolEntry]
+    ) -> sa_pool.ConnectionPoolEntry:
+        """Get a connection from the pool, timing the wait.
+
+        Parameters
+        ----------
+        do_get : Callable[[], sa_pool.ConnectionPoolEntry]
+            The pool's getter.
+
+        Returns
+        -------
+        sa_pool.ConnectionPoolEntry
+            The pool's entry.
+
+        Raises
+        ------
+        sa_exc.TimeoutError
+            If no connection was available in time.
+        """
+        started = time.perf_counter()
+        try:
+            return do_get()
+        except sa_exc.TimeoutError:
+            self.timeouts += 1
+            LOG.warning("Timed out waiting for a database connection")
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.waits += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    # noinspection PyUnusedLocal
+    def on_checkout(  # pylint: disable=unused-argument
+        self,
+        dbapi_connection: DBAPIConnection,
+        connection_record: sa_pool.ConnectionPoolEntry,
+        connection_proxy: sa_pool.PoolProxiedConnection,
+    ) -> None:
+        """Count a connection's checkout.
+
+        Parameters
+        ----------
+        dbapi_connection : DBAPIConnection
+            The database connection.
+        connection_record : sa_pool.ConnectionPoolEntry
+            The connection pool entry.
+        connection_proxy : sa_pool.PoolProxiedConnection
+            The checked out connection.
+        """
+        self.checkouts += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+
+    # noinspection PyUnusedLocal
+    def on_checkin(  # pylint: disable=unused-argument
+        self,
+        dbapi_connection: DBAPIConnection | None,
+        connection_record: sa_pool.ConnectionPoolEntry,
+    ) -> None:
+        """Count a connection's return.
+
+        Parameters
+        ----------
+        dbapi_connection : DBAPIConnection | None
+            The database connection (None if invalidated).
+        connection_record : sa_pool.ConnectionPoolEntry
+            The connection pool entry.
+        """
+        self.in_use = max(0, self.in_use - 1)
+
+    def metrics(self) -> dict[str, float]:
+        """Get the counters.
+
+        Returns
+        -------
+        dict[str, float]
+            The checkouts, the connections in use (now and at most),
+            the overflow connections opened, the checkouts that timed
+            out and the checkouts' wait (average and max, in ms).
+        """
+        wait_avg = self.wait_total / self.waits if self.waits else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "overflow_events": self.overflows,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(wait_avg * 1000, 3),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class InstrumentedQueuePool(sa_pool.AsyncAdaptedQueuePool):
+    """A queue pool that counts its checkouts' waits and overflows."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the pool.
+
+        Parameters
+        ----------
+        *args : Any
+            The pool's positional arguments.
+        **kwargs : Any
+            The pool's keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> sa_pool.ConnectionPoolEntry:
+        return self.stats.timed_get(super()._do_get)
+
+    def _create_connection(self) -> sa_pool.ConnectionPoolEntry:
+        entry = super()._create_connection()
+        if self.overflow() > 0:
+            self.stats.overflows += 1
+        return entry
+
+    def recreate(self) -> sa_pool.QueuePool:
+        """Recreate the pool (on dispose), keeping the counters.
+
+        Returns
+        -------
+        sa_pool.QueuePool
+            The new pool.
+        """
+        new_pool = super().recreate()
+        if isinstance(new_pool, InstrumentedQueuePool):
+            new_pool.stats = self.stats
+        return new_pool
+
+
+class InstrumentedNullPool(sa_pool.NullPool):
+    """A pool without pooling (e.g. behind PgBouncer) that times connects."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the pool.
+
+        Parameters
+        ----------
+        *args : Any
+            The pool's positional arguments.
+        **kwargs : Any
+            The pool's keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> sa_pool.ConnectionPoolEntry:
+        return self.stats.timed_get(super()._do_get)
+
+    def recreate(self) -> sa_pool.NullPool:
+        """Recreate the pool (on dispose), keeping the counters.
+
+        Returns
+        -------
+        sa_pool.NullPool
+            The new pool.
+        """
+        new_pool = super().recreate()
+        if isinstance(new_pool, InstrumentedNullPool):
+            new_pool.stats = self.stats
+        return new_pool
+
 
 class DatabaseManager:
     """Database connection manager with retries and proper session handling."""
 
     engine: AsyncEngine | None = None
     session_maker: async_sessionmaker[AsyncSession] | None = None
+    replica_engine: AsyncEngine | None = None
+    replica_session_maker: async_sessionmaker[AsyncSession] | None = None
     _db_url: str
     _db_lock = Lock()
 
-    def __init__(self, settings: "Settings") -> None:
-        """Initialize the database manager."""
+    def __init__(
+        self,
+        settings: "Settings",
+        replica_url: str | None = None,
+        pin_seconds: float = DB_REPLICA_PIN_SECONDS,
+        role: DatabaseRole = "api",
+        pgbouncer: bool = DB_PGBOUNCER,
+    ) -> None:
+        """Initialize the database manager.
+
+        Parameters
+        ----------
+        settings : Settings
+            The settings instance.
+        replica_url : str | None, optional
+            A read replica's URL, by default the configured one
+            (only with PostgreSQL).
+        pin_seconds : float, optional
+            How long a client reads from the primary after a write.
+        role : DatabaseRole, optional
+            The process' role, for its pools' sizes, by default "api".
+        pgbouncer : bool, optional
+            Whether the database is behind PgBouncer (no pooling and
+            no prepared statements), by default the configured one.
+        """
         self.settings = settings
         self._db_url = self.settings.get_database_url()
+        if replica_url is None and settings.postgres:
+            replica_url = DB_REPLICA_URL
+        self._replica_url = replica_url
+        self._pin_seconds = pin_seconds
+        self._pinned: dict[str, float] = {}
+        self._role = role
+        self._pgbouncer = pgbouncer
         self.setup()
 
     def setup(self) -> None:
         """Setup the database connection."""
+        self.engine, self.session_maker = self._create_engine(self._db_url)
+        LOG.info("Database configured with %s", self._db_url)
+        if self._replica_url:
+            self.replica_engine, self.replica_session_maker = (
+                self._create_engine(self._replica_url)
+            )
+            LOG.info("Database read replica configured")
+
+    def _create_engine(
+        self,
+        db_url: str,
+    ) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+        """Create an engine and its session maker."""
 
         def _serializer(obj: Any) -> str:
             """Serialize JSON objects for the database.
@@ -61,17 +325,37 @@ class DatabaseManager:
             return json.dumps(obj, ensure_ascii=False)
 
         engine_creation_args: dict[str, Any] = {
-            "pool_recycle": 1800,
+            "poolclass": InstrumentedQueuePool,
+            "pool_recycle": DB_POOL_RECYCLE if DB_POOL_RECYCLE > 0 else -1,
             "pool_pre_ping": True,
             "json_serializer": _serializer,
             "echo": False,
         }
-        if "sqlite" not in self._db_url:  # pragma: no cover
+        pgbouncer = self._pgbouncer and "sqlite" not in db_url
+        if pgbouncer:  # pragma: no cover
+            # PgBouncer pools the connections
+            engine_creation_args.update(
+                {
+                    "poolclass": InstrumentedNullPool,
+                    "pool_pre_ping": False,
+                    "connect_args": prepared_statements_connect_args(
+                        db_url,
+                        DB_PREPARE_THRESHOLD,
+                        DB_PREPARED_STATEMENTS,
+                        pgbouncer=True,
+                    ),
+                }
+            )
+        elif "sqlite" not in db_url:  # pragma: no cover
+            pool_size, max_overflow = POOL_SIZES[self._role]
             engine_creation_args.update(
                 {
-                    "pool_size": 10,
-                    "max_overflow": 20,
-                    "pool_timeout": 30,
+                    "pool_size": pool_size,
+                    "max_overflow": max_overflow,
+                    "pool_timeout": DB_POOL_TIMEOUT,
+                    "connect_args": prepared_statements_connect_args(
+                        db_url, DB_PREPARE_THRESHOLD, DB_PREPARED_STATEMENTS
+                    ),
                 }
             )
         else:
@@ -80,22 +364,31 @@ class DatabaseManager:
                 "timeout": 60,
             }
 
-        self.engine = create_async_engine(
-            self._db_url,
+        engine = create_async_engine(
+            db_url,
             **engine_creation_args,
         )
 
-        self.session_maker = async_sessionmaker(
-            bind=self.engine,
+        session_maker = async_sessionmaker(
+            bind=engine,
             class_=AsyncSession,
             expire_on_commit=False,
             autoflush=False,
         )
 
-        if self.is_sqlite:
-            listen(self.engine.sync_engine, "connect", _set_sqlite_pragma)
-
-        LOG.info("Database configured with %s", self._db_url)
+        if "sqlite" in db_url:
+            listen(engine.sync_engine, "connect", _set_sqlite_pragma)
+        elif (
+            "+psycopg" in db_url
+            and DB_PREPARED_STATEMENTS > 0
+            and not pgbouncer
+        ):
+            listen(engine.sync_engine, "connect", _set_psycopg_prepared_max)
+        stats = getattr(engine.sync_engine.pool, "stats", None)
+        if isinstance(stats, PoolStats):
+            listen(engine.sync_engine.pool, "checkout", stats.on_checkout)
+            listen(engine.sync_engine.pool, "checkin", stats.on_checkin)
+        return engine, session_maker
 
     @property
     def is_sqlite(self) -> bool:
@@ -108,8 +401,25 @@ class DatabaseManager:
         """
         return "sqlite" in self._db_url
 
+    def pool_metrics(self) -> dict[str, dict[str, float]]:
+        """Get the connection pools' metrics (of this process).
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            The primary's (and the read replica's) pool metrics.
+        """
+        metrics: dict[str, dict[str, float]] = {}
+        if self.engine is not None:
+            metrics["primary"] = engine_pool_metrics(self.engine)
+        if self.replica_engine is not None:
+            metrics["replica"] = engine_pool_metrics(self.replica_engine)
+        return metrics
+
     async def close(self) -> None:
         """Close the database connection."""
+        if self.replica_engine:
+            await self.replica_engine.dispose()
         if self.engine:
             if self.is_sqlite:
                 connection = await self.engine.raw_connection()
@@ -118,11 +428,64 @@ class DatabaseManager:
             LOG.info("Database connection closed.")
         self.engine = None
         self.session_maker = None
+        self.replica_engine = None
+        self.replica_session_maker = None
+
+    def pin_to_primary(self, client_id: str) -> None:
+        """Read a client's data from the primary for a while.
+
+        Parameters
+        ----------
+        client_id : str
+            The client's ID.
+        """
+        if self.replica_session_maker is None or self._pin_seconds <= 0:
+            return
+        now = time.monotonic()
+        if len(self._pinned) >= MAX_PINNED_CLIENTS:
+            self._pinned = {
+                key: until for key, until in self._pinned.items() if until > now
+            }
+        self._pinned[client_id] = now + self._pin_seconds
+
+    def is_pinned(self, client_id: str) -> bool:
+        """Check if a client must read from the primary.
+
+        Parameters
+        ----------
+        client_id : str
+            The client's ID.
+
+        Returns
+        -------
+        bool
+            True if the client has written recently.
+        """
+        until = self._pinned.get(client_id)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._pinned.pop(client_id, None)
+            return False
+        return True
 
     @contextlib.asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
+    async def session(
+        self,
+        readonly: bool = False,
+        client_id: str | None = None,
+    ) -> AsyncIterator[AsyncSession]:
         """Get a database session with retries.
 
+        Parameters
+        ----------
+        readonly : bool, optional
+            Only for reading: use the read replica if there is one
+            (and the client has not written recently), by default False.
+        client_id : str | None, optional
+            The client the session is for. A client whose writes are
+            committed reads from the primary for a while.
+
         Yields
         ------
         AsyncSession
@@ -142,7 +505,20 @@ class DatabaseManager:
         if self.session_maker is None:  # pragma: no cover
             raise RuntimeError("Database not initialized. Call setup() first.")
 
-        session = self.session_maker()
+        session_maker = self.session_maker
+        if (
+            readonly
+            and self.replica_session_maker is not None
+            and not (client_id and self.is_pinned(client_id))
+        ):
+            session_maker = self.replica_session_maker
+        session = session_maker()
+        if client_id and not readonly and self.replica_session_maker:
+            listen(
+                session.sync_session,
+                "after_commit",
+                lambda _session: self.pin_to_primary(client_id),
+            )
         try:
             yield session
         except Exception:
@@ -156,6 +532,97 @@ class DatabaseManager:
                 await session.close()
 
 
+def engine_pool_metrics(engine: AsyncEngine) -> dict[str, float]:
+    """Get an engine's pool metrics.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        The engine.
+
+    Returns
+    -------
+    dict[str, float]
+        The pool's counters and, for a queue pool, its size, its
+        idle connections and its current overflow.
+    """
+    pool = engine.sync_engine.pool
+    stats = getattr(pool, "stats", None)
+    metrics = stats.metrics() if isinstance(stats, PoolStats) else {}
+    if isinstance(pool, sa_pool.QueuePool):
+        metrics.update(
+            {
+                "pool_size": pool.size(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        )
+    return metrics
+
+
+def prepared_statements_connect_args(
+    db_url: str,
+    prepare_threshold: int,
+    prepared_statements: int,
+    pgbouncer: bool = False,
+) -> dict[str, Any]:
+    """Get the driver's connect args for the prepared statements.
+
+    Parameters
+    ----------
+    db_url : str
+        The database URL.
+    prepare_threshold : int
+        After how many executions psycopg prepares a statement
+        (<0: never).
+    prepared_statements : int
+        The asyncpg statement cache's size (<=0: the default).
+    pgbouncer : bool, optional
+        Behind PgBouncer: no prepared statements, by default False.
+
+    Returns
+    -------
+    dict[str, Any]
+        The connect args.
+    """
+    if "+asyncpg" in db_url:
+        if pgbouncer:
+            # the next transaction might use another server connection
+            return {
+                "prepared_statement_cache_size": 0,
+                "statement_cache_size": 0,
+            }
+        if prepared_statements > 0:
+            return {"prepared_statement_cache_size": prepared_statements}
+        return {}
+    if "+psycopg" in db_url:
+        if pgbouncer or prepare_threshold < 0:
+            return {"prepare_threshold": None}
+        return {"prepare_threshold": prepare_threshold}
+    return {}
+
+
+# noinspection PyUnusedLocal
+def _set_psycopg_prepared_max(
+    dbapi_connection: DBAPIConnection,
+    connection_record: ConnectionPoolEntry,  # pylint: disable=unused-argument
+) -> None:
+    """Set the max prepared statements of a psycopg connection.
+
+    Parameters
+    ----------
+    dbapi_connection : DBAPIConnection
+        The database connection.
+    connection_record : ConnectionPoolEntry
+        The connection pool entry.
+    """
+    driver_connection: Any = getattr(
+        dbapi_connection, "driver_connection", None
+    )
+    if hasattr(driver_connection, "prepared_max"):
+        driver_connection.prepared_max = DB_PREPARED_STATEMENTS
+
+
 # noinspection PyUnusedLocal
 def _set_sqlite_pragma(
     dbapi_connection: DBAPIConnection,
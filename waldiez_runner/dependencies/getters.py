@@ -15,6 +15,7 @@ from waldiez_runner.services.client_service import ClientService
 from .auth import (
     ADMIN_API_AUDIENCE,
     TASK_API_AUDIENCE,
+    checked_audience,
     get_client_id_from_token,
     verify_external_auth_token,
 )
@@ -23,6 +24,7 @@ from .database import DatabaseManager
 from .jwks import JWKSCache
 from .lifecycle import app_state
 from .storage import Storage, get_storage_backend
+from .token_cache import verified_tokens
 
 bearer_scheme = HTTPBearer()
 
@@ -45,6 +47,60 @@ async def get_db_manager() -> AsyncGenerator[DatabaseManager, None]:
     yield app_state.db
 
 
+async def verify_client_token(
+    expected_audience: str | list[str] | None,
+    token: str,
+    settings: Settings,
+    jwks_cache: JWKSCache,
+    db_manager: DatabaseManager,
+) -> tuple[str | None, str | list[str] | None, BaseException | None]:
+    """Verify a (local or OIDC) token and get its client's database id.
+
+    Verified tokens are cached until they expire, so a known token
+    needs neither a signature check nor a database query.
+
+    Parameters
+    ----------
+    expected_audience : str | list[str] | None
+        The expected audience(s).
+    token : str
+        The token.
+    settings : Settings
+        The settings instance.
+    jwks_cache : JWKSCache
+        The JWKS cache.
+    db_manager : DatabaseManager
+        The database session manager.
+
+    Returns
+    -------
+    tuple[str | None, str | list[str] | None, BaseException | None]
+        The client's database id, the token's audience
+        and the verification exception if any.
+
+    Raises
+    ------
+    HTTPException
+        If the token is valid but its client does not exist.
+    """
+    cached = verified_tokens.get(
+        token, checked_audience(expected_audience, settings)
+    )
+    if cached is not None:
+        return cached.db_id, cached.audience, None
+    client_id, token_audience, exception = await get_client_id_from_token(
+        expected_audience, token, settings, jwks_cache
+    )
+    if not client_id or exception:
+        return None, None, exception
+    async with db_manager.session() as session:
+        client = await ClientService.get_client_in_db(session, None, client_id)
+    if not client:
+        raise HTTPException(status_code=401, detail="Invalid credentials.")
+    verified_tokens.put(token, client_id, token_audience, client.id)
+    return client.id, token_audience, None
+
+
 # pylint: disable=line-too-long
 def get_client_id(
     *expected_audiences: str, allow_external_auth: bool = True
@@ -119,22 +175,12 @@ def get_client_id(
         if not settings or not jwks_cache:
             raise RuntimeError("Settings or JWKs cache not initialized")
 
-        # First try standard JWT verification
-        client_id, _, exception = await get_client_id_from_token(
-            audience, token, settings, jwks_cache
+        # First try standard JWT verification (and the client in the db)
+        db_id, _, exception = await verify_client_token(
+            audience, token, settings, jwks_cache, db_manager
         )
-
-        # If successful, verify the client exists in the database
-        if client_id and not exception:
-            async with db_manager.session() as session:
-                client = await ClientService.get_client_in_db(
-                    session, None, client_id
-                )
-            if not client:
-                raise HTTPException(
-                    status_code=401, detail="Invalid credentials."
-                )
-            return client.id
+        if db_id:
+            return db_id
 
         # If standard auth failed and external auth is allowed, try that next
         if allow_external_auth and settings.enable_external_auth:
@@ -229,23 +275,13 @@ def get_client_id_with_admin_check(
         # Accept both task and admin audiences
         expected_audiences = [TASK_API_AUDIENCE, ADMIN_API_AUDIENCE]
 
-        # First try standard JWT verification
-        client_id, token_audience, exception = await get_client_id_from_token(
-            expected_audiences, token, settings, jwks_cache
+        # First try standard JWT verification (and the client in the db)
+        db_id, token_audience, exception = await verify_client_token(
+            expected_audiences, token, settings, jwks_cache, db_manager
         )
-
-        # If successful, verify the client exists in the database
-        if client_id and not exception:
-            async with db_manager.session() as session:
-                client = await ClientService.get_client_in_db(
-                    session, None, client_id
-                )
-            if not client:
-                raise HTTPException(
-                    status_code=401, detail="Invalid credentials."
-                )
+        if db_id:
             is_admin = token_audience == ADMIN_API_AUDIENCE
-            return client.id, is_admin
+            return db_id, is_admin
 
         # If standard auth failed and external auth is allowed, try that next
         if allow_external_auth and settings.enable_external_auth:
@@ -358,22 +394,12 @@ def get_admin_client_id(
                 )
             )
 
-        # First try standard JWT verification
-        client_id, _, exception = await get_client_id_from_token(
-            audience, token, settings, jwks_cache
+        # First try standard JWT verification (and the client in the db)
+        db_id, _, exception = await verify_client_token(
+            audience, token, settings, jwks_cache, db_manager
         )
-
-        # If successful, verify the client exists in the database
-        if client_id and not exception:
-            async with db_manager.session() as session:
-                client = await ClientService.get_client_in_db(
-                    session, None, client_id
-                )
-                if not client:
-                    raise HTTPException(
-                        status_code=401, detail="Invalid credentials."
-                    )
-                return client.id
+        if db_id:
+            return db_id
 
         # If standard auth failed and external auth is allowed, try that next
         if allow_external_auth and settings.enable_external_auth:
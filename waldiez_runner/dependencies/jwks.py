@@ -1,33 +1,108 @@
 # SPDX-License-Identifier: Apache-2.0.
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-instance-attributes,broad-exception-caught
+
 """JSON Web Key Set (JWKS) utilities."""
 
 import asyncio
+import logging
 import time
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 import httpx
+import jwt
+import jwt.algorithms
 
 if TYPE_CHECKING:
     from waldiez_runner.config import Settings
 
+LOG = logging.getLogger(__name__)
+
+
+class JWKey(NamedTuple):
+    """A parsed public key of the key set."""
+
+    key: Any
+    """The public key object."""
+    alg: str
+    """The key's algorithm."""
+
+
+def parse_jwks(jwks: dict[str, Any]) -> dict[str, JWKey]:
+    """Parse the RSA keys of a key set.
+
+    Keys without a ``kid`` or that cannot be parsed are skipped.
+
+    Parameters
+    ----------
+    jwks : dict[str, Any]
+        The JWKS response.
+
+    Returns
+    -------
+    dict[str, JWKey]
+        The parsed keys by their ``kid``.
+    """
+    keys: dict[str, JWKey] = {}
+    for jwk in jwks.get("keys", []):
+        if not isinstance(jwk, dict) or not jwk.get("kid"):
+            continue
+        try:
+            public_key = jwt.algorithms.RSAAlgorithm.from_jwk(jwk)
+        except (jwt.PyJWTError, ValueError, KeyError, TypeError) as err:
+            LOG.warning("Skipping JWK %s: %s", jwk.get("kid"), err)
+            continue
+        keys[str(jwk["kid"])] = JWKey(public_key, jwk.get("alg", "RS256"))
+    return keys
+
 
-# pylint: disable=too-few-public-methods
 class JWKSCache:
-    """Cache for JWKS keys."""
+    """Cache for JWKS keys.
 
-    def __init__(self, settings: "Settings"):
+    The keys are parsed once per fetch and looked up by ``kid``. Shortly
+    before they expire (``refresh_ahead`` of the TTL), they are refreshed
+    in the background while the current ones are still served; if the
+    identity provider is slow or down, the stale keys keep being served
+    for up to ``max_stale`` seconds. Callers only wait for the provider
+    on the first fetch, once the keys are too stale, or when a token
+    has an unknown ``kid`` (a key rotation), which forces a refresh at
+    most once per ``min_refresh_interval``.
+    """
+
+    def __init__(
+        self,
+        settings: "Settings",
+        refresh_ahead: float = 0.1,
+        max_stale: float | None = None,
+        min_refresh_interval: float = 30.0,
+    ):
         """Initialize the JWKS cache.
 
         Parameters
         ----------
         settings : Settings
             The settings instance.
+        refresh_ahead : float, optional
+            Fraction of the TTL before the expiry to start refreshing in
+            the background, by default 0.1.
+        max_stale : float | None, optional
+            Seconds to keep serving expired keys while they cannot be
+            refreshed, by default the TTL.
+        min_refresh_interval : float, optional
+            Minimum seconds between refreshes that are not due to the
+            expiry (unknown ``kid`` or retries), by default 30.
         """
         self.settings = settings
         self.cache_ttl = settings.oidc_jwks_cache_ttl
+        self.refresh_ahead = min(max(refresh_ahead, 0.0), 1.0)
+        self.max_stale = self.cache_ttl if max_stale is None else max_stale
+        self.min_refresh_interval = min(min_refresh_interval, self.cache_ttl)
         self._cache: dict[str, Any] | None = None
         self._cache_expiry = 0.0
+        self._keys: dict[str, JWKey] = {}
+        self._last_attempt = 0.0
+        self._refresh_task: asyncio.Task[None] | None = None
         self._lock = asyncio.Lock()
         if settings.use_oidc_auth and not settings.oidc_jwks_url:
             raise ValueError("OIDC JWKS URL is required for OIDC auth")
@@ -45,8 +120,11 @@ class JWKSCache:
         dict[str, Any]
             The JWKS keys.
         """
-        # Fast path: use cache if still valid
-        if self._cache and time.time() < self._cache_expiry:
+        now = time.time()
+        # Fast path: use cache if still valid (or not too stale)
+        if self._cache and now < self._cache_expiry + self.max_stale:
+            if now >= self._refresh_at():
+                self._schedule_refresh(now)
             return self._cache
 
         # Slow path: Acquire lock and fetch keys if still expired
@@ -56,10 +134,83 @@ class JWKSCache:
                 self._cache and time.time() < self._cache_expiry
             ):  # pragma: no cover
                 return self._cache
+            return await self._fetch()
+
+    async def get_key(self, kid: str | None) -> JWKey | None:
+        """Get the parsed public key of a ``kid``.
+
+        Parameters
+        ----------
+        kid : str | None
+            The token's key id.
+
+        Returns
+        -------
+        JWKey | None
+            The key, None if the key set has no such key.
+        """
+        await self.get_keys()
+        if not kid:
+            return None
+        key = self._keys.get(kid)
+        if key is None and self._may_refresh(time.time()):
+            await self._refresh(self._last_attempt)
+            key = self._keys.get(kid)
+        return key
+
+    async def close(self) -> None:
+        """Stop any background refresh and close the HTTP client."""
+        task, self._refresh_task = self._refresh_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._http_client.aclose()
+
+    def _refresh_at(self) -> float:
+        return self._cache_expiry - self.cache_ttl * self.refresh_ahead
+
+    def _may_refresh(self, now: float) -> bool:
+        return now - self._last_attempt >= self.min_refresh_interval
+
+    def _schedule_refresh(self, now: float) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        # after a failed refresh, retry at most once per interval
+        if self._last_attempt >= self._refresh_at() and not self._may_refresh(
+            now
+        ):
+            return
+        self._refresh_task = asyncio.create_task(
+            self._background_refresh(), name="jwks-refresh"
+        )
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self._refresh(self._last_attempt)
+        except Exception as err:
+            LOG.warning("JWKS refresh failed, serving stale keys: %s", err)
+
+    async def _refresh(self, last_attempt: float) -> None:
+        async with self._lock:
+            # single flight: skip if someone refreshed while we waited
+            if self._last_attempt != last_attempt:
+                return
+            try:
+                await self._fetch()
+            except Exception as err:
+                LOG.warning("JWKS refresh failed: %s", err)
+                if self._cache is None:
+                    raise
 
-            response = await self._http_client.get(self.jwks_url)
-            response.raise_for_status()
-            keys = response.json()
-            self._cache_expiry = time.time() + self.cache_ttl
-            self._cache = keys
-            return keys
+    async def _fetch(self) -> dict[str, Any]:
+        self._last_attempt = time.time()
+        response = await self._http_client.get(self.jwks_url)
+        response.raise_for_status()
+        keys = response.json()
+        self._keys = parse_jwks(keys)
+        self._cache_expiry = time.time() + self.cache_ttl
+        self._cache = keys
+        return keys
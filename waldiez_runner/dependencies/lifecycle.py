@@ -5,8 +5,9 @@
 import logging
 
 from waldiez_runner.config import Settings, SettingsManager
+from waldiez_runner.hashing import hashing_pool
 from waldiez_runner.models import Base
-from waldiez_runner.services import TaskService
+from waldiez_runner.services import TaskService, close_http_client
 
 from .database import DatabaseManager
 from .jwks import JWKSCache
@@ -56,6 +57,8 @@ async def on_shutdown() -> None:
                 await TaskService.mark_active_tasks_as_failed(session)
         except BaseException as e:  # pragma: no cover
             LOG.error("Error marking tasks as failed: %s", e)
+        if app_state.redis is not None:
+            await _reconcile_task_counters(app_state.db, app_state.redis)
         try:
             await app_state.db.close()
         except BaseException as e:  # pragma: no cover
@@ -65,3 +68,31 @@ async def on_shutdown() -> None:
             await app_state.redis.close()
         except BaseException as e:  # pragma: no cover
             LOG.error("Error closing Redis client: %s", e)
+    await _close_clients_and_pools()
+
+
+async def _reconcile_task_counters(
+    db: DatabaseManager, redis: RedisManager
+) -> None:
+    # pylint: disable=broad-exception-caught
+    try:
+        async with db.session() as session:
+            await TaskService.reconcile_task_counters(
+                session, await redis.client()
+            )
+    except BaseException as e:  # pragma: no cover
+        LOG.error("Error reconciling the task counters: %s", e)
+
+
+async def _close_clients_and_pools() -> None:
+    # pylint: disable=broad-exception-caught
+    if app_state.jwks_cache is not None:
+        try:
+            await app_state.jwks_cache.close()
+        except BaseException as e:  # pragma: no cover
+            LOG.error("Error closing JWKS cache: %s", e)
+    try:
+        await close_http_client()
+    except BaseException as e:  # pragma: no cover
+        LOG.error("Error closing external verification client: %s", e)
+    hashing_pool.shutdown()
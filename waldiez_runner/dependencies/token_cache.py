@@ -0,0 +1,358 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-try-statements,broad-exception-caught
+
+"""Cache of verified (local or OIDC) tokens.
+
+A verified token and the client it belongs to are kept (by the token's
+digest) until the token expires, so authenticating the same token again
+needs no signature check and no database query. Entries of updated or
+deleted clients are dropped in every API process through Redis pub/sub.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+import jwt
+from redis.exceptions import RedisError
+
+from waldiez_runner.config import AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_CACHE_TTL
+
+from .lifecycle import app_state
+from .redis import RedisManager
+
+LOG = logging.getLogger(__name__)
+
+TOKEN_INVALIDATION_CHANNEL = "auth:clients:invalidate"
+
+
+class VerifiedToken(NamedTuple):
+    """A verified token's client."""
+
+    client_id: str
+    """The token's subject (the client's client_id)."""
+    audience: str | list[str] | None
+    """The token's audience."""
+    db_id: str
+    """The client's database id."""
+    expires_at: float
+    """When to stop using the entry (epoch seconds)."""
+
+
+def token_digest(token: str) -> str:
+    """Get the cache key of a token.
+
+    Parameters
+    ----------
+    token : str
+        The token.
+
+    Returns
+    -------
+    str
+        The token's SHA-256 hex digest.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def token_expiry(token: str) -> float | None:
+    """Get the expiry of an already verified token.
+
+    Parameters
+    ----------
+    token : str
+        The token.
+
+    Returns
+    -------
+    float | None
+        The ``exp`` claim, None if the token has none.
+    """
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return None
+    expiry = claims.get("exp")
+    if isinstance(expiry, (int, float)) and not isinstance(expiry, bool):
+        return float(expiry)
+    return None
+
+
+def audience_matches(
+    audience: str | list[str] | None,
+    expected_audience: str | list[str] | None,
+) -> bool:
+    """Check a token's audience like the token verification does.
+
+    Parameters
+    ----------
+    audience : str | list[str] | None
+        The token's audience.
+    expected_audience : str | list[str] | None
+        The expected audience(s), None for any.
+
+    Returns
+    -------
+    bool
+        True if any of the expected audiences is in the token's ones.
+    """
+    if not expected_audience:
+        return True
+    expected = (
+        [expected_audience]
+        if isinstance(expected_audience, str)
+        else expected_audience
+    )
+    actual = [audience] if isinstance(audience, str) else audience or []
+    return any(item in actual for item in expected)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of verified tokens."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        max_ttl: float = 300.0,
+        retry_delay: float = 1.0,
+        redis: RedisManager | None = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        max_size : int, optional
+            Maximum cached tokens, by default 1024 (<=0: no cache).
+        max_ttl : float, optional
+            Maximum seconds to keep a token, by default 300.
+        retry_delay : float, optional
+            Seconds to wait after losing the invalidation channel,
+            by default 1.0.
+        redis : RedisManager | None, optional
+            The Redis manager to use, by default the app's one.
+        """
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.retry_delay = retry_delay
+        self.redis = redis
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, VerifiedToken] = OrderedDict()
+        self._listener: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        """Get the number of cached tokens.
+
+        Returns
+        -------
+        int
+            The number of cached tokens.
+        """
+        return len(self._entries)
+
+    def get(
+        self, token: str, expected_audience: str | list[str] | None
+    ) -> VerifiedToken | None:
+        """Get a cached token if it is still valid for the audience.
+
+        Parameters
+        ----------
+        token : str
+            The token.
+        expected_audience : str | list[str] | None
+            The expected audience(s).
+
+        Returns
+        -------
+        VerifiedToken | None
+            The cached entry, None if not cached, expired or
+            not for this audience.
+        """
+        key = token_digest(token)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.time():
+            del self._entries[key]
+            entry = None
+        if entry is None or not audience_matches(
+            entry.audience, expected_audience
+        ):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        token: str,
+        client_id: str,
+        audience: str | list[str] | None,
+        db_id: str,
+    ) -> VerifiedToken | None:
+        """Cache a verified token until it expires (at most max_ttl).
+
+        Tokens without an expiry are not cached.
+
+        Parameters
+        ----------
+        token : str
+            The verified token.
+        client_id : str
+            The token's subject.
+        audience : str | list[str] | None
+            The token's audience.
+        db_id : str
+            The client's database id.
+
+        Returns
+        -------
+        VerifiedToken | None
+            The cached entry, None if the token was not cached.
+        """
+        expiry = token_expiry(token)
+        if self.max_size <= 0 or expiry is None:
+            return None
+        expires_at = min(expiry, time.time() + self.max_ttl)
+        if expires_at <= time.time():
+            return None
+        entry = VerifiedToken(client_id, audience, db_id, expires_at)
+        key = token_digest(token)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, client_ids: list[str]) -> int:
+        """Drop the tokens of clients.
+
+        Parameters
+        ----------
+        client_ids : list[str]
+            The clients' database ids or client_ids.
+
+        Returns
+        -------
+        int
+            The number of dropped tokens.
+        """
+        ids = set(client_ids)
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if entry.db_id in ids or entry.client_id in ids
+        ]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all the cached tokens."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get the cache's size and counters.
+
+        Returns
+        -------
+        dict[str, int]
+            The cached tokens, the hits and the misses.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def start_listener(self) -> None:
+        """Start listening for invalidations (if not already started)."""
+        if self.max_size <= 0 or (self._listener and not self._listener.done()):
+            return
+        self._listener = asyncio.create_task(
+            self._listen(), name="auth-token-cache-invalidations"
+        )
+
+    async def stop_listener(self) -> None:
+        """Stop listening for invalidations."""
+        listener, self._listener = self._listener, None
+        if listener is None or listener.done():
+            return
+        listener.cancel()
+        try:
+            await listener
+        except asyncio.CancelledError:
+            pass
+
+    async def _listen(self) -> None:
+        redis_manager = self.redis or app_state.redis
+        if not redis_manager:  # pragma: no cover
+            raise RuntimeError("Redis not initialized")
+        while True:
+            try:
+                async with redis_manager.contextual_client(
+                    use_single_connection=True
+                ) as redis:
+                    pubsub = redis.pubsub()
+                    await pubsub.subscribe(TOKEN_INVALIDATION_CHANNEL)
+                    try:
+                        async for message in pubsub.listen():
+                            if message.get("type") == "message":
+                                self._on_invalidation(message.get("data"))
+                    finally:
+                        await pubsub.close()
+            except (RedisError, OSError) as err:
+                # invalidations might have been missed
+                LOG.warning("Token invalidation channel lost: %s", err)
+                self.clear()
+                await asyncio.sleep(self.retry_delay)
+
+    def _on_invalidation(self, data: Any) -> None:
+        try:
+            client_ids = json.loads(data)
+        except (TypeError, ValueError):
+            LOG.warning("Invalid token invalidation message: %s", data)
+            return
+        if isinstance(client_ids, list):
+            self.invalidate([str(item) for item in client_ids])
+
+
+async def invalidate_client_tokens(
+    client_ids: list[str],
+    cache: "VerifiedTokenCache | None" = None,
+    redis: RedisManager | None = None,
+) -> None:
+    """Drop the cached tokens of clients in all API processes.
+
+    Parameters
+    ----------
+    client_ids : list[str]
+        The updated or deleted clients' database ids or client_ids.
+    cache : VerifiedTokenCache | None, optional
+        This process' cache, by default the app's one.
+    redis : RedisManager | None, optional
+        The Redis manager to use, by default the app's one.
+    """
+    if not client_ids:
+        return
+    (cache or verified_tokens).invalidate(client_ids)
+    redis_manager = redis or app_state.redis
+    if not redis_manager:  # pragma: no cover
+        return
+    try:
+        async with redis_manager.contextual_client() as client:
+            await client.publish(
+                TOKEN_INVALIDATION_CHANNEL, json.dumps(client_ids)
+            )
+    except Exception as err:
+        LOG.warning("Failed to publish token invalidation: %s", err)
+
+
+verified_tokens = VerifiedTokenCache(
+    max_size=AUTH_TOKEN_CACHE_SIZE, max_ttl=AUTH_TOKEN_CACHE_TTL
+)
@@ -4,8 +4,15 @@
 """Password hashing and verification."""
 
 from .dispatcher import PasswordHasherDispatcher
+from .pool import HashingPool, HashingPoolBusy, hashing_pool
 from .protocol import Hasher
 
 password_hasher: Hasher = PasswordHasherDispatcher()
 
-__all__ = ["password_hasher", "Hasher"]
+__all__ = [
+    "password_hasher",
+    "hashing_pool",
+    "Hasher",
+    "HashingPool",
+    "HashingPoolBusy",
+]
@@ -17,6 +17,28 @@ _SCRYPT_RE = re.compile(
     r"^scrypt\$n=(\d+)\$r=(\d+)\$p=(\d+)\$([A-Za-z0-9+/=]+)\$([A-Za-z0-9+/=]+)$"
 )
 
+_MAXMEM_SLACK = 1024 * 1024
+
+
+def scrypt_memory(n: int, r: int, p: int) -> int:
+    """Get the memory scrypt needs for some parameters.
+
+    Parameters
+    ----------
+    n : int
+        The CPU/memory cost.
+    r : int
+        The block size.
+    p : int
+        The parallelism.
+
+    Returns
+    -------
+    int
+        The bytes of its largest buffers (128 * r * (n + p)).
+    """
+    return 128 * r * (n + p)
+
 
 @dataclass(frozen=True)
 class ScryptHasher:
@@ -48,6 +70,8 @@ class ScryptHasher:
             r=r,
             p=p,
             dklen=dklen,
+            # the default limit (32 MiB) rejects n >= 2^15 with r=8
+            maxmem=scrypt_memory(n, r, p) + _MAXMEM_SLACK,
         )
 
     def hash(self, plain: str) -> str:
@@ -123,4 +147,4 @@ class ScryptHasher:
             return True
 
 
-__all__ = ["ScryptHasher"]
+__all__ = ["ScryptHasher", "scrypt_memory"]
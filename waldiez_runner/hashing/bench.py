@@ -0,0 +1,301 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Calibrate the secret hashing cost on the current host.
+
+Every token request verifies a client secret, so the hashing cost is a
+trade-off between the login latency (and the hashing pool's throughput)
+and the resistance to offline attacks. The best parameters depend on the
+host's CPU and memory: this measures the verify latency of a range of
+argon2 (or scrypt) parameters and recommends the strongest ones that are
+still within a target latency and memory. The recommendation can be
+written to the ``.env`` file; existing secrets are then upgraded to the
+new parameters on their next successful login.
+
+Usage: ``python -m waldiez_runner hashing-bench [--target-ms 250]``
+"""
+
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from waldiez_runner.config import ENV_PREFIX
+
+from ._argon_hasher import HAS_ARGON, Argon2Hasher
+from ._scrypt_hasher import ScryptHasher, scrypt_memory
+
+ARGON2_MEMORY_COSTS = (19456, 32768, 47104, 65536, 131072)  # KiB
+ARGON2_TIME_COSTS = (1, 2, 3, 4)
+SCRYPT_NS = (2**14, 2**15, 2**16, 2**17)
+SCRYPT_R = 8
+
+_BENCH_SECRET = "hashing-bench-secret"
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """The measured cost of some hashing parameters."""
+
+    algorithm: str
+    """The algorithm (argon2 or scrypt)."""
+    params: dict[str, int] = field(compare=False)
+    """The parameters (by their setting's name, without the prefix)."""
+    memory_mib: float
+    """The memory a verification needs (MiB)."""
+    verify_ms: float
+    """The median verify latency (ms)."""
+
+    def env(self) -> dict[str, str]:
+        """Get the environment variables of the parameters.
+
+        Returns
+        -------
+        dict[str, str]
+            The prefixed variable names and their values.
+        """
+        return {
+            f"{ENV_PREFIX}{key}": str(value)
+            for key, value in self.params.items()
+        }
+
+
+def argon2_candidates(
+    memory_costs: Iterable[int] = ARGON2_MEMORY_COSTS,
+    time_costs: Iterable[int] = ARGON2_TIME_COSTS,
+    parallelism: int = 1,
+) -> list[list[Any]]:
+    """Get the argon2 hashers to measure.
+
+    Parameters
+    ----------
+    memory_costs : Iterable[int], optional
+        The memory costs (KiB) to try.
+    time_costs : Iterable[int], optional
+        The time costs (iterations) to try.
+    parallelism : int, optional
+        The lanes, by default 1.
+
+    Returns
+    -------
+    list[list[Any]]
+        The hashers, one (time cost ascending) list per memory cost.
+        Empty if argon2 is not available.
+    """
+    if not HAS_ARGON:  # pragma: no cover
+        return []
+    return [
+        [
+            Argon2Hasher(
+                time_cost=time_cost,
+                memory_cost=memory_cost,
+                parallelism=parallelism,
+            )
+            for time_cost in sorted(time_costs)
+        ]
+        for memory_cost in sorted(memory_costs)
+    ]
+
+
+def scrypt_candidates(
+    ns: Iterable[int] = SCRYPT_NS, r: int = SCRYPT_R, p: int = 1
+) -> list[list[ScryptHasher]]:
+    """Get the scrypt hashers to measure.
+
+    Parameters
+    ----------
+    ns : Iterable[int], optional
+        The CPU/memory costs (powers of 2) to try.
+    r : int, optional
+        The block size, by default 8.
+    p : int, optional
+        The parallelism, by default 1.
+
+    Returns
+    -------
+    list[list[ScryptHasher]]
+        The hashers (N ascending) in a single list.
+    """
+    return [[ScryptHasher(n=n, r=r, p=p) for n in sorted(ns)]]
+
+
+def describe(hasher: Any) -> tuple[str, dict[str, int], float]:
+    """Get a hasher's algorithm, parameters and memory.
+
+    Parameters
+    ----------
+    hasher : Any
+        An Argon2Hasher or ScryptHasher.
+
+    Returns
+    -------
+    tuple[str, dict[str, int], float]
+        The algorithm, the parameters and the memory (MiB) it needs.
+    """
+    if isinstance(hasher, ScryptHasher):
+        return (
+            "scrypt",
+            {
+                "HASHING_SCRYPT_N": hasher.n,
+                "HASHING_SCRYPT_R": hasher.r,
+                "HASHING_SCRYPT_P": hasher.p,
+            },
+            round(scrypt_memory(hasher.n, hasher.r, hasher.p) / 2**20, 1),
+        )
+    return (
+        "argon2",
+        {
+            "HASHING_ARGON2_TIME_COST": hasher.time_cost,
+            "HASHING_ARGON2_MEMORY_COST": hasher.memory_cost,
+            "HASHING_ARGON2_PARALLELISM": hasher.parallelism,
+        },
+        hasher.memory_cost / 1024,
+    )
+
+
+def measure(hasher: Any, rounds: int = 5) -> float:
+    """Measure a hasher's verify latency.
+
+    Parameters
+    ----------
+    hasher : Any
+        An Argon2Hasher or ScryptHasher.
+    rounds : int, optional
+        The verifications to time, by default 5.
+
+    Returns
+    -------
+    float
+        The median verify latency (ms).
+    """
+    stored = hasher.hash(_BENCH_SECRET)
+    timings: list[float] = []
+    for _ in range(max(rounds, 1)):
+        started = time.perf_counter()
+        hasher.verify(_BENCH_SECRET, stored)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_bench(
+    candidates: list[list[Any]],
+    target_ms: float,
+    max_memory_mib: float,
+    rounds: int = 5,
+) -> list[BenchResult]:
+    """Measure the candidates within the memory limit.
+
+    In each list, the candidates after the first one that is slower
+    than the target are skipped (they can only be slower).
+
+    Parameters
+    ----------
+    candidates : list[list[Any]]
+        The hashers, in lists of ascending cost.
+    target_ms : float
+        The target verify latency (ms).
+    max_memory_mib : float
+        The maximum memory of a verification (MiB).
+    rounds : int, optional
+        The verifications to time per candidate, by default 5.
+
+    Returns
+    -------
+    list[BenchResult]
+        The measured candidates.
+    """
+    results: list[BenchResult] = []
+    for group in candidates:
+        for hasher in group:
+            algorithm, params, memory_mib = describe(hasher)
+            if memory_mib > max_memory_mib:
+                break
+            verify_ms = measure(hasher, rounds=rounds)
+            results.append(
+                BenchResult(algorithm, params, memory_mib, verify_ms)
+            )
+            if verify_ms > target_ms:
+                break
+    return results
+
+
+def recommend(
+    results: list[BenchResult], target_ms: float
+) -> BenchResult | None:
+    """Get the strongest parameters within the target latency.
+
+    Parameters
+    ----------
+    results : list[BenchResult]
+        The measured candidates.
+    target_ms : float
+        The target verify latency (ms).
+
+    Returns
+    -------
+    BenchResult | None
+        The candidate with the most memory (then the slowest one) that
+        verifies within the target, None if none does.
+    """
+    fitting = [result for result in results if result.verify_ms <= target_ms]
+    if not fitting:
+        return None
+    return max(
+        fitting, key=lambda result: (result.memory_mib, result.verify_ms)
+    )
+
+
+def format_results(
+    results: list[BenchResult], chosen: BenchResult | None = None
+) -> str:
+    """Format the measured candidates as a table.
+
+    Parameters
+    ----------
+    results : list[BenchResult]
+        The measured candidates.
+    chosen : BenchResult | None, optional
+        The recommended candidate (marked with ``*``).
+
+    Returns
+    -------
+    str
+        The table.
+    """
+    lines = [f"  {'algorithm':<9} {'memory':>10} {'verify':>10}  parameters"]
+    for result in results:
+        marker = "*" if result is chosen else " "
+        params = " ".join(
+            f"{key.split('_', 2)[-1].lower()}={value}"
+            for key, value in result.params.items()
+        )
+        lines.append(
+            f"{marker} {result.algorithm:<9} "
+            f"{result.memory_mib:>6.1f} MiB {result.verify_ms:>7.1f} ms"
+            f"  {params}"
+        )
+    return "\n".join(lines)
+
+
+def write_env(values: dict[str, str], path: Path) -> None:
+    """Set variables in a ``.env`` file (keeping the other lines).
+
+    Parameters
+    ----------
+    values : dict[str, str]
+        The variables to set.
+    path : Path
+        The ``.env`` file (created if missing).
+    """
+    pending = dict(values)
+    lines: list[str] = []
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            key = line.split("=", 1)[0].strip()
+            if "=" in line and key in pending:
+                line = f"{key}={pending.pop(key)}"
+            lines.append(line)
+    lines.extend(f"{key}={value}" for key, value in pending.items())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -5,6 +5,15 @@
 # flake8: noqa: E501,C901
 """Password hasher dispatcher supporting multiple hash formats."""
 
+from waldiez_runner.config import (
+    HASHING_ARGON2_MEMORY_COST,
+    HASHING_ARGON2_PARALLELISM,
+    HASHING_ARGON2_TIME_COST,
+    HASHING_SCRYPT_N,
+    HASHING_SCRYPT_P,
+    HASHING_SCRYPT_R,
+)
+
 from ._argon_hasher import HAS_ARGON, Argon2Hasher
 from ._bcrypt_verifier import BcryptVerifier
 from ._scrypt_hasher import ScryptHasher
@@ -12,12 +21,41 @@ from .protocol import Hasher
 
 
 class PasswordHasherDispatcher(Hasher):
-    """Dispatcher that uses best available hasher but verifies all formats."""
+    """Dispatcher that uses best available hasher but verifies all formats.
+
+    New hashes use the configured cost parameters. Hashes made with other
+    parameters still verify, but ``needs_rehash`` flags them, so after a
+    parameter change each secret is upgraded on its next successful login.
+    """
+
+    def __init__(
+        self,
+        argon2: "Argon2Hasher | None" = None,
+        scrypt: ScryptHasher | None = None,
+    ) -> None:
+        """Initialize the hasher.
 
-    def __init__(self) -> None:
-        """Initialize the hasher."""
-        self._argon2 = Argon2Hasher() if HAS_ARGON else None
-        self._scrypt = ScryptHasher()
+        Parameters
+        ----------
+        argon2 : Argon2Hasher | None, optional
+            The argon2 hasher, by default one with the configured
+            parameters (if argon2 is available).
+        scrypt : ScryptHasher | None, optional
+            The scrypt hasher, by default one with the configured
+            parameters.
+        """
+        if argon2 is None and HAS_ARGON:
+            argon2 = Argon2Hasher(
+                time_cost=HASHING_ARGON2_TIME_COST,
+                memory_cost=HASHING_ARGON2_MEMORY_COST,
+                parallelism=HASHING_ARGON2_PARALLELISM,
+            )
+        self._argon2 = argon2
+        self._scrypt = scrypt or ScryptHasher(
+            n=HASHING_SCRYPT_N,
+            r=HASHING_SCRYPT_R,
+            p=HASHING_SCRYPT_P,
+        )
 
     def hash(self, plain: str) -> str:
         """Hash with best available algorithm.
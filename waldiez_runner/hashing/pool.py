@@ -0,0 +1,211 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Bounded process pool for verifying and hashing client secrets.
+
+Argon2/scrypt are CPU (and memory) heavy. Running them in the shared
+anyio thread pool lets a burst of token requests starve every other
+thread-offloaded call (file I/O, etc.), so they run in a few dedicated
+worker processes instead. At most ``max_pending`` jobs run or wait at a
+time, further ones are rejected right away with ``HashingPoolBusy``.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from waldiez_runner.config import (
+    HASHING_POOL_MAX_PENDING,
+    HASHING_POOL_WORKERS,
+)
+
+from .dispatcher import PasswordHasherDispatcher
+
+LOG = logging.getLogger(__name__)
+T = TypeVar("T")
+
+_WORKER_HASHER: PasswordHasherDispatcher | None = None
+
+
+class HashingPoolBusy(Exception):
+    """Too many secrets are being verified or hashed, try again later."""
+
+
+def _hasher() -> PasswordHasherDispatcher:
+    # pylint: disable=global-statement
+    global _WORKER_HASHER
+    if _WORKER_HASHER is None:
+        _WORKER_HASHER = PasswordHasherDispatcher()
+    return _WORKER_HASHER
+
+
+def _verify_job(
+    plain: str, stored: str, submitted_at: float
+) -> tuple[tuple[bool, bool], float]:
+    """Verify a secret in a worker (with the time it waited)."""
+    queued = time.time() - submitted_at
+    hasher = _hasher()
+    # pylint: disable=broad-exception-caught
+    try:
+        valid = hasher.verify(plain=plain, stored=stored)
+        return (valid, valid and hasher.needs_rehash(stored)), queued
+    except Exception:  # pragma: no cover
+        return (False, False), queued
+
+
+def _hash_job(plain: str, submitted_at: float) -> tuple[str, float]:
+    """Hash a secret in a worker (with the time it waited)."""
+    queued = time.time() - submitted_at
+    return _hasher().hash(plain), queued
+
+
+def default_workers() -> int:
+    """Get the default number of worker processes.
+
+    Returns
+    -------
+    int
+        min(4, CPUs).
+    """
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+class HashingPool:
+    """Verify and hash secrets in dedicated worker processes."""
+
+    def __init__(self, max_workers: int = 0, max_pending: int = 32) -> None:
+        """Initialize the pool (the workers start on first use).
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Worker processes, by default 0 (min(4, CPUs)).
+        max_pending : int, optional
+            Maximum running and queued jobs, by default 32.
+        """
+        self.max_workers = max_workers if max_workers > 0 else default_workers()
+        self.max_pending = max(max_pending, 1)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def verify(self, plain: str, stored: str) -> tuple[bool, bool]:
+        """Verify a secret against its stored hash.
+
+        Parameters
+        ----------
+        plain : str
+            The plain secret.
+        stored : str
+            The stored hashed secret.
+
+        Returns
+        -------
+        tuple[bool, bool]
+            Whether the secret is valid and whether the stored hash
+            should be upgraded.
+
+        Raises
+        ------
+        HashingPoolBusy
+            If too many jobs are pending.
+        """
+        return await self._run(_verify_job, plain, stored)
+
+    async def hash(self, plain: str) -> str:
+        """Hash a secret with the best available algorithm.
+
+        Parameters
+        ----------
+        plain : str
+            The plain secret.
+
+        Returns
+        -------
+        str
+            The hashed secret.
+
+        Raises
+        ------
+        HashingPoolBusy
+            If too many jobs are pending.
+        """
+        return await self._run(_hash_job, plain)
+
+    def stats(self) -> dict[str, Any]:
+        """Get the pool's counters and queue times.
+
+        Returns
+        -------
+        dict[str, Any]
+            The pending, completed and rejected jobs and the average
+            and maximum seconds a job waited for a worker.
+        """
+        average = (
+            self.queue_time_total / self.completed if self.completed else 0.0
+        )
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_time_avg": average,
+            "queue_time_max": self.queue_time_max,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (restarted on next use)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # no fork: the API process has threads and open sockets
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _run(self, job: Callable[..., tuple[T, float]], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HashingPoolBusy("Too many pending hashing jobs")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            try:
+                result, queued = await loop.run_in_executor(
+                    executor, functools.partial(job, *args, time.time())
+                )
+            except BrokenProcessPool:
+                # a worker died (e.g. OOM), start over once
+                LOG.warning("Hashing pool broken, restarting it")
+                if self._executor is executor:
+                    self.shutdown()
+                result, queued = await loop.run_in_executor(
+                    self._get_executor(),
+                    functools.partial(job, *args, time.time()),
+                )
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        self.queue_time_total += queued
+        self.queue_time_max = max(self.queue_time_max, queued)
+        return result
+
+
+hashing_pool = HashingPool(
+    max_workers=HASHING_POOL_WORKERS, max_pending=HASHING_POOL_MAX_PENDING
+)
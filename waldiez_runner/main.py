@@ -20,10 +20,19 @@ from fastapi_pagination import add_pagination
 from starlette.exceptions import HTTPException
 
 from waldiez_runner._version import __version__
-from waldiez_runner.config import SettingsManager
-from waldiez_runner.dependencies import on_shutdown, on_startup
+from waldiez_runner.config import (
+    WS_IDLE_GRACE,
+    WS_REAP_INTERVAL,
+    SettingsManager,
+)
+from waldiez_runner.dependencies import (
+    on_shutdown,
+    on_startup,
+    verified_tokens,
+)
 from waldiez_runner.middleware import add_middlewares
 from waldiez_runner.routes import add_routes
+from waldiez_runner.routes.ws import ws_stream_hub, ws_task_registry
 
 LOG = logging.getLogger(__name__)
 
@@ -46,8 +55,13 @@ async def lifespan(application: FastAPI) -> AsyncIterator[None]:
     """
     # On startup
     await on_startup()
+    verified_tokens.start_listener()
+    ws_task_registry.start_reaper(WS_REAP_INTERVAL, WS_IDLE_GRACE)
     yield
     # On shutdown
+    await ws_task_registry.stop_reaper()
+    await ws_stream_hub.stop()
+    await verified_tokens.stop_listener()
     await on_shutdown()
 
 
@@ -117,6 +131,7 @@ def get_app() -> FastAPI:
         return ORJSONResponse(
             content=detail,
             status_code=status_code,
+            headers=getattr(exc, "headers", None),
         )
 
     add_pagination(application)
@@ -22,6 +22,7 @@ if TYPE_CHECKING:
 
 EXCLUDE_PATTERNS = [
     r"^/api/v1/tasks/[^/]+/download/?$",
+    r"^/api/v1/tasks/[^/]+/events/stream/?$",
 ]
 
 
@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""add task composite partial indexes
+
+Revision ID: 0f3a9c27d1e4
+Revises: 65bf12b84df9
+Create Date: 2026-10-19 09:20:00.000000+00:00
+"""
+
+# flake8: noqa
+# pylint: skip-file
+from typing import Any, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0f3a9c27d1e4"
+down_revision: Union[str, None] = "65bf12b84df9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text("deleted_at IS NULL")
+DELETED = sa.text("deleted_at IS NOT NULL")
+
+INDEXES: list[tuple[str, list[str], Any]] = [
+    ("ix_tasks_live_client_created", ["client_id", "created_at", "id"], LIVE),
+    ("ix_tasks_live_status_created", ["status", "created_at"], LIVE),
+    ("ix_tasks_live_status_updated", ["status", "updated_at"], LIVE),
+    ("ix_tasks_created_at", ["created_at", "id"], None),
+    ("ix_tasks_deleted_at", ["deleted_at"], DELETED),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if not _is_postgresql():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name, "tasks", columns, unique=False, sqlite_where=where
+            )
+        return
+    # no table lock while building them
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                unique=False,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    if not _is_postgresql():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="tasks")
+        return
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="tasks",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
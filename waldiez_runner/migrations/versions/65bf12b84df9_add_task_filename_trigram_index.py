@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""add task filename trigram index
+
+Revision ID: 65bf12b84df9
+Revises: dc6dd57db1a5
+Create Date: 2026-10-18 23:55:00.000000+00:00
+"""
+
+# flake8: noqa
+# pylint: skip-file
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "65bf12b84df9"
+down_revision: Union[str, None] = "dc6dd57db1a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # "ILIKE '%term%'" task searches, PostgreSQL only
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # no table lock while building it
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_filename_trgm",
+            "tasks",
+            ["filename"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"filename": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_filename_trgm",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    # the pg_trgm extension is kept (other objects might use it)
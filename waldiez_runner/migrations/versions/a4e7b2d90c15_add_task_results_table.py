@@ -0,0 +1,51 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""add task results table
+
+Revision ID: a4e7b2d90c15
+Revises: 0f3a9c27d1e4
+Create Date: 2026-10-19 11:05:00.000000+00:00
+"""
+
+# flake8: noqa
+# pylint: skip-file
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e7b2d90c15"
+down_revision: Union[str, None] = "0f3a9c27d1e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_results",
+        sa.Column("task_id", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_task_results_task_id"),
+        "task_results",
+        ["task_id"],
+        unique=True,
+    )
+    op.add_column("tasks", sa.Column("results_ref", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    # the out of row results are lost
+    op.drop_column("tasks", "results_ref")
+    op.drop_index(op.f("ix_task_results_task_id"), table_name="task_results")
+    op.drop_table("task_results")
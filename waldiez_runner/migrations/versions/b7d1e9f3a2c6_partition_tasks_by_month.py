@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""partition tasks by month
+
+Revision ID: b7d1e9f3a2c6
+Revises: a4e7b2d90c15
+Create Date: 2026-10-19 13:20:00.000000+00:00
+
+PostgreSQL only and only if TASKS_PARTITIONED is set when it runs
+(to switch later: downgrade to a4e7b2d90c15, set it and upgrade).
+The table is rewritten, so it is locked while the rows are copied.
+"""
+
+# flake8: noqa
+# pylint: skip-file
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from waldiez_runner.config import TASKS_PARTITIONED
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d1e9f3a2c6"
+down_revision: Union[str, None] = "a4e7b2d90c15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# the current and the next two months
+MONTHS_AHEAD = 2
+
+
+def _is_partitioned() -> bool:
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "WHERE partrelid = to_regclass('tasks'))"
+            )
+        )
+        .scalar()
+    )
+
+
+def _index_definitions() -> list[str]:
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE schemaname = current_schema() AND tablename = 'tasks' "
+            "AND indexname <> 'tasks_pkey'"
+        )
+    )
+    # a partitioned table's ones are "ON ONLY" it
+    return [str(row[0]).replace(" ON ONLY ", " ON ") for row in rows]
+
+
+def _month_start(value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value: datetime) -> datetime:
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or not TASKS_PARTITIONED:
+        return
+    if _is_partitioned():
+        return
+    bind = op.get_bind()
+    indexes = _index_definitions()
+    # a partitioned table cannot be referenced by a foreign key
+    # (the services delete the task_results rows themselves)
+    foreign_keys = bind.execute(
+        sa.text(
+            "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid = 'tasks'::regclass"
+        )
+    ).all()
+    for table, name in foreign_keys:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    op.execute("ALTER TABLE tasks RENAME TO tasks_unpartitioned")
+    op.execute(
+        "ALTER TABLE tasks_unpartitioned "
+        "RENAME CONSTRAINT tasks_pkey TO tasks_unpartitioned_pkey"
+    )
+    op.execute(
+        "CREATE TABLE tasks (LIKE tasks_unpartitioned "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    # the partition key must be part of the primary key
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT tasks_pkey "
+        "PRIMARY KEY (id, created_at)"
+    )
+    op.execute("CREATE TABLE tasks_default PARTITION OF tasks DEFAULT")
+    now = datetime.now(timezone.utc)
+    oldest = bind.execute(
+        sa.text("SELECT min(created_at) FROM tasks_unpartitioned")
+    ).scalar()
+    month = _month_start(oldest if oldest is not None else now)
+    end = _month_start(now)
+    for _ in range(MONTHS_AHEAD + 1):
+        end = _next_month(end)
+    while month < end:
+        following = _next_month(month)
+        op.execute(
+            f'CREATE TABLE "tasks_p{month:%Y%m}" PARTITION OF tasks '
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{following.isoformat()}')"
+        )
+        month = following
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_unpartitioned")
+    op.execute("DROP TABLE tasks_unpartitioned")
+    # same names, now on the partitioned table (and its partitions)
+    for definition in indexes:
+        op.execute(definition)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    if not _is_partitioned():
+        return
+    indexes = _index_definitions()
+    op.execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+    op.execute(
+        "ALTER TABLE tasks_partitioned "
+        "RENAME CONSTRAINT tasks_pkey TO tasks_partitioned_pkey"
+    )
+    op.execute(
+        "CREATE TABLE tasks (LIKE tasks_partitioned "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute("ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id)")
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_partitioned")
+    # with all its (attached) partitions
+    op.execute("DROP TABLE tasks_partitioned")
+    for definition in indexes:
+        op.execute(definition)
+    op.execute(
+        "DELETE FROM task_results "
+        "WHERE task_id NOT IN (SELECT id FROM tasks)"
+    )
+    op.execute(
+        "ALTER TABLE task_results ADD CONSTRAINT task_results_task_id_fkey "
+        "FOREIGN KEY (task_id) REFERENCES tasks (id) ON DELETE CASCADE"
+    )
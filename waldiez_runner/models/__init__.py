@@ -5,6 +5,7 @@
 from .client import Client
 from .common import Base
 from .task import Task
+from .task_result import TaskResult
 from .task_status import TaskStatus
 
-__all__ = ["Base", "Client", "Task", "TaskStatus"]
+__all__ = ["Base", "Client", "Task", "TaskResult", "TaskStatus"]
@@ -8,7 +8,7 @@ from typing import Any
 
 from sqlalchemy import JSON
 from sqlalchemy import Enum as SqlEnum
-from sqlalchemy import Integer, String
+from sqlalchemy import Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 from typing_extensions import Literal
 
@@ -20,6 +20,49 @@ class Task(Base):
     """Task in database model."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # the listings and the background checks only look at the tasks
+        # that are not (soft) deleted, the indexes serve both the filter
+        # and the ordering (id: the cursor pages' tie breaker)
+        Index(
+            "ix_tasks_live_client_created",
+            "client_id",
+            "created_at",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_tasks_live_status_created",
+            "status",
+            "created_at",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_tasks_live_status_updated",
+            "status",
+            "updated_at",
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # the admin listing and the retention of old tasks
+        Index("ix_tasks_created_at", "created_at", "id"),
+        # purging the soft deleted tasks
+        Index(
+            "ix_tasks_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+        # for "ILIKE '%term%'" searches (needs the pg_trgm extension)
+        Index(
+            "ix_tasks_filename_trgm",
+            "filename",
+            postgresql_using="gin",
+            postgresql_ops={"filename": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     client_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
     flow_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
@@ -42,6 +85,10 @@ class Task(Base):
     results: Mapped[dict[str, Any] | list[dict[str, Any]] | None] = (
         mapped_column(JSON, nullable=True)
     )
+    results_ref: Mapped[str | None] = mapped_column(
+        String, nullable=True, default=None
+    )
+    """The TaskResult's id if the results are stored out of the row."""
 
     schedule_type: Mapped[Literal["once", "cron"] | None] = mapped_column(
         String, nullable=True, index=True, default=None
@@ -107,4 +154,6 @@ class Task(Base):
         bool
             True if the task is stuck.
         """
-        return self.is_active() and self.results is not None
+        return self.is_active() and (
+            self.results is not None or self.results_ref is not None
+        )
@@ -0,0 +1,26 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+"""Task result model."""
+
+from sqlalchemy import ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .common import Base
+
+
+class TaskResult(Base):
+    """Large task results, stored (compressed) out of the task's row."""
+
+    __tablename__ = "task_results"
+
+    task_id: Mapped[str] = mapped_column(
+        String,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    """The zlib compressed JSON of the results."""
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    """The size of the (uncompressed) JSON in bytes."""
@@ -10,7 +10,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import jwt
-from fastapi import APIRouter, Depends, Form, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException
 from pydantic import BaseModel
 
 from waldiez_runner.config import Settings
@@ -19,6 +19,7 @@ from waldiez_runner.dependencies import (
     get_db_manager,
     get_settings,
 )
+from waldiez_runner.hashing import HashingPoolBusy
 from waldiez_runner.services import ClientService
 
 router = APIRouter()
@@ -57,6 +58,7 @@ class TokensResponse(BaseModel):
     ),
 )
 async def get_token(
+    background_tasks: BackgroundTasks,
     client_id: str = Form(
         ...,
         examples=[""],  # just to avoid the default in swagger
@@ -69,6 +71,8 @@ async def get_token(
 
     Parameters
     ----------
+    background_tasks : BackgroundTasks
+        Where outdated secret hashes are upgraded (after responding).
     client_id : str
         The client ID.
     client_secret : str
@@ -86,22 +90,44 @@ async def get_token(
     Raises
     ------
     HTTPException
-        If the credentials are invalid.
+        If the credentials are invalid or too many are being verified.
     """
     if not settings.use_local_auth:  # pragma: no cover
         raise HTTPException(
             status_code=400, detail="Token issuance is disabled in OIDC mode."
         )
-    async with db.session() as session:
-        client = await ClientService.verify_client(
-            session, client_id, client_secret
+
+    def defer_rehash(client_id: str, secret: str, stored_hash: str) -> None:
+        background_tasks.add_task(
+            _upgrade_client_secret, db, client_id, secret, stored_hash
         )
 
+    try:
+        async with db.session() as session:
+            client = await ClientService.verify_client(
+                session, client_id, client_secret, defer_rehash=defer_rehash
+            )
+    except HashingPoolBusy as error:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many authentication requests, try again later.",
+            headers={"Retry-After": "1"},
+        ) from error
+
     if not client:
         raise HTTPException(status_code=401, detail="Invalid credentials.")
     return generate_tokens(client_id, client.audience, settings)
 
 
+async def _upgrade_client_secret(
+    db: DatabaseManager, client_id: str, secret: str, stored_hash: str
+) -> None:
+    async with db.session() as session:
+        await ClientService.rehash_client_secret(
+            session, client_id, secret, stored_hash
+        )
+
+
 @router.post("/token/refresh/", include_in_schema=False)
 @router.post(
     "/token/refresh",
@@ -11,11 +11,15 @@ from waldiez_runner.config import ServerStatus
 from waldiez_runner.dependencies import (
     VALID_AUDIENCES,
     DatabaseManager,
+    app_state,
     get_client_id,
     get_db_manager,
 )
+from waldiez_runner.models import TaskStatus
 from waldiez_runner.services import TaskService
 
+from .ws import ws_task_registry
+
 router = APIRouter()
 
 validate_clients_audience = get_client_id(*VALID_AUDIENCES)
@@ -88,9 +92,7 @@ def add_status_route(app: FastAPI, max_jobs: int) -> None:
         ServerStatus
             The status
         """
-        async with db.session() as session:
-            active_tasks_count = await TaskService.count_active_tasks(session)
-            pending_tasks_count = await TaskService.count_pending_tasks(session)
+        active_tasks_count, pending_tasks_count = await _get_task_counts(db)
         return {
             "healthy": True,
             "active_tasks": active_tasks_count,
@@ -101,4 +103,33 @@ def add_status_route(app: FastAPI, max_jobs: int) -> None:
             "total_memory": psutil.virtual_memory().total,
             "used_memory": psutil.virtual_memory().used,
             "memory_percent": psutil.virtual_memory().percent,
+            "websockets": ws_task_registry.metrics(),
+            "database": db.pool_metrics(),
         }
+
+
+async def _get_task_counts(db: DatabaseManager) -> tuple[int, int]:
+    """Get the active and pending tasks' counts.
+
+    Parameters
+    ----------
+    db : DatabaseManager
+        The database session manager
+
+    Returns
+    -------
+    tuple[int, int]
+        The active and the pending tasks' counts.
+    """
+    redis = await app_state.redis.client() if app_state.redis else None
+    counts = await TaskService.get_task_counts(redis) if redis else None
+    if counts is None and redis is not None:
+        # the counters are reset to the primary's counts
+        async with db.session() as session:
+            counts = await TaskService.reconcile_task_counters(session, redis)
+    if counts is None:
+        async with db.session(readonly=True) as session:
+            active = await TaskService.count_active_tasks(session)
+            pending = await TaskService.count_pending_tasks(session)
+            return active, pending
+    return sum(counts.values()), counts[TaskStatus.PENDING]
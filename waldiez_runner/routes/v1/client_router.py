@@ -12,6 +12,7 @@ from waldiez_runner.dependencies import (
     DatabaseManager,
     get_client_id,
     get_db_manager,
+    invalidate_client_tokens,
 )
 from waldiez_runner.schemas.client import (
     ClientCreate,
@@ -198,6 +199,7 @@ async def update_client(
         )
     if not client:
         raise HTTPException(status_code=404, detail="Client not found.")
+    await invalidate_client_tokens([client_id])
     return client
 
 
@@ -241,6 +243,7 @@ async def delete_client(
         )
     async with db.session() as session:
         await ClientService.delete_client(session, client_id)
+    await invalidate_client_tokens([client_id])
     return Response(status_code=204)
 
 
@@ -304,7 +307,8 @@ async def delete_clients(
         excluded = [client_id] + excluded
     excluded = list(set(excluded))
     async with db.session() as session:
-        await ClientService.delete_clients(
+        deleted_ids = await ClientService.delete_clients(
             session, audiences=audience_filter, excluded=[client_id], ids=ids
         )
+    await invalidate_client_tokens(deleted_ids)
     return Response(status_code=204)
@@ -9,6 +9,9 @@ from typing_extensions import Literal
 Order = Literal["asc", "desc"]
 """Order type for sorting."""
 
+Pagination = Literal["offset", "cursor"]
+"""Pagination mode: page numbers or keyset cursors."""
+
 
 def get_pagination_params() -> Params:
     """Get pagination parameters.
@@ -8,6 +8,8 @@ import asyncio
 import hashlib
 import os
 import secrets
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import HTTPException, UploadFile
@@ -18,6 +20,7 @@ from waldiez_runner.dependencies import (
     ALLOWED_EXTENSIONS,
     DatabaseManager,
     Storage,
+    app_state,
     get_filename_from_url,
 )
 from waldiez_runner.services.task_service import TaskService
@@ -103,6 +106,88 @@ async def _validate_file_path(
     return filename, file_hash, saved_path
 
 
+async def check_task_admission(
+    db: DatabaseManager,
+    client_id: str,
+    max_jobs: int,
+) -> bool | None:
+    """Check (and take) one of the client's slots for a new task.
+
+    Parameters
+    ----------
+    db : DatabaseManager
+        The database session manager.
+    client_id : str
+        The client ID.
+    max_jobs : int
+        The upper limit for concurrent running tasks/jobs (<=0 means no limit)
+
+    Returns
+    -------
+    bool | None
+        True if a slot was taken (to release if the task is not created),
+        None if admitted without one (the task counters are unavailable).
+
+    Raises
+    ------
+    HTTPException
+        If the maximum number of tasks per client is reached.
+    """
+    redis = await app_state.redis.client() if app_state.redis else None
+    async with db.session() as session:
+        slot = await TaskService.admit_task(
+            session,
+            redis,
+            client_id=client_id,
+            max_jobs=max_jobs,
+        )
+    if slot is False:
+        detail = (
+            f"Cannot create more than {max_jobs} tasks "
+            "at the same time. Please wait for some tasks to finish"
+        )
+        raise HTTPException(status_code=400, detail=detail)
+    return slot
+
+
+@asynccontextmanager
+async def task_admission(
+    db: DatabaseManager,
+    client_id: str,
+    max_jobs: int,
+) -> AsyncIterator[None]:
+    """Admit a new task, releasing its slot if it is not created.
+
+    Parameters
+    ----------
+    db : DatabaseManager
+        The database session manager.
+    client_id : str
+        The client ID.
+    max_jobs : int
+        The upper limit for concurrent running tasks/jobs (<=0 means no limit)
+
+    Yields
+    ------
+    None
+        Once admitted (the block creates the task).
+
+    Raises
+    ------
+    BaseException
+        Any error of the block (after releasing the slot).
+    """
+    slot = await check_task_admission(db, client_id, max_jobs)
+    try:
+        yield
+    except BaseException:
+        if slot and app_state.redis:
+            await TaskService.release_task_slot(
+                await app_state.redis.client(), client_id
+            )
+        raise
+
+
 # pylint: disable=too-many-locals
 async def validate_task_input(
     db: DatabaseManager,
@@ -112,7 +197,6 @@ async def validate_task_input(
     env_vars: str | None,
     client_id: str,
     storage: Storage,
-    max_jobs: int,
     force: bool,
     schedule_type: Literal["once", "cron"] | None = None,
 ) -> tuple[str, str, str, dict[str, str]]:
@@ -134,8 +218,6 @@ async def validate_task_input(
         The client ID.
     storage : Storage
         The storage service.
-    max_jobs : int
-        The upper limit for concurrent running tasks/jobs (<=0 means no limit)
     force : bool, optional
         Whether to force running even if a task with the same flow has already
         started, by default False
@@ -150,24 +232,11 @@ async def validate_task_input(
     Raises
     ------
     HTTPException
-        If the file is invalid or
-        if the maximum number of tasks per client is reached.
+        If the file is invalid.
     """
     if schedule_type is not None:
         raise HTTPException(500, detail="Scheduling not supported yet")
 
-    async with db.session() as session:
-        active_tasks = await TaskService.get_active_client_tasks(
-            session,
-            client_id=client_id,
-        )
-    # pylint: disable=chained-comparison
-    if max_jobs > 0 and len(active_tasks.items) >= max_jobs:
-        detail = (
-            f"Cannot create more than {max_jobs} tasks "
-            "at the same time. Please wait for some tasks to finish"
-        )
-        raise HTTPException(status_code=400, detail=detail)
     saved_path: str = ""
     file_hash: str = ""
     filename: str = ""
@@ -193,10 +262,12 @@ async def validate_task_input(
     ).hexdigest()[:8]
     base_flow_id = f"{file_hash}-{filename_hash}"
 
-    active_task = next(
-        (task for task in active_tasks.items if task.flow_id == base_flow_id),
-        None,
-    )
+    async with db.session() as session:
+        active_task = await TaskService.get_active_client_flow_task(
+            session,
+            client_id=client_id,
+            flow_id=base_flow_id,
+        )
 
     if active_task and not force:
         await storage.delete_file(saved_path)
@@ -5,6 +5,7 @@
 
 """Task router helpers."""
 
+import functools
 import logging
 from typing import Any, cast
 
@@ -17,6 +18,12 @@ from waldiez_runner.dependencies import app_state
 from waldiez_runner.dependencies.context import (
     RequestContext,
 )
+from waldiez_runner.services import (
+    VerificationCache,
+    get_http_client,
+    new_verification_cache,
+    verification_key,
+)
 
 LOG = logging.getLogger(__name__)
 
@@ -89,30 +96,48 @@ def _extract_user_id(context: RequestContext) -> str:
     return user_id
 
 
+def _is_allowed(denied_reason: str | None) -> bool:
+    """Check if a permission result allows running a task."""
+    return denied_reason is None
+
+
+permission_results: VerificationCache[str | None] = new_verification_cache(
+    _is_allowed
+)
+"""Recent permission results (the denial reasons) by service and user."""
+
+
 async def _verify_user_permission(settings: Settings, user_id: str) -> None:
-    """Verify user permission by making an HTTP request."""
+    """Verify user permission, using a recent result if any."""
+    denied_reason = await permission_results.get_or_load(
+        verification_key(settings.task_permission_verify_url, user_id),
+        functools.partial(_check_user_permission, settings, user_id),
+    )
+    if denied_reason is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=denied_reason,
+        )
+
+
+async def _check_user_permission(
+    settings: Settings, user_id: str
+) -> str | None:
+    """Ask the permission service, get the reason if the user is denied."""
     try:
-        data = await _make_permission_request(settings, user_id)
+        await _make_permission_request(settings, user_id)
         # Assuming server returns 200 only if can_run is true
         # If can_run is false, server returns 429
     except HTTPException:
-        # Re-raise HTTPException instances (like 429 errors)
-        # without wrapping them
+        # Re-raise HTTPException instances without wrapping them
         raise
     except httpx.HTTPStatusError as error:
         if error.response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
             try:
                 data = error.response.json()
-                reason = data.get("reason", "Too many requests")
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail=reason,
-                ) from error
-            except (ValueError, KeyError):
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Too many requests",
-                ) from error
+                return str(data.get("reason", "Too many requests"))
+            except (ValueError, KeyError, AttributeError):
+                return "Too many requests"
         LOG.error(
             "Permission check failed with status %s", error.response.status_code
         )
@@ -132,18 +157,18 @@ async def _verify_user_permission(settings: Settings, user_id: str) -> None:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to verify user permission",
         ) from error
+    return None
 
 
 async def _make_permission_request(
     settings: Settings, user_id: str
 ) -> dict[str, Any]:
     """Make the HTTP request to verify user permission."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            settings.task_permission_verify_url,
-            params={"user_id": user_id},
-            headers={"X-Runner-Secret-Key": settings.task_permission_secret},
-            timeout=10.0,
-        )
-        response.raise_for_status()
-        return response.json()
+    response = await get_http_client().get(
+        settings.task_permission_verify_url,
+        params={"user_id": user_id},
+        headers={"X-Runner-Secret-Key": settings.task_permission_secret},
+        timeout=10.0,
+    )
+    response.raise_for_status()
+    return response.json()
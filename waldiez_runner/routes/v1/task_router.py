@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0.
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
+# pylint: disable=too-many-lines
 # pyright: reportPossiblyUnboundVariable=false
 # pyright: reportCallInDefaultInitializer=false
 
@@ -16,6 +17,7 @@ from fastapi import (
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Query,
     Response,
@@ -23,6 +25,7 @@ from fastapi import (
 )
 from fastapi.responses import FileResponse, StreamingResponse
 from fastapi_pagination import Page
+from fastapi_pagination.api import pagination_ctx
 from pydantic import ValidationError
 from starlette import status as http_status
 from typing_extensions import Literal
@@ -31,8 +34,10 @@ from waldiez_runner.config import Settings
 from waldiez_runner.dependencies import (
     ADMIN_API_AUDIENCE,
     TASK_API_AUDIENCE,
+    AsyncRedis,
     DatabaseManager,
     Storage,
+    app_state,
     get_admin_client_id,
     get_client_id,
     get_client_id_with_admin_check,
@@ -45,17 +50,28 @@ from waldiez_runner.dependencies.context import (
     get_request_context,
 )
 from waldiez_runner.models import TaskStatus
+from waldiez_runner.routes.ws.listeners import is_stream_id
+from waldiez_runner.routes.ws.manager import TooManyClientsException
+from waldiez_runner.routes.ws.registry import TooManyTasksException
+from waldiez_runner.routes.ws.sse import (
+    SSE_HEADERS,
+    check_sse_capacity,
+    task_event_stream,
+)
+from waldiez_runner.routes.ws.validation import is_watchable
 from waldiez_runner.schemas.task import (
     InputResponse,
     TaskCountResponse,
     TaskCreate,
+    TaskCursorPage,
     TaskResponse,
     TaskUpdate,
 )
 from waldiez_runner.services.task_service import TaskService
 
-from .pagination import Order, get_pagination_params
+from .pagination import Order, Pagination, get_pagination_params
 from .task_input_validation import (
+    task_admission,
     validate_task_input,
     validate_uploaded_file,
     validate_waldiez_flow,
@@ -80,12 +96,82 @@ validate_client_with_admin = get_client_id_with_admin_check()
 task_router = APIRouter()
 
 
+async def _task_counters_redis() -> AsyncRedis | None:
+    """Get a Redis client to update the task counters with."""
+    return await app_state.redis.client() if app_state.redis else None
+
+
+PaginationQuery = Annotated[
+    Pagination | None,
+    Query(
+        description=(
+            "'offset' (default) for page numbers, "
+            "'cursor' for keyset pagination with after/before cursors"
+        )
+    ),
+]
+AfterQuery = Annotated[
+    str | None,
+    Query(description="Cursor mode: the next_cursor of the previous page"),
+]
+BeforeQuery = Annotated[
+    str | None,
+    Query(description="Cursor mode: the prev_cursor of the next page"),
+]
+IncludeTotalQuery = Annotated[
+    bool,
+    Query(description="Cursor mode: also count all the matching tasks"),
+]
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+async def _get_tasks_by_cursor(
+    db: DatabaseManager,
+    client_id: str | None,
+    after: str | None,
+    before: str | None,
+    include_total: bool,
+    status: TaskStatus | None,
+    search: str | None,
+    order_by: str | None,
+    order_type: str | None,
+) -> TaskCursorPage:
+    """Get a page of a cursor (keyset) based listing."""
+    size = get_pagination_params().size
+    async with db.session(readonly=True, client_id=client_id) as session:
+        try:
+            return await TaskService.get_tasks_by_cursor(
+                session,
+                size=size,
+                client_id=client_id,
+                after=after,
+                before=before,
+                status=status,
+                search=search,
+                order_by=order_by,
+                descending=order_type == "desc",
+                include_total=include_total,
+            )
+        except ValueError as error:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=str(error),
+            ) from error
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
 @task_router.get("/tasks/", include_in_schema=False)
 @task_router.get(
     "/tasks",
-    response_model=Page[TaskResponse],
+    response_model=Page[TaskResponse] | TaskCursorPage,
+    # not detected with a union response model
+    dependencies=[Depends(pagination_ctx(Page[TaskResponse]))],
     summary="Get all client's tasks",
-    description="Get all client's tasks.",
+    description=(
+        "Get all client's tasks. With pagination=cursor (or an after/"
+        "before cursor), pages follow opaque cursors instead of page "
+        "numbers and the total is only counted if include_total is set."
+    ),
 )
 async def get_client_tasks(
     client_id: Annotated[str, Depends(validate_tasks_audience)],
@@ -103,7 +189,11 @@ async def get_client_tasks(
         Order | None,
         Query(description="The order direction, can be 'asc' or 'desc'"),
     ] = None,
-) -> Page[TaskResponse]:
+    pagination: PaginationQuery = None,
+    after: AfterQuery = None,
+    before: BeforeQuery = None,
+    include_total: IncludeTotalQuery = False,
+) -> Page[TaskResponse] | TaskCursorPage:
     """Get all tasks.
 
     Parameters
@@ -120,14 +210,34 @@ async def get_client_tasks(
         The field to sort the tasks.
     order_type : str | None
         The order to sort the tasks. Can be "asc" or "desc".
+    pagination : Pagination | None
+        The pagination mode, "offset" (default) or "cursor".
+    after : str | None
+        Cursor mode: the cursor of the page's previous task.
+    before : str | None
+        Cursor mode: the cursor of the page's next task.
+    include_total : bool
+        Cursor mode: whether to count all the matching tasks.
 
     Returns
     -------
-    Page[TaskResponse]
+    Page[TaskResponse] | TaskCursorPage
         The tasks.
     """
+    if pagination == "cursor" or after or before:
+        return await _get_tasks_by_cursor(
+            db,
+            client_id=client_id,
+            after=after,
+            before=before,
+            include_total=include_total,
+            status=status,
+            search=search,
+            order_by=order_by,
+            order_type=order_type,
+        )
     params = get_pagination_params()
-    async with db.session() as session:
+    async with db.session(readonly=True, client_id=client_id) as session:
         return await TaskService.get_client_tasks(
             session,
             client_id,
@@ -139,11 +249,16 @@ async def get_client_tasks(
         )
 
 
+# pylint: disable=too-many-arguments,too-many-positional-arguments
 @task_router.get(
     "/admin/tasks",
-    response_model=Page[TaskResponse],
+    response_model=Page[TaskResponse] | TaskCursorPage,
+    dependencies=[Depends(pagination_ctx(Page[TaskResponse]))],
     summary="Get all tasks (admin only)",
-    description="Get all tasks from all users. Requires admin audience.",
+    description=(
+        "Get all tasks from all users. Requires admin audience. "
+        "Supports the same cursor mode as /tasks."
+    ),
 )
 async def get_all_tasks(
     _: Annotated[str, Depends(validate_admin_audience)],
@@ -161,7 +276,11 @@ async def get_all_tasks(
         Order | None,
         Query(description="The order direction, can be 'asc' or 'desc'"),
     ] = None,
-) -> Page[TaskResponse]:
+    pagination: PaginationQuery = None,
+    after: AfterQuery = None,
+    before: BeforeQuery = None,
+    include_total: IncludeTotalQuery = False,
+) -> Page[TaskResponse] | TaskCursorPage:
     """Get all tasks from all users.
 
     Parameters
@@ -176,14 +295,34 @@ async def get_all_tasks(
         The field to sort the tasks.
     order_type : str | None
         The order to sort the tasks. Can be "asc" or "desc".
+    pagination : Pagination | None
+        The pagination mode, "offset" (default) or "cursor".
+    after : str | None
+        Cursor mode: the cursor of the page's previous task.
+    before : str | None
+        Cursor mode: the cursor of the page's next task.
+    include_total : bool
+        Cursor mode: whether to count all the matching tasks.
 
     Returns
     -------
-    Page[TaskResponse]
+    Page[TaskResponse] | TaskCursorPage
         All tasks from all users.
     """
+    if pagination == "cursor" or after or before:
+        return await _get_tasks_by_cursor(
+            db,
+            client_id=None,
+            after=after,
+            before=before,
+            include_total=include_total,
+            status=status,
+            search=search,
+            order_by=order_by,
+            order_type=order_type,
+        )
     params = get_pagination_params()
-    async with db.session() as session:
+    async with db.session(readonly=True) as session:
         return await TaskService.get_all_tasks(
             session,
             params=params,
@@ -293,65 +432,67 @@ async def create_task(
                 "Only one of `file`, `file_url` or `filename` can be provided"
             ),
         )
-    (
-        file_hash,
-        file_name,
-        save_path,
-        environment_vars,
-    ) = await validate_task_input(
-        db=db_manager,
-        file=file,
-        file_url=file_url,
-        file_path=filename,
-        env_vars=env_vars,
-        client_id=client_id,
-        storage=storage,
-        max_jobs=settings.max_jobs,
-        force=force,
-        schedule_type=schedule_type,
-    )
-    try:
-        task_create = TaskCreate(
+    async with task_admission(
+        db_manager, client_id=client_id, max_jobs=settings.max_jobs
+    ):
+        (
+            file_hash,
+            file_name,
+            save_path,
+            environment_vars,
+        ) = await validate_task_input(
+            db=db_manager,
+            file=file,
+            file_url=file_url,
+            file_path=filename,
+            env_vars=env_vars,
             client_id=client_id,
-            flow_id=file_hash,
-            filename=file_name,
-            input_timeout=input_timeout,
+            storage=storage,
+            force=force,
             schedule_type=schedule_type,
-            scheduled_time=scheduled_time,
-            cron_expression=cron_expression,
-            expires_at=expires_at,
         )
-    except ValidationError as error:
-        await storage.delete_file(save_path)
-        raise HTTPException(
-            status_code=422,
-            detail=error.json(),
-        ) from error
-    try:
-        async with db_manager.session() as session:
-            task = await TaskService.create_task(
-                session,
-                task_create=task_create,
-            )
-        # relative to root if local, or "bucket" if other (e.g. S3, GCS)
-        dst = os.path.join(client_id, str(task.id), file_name)
-        await storage.move_file(save_path, dst)
-    except BaseException as error:  # pragma: no cover
-        await storage.delete_file(save_path)
-        async with db_manager.session() as session:
-            await TaskService.delete_client_flow_task(
-                session,
+        try:
+            task_create = TaskCreate(
                 client_id=client_id,
                 flow_id=file_hash,
+                filename=file_name,
+                input_timeout=input_timeout,
+                schedule_type=schedule_type,
+                scheduled_time=scheduled_time,
+                cron_expression=cron_expression,
+                expires_at=expires_at,
             )
-        if isinstance(error, HTTPException):
+        except ValidationError as error:
+            await storage.delete_file(save_path)
             raise HTTPException(
-                status_code=error.status_code, detail=error.detail
+                status_code=422,
+                detail=error.json(),
+            ) from error
+        try:
+            async with db_manager.session(client_id=client_id) as session:
+                task = await TaskService.create_task(
+                    session,
+                    task_create=task_create,
+                )
+            # relative to root if local, or "bucket" if other (e.g. S3, GCS)
+            dst = os.path.join(client_id, str(task.id), file_name)
+            await storage.move_file(save_path, dst)
+        except BaseException as error:  # pragma: no cover
+            await storage.delete_file(save_path)
+            async with db_manager.session() as session:
+                await TaskService.delete_client_flow_task(
+                    session,
+                    client_id=client_id,
+                    flow_id=file_hash,
+                )
+            if isinstance(error, HTTPException):
+                raise HTTPException(
+                    status_code=error.status_code, detail=error.detail
+                ) from error
+            LOG.error("Error creating task: %s", error)
+            raise HTTPException(
+                status_code=500, detail="Internal server error"
             ) from error
-        LOG.error("Error creating task: %s", error)
-        raise HTTPException(
-            status_code=500, detail="Internal server error"
-        ) from error
     task_response = TaskResponse.model_validate(task, from_attributes=True)
     if task.schedule_type is None or trigger_now:
         await trigger_run_task(
@@ -477,7 +618,7 @@ async def count_tasks(
             detail="active_only and inactive_only cannot both be true",
         )
     try:
-        async with db.session() as session:
+        async with db.session(readonly=True, client_id=client_id) as session:
             count = await TaskService.count_client_tasks(
                 session,
                 client_id=client_id,
@@ -543,13 +684,105 @@ async def get_task(
         If the task is not found.
     """
     client_id, is_admin = client_id_and_admin
+    async with db.session() as session:
+        task = await TaskService.get_task(session, task_id=task_id)
+        if task is None or (not is_admin and task.client_id != client_id):
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail="Task not found",
+            )
+        # large results are stored out of the task's row
+        results = await TaskService.get_task_results(session, task)
+    response = TaskResponse.model_validate(task)
+    response.results = results
+    return response
+
+
+@task_router.get(
+    "/tasks/{task_id}/events/stream/",
+    response_class=StreamingResponse,
+    include_in_schema=False,
+)
+@task_router.get(
+    "/tasks/{task_id}/events/stream",
+    response_class=StreamingResponse,
+    summary="Stream a task's output",
+    description=(
+        "Stream a task's status, output history and live output as "
+        "Server-Sent Events (read-only). Send the Last-Event-ID header "
+        "(or the last_event_id query parameter) to resume after the last "
+        "received event. Admins can view any task, regular users can "
+        "only view their own."
+    ),
+)
+async def stream_task_events(
+    task_id: str,
+    client_id_and_admin: Annotated[
+        tuple[str, bool], Depends(validate_client_with_admin)
+    ],
+    db: Annotated[DatabaseManager, Depends(get_db_manager)],
+    last_event_id_header: Annotated[
+        str | None, Header(alias="Last-Event-ID")
+    ] = None,
+    last_event_id: Annotated[str | None, Query()] = None,
+) -> StreamingResponse:
+    """Stream a task's output as Server-Sent Events.
+
+    Parameters
+    ----------
+    task_id : str
+        The task ID.
+    client_id_and_admin : tuple[str, bool]
+        The client ID and admin status.
+    db : DatabaseManager
+        The database session manager.
+    last_event_id_header : str | None
+        The Last-Event-ID header (sent by reconnecting EventSources).
+    last_event_id : str | None
+        Resume after this event id (if the header is not sent).
+
+    Returns
+    -------
+    StreamingResponse
+        The event stream.
+
+    Raises
+    ------
+    HTTPException
+        If the task is not found, not active or has too many viewers.
+    """
+    client_id, is_admin = client_id_and_admin
     async with db.session() as session:
         task = await TaskService.get_task(session, task_id=task_id)
     if task is None or (not is_admin and task.client_id != client_id):
         raise HTTPException(
             status_code=http_status.HTTP_404_NOT_FOUND, detail="Task not found"
         )
-    return TaskResponse.model_validate(task)
+    if not is_watchable(task):
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="Task is not active",
+        )
+    resume_after = last_event_id_header or last_event_id
+    if not is_stream_id(resume_after):
+        resume_after = None
+    try:
+        check_sse_capacity(task_id)
+    except TooManyTasksException as error:
+        raise HTTPException(
+            status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many active tasks",
+        ) from error
+    except TooManyClientsException as error:
+        raise HTTPException(
+            status_code=http_status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many viewers for this task",
+        ) from error
+    return StreamingResponse(
+        task_event_stream(task, last_event_id=resume_after),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
 
 
 @task_router.patch(
@@ -607,11 +840,18 @@ async def update_task(
             status_code=400,
             detail=f"Cannot update task with status {task.get_status()}",
         )
-    async with db.session() as session:
+    async with db.session(client_id=client_id) as session:
         updated = await TaskService.update_task(
             session, task_id=task_id, task_update=task_update
         )
-    return TaskResponse.model_validate(updated, from_attributes=True)
+        # (deleted meanwhile)
+        if updated is None:  # pragma: no cover
+            raise HTTPException(status_code=404, detail="Task not found")
+        # large results are stored out of the task's row
+        results = await TaskService.get_task_results(session, updated)
+    response = TaskResponse.model_validate(updated, from_attributes=True)
+    response.results = results
+    return response
 
 
 @task_router.post("/tasks/{task_id}/input/", include_in_schema=False)
@@ -815,12 +1055,13 @@ async def cancel_task(
             detail=f"Cannot cancel task with status {task.get_status()}",
         )
     task.status = TaskStatus.CANCELLED
-    async with db.session() as session:
+    async with db.session(client_id=client_id) as session:
         await TaskService.update_task_status(
             session,
             task_id=task_id,
             status=TaskStatus.CANCELLED,
             results={"detail": "Task cancelled"},
+            redis=await _task_counters_redis(),
         )
     await publish_task_cancellation(task_id=task_id)
     return TaskResponse.model_validate(task, from_attributes=True)
@@ -876,7 +1117,7 @@ async def delete_task(
     """
     client_id, is_admin = client_info
 
-    async with db.session() as session:
+    async with db.session(client_id=client_id) as session:
         task = await TaskService.get_task(
             session,
             task_id=task_id,
@@ -893,9 +1134,15 @@ async def delete_task(
                 status_code=400,
                 detail=f"Cannot delete task with status {task.get_status()}",
             )
+        old_status = task.status
         task.mark_deleted()
         await session.commit()
         await session.refresh(task)
+    redis = await _task_counters_redis()
+    if redis is not None:
+        await TaskService.record_task_transition(
+            redis, task.client_id, old_status, new_status=None
+        )
     await trigger_delete_task(
         task_id=task_id,
         client_id=client_id,
@@ -960,7 +1207,7 @@ async def delete_tasks(
             detail="Task IDs must be specified for deletion",
         )
 
-    async with db.session() as session:
+    async with db.session(client_id=client_id) as session:
         # Delete specific tasks by ID
         if is_admin:
             # Admins can delete any tasks by ID
@@ -981,4 +1228,8 @@ async def delete_tasks(
         # Soft delete in DB
         if task_ids_to_delete:
             await session.commit()
+        redis = await _task_counters_redis()
+        if task_ids_to_delete and force is True and redis is not None:
+            # active ones might be included
+            await TaskService.reconcile_task_counters(session, redis)
     return Response(status_code=204)
@@ -3,13 +3,21 @@
 """WebSocket route utilities."""
 
 from .manager import WsTaskManager
+from .multiplex import MultiplexWebSocketHandler
 from .registry import WsTaskRegistry
 from .router import ws_router
-from .validation import ws_task_registry
+from .status_hub import WsStatusHub
+from .stream_hub import WsStreamHub
+from .validation import ws_status_hub, ws_stream_hub, ws_task_registry
 
 __all__ = [
+    "MultiplexWebSocketHandler",
     "WsTaskManager",
     "WsTaskRegistry",
+    "WsStatusHub",
+    "WsStreamHub",
     "ws_task_registry",
+    "ws_status_hub",
+    "ws_stream_hub",
     "ws_router",
 ]
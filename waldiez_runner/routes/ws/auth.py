@@ -24,8 +24,12 @@ from waldiez_runner.dependencies import (
     get_client_id_from_token,
     get_jwks_cache,
     get_settings,
+    verified_tokens,
+)
+from waldiez_runner.dependencies.auth import (
+    checked_audience,
+    verify_external_auth_token,
 )
-from waldiez_runner.dependencies.auth import verify_external_auth_token
 
 LOG = logging.getLogger(__name__)
 
@@ -78,6 +82,13 @@ async def get_ws_client_id(
 
         LOG.debug("Found token in %s", source["name"])
 
+        # Already verified (and its client found) by an HTTP request
+        cached = verified_tokens.get(
+            token, checked_audience(TASK_API_AUDIENCE, settings)
+        )
+        if cached is not None:
+            return cached.client_id, cast(str | None, source["subprotocol"])
+
         # Try internal validation
         client_id, _, exception = await get_client_id_from_token(
             expected_audience=TASK_API_AUDIENCE,
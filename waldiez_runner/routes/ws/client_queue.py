@@ -0,0 +1,200 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Per-client outgoing WebSocket queue with slow-consumer policies."""
+
+import asyncio
+from typing import Any, Literal, NamedTuple
+
+from typing_extensions import TypeGuard
+
+SlowClientPolicy = Literal["drop_oldest", "coalesce", "disconnect"]
+SLOW_CLIENT_POLICIES: tuple[SlowClientPolicy, ...] = (
+    "drop_oldest",
+    "coalesce",
+    "disconnect",
+)
+
+
+def is_slow_client_policy(value: Any) -> TypeGuard[SlowClientPolicy]:
+    """Check if a value is a valid slow client policy.
+
+    Parameters
+    ----------
+    value : Any
+        The value to check.
+
+    Returns
+    -------
+    bool
+        True if the value is a valid policy, False otherwise.
+    """
+    return value in SLOW_CLIENT_POLICIES
+
+
+def stream_id_after(entry_id: str, other_id: str) -> bool:
+    """Check if a Redis stream id comes after another one.
+
+    Parameters
+    ----------
+    entry_id : str
+        The stream id to check.
+    other_id : str
+        The stream id to compare with.
+
+    Returns
+    -------
+    bool
+        True if entry_id is after other_id, False otherwise.
+    """
+    return _stream_id_key(entry_id) > _stream_id_key(other_id)
+
+
+def _stream_id_key(entry_id: str) -> tuple[int, int]:
+    millis, _, seq = entry_id.partition("-")
+    try:
+        return int(millis), int(seq or 0)
+    except ValueError:
+        return 0, 0
+
+
+class WsFrame(NamedTuple):
+    """A serialized frame, shared by all the clients of a task."""
+
+    type: str | None
+    text: str
+    id: str | None = None
+
+
+CLOSE_FRAME_TYPE = "__close__"
+
+
+def close_frame(reason: str = "") -> WsFrame:
+    """Create the frame that ends a client's connection.
+
+    Parameters
+    ----------
+    reason : str, optional
+        The close reason, by default "".
+
+    Returns
+    -------
+    WsFrame
+        The (never sent) close frame.
+    """
+    return WsFrame(CLOSE_FRAME_TYPE, reason)
+
+
+def is_close_frame(frame: WsFrame) -> bool:
+    """Check if a queued frame ends the client's connection.
+
+    Parameters
+    ----------
+    frame : WsFrame
+        The queued frame.
+
+    Returns
+    -------
+    bool
+        True if the frame is a close frame, False otherwise.
+    """
+    return frame.type == CLOSE_FRAME_TYPE
+
+
+class WsClientQueue(asyncio.Queue[WsFrame]):
+    """Bounded queue of frames waiting to be sent to one client.
+
+    Frames are added with ``offer`` which never waits. When the client
+    falls behind, the policy decides what happens:
+
+    - ``drop_oldest``: the oldest queued frame is dropped.
+    - ``coalesce``: queued status frames are superseded by a newer
+      status frame; otherwise the oldest queued frame is dropped.
+    - ``disconnect``: the client should be disconnected once it is
+      ``max_lag`` frames behind.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100,
+        policy: SlowClientPolicy = "drop_oldest",
+        max_lag: int = 0,
+    ) -> None:
+        """Initialize the queue.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum queued frames, by default 100.
+        policy : SlowClientPolicy, optional
+            What to do with a slow client, by default "drop_oldest".
+        max_lag : int, optional
+            Queued frames after which a client is disconnected with the
+            "disconnect" policy, by default 0 (use maxsize).
+        """
+        super().__init__(maxsize=maxsize)
+        self.policy: SlowClientPolicy = policy
+        self.max_lag = max_lag if max_lag > 0 else maxsize
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def lag(self) -> int:
+        """Get the number of frames the client is behind.
+
+        Returns
+        -------
+        int
+            The queued frames.
+        """
+        return self.qsize()
+
+    def offer(self, frame: WsFrame) -> bool:
+        """Add a frame without waiting, applying the slow client policy.
+
+        Parameters
+        ----------
+        frame : WsFrame
+            The frame to add.
+
+        Returns
+        -------
+        bool
+            False if the client should be disconnected, True otherwise.
+        """
+        if self.policy == "disconnect":
+            if self.lag >= self.max_lag or self.full():
+                self.dropped += 1
+                return False
+        elif self.full():
+            if self.policy == "coalesce" and frame.type == "status":
+                self._drop_status_frames()
+            if self.full():
+                self.get_nowait()
+                self.dropped += 1
+        self.put_nowait(frame)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Get the queue's counters.
+
+        Returns
+        -------
+        dict[str, Any]
+            The lag, the dropped and the coalesced frames.
+        """
+        return {
+            "lag": self.lag,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+    def _drop_status_frames(self) -> None:
+        queued: list[WsFrame] = []
+        while not self.empty():
+            queued.append(self.get_nowait())
+        for item in queued:
+            if item.type == "status":
+                self.coalesced += 1
+            else:
+                self.put_nowait(item)
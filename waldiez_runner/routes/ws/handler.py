@@ -6,6 +6,7 @@
 """WebSocket route utilities."""
 
 import asyncio
+import json
 import logging
 import time
 from datetime import datetime
@@ -14,16 +15,25 @@ from typing import Any
 from fastapi import WebSocket, WebSocketDisconnect, WebSocketException
 from starlette import status
 
-from waldiez_runner.config import Settings
+from waldiez_runner.config import TRUTHY, WS_RESUME_WAIT_MS, Settings
 from waldiez_runner.dependencies import AsyncRedis, app_state
 from waldiez_runner.models import Task
 
-from .listeners import listen_for_ws_input, stream_history_and_live
+from .listeners import (
+    is_stream_id,
+    listen_for_ws_input,
+    parse_resume_request,
+    stream_history_and_live,
+)
 from .manager import WsTaskManager
+from .stream_hub import task_stream_key
 from .validation import validate_websocket_connection, ws_task_registry
 
 LOG = logging.getLogger(__name__)
 
+RESUME_SIGNALED_WAIT_MS = 1000
+"""How long to wait for the resume message of a ``?resume=1`` client."""
+
 
 class TaskWebSocketHandler:
     """WebSocket handler for task-related operations."""
@@ -59,6 +69,8 @@ class TaskWebSocketHandler:
 
         self.input_task: asyncio.Task[Any] | None = None
         self.output_task: asyncio.Task[Any] | None = None
+        self.last_event_id: str | None = None
+        self.first_message: str | None = None
 
     async def run(self) -> None:
         """Run the WebSocket handler.
@@ -77,6 +89,7 @@ class TaskWebSocketHandler:
             await self.validate()
             await self._accept()
             await self._send_initial_status()
+            await self._resolve_last_event_id()
             await self._start_task_listeners()
         except WebSocketException as err:
             LOG.error("WebSocket error: %s", err)
@@ -145,8 +158,42 @@ class TaskWebSocketHandler:
                 reason="Initial status send failed",
             ) from err
 
+    async def _resolve_last_event_id(self) -> None:
+        """Get the stream id to resume after, if any.
+
+        The id is taken from the ``last_event_id`` query param or from
+        a ``{"type": "resume", "last_event_id": "<id>"}`` first message
+        sent within ``WS_RESUME_WAIT_MS`` (or ``RESUME_SIGNALED_WAIT_MS``
+        if the client connected with ``?resume=1``). Without either,
+        nothing is waited for. Any other first message is kept for the
+        input listener.
+        """
+        query_params = self.websocket.query_params
+        query_id = query_params.get("last_event_id")
+        if query_id is not None:
+            self.last_event_id = query_id if is_stream_id(query_id) else None
+            return
+        wait_ms = WS_RESUME_WAIT_MS
+        if str(query_params.get("resume", "")).lower() in TRUTHY:
+            wait_ms = max(wait_ms, RESUME_SIGNALED_WAIT_MS)
+        if wait_ms <= 0:
+            return
+        try:
+            message = await asyncio.wait_for(
+                self.websocket.receive_text(),
+                timeout=wait_ms / 1000,
+            )
+        except asyncio.TimeoutError:
+            return
+        try:
+            self.last_event_id = parse_resume_request(json.loads(message))
+        except json.JSONDecodeError:
+            self.last_event_id = None
+        if self.last_event_id is None:
+            self.first_message = message
+
     async def _start_task_listeners(self) -> None:
-        stream_key = f"task:{self.task_id}:output"
+        stream_key = task_stream_key(self.task_id)
         input_channel = f"task:{self.task_id}:input_response"
 
         if not self.task_manager:
@@ -160,6 +207,8 @@ class TaskWebSocketHandler:
                 input_channel,
                 self.task_id,
                 self.redis,
+                stream_key=stream_key,
+                first_message=self.first_message,
             ),
             name=f"input-listener:{self.task_id}",
         )
@@ -169,6 +218,9 @@ class TaskWebSocketHandler:
                 self.redis,
                 stream_key,
                 self.task_manager,
+                ws_task_registry.hub,
+                self.websocket,
+                last_event_id=self.last_event_id,
             ),
             name=f"output-streamer:{self.task_id}",
         )
@@ -197,6 +249,10 @@ class TaskWebSocketHandler:
 def build_status_payload(task: Task) -> dict[str, Any]:
     """Build the status payload for the WebSocket.
 
+    Large results are stored out of the task's row: then ``results``
+    is null and ``results_ref`` is set (``GET /tasks/{task_id}`` has
+    them).
+
     Parameters
     ----------
     task : Task
@@ -230,6 +286,7 @@ def build_status_payload(task: Task) -> dict[str, Any]:
             "created_at": format_iso(task.created_at),
             "updated_at": format_iso(task.updated_at),
             "results": task.results,
+            "results_ref": task.results_ref,
             "input_request_id": task.input_request_id,
         },
     }
@@ -11,23 +11,43 @@
 import asyncio
 import json
 import logging
-from typing import Any
+import re
+from typing import TYPE_CHECKING, Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 
 from waldiez_runner.dependencies import AsyncRedis
 
-from .manager import WsTaskManager
+from .client_queue import stream_id_after
+from .manager import WsClient, WsTaskManager
+
+if TYPE_CHECKING:
+    from .stream_hub import WsStreamHub
 
 LOG = logging.getLogger(__name__)
 
 
+HISTORY_SIZE = 50
+MAX_HISTORY_PAGE = 500
+REPLAY_BATCH = 100
+STREAM_ID_REGEX = re.compile(r"^\d+(-\d+)?$")
+
+
 async def stream_history_and_live(
     redis: AsyncRedis,
     stream_key: str,
     manager: WsTaskManager,
+    hub: "WsStreamHub",
+    websocket: WsClient,
+    last_event_id: str | None = None,
 ) -> None:
-    """Stream history and live updates from Redis to WebSocket clients.
+    """Stream history and live updates from Redis to a WebSocket client.
+
+    The history is sent to this client only, the live entries are
+    dispatched to the manager by the process-wide stream hub. The
+    client's queued live entries that were part of the history
+    are skipped. Returns when the client's writer stops (the client
+    disconnected, was closed or removed).
 
     Parameters
     ----------
@@ -37,6 +57,13 @@ async def stream_history_and_live(
         The Redis stream key.
     manager : WsTaskManager
         The WebSocket task manager.
+    hub : WsStreamHub
+        The shared stream reader.
+    websocket : WsClient
+        The client (its WebSocket connection or a stand-in).
+    last_event_id : str | None, optional
+        Resume after this stream id instead of sending the
+        latest entries, by default None.
 
     Raises
     ------
@@ -46,45 +73,170 @@ async def stream_history_and_live(
         If the WebSocket connection is invalid.
     """
     try:
-        history = await redis.xrevrange(stream_key, "+", "-", count=50)
-        history.reverse()
-
-        last_id = "0"
-        for entry_id, raw in history:
-            last_id = entry_id
-            msg = decode_stream_msg(raw, entry_id)
-            asyncio.create_task(manager.broadcast(msg, skip_queue=True))
-
-        # Live stream
-        while True:
-            response = await redis.xread(
-                {stream_key: last_id}, block=5000, count=10
-            )
-            if not response:  # pragma: no cover
-                await asyncio.sleep(0.5)
-                continue
+        history, last_id = await read_initial_history(
+            redis, stream_key, last_event_id
+        )
+        texts = [manager.serialize(msg) for msg in history]
+        if websocket in manager.batching:
+            size = manager.batch_max_frames
+            for start in range(0, len(texts), size):
+                chunk = texts[start : start + size]
+                await websocket.send_text("[" + ",".join(chunk) + "]")
+        else:
+            for text in texts:
+                await websocket.send_text(text)
 
-            for _, entries in response:
-                for entry_id, raw in entries:
-                    if entry_id == last_id:
-                        continue
-                    msg = decode_stream_msg(raw, entry_id)
-                    asyncio.create_task(manager.broadcast(msg))
-                    last_id = entry_id
+        # Live stream: the shared reader fills the client's queue,
+        # this client's writer sends it.
+        manager.start_writer(websocket, after_id=last_id)
+        hub.add(manager, last_id)
+        writer = manager.client_tasks.get(websocket)
+        if writer is not None:
+            # not awaited directly: a cancelled writer is not our
+            # cancellation
+            await asyncio.wait([writer])
 
     except asyncio.CancelledError:
         LOG.debug("Output stream cancelled for %s", stream_key)
         raise
 
 
+async def read_initial_history(
+    redis: AsyncRedis,
+    stream_key: str,
+    last_event_id: str | None = None,
+) -> tuple[list[dict[str, Any]], str]:
+    """Read the entries to send to a client before the live ones.
+
+    Parameters
+    ----------
+    redis : AsyncRedis
+        The Redis client.
+    stream_key : str
+        The Redis stream key.
+    last_event_id : str | None, optional
+        The last entry the client has, by default None
+        (send the latest entries).
+
+    Returns
+    -------
+    tuple[list[dict[str, Any]], str]
+        The decoded entries (oldest first) and the
+        stream id to read the live entries after.
+    """
+    if last_event_id:
+        entries = await read_stream_after(redis, stream_key, last_event_id)
+        last_id = last_event_id
+        if not entries:
+            # do not let a (bogus) future id stall the live stream
+            last_id = await _min_with_latest_id(
+                redis, stream_key, last_event_id
+            )
+    else:
+        entries = await redis.xrevrange(
+            stream_key, "+", "-", count=HISTORY_SIZE
+        )
+        entries.reverse()
+        last_id = "0"
+    if entries:
+        last_id = entries[-1][0]
+    return [decode_stream_msg(raw, entry_id) for entry_id, raw in entries], (
+        last_id
+    )
+
+
+async def read_stream_after(
+    redis: AsyncRedis,
+    stream_key: str,
+    after_id: str,
+) -> list[tuple[str, dict[str, str]]]:
+    """Read all the stream entries after an id.
+
+    Parameters
+    ----------
+    redis : AsyncRedis
+        The Redis client.
+    stream_key : str
+        The Redis stream key.
+    after_id : str
+        The (excluded) stream id to start after.
+
+    Returns
+    -------
+    list[tuple[str, dict[str, str]]]
+        The entries, oldest first.
+    """
+    entries: list[tuple[str, dict[str, str]]] = []
+    start = f"({after_id}"
+    while True:
+        page = await redis.xrange(stream_key, start, "+", count=REPLAY_BATCH)
+        entries.extend(page)
+        if len(page) < REPLAY_BATCH:
+            return entries
+        start = f"({page[-1][0]}"
+
+
+async def read_history_page(
+    redis: AsyncRedis,
+    stream_key: str,
+    before: str | None = None,
+    count: int = HISTORY_SIZE,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Read a page of older stream entries.
+
+    Parameters
+    ----------
+    redis : AsyncRedis
+        The Redis client.
+    stream_key : str
+        The Redis stream key.
+    before : str | None, optional
+        The (excluded) stream id to read before, by default the latest.
+    count : int, optional
+        The max entries to read, by default 50.
+
+    Returns
+    -------
+    tuple[list[dict[str, Any]], bool]
+        The decoded entries (oldest first) and whether there are more.
+    """
+    count = max(1, min(count, MAX_HISTORY_PAGE))
+    max_id = f"({before}" if before else "+"
+    page = await redis.xrevrange(stream_key, max_id, "-", count=count + 1)
+    has_more = len(page) > count
+    page = page[:count]
+    page.reverse()
+    return [decode_stream_msg(raw, entry_id) for entry_id, raw in page], (
+        has_more
+    )
+
+
+async def _min_with_latest_id(
+    redis: AsyncRedis, stream_key: str, entry_id: str
+) -> str:
+    latest = await redis.xrevrange(stream_key, "+", "-", count=1)
+    if not latest:
+        return "0"
+    latest_id: str = latest[0][0]
+    if stream_id_after(entry_id, latest_id):
+        return latest_id
+    return entry_id
+
+
 async def listen_for_ws_input(
     websocket: WebSocket,
     channel: str,
     task_id: str,
     redis_client: AsyncRedis,
+    stream_key: str | None = None,
+    first_message: str | None = None,
 ) -> None:
     """Listen for user input from WebSocket and publish to Redis.
 
+    Control messages (``{"type": "history", "before": "<id>"}``) are
+    answered with a page of older stream entries if ``stream_key``
+    is given.
+
     Parameters
     ----------
     websocket : WebSocket
@@ -95,6 +247,10 @@ async def listen_for_ws_input(
         The task ID.
     redis_client:
         The Redis client.
+    stream_key : str | None, optional
+        The task's output stream, to answer history requests.
+    first_message : str | None, optional
+        A message already received from the client, by default None.
     Raises
     ------
     WebSocketDisconnect
@@ -103,10 +259,20 @@ async def listen_for_ws_input(
         If the task is cancelled.
     """
     try:
+        pending = first_message
         while True:
-            msg = await websocket.receive_text()
+            if pending is not None:
+                msg, pending = pending, None
+            else:
+                msg = await websocket.receive_text()
             payload = json.loads(msg)
 
+            if stream_key and is_history_request(payload):
+                await send_history_page(
+                    websocket, redis_client, stream_key, task_id, payload
+                )
+                continue
+
             if not valid_user_input(payload):
                 await websocket.send_json({"error": "Invalid input payload"})
                 continue
@@ -120,6 +286,99 @@ async def listen_for_ws_input(
         LOG.error("Input listener error: %s", err)
 
 
+async def send_history_page(
+    websocket: WsClient,
+    redis: AsyncRedis,
+    stream_key: str,
+    task_id: str,
+    request: dict[str, Any],
+) -> None:
+    """Answer a history request with a page of older stream entries.
+
+    Parameters
+    ----------
+    websocket : WsClient
+        The WebSocket connection.
+    redis : AsyncRedis
+        The Redis client.
+    stream_key : str
+        The task's output stream.
+    task_id : str
+        The task ID.
+    request : dict[str, Any]
+        The (valid) history request.
+    """
+    before = request.get("before")
+    count = request.get("count", HISTORY_SIZE)
+    entries, has_more = await read_history_page(
+        redis, stream_key, before=before, count=count
+    )
+    page = {
+        "type": "history",
+        "task_id": task_id,
+        "data": [WsTaskManager.parse_print_message(e) for e in entries],
+        "has_more": has_more,
+    }
+    await websocket.send_text(WsTaskManager.serialize(page))
+
+
+def is_history_request(payload: Any) -> bool:
+    """Check if a payload is a request for older stream entries.
+
+    Parameters
+    ----------
+    payload : Any
+        The payload.
+
+    Returns
+    -------
+    bool
+        True if the payload is a valid history request, False otherwise.
+    """
+    if not isinstance(payload, dict) or payload.get("type") != "history":
+        return False
+    before = payload.get("before")
+    count = payload.get("count", HISTORY_SIZE)
+    return (before is None or is_stream_id(before)) and (
+        isinstance(count, int) and not isinstance(count, bool)
+    )
+
+
+def parse_resume_request(payload: Any) -> str | None:
+    """Get the last event id from a resume request.
+
+    Parameters
+    ----------
+    payload : Any
+        The payload (``{"type": "resume", "last_event_id": "<id>"}``).
+
+    Returns
+    -------
+    str | None
+        The last event id if the payload is a valid resume request.
+    """
+    if not isinstance(payload, dict) or payload.get("type") != "resume":
+        return None
+    last_event_id = payload.get("last_event_id")
+    return last_event_id if is_stream_id(last_event_id) else None
+
+
+def is_stream_id(value: Any) -> bool:
+    """Check if a value is a valid Redis stream id.
+
+    Parameters
+    ----------
+    value : Any
+        The value to check.
+
+    Returns
+    -------
+    bool
+        True if the value is a stream id (e.g. "1712345678901-0").
+    """
+    return isinstance(value, str) and bool(STREAM_ID_REGEX.match(value))
+
+
 def valid_user_input(payload: Any) -> bool:
     """Validate the structure of user input payload.
 
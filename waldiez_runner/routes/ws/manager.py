@@ -3,19 +3,62 @@
 """Manage WebSocket clients for a single task."""
 
 # pylint: disable=broad-exception-caught,too-few-public-methods
-# pylint: disable=too-many-try-statements
+# pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-try-statements,unnecessary-ellipsis
 
 import asyncio
-import json
 import logging
 import time
-from typing import Any
+from typing import Any, Protocol
 
-from fastapi import WebSocket
+import orjson
+from starlette import status
+from starlette.websockets import WebSocketState
+
+from .client_queue import (
+    SlowClientPolicy,
+    WsClientQueue,
+    WsFrame,
+    close_frame,
+    is_close_frame,
+    stream_id_after,
+)
 
 LOG = logging.getLogger(__name__)
 
 
+class WsClient(Protocol):  # pragma: no cover
+    """What a task manager needs from a client.
+
+    A WebSocket connection, or anything that stands in for one (an SSE
+    viewer, a multiplexed subscription).
+    """
+
+    async def send_text(self, data: str) -> None:
+        """Send a serialized frame.
+
+        Parameters
+        ----------
+        data : str
+            The frame.
+        """
+        ...
+
+    async def close(
+        self, code: int = status.WS_1000_NORMAL_CLOSURE, reason: str = ""
+    ) -> None:
+        """Close the client.
+
+        Parameters
+        ----------
+        code : int, optional
+            The close code, by default 1000.
+        reason : str, optional
+            The reason, by default "".
+        """
+        ...
+
+
 class TooManyClientsException(Exception):
     """Exception raised when too many clients are connected."""
 
@@ -24,7 +67,14 @@ class WsTaskManager:
     """Manage WebSocket clients for a single task."""
 
     def __init__(
-        self, task_id: str, max_clients: int = 5, queue_size: int = 100
+        self,
+        task_id: str,
+        max_clients: int = 5,
+        queue_size: int = 100,
+        slow_client_policy: SlowClientPolicy = "drop_oldest",
+        max_client_lag: int = 0,
+        batch_window: float = 0.01,
+        batch_max_frames: int = 100,
     ) -> None:
         """Initialize the task manager.
 
@@ -36,22 +86,54 @@ class WsTaskManager:
             Maximum allowed clients for this task, by default 5.
         queue_size : int, optional
             Maximum messages per client queue, by default 100.
+        slow_client_policy : SlowClientPolicy, optional
+            What to do with clients that fall behind,
+            by default "drop_oldest".
+        max_client_lag : int, optional
+            Queued messages after which a client is disconnected with the
+            "disconnect" policy, by default 0 (use queue_size).
+        batch_window : float, optional
+            Seconds a batching client's writer waits for more frames,
+            by default 0.01.
+        batch_max_frames : int, optional
+            Maximum frames per batch, by default 100.
         """
         self.task_id = task_id
         self.max_clients = max_clients
         self.queue_size = queue_size
+        self.slow_client_policy: SlowClientPolicy = slow_client_policy
+        self.max_client_lag = max_client_lag
+        self.batch_window = batch_window
+        self.batch_max_frames = batch_max_frames
         self.last_used = time.monotonic()
-        self.clients: list[WebSocket] = []
-        self.client_queues: dict[WebSocket, asyncio.Queue[dict[str, Any]]] = {}
-        self.client_tasks: dict[WebSocket, asyncio.Task[Any]] = {}
+        self.slow_disconnects = 0
+        self.dead_clients = 0
+        self.enqueued = 0
+        self.last_id: str | None = None
+        self.clients: list[WsClient] = []
+        self.client_queues: dict[WsClient, WsClientQueue] = {}
+        self.client_tasks: dict[WsClient, asyncio.Task[Any]] = {}
+        self.batching: set[WsClient] = set()
+        self._close_tasks: set[asyncio.Task[Any]] = set()
 
-    def add_client(self, websocket: WebSocket) -> None:
+    def add_client(
+        self,
+        websocket: WsClient,
+        start_writer: bool = True,
+        batch: bool = False,
+    ) -> None:
         """Add a WebSocket client if within limits.
 
         Parameters
         ----------
-        websocket : WebSocket
-            The WebSocket connection.
+        websocket : WsClient
+            The client.
+        start_writer : bool, optional
+            Whether to start sending the queued messages now, by default
+            True. If False, messages are queued until ``start_writer``.
+        batch : bool, optional
+            Whether the client gets its queued messages in batches (JSON
+            arrays), by default False.
 
         Raises
         ------
@@ -63,15 +145,18 @@ class WsTaskManager:
                 f"Too many clients for task {self.task_id}"
             )
 
-        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
-            maxsize=self.queue_size
+        queue = WsClientQueue(
+            maxsize=self.queue_size,
+            policy=self.slow_client_policy,
+            max_lag=self.max_client_lag,
         )
         self.clients.append(websocket)
         self.client_queues[websocket] = queue
-
-        # Start a background task to send messages from the queue
-        task = asyncio.create_task(self.websocket_writer(websocket, queue))
-        self.client_tasks[websocket] = task
+        if batch:
+            self.batching.add(websocket)
+        self.update_usage()
+        if start_writer:
+            self.start_writer(websocket)
 
         LOG.debug(
             "Added client to task %s, total: %d",
@@ -79,25 +164,63 @@ class WsTaskManager:
             len(self.clients),
         )
 
+    def start_writer(
+        self, websocket: WsClient, after_id: str | None = None
+    ) -> None:
+        """Start sending the queued messages to a client.
+
+        Parameters
+        ----------
+        websocket : WsClient
+            The client.
+        after_id : str | None, optional
+            Skip queued stream entries up to this id (already sent
+            to the client), by default None.
+        """
+        queue = self.client_queues.get(websocket)
+        if queue is None or websocket in self.client_tasks:
+            return
+        # Start a background task to send messages from the queue
+        task = asyncio.create_task(
+            self.websocket_writer(websocket, queue, after_id)
+        )
+        self.client_tasks[websocket] = task
+
     async def websocket_writer(
         self,
-        websocket: WebSocket,
-        queue: asyncio.Queue[dict[str, Any]],
+        websocket: WsClient,
+        queue: WsClientQueue,
+        after_id: str | None = None,
     ) -> None:
         """Sends messages from queue to the WebSocket client.
 
         Parameters
         ----------
-        websocket : WebSocket
-            The WebSocket connection.
+        websocket : WsClient
+            The client.
         queue : asyncio.Queue
-            The message queue.
+            The queue with the already serialized frames.
+        after_id : str | None, optional
+            Skip stream entries up to this id, by default None.
         """
+        batch = websocket in self.batching
         try:
             while True:
-                message = await queue.get()  # Wait for message
-                parsed_message = self._try_parse_print_message(message)
-                await websocket.send_json(parsed_message)
+                frame = await queue.get()  # Wait for message
+                frames = [frame]
+                if batch:
+                    frames = await collect_batch(
+                        queue, frame, self.batch_window, self.batch_max_frames
+                    )
+                texts, after_id, closing = _frames_to_send(frames, after_id)
+                if texts and batch:
+                    # one frame (and one write) for all of them
+                    await websocket.send_text("[" + ",".join(texts) + "]")
+                elif texts:
+                    await websocket.send_text(texts[0])
+                if closing is not None:
+                    await self._close_client(websocket, closing.text)
+                    return
         except asyncio.CancelledError:  # pragma: no cover
             LOG.debug(
                 "WebSocket writer task cancelled for client %s", websocket
@@ -107,16 +230,18 @@ class WsTaskManager:
         finally:
             self.remove_client(websocket)  # Cleanup
 
-    def remove_client(self, websocket: WebSocket) -> None:
+    def remove_client(self, websocket: WsClient) -> None:
         """Remove a WebSocket client and cleanup.
 
         Parameters
         ----------
-        websocket : WebSocket
-            The WebSocket connection
+        websocket : WsClient
+            The client.
         """
         try:
             self.clients.remove(websocket)
+            self.update_usage()
+            self.batching.discard(websocket)
             queue = self.client_queues.pop(websocket, None)
             task = self.client_tasks.pop(websocket, None)
 
@@ -143,6 +268,9 @@ class WsTaskManager:
     ) -> None:
         """Broadcast a message by adding it to each client's queue.
 
+        The message is serialized once and the same frame
+        is shared by all the clients' queues (see ``enqueue``).
+
         Parameters
         ----------
         message : dict
@@ -150,19 +278,130 @@ class WsTaskManager:
         skip_queue : bool, optional
             Send message directly without adding to queue, by default False.
         """
-        parsed_message = self._try_parse_print_message(message)
+        if not skip_queue:
+            self.enqueue(message)
+            return
+        if not self.clients:
+            return
+        text = self.serialize(message)
+        for client in self.clients[:]:
+            await client.send_text(text)
+
+    def enqueue(self, message: dict[str, Any]) -> bool:
+        """Append a message to each client's queue, in order.
+
+        This never waits (and never creates a task): the clients' writers
+        send the queued frames in the order they were appended. Stream
+        entries that are not after the last enqueued one are skipped.
+
+        Parameters
+        ----------
+        message : dict[str, Any]
+            The message to enqueue.
+
+        Returns
+        -------
+        bool
+            False if the message was skipped as out of order.
+        """
+        entry_id = message.get("id")
+        if isinstance(entry_id, str):
+            if self.last_id is not None and not stream_id_after(
+                entry_id, self.last_id
+            ):
+                return False
+            self.last_id = entry_id
+        self.enqueued += 1
+        if not self.clients:
+            return True
+        frame = WsFrame(message.get("type"), self.serialize(message), entry_id)
+        for client in self.clients[:]:
+            queue = self.client_queues.get(client)
+            # never wait for a slow client
+            if queue is not None and not queue.offer(frame):
+                self._disconnect_slow_client(client)
+        return True
+
+    def close_clients(self, reason: str = "") -> None:
+        """Close all the clients normally, after their queued frames.
+
+        Parameters
+        ----------
+        reason : str, optional
+            The close reason, by default "".
+        """
+        frame = close_frame(reason)
         for client in self.clients[:]:
-            try:
-                if skip_queue:
-                    await client.send_json(parsed_message)
-                else:
-                    queue = self.client_queues.get(client)
-                    if queue:
-                        await queue.put(parsed_message)
-            except asyncio.QueueFull:
-                LOG.warning(
-                    "Queue full for client %s, dropping message.", client
-                )
+            queue = self.client_queues.get(client)
+            if queue is not None and not queue.offer(frame):
+                self._disconnect_slow_client(client)
+
+    async def _close_client(self, websocket: WsClient, reason: str) -> None:
+        # removed first: closing must not cancel the writer we run in
+        self.client_tasks.pop(websocket, None)
+        self.remove_client(websocket)
+        await websocket.close(code=status.WS_1000_NORMAL_CLOSURE, reason=reason)
+
+    def client_stats(self) -> list[dict[str, Any]]:
+        """Get the lag and drop counters of each client.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The counters of each connected client.
+        """
+        return [
+            queue.stats()
+            for client in self.clients
+            if (queue := self.client_queues.get(client)) is not None
+        ]
+
+    def _disconnect_slow_client(self, websocket: WsClient) -> None:
+        """Disconnect a client that fell too far behind.
+
+        Parameters
+        ----------
+        websocket : WsClient
+            The client.
+        """
+        LOG.warning(
+            "Client of task %s is too slow, disconnecting it.", self.task_id
+        )
+        self.slow_disconnects += 1
+        self.remove_client(websocket)
+        # closing might also wait for the slow client
+        task = asyncio.create_task(
+            websocket.close(
+                code=status.WS_1013_TRY_AGAIN_LATER,
+                reason="Client too slow",
+            )
+        )
+        self._close_tasks.add(task)
+        task.add_done_callback(self._on_close_done)
+
+    def _on_close_done(self, task: asyncio.Task[Any]) -> None:
+        self._close_tasks.discard(task)
+        if not task.cancelled() and task.exception():  # pragma: no cover
+            LOG.debug("Error closing slow client: %s", task.exception())
+
+    def remove_dead_clients(self) -> int:
+        """Remove the clients whose connection is gone.
+
+        A client is dead if its writer has stopped or its socket is
+        disconnected but it was not removed (e.g. a handler that never
+        got to its cleanup).
+
+        Returns
+        -------
+        int
+            The number of removed clients.
+        """
+        dead = [client for client in self.clients if _is_dead(client, self)]
+        for client in dead:
+            LOG.debug("Removing dead client of task %s", self.task_id)
+            self.remove_client(client)
+        self.dead_clients += len(dead)
+        return len(dead)
 
     def is_empty(self) -> bool:
         """Check if the task has no connected clients.
@@ -178,19 +417,112 @@ class WsTaskManager:
         """Update the last used timestamp"""
         self.last_used = time.monotonic()
 
+    @classmethod
+    def serialize(cls, message: dict[str, Any]) -> str:
+        """Serialize a message to the text frame sent to the clients.
+
+        Parameters
+        ----------
+        message : dict[str, Any]
+            The message to serialize.
+
+        Returns
+        -------
+        str
+            The JSON text frame.
+        """
+        parsed_message = cls.parse_print_message(message)
+        return orjson.dumps(parsed_message, default=str).decode()
+
     @staticmethod
-    def _try_parse_print_message(message: dict[str, Any]) -> dict[str, Any]:
-        """Check if the message double dumped, if so parse the inner."""
+    def parse_print_message(message: dict[str, Any]) -> dict[str, Any]:
+        """Check if the message double dumped, if so parse the inner.
+
+        Parameters
+        ----------
+        message : dict[str, Any]
+            The message from the stream.
+
+        Returns
+        -------
+        dict[str, Any]
+            The message with its data parsed if needed.
+        """
+        if message.get("type") != "print" or "data" not in message:
+            return message
+        try:
+            parsed = orjson.loads(message["data"])
+        except BaseException:  # pylint: disable=broad-exception-caught
+            return message
+        if not isinstance(parsed, (dict, list)):
+            return message
         message_copy = message.copy()
-        if (
-            "type" in message
-            and message["type"] == "print"
-            and "data" in message
-        ):
-            try:
-                parsed = json.loads(message["data"])
-                if isinstance(parsed, (dict, list)):
-                    message_copy["data"] = parsed
-            except BaseException:  # pylint: disable=broad-exception-caught
-                pass
+        message_copy["data"] = parsed
         return message_copy
+
+
+async def collect_batch(
+    queue: WsClientQueue,
+    first: WsFrame,
+    window: float,
+    max_frames: int,
+) -> list[WsFrame]:
+    """Collect the frames queued within a window after the first one.
+
+    Parameters
+    ----------
+    queue : WsClientQueue
+        The client's queue.
+    first : WsFrame
+        The already received frame.
+    window : float
+        Seconds to wait for more frames (<=0: only the queued ones).
+    max_frames : int
+        Maximum frames to collect.
+
+    Returns
+    -------
+    list[WsFrame]
+        The collected frames, in order.
+    """
+    frames = [first]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + window
+    while len(frames) < max_frames:
+        if not queue.empty():
+            frames.append(queue.get_nowait())
+            continue
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            async with asyncio.timeout(remaining):
+                frames.append(await queue.get())
+        except TimeoutError:
+            break
+    return frames
+
+
+def _frames_to_send(
+    frames: list[WsFrame], after_id: str | None
+) -> tuple[list[str], str | None, WsFrame | None]:
+    texts: list[str] = []
+    for frame in frames:
+        if is_close_frame(frame):
+            return texts, after_id, frame
+        if after_id is not None and frame.id is not None:
+            if not stream_id_after(frame.id, after_id):
+                continue  # already sent
+            after_id = None
+        texts.append(frame.text)
+    return texts, after_id, None
+
+
+def _is_dead(websocket: WsClient, manager: WsTaskManager) -> bool:
+    writer = manager.client_tasks.get(websocket)
+    if writer is not None and writer.done():
+        return True
+    return any(
+        getattr(websocket, state, None) == WebSocketState.DISCONNECTED
+        for state in ("client_state", "application_state")
+    )
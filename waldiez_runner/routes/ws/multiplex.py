@@ -0,0 +1,376 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-try-statements,broad-exception-caught
+
+"""Subscribe to many tasks over a single WebSocket connection.
+
+After connecting (and authenticating once) to ``/ws``, a client sends:
+
+- ``{"type": "subscribe", "task_ids": ["a", "b"]}`` (or ``"task_id"``),
+  optionally with ``"last_event_id"`` to resume a single task.
+- ``{"type": "unsubscribe", "task_ids": ["a"]}`` (or ``"task_id"``).
+- ``{"type": "history", "task_id": "a", "before": "<id>"}``.
+- ``{"task_id": "a", "request_id": "...", "data": "..."}`` (user input).
+
+Each task frame is tagged with its task id:
+``{"task_id": "a", "message": {...}}``. Replies about the subscriptions
+are ``{"type": "subscribed" | "unsubscribed" | "error", "task_id": ...}``.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+import orjson
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette import status
+
+from waldiez_runner.config import WS_MAX_SUBSCRIPTIONS, Settings
+from waldiez_runner.dependencies import AsyncRedis, app_state
+from waldiez_runner.models import Task
+from waldiez_runner.services import TaskService
+
+from .auth import get_ws_client_id
+from .handler import build_status_payload
+from .listeners import (
+    is_history_request,
+    is_stream_id,
+    send_history_page,
+    stream_history_and_live,
+    valid_user_input,
+)
+from .manager import TooManyClientsException, WsTaskManager
+from .registry import TooManyTasksException
+from .stream_hub import task_stream_key
+from .validation import is_watchable, ws_task_registry
+
+LOG = logging.getLogger(__name__)
+
+
+def tag_frame(task_id: str, text: str) -> str:
+    """Tag an already serialized frame with its task id.
+
+    Parameters
+    ----------
+    task_id : str
+        The task ID.
+    text : str
+        The serialized frame.
+
+    Returns
+    -------
+    str
+        The ``{"task_id": ..., "message": ...}`` frame.
+    """
+    return (
+        '{"task_id":' + orjson.dumps(task_id).decode() + ',"message":'
+        f"{text}}}"
+    )
+
+
+class WsSubscription:
+    """A task subscription of a multiplexed connection.
+
+    It is added to the task's manager in place of a WebSocket, so the
+    task's frames go through the shared per-task reader and queue like
+    any other client's. Sent frames are tagged with the task id.
+    """
+
+    def __init__(
+        self,
+        handler: "MultiplexWebSocketHandler",
+        task_id: str,
+        manager: WsTaskManager,
+    ) -> None:
+        """Initialize the subscription.
+
+        Parameters
+        ----------
+        handler : MultiplexWebSocketHandler
+            The connection's handler.
+        task_id : str
+            The task ID.
+        manager : WsTaskManager
+            The task's manager.
+        """
+        self.handler = handler
+        self.task_id = task_id
+        self.manager = manager
+        self.output_task: asyncio.Task[Any] | None = None
+
+    async def send_text(self, data: str) -> None:
+        """Send a frame of this task.
+
+        Parameters
+        ----------
+        data : str
+            The serialized frame.
+        """
+        await self.handler.send_text(tag_frame(self.task_id, data))
+
+    async def close(  # pylint: disable=unused-argument
+        self, code: int = status.WS_1000_NORMAL_CLOSURE, reason: str = ""
+    ) -> None:
+        """End the subscription (the connection stays open).
+
+        Parameters
+        ----------
+        code : int, optional
+            The close code, by default 1000.
+        reason : str, optional
+            The reason, by default "".
+        """
+        await self.handler.unsubscribe(self.task_id, reason=reason or None)
+
+
+class MultiplexWebSocketHandler:
+    """Handle a WebSocket connection with many task subscriptions."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        settings: Settings,
+        redis: AsyncRedis,
+        max_subscriptions: int = WS_MAX_SUBSCRIPTIONS,
+    ) -> None:
+        """Initialize the handler.
+
+        Parameters
+        ----------
+        websocket : WebSocket
+            The WebSocket connection.
+        settings : Settings
+            The settings dependency.
+        redis : AsyncRedis
+            The Redis client, shared by all the subscriptions.
+        max_subscriptions : int, optional
+            The max subscribed tasks, by default WS_MAX_SUBSCRIPTIONS.
+        """
+        self.websocket = websocket
+        self.settings = settings
+        self.redis = redis
+        self.max_subscriptions = max_subscriptions
+        self.client_id: str | None = None
+        self.subscriptions: dict[str, WsSubscription] = {}
+        self._send_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        """Authenticate, accept and serve the connection."""
+        self.client_id, subprotocol = await get_ws_client_id(
+            self.websocket, settings=self.settings
+        )
+        if self.client_id is None:
+            await self.websocket.close(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason="Invalid client ID",
+            )
+            return
+        await self.websocket.accept(subprotocol=subprotocol)
+        try:
+            while True:
+                message = await self.websocket.receive_text()
+                await self.handle_message(message)
+        except WebSocketDisconnect:
+            LOG.debug("Multiplexed WS disconnected: %s", self.client_id)
+        except Exception as err:
+            LOG.error("Multiplexed WS error: %s", err)
+        finally:
+            self.cleanup()
+
+    async def send_text(self, data: str) -> None:
+        """Send a frame, one at a time.
+
+        Parameters
+        ----------
+        data : str
+            The serialized frame.
+        """
+        async with self._send_lock:
+            await self.websocket.send_text(data)
+
+    async def handle_message(self, message: str) -> None:
+        """Handle a message from the client.
+
+        Parameters
+        ----------
+        message : str
+            The received message.
+        """
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError:
+            await self._reply("error", None, error="Invalid JSON")
+            return
+        if not isinstance(payload, dict):
+            await self._reply("error", None, error="Invalid message")
+            return
+        msg_type = payload.get("type")
+        if msg_type == "subscribe":
+            await self.subscribe(
+                _get_task_ids(payload), payload.get("last_event_id")
+            )
+        elif msg_type == "unsubscribe":
+            for task_id in _get_task_ids(payload):
+                await self.unsubscribe(task_id)
+        else:
+            await self._handle_task_message(payload)
+
+    async def subscribe(
+        self, task_ids: list[str], last_event_id: Any = None
+    ) -> None:
+        """Subscribe to tasks.
+
+        Parameters
+        ----------
+        task_ids : list[str]
+            The task IDs.
+        last_event_id : Any, optional
+            Resume after this stream id (single task only).
+        """
+        if not is_stream_id(last_event_id) or len(task_ids) != 1:
+            last_event_id = None
+        new_ids = [t for t in task_ids if t not in self.subscriptions]
+        for task_id in task_ids:
+            if task_id not in new_ids:
+                await self._reply("subscribed", task_id)
+        if not new_ids:
+            return
+        if not app_state.db:  # pragma: no cover
+            await self._reply("error", None, error="Database not available")
+            return
+        async with app_state.db.session() as session:
+            tasks = [
+                (task_id, await TaskService.get_task(session, task_id))
+                for task_id in new_ids
+            ]
+        for task_id, task in tasks:
+            await self._subscribe_task(task_id, task, last_event_id)
+
+    async def unsubscribe(
+        self, task_id: str, reason: str | None = None
+    ) -> None:
+        """Unsubscribe from a task.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+        reason : str | None, optional
+            Why the subscription ended, if not requested by the client.
+        """
+        subscription = self.subscriptions.pop(task_id, None)
+        if subscription is None:
+            return
+        _end_subscription(subscription)
+        extra = {"reason": reason} if reason else {}
+        try:
+            await self._reply("unsubscribed", task_id, **extra)
+        except Exception as err:  # pragma: no cover
+            LOG.debug("Could not send unsubscribe reply: %s", err)
+
+    def cleanup(self) -> None:
+        """End all the subscriptions."""
+        subscriptions = list(self.subscriptions.values())
+        self.subscriptions.clear()
+        for subscription in subscriptions:
+            _end_subscription(subscription)
+
+    async def _subscribe_task(
+        self, task_id: str, task: Task | None, last_event_id: str | None
+    ) -> None:
+        # (another client's task is not found either)
+        if task is None or task.client_id != self.client_id:
+            await self._reply("error", task_id, error="Task not found")
+            return
+        if not is_watchable(task):
+            await self._reply("error", task_id, error="Task is not active")
+            return
+        if len(self.subscriptions) >= self.max_subscriptions:
+            await self._reply("error", task_id, error="Too many subscriptions")
+            return
+        try:
+            manager = ws_task_registry.get_or_create_task_manager(task_id)
+        except TooManyTasksException:
+            await self._reply("error", task_id, error="Too many tasks")
+            return
+        subscription = WsSubscription(self, task_id, manager)
+        try:
+            manager.add_client(subscription, start_writer=False)
+        except TooManyClientsException:
+            ws_task_registry.remove_task_if_empty(task_id)
+            await self._reply("error", task_id, error="Too many clients")
+            return
+        self.subscriptions[task_id] = subscription
+        await self._reply("subscribed", task_id)
+        await subscription.send_text(
+            manager.serialize(build_status_payload(task))
+        )
+        subscription.output_task = asyncio.create_task(
+            stream_history_and_live(
+                self.redis,
+                task_stream_key(task_id),
+                manager,
+                ws_task_registry.hub,
+                subscription,
+                last_event_id=last_event_id,
+            ),
+            name=f"output-streamer:{task_id}:{id(self)}",
+        )
+        subscription.output_task.add_done_callback(_log_stream_error)
+
+    async def _handle_task_message(self, payload: dict[str, Any]) -> None:
+        task_id = payload.get("task_id")
+        subscription = (
+            self.subscriptions.get(task_id)
+            if isinstance(task_id, str)
+            else None
+        )
+        if subscription is None:
+            await self._reply("error", None, error="Not subscribed")
+            return
+        if is_history_request(payload):
+            await send_history_page(
+                subscription,
+                self.redis,
+                task_stream_key(subscription.task_id),
+                subscription.task_id,
+                payload,
+            )
+            return
+        if not valid_user_input(payload):
+            await self._reply(
+                "error", subscription.task_id, error="Invalid input payload"
+            )
+            return
+        await self.redis.publish(
+            f"task:{subscription.task_id}:input_response", json.dumps(payload)
+        )
+
+    async def _reply(
+        self, msg_type: str, task_id: str | None, **extra: Any
+    ) -> None:
+        payload: dict[str, Any] = {"type": msg_type, "task_id": task_id}
+        payload.update(extra)
+        await self.send_text(orjson.dumps(payload).decode())
+
+
+def _get_task_ids(payload: dict[str, Any]) -> list[str]:
+    task_ids = payload.get("task_ids")
+    if not isinstance(task_ids, list):
+        task_ids = [payload.get("task_id")]
+    unique = dict.fromkeys(t for t in task_ids if isinstance(t, str) and t)
+    return list(unique)
+
+
+def _end_subscription(subscription: WsSubscription) -> None:
+    if subscription.output_task and not subscription.output_task.done():
+        subscription.output_task.cancel()
+    subscription.manager.remove_client(subscription)
+    ws_task_registry.remove_task_if_empty(subscription.task_id)
+
+
+def _log_stream_error(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        LOG.error("Subscription stream error: %s", task.exception())
@@ -1,12 +1,16 @@
 # SPDX-License-Identifier: Apache-2.0.
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
+# pylint: disable=too-many-instance-attributes
 """Manage WebSocket tasks."""
 
+import asyncio
 import logging
 import time
 from typing import Any
 
+from .client_queue import SlowClientPolicy
 from .manager import WsTaskManager
+from .stream_hub import WsStreamHub
 
 LOG = logging.getLogger(__name__)
 
@@ -19,20 +23,53 @@ class WsTaskRegistry:
     """Registry to manage task managers for WebSocket tasks."""
 
     def __init__(
-        self, max_active_tasks: int = 50, max_clients_per_task: int = 5
+        self,
+        max_active_tasks: int = 1000,
+        max_clients_per_task: int = 5,
+        hub: WsStreamHub | None = None,
+        queue_size: int = 100,
+        slow_client_policy: SlowClientPolicy = "drop_oldest",
+        max_client_lag: int = 0,
+        batch_window: float = 0.01,
+        batch_max_frames: int = 100,
     ) -> None:
         """Initialize the task registry.
 
         Parameters
         ----------
         max_active_tasks : int, optional
-            Maximum number of active tasks, by default 50.
+            Maximum number of active tasks, by default 1000.
+            Use zero or a negative value for no limit.
         max_clients_per_task : int, optional
             Maximum clients per task, by default 5.
+        hub : WsStreamHub | None, optional
+            The shared stream reader, by default a new one.
+        queue_size : int, optional
+            Maximum messages per client queue, by default 100.
+        slow_client_policy : SlowClientPolicy, optional
+            What to do with clients that fall behind,
+            by default "drop_oldest".
+        max_client_lag : int, optional
+            Queued messages after which a client is disconnected with the
+            "disconnect" policy, by default 0 (use queue_size).
+        batch_window : float, optional
+            Seconds a batching client's writer waits for more frames,
+            by default 0.01.
+        batch_max_frames : int, optional
+            Maximum frames per batch, by default 100.
         """
         self.max_active_tasks = max_active_tasks
         self.max_clients_per_task = max_clients_per_task
+        self.queue_size = queue_size
+        self.slow_client_policy: SlowClientPolicy = slow_client_policy
+        self.max_client_lag = max_client_lag
+        self.batch_window = batch_window
+        self.batch_max_frames = batch_max_frames
+        self.hub = hub if hub is not None else WsStreamHub()
         self.tasks: dict[str, WsTaskManager] = {}
+        self.evicted_tasks = 0
+        self.dead_clients = 0
+        self._reaper: asyncio.Task[None] | None = None
 
     def get_or_create_task_manager(self, task_id: str) -> WsTaskManager:
         """Get or create a task manager if within active task limits.
@@ -53,12 +90,18 @@ class WsTaskRegistry:
             Raised when too many tasks are active.
         """
         if task_id not in self.tasks:
-            if len(self.tasks) >= self.max_active_tasks:
+            if 0 < self.max_active_tasks <= len(self.tasks):
                 raise TooManyTasksException(
                     f"Too many active tasks ({len(self.tasks)})"
                 )
             self.tasks[task_id] = WsTaskManager(
-                task_id, self.max_clients_per_task
+                task_id,
+                self.max_clients_per_task,
+                queue_size=self.queue_size,
+                slow_client_policy=self.slow_client_policy,
+                max_client_lag=self.max_client_lag,
+                batch_window=self.batch_window,
+                batch_max_frames=self.batch_max_frames,
             )
 
         return self.tasks[task_id]
@@ -74,6 +117,7 @@ class WsTaskRegistry:
         if task_id in self.tasks and self.tasks[task_id].is_empty():
             LOG.debug("Removing empty task %s", task_id)
             del self.tasks[task_id]
+            self.hub.remove(task_id)
 
     async def broadcast_to(
         self, task_id: str, message: dict[str, Any], skip_queue: bool = False
@@ -109,15 +153,49 @@ class WsTaskRegistry:
             "per_task": {
                 task_id: len(m.clients) for task_id, m in self.tasks.items()
             },
+            "per_client": {
+                task_id: m.client_stats() for task_id, m in self.tasks.items()
+            },
+            "slow_client_policy": self.slow_client_policy,
+            "slow_disconnects": sum(
+                m.slow_disconnects for m in self.tasks.values()
+            ),
+            "evicted_tasks": self.evicted_tasks,
+            "dead_clients": self.dead_clients,
         }
 
-    def expire_idle_tasks(self, max_idle_seconds: float = 300) -> None:
+    def metrics(self) -> dict[str, int]:
+        """Get the registry's size and eviction counters.
+
+        Returns
+        -------
+        dict[str, int]
+            The active tasks, the connected clients and the counters.
+        """
+        return {
+            "active_tasks": len(self.tasks),
+            "connected_clients": sum(
+                len(m.clients) for m in self.tasks.values()
+            ),
+            "evicted_tasks": self.evicted_tasks,
+            "dead_clients": self.dead_clients,
+            "slow_disconnects": sum(
+                m.slow_disconnects for m in self.tasks.values()
+            ),
+        }
+
+    def expire_idle_tasks(self, max_idle_seconds: float = 300) -> int:
         """Expire idle tasks.
 
         Parameters
         ----------
         max_idle_seconds : float, optional
             Maximum idle time in seconds, by default 300.
+
+        Returns
+        -------
+        int
+            The number of expired tasks.
         """
         now = time.monotonic()
         expired_ids: list[str] = []
@@ -132,3 +210,64 @@ class WsTaskRegistry:
         for task_id in expired_ids:
             LOG.debug("Expiring idle task: %s", task_id)
             del self.tasks[task_id]
+            self.hub.remove(task_id)
+        self.evicted_tasks += len(expired_ids)
+        return len(expired_ids)
+
+    def reap(self, grace_seconds: float) -> int:
+        """Remove dead clients and evict the tasks without live clients.
+
+        Parameters
+        ----------
+        grace_seconds : float
+            How long a task can stay without clients before it is evicted.
+
+        Returns
+        -------
+        int
+            The number of evicted tasks.
+        """
+        for manager in list(self.tasks.values()):
+            self.dead_clients += manager.remove_dead_clients()
+        return self.expire_idle_tasks(grace_seconds)
+
+    def start_reaper(self, interval: float, grace_seconds: float) -> None:
+        """Start reaping periodically (if not already started).
+
+        Parameters
+        ----------
+        interval : float
+            Seconds between runs (<=0: do not start).
+        grace_seconds : float
+            How long a task can stay without clients before it is evicted.
+        """
+        if interval <= 0 or (self._reaper and not self._reaper.done()):
+            return
+        self._reaper = asyncio.create_task(
+            self._reap_forever(interval, grace_seconds),
+            name="ws-registry-reaper",
+        )
+
+    async def stop_reaper(self) -> None:
+        """Stop the periodic reaper."""
+        reaper, self._reaper = self._reaper, None
+        if reaper is None or reaper.done():
+            return
+        reaper.cancel()
+        try:
+            await reaper
+        except asyncio.CancelledError:
+            pass
+
+    async def _reap_forever(
+        self, interval: float, grace_seconds: float
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                evicted = self.reap(grace_seconds)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                LOG.error("WebSocket registry reaper error: %s", err)
+                continue
+            if evicted:
+                LOG.debug("Evicted %d idle WebSocket tasks", evicted)
@@ -12,10 +12,43 @@ from waldiez_runner.config import Settings
 from waldiez_runner.dependencies import app_state, get_settings
 
 from .handler import TaskWebSocketHandler
+from .multiplex import MultiplexWebSocketHandler
 
 ws_router = APIRouter()
 
 
+@ws_router.websocket("/ws")
+async def multiplexed_websocket_endpoint(
+    websocket: WebSocket,
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> None:
+    """WebSocket endpoint to subscribe to many tasks.
+
+    Parameters
+    ----------
+    websocket : WebSocket
+        The WebSocket connection.
+    settings : Settings
+        The settings dependency.
+
+    Raises
+    ------
+    RuntimeError
+        If the Redis client is not initialized.
+    """
+    if not app_state.redis:  # pragma: no cover
+        raise RuntimeError("Redis not initialized")
+    async with app_state.redis.contextual_client(
+        use_single_connection=True
+    ) as redis_client:
+        handler = MultiplexWebSocketHandler(
+            websocket=websocket,
+            settings=settings,
+            redis=redis_client,
+        )
+        await handler.run()
+
+
 @ws_router.websocket("/ws/{task_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
@@ -0,0 +1,239 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-try-statements
+
+"""Read-only task output over Server-Sent Events.
+
+An SSE viewer is added to the task's manager like a WebSocket client,
+so it is fed by the same shared stream reader. Its queued frames are
+read directly by the response's generator: there is no writer or input
+listener task per viewer.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Any
+
+from starlette import status
+
+from waldiez_runner.config import SSE_KEEPALIVE_SECONDS
+from waldiez_runner.dependencies import RedisManager, app_state
+from waldiez_runner.models import Task
+
+from .client_queue import (
+    WsClientQueue,
+    WsFrame,
+    close_frame,
+    is_close_frame,
+    stream_id_after,
+)
+from .handler import build_status_payload
+from .listeners import read_initial_history
+from .manager import TooManyClientsException
+from .registry import TooManyTasksException, WsTaskRegistry
+from .stream_hub import task_stream_key
+from .validation import ws_task_registry
+
+LOG = logging.getLogger(__name__)
+
+SSE_RETRY_MS = 3000
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # nginx: do not buffer this response
+    "X-Accel-Buffering": "no",
+}
+
+
+class SseClient:
+    """A read-only task viewer over Server-Sent Events.
+
+    A ``WsClient`` for the task's manager.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the viewer."""
+        self.queue: WsClientQueue | None = None
+        self.closed = False
+
+    async def send_text(self, data: str) -> None:
+        """Queue a frame (for direct sends by the manager).
+
+        Parameters
+        ----------
+        data : str
+            The serialized frame.
+        """
+        if self.queue is not None and not self.closed:
+            self.queue.offer(WsFrame(None, data))
+
+    async def close(
+        self, code: int = status.WS_1000_NORMAL_CLOSURE, reason: str = ""
+    ) -> None:
+        """End the event stream.
+
+        Parameters
+        ----------
+        code : int, optional
+            The close code, by default 1000.
+        reason : str, optional
+            The reason, by default "".
+        """
+        LOG.debug("Closing SSE viewer (%s): %s", code, reason)
+        self.closed = True
+        if self.queue is not None:
+            # a slow viewer is closed with a full queue
+            if self.queue.full():
+                self.queue.get_nowait()
+            self.queue.put_nowait(close_frame(reason))
+
+
+def format_sse_event(data: str, event_id: str | None = None) -> str:
+    """Format a serialized frame as a Server-Sent Event.
+
+    Parameters
+    ----------
+    data : str
+        The serialized frame.
+    event_id : str | None, optional
+        The event id (the stream entry id), by default None.
+
+    Returns
+    -------
+    str
+        The event.
+    """
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def check_sse_capacity(
+    task_id: str, registry: WsTaskRegistry = ws_task_registry
+) -> None:
+    """Check that a task can get one more viewer.
+
+    Parameters
+    ----------
+    task_id : str
+        The task ID.
+    registry : WsTaskRegistry, optional
+        The task registry, by default the app's one.
+
+    Raises
+    ------
+    TooManyTasksException
+        If no more tasks can be watched.
+    TooManyClientsException
+        If the task has too many viewers.
+    """
+    manager = registry.tasks.get(task_id)
+    if manager is None:
+        if 0 < registry.max_active_tasks <= len(registry.tasks):
+            raise TooManyTasksException("Too many active tasks")
+        return
+    if len(manager.clients) >= manager.max_clients:
+        raise TooManyClientsException(f"Too many clients for task {task_id}")
+
+
+async def task_event_stream(
+    task: Task,
+    last_event_id: str | None = None,
+    keepalive: float = SSE_KEEPALIVE_SECONDS,
+    registry: WsTaskRegistry = ws_task_registry,
+    redis: RedisManager | None = None,
+) -> AsyncGenerator[str, None]:
+    """Stream a task's status, history and live output as SSE events.
+
+    Parameters
+    ----------
+    task : Task
+        The task.
+    last_event_id : str | None, optional
+        Resume after this stream id, by default None.
+    keepalive : float, optional
+        Seconds after which an idle stream gets a comment,
+        by default SSE_KEEPALIVE_SECONDS.
+    registry : WsTaskRegistry, optional
+        The task registry, by default the app's one.
+    redis : RedisManager | None, optional
+        The Redis manager, by default the app's one.
+
+    Yields
+    ------
+    str
+        The events.
+    """
+    task_id = str(task.id)
+    try:
+        manager = registry.get_or_create_task_manager(task_id)
+        client = SseClient()
+        manager.add_client(client, start_writer=False)
+    except (TooManyTasksException, TooManyClientsException) as err:
+        LOG.warning("Cannot stream task %s: %s", task_id, err)
+        registry.remove_task_if_empty(task_id)
+        yield format_sse_event('{"type":"error","data":"Too many viewers"}')
+        return
+    queue = manager.client_queues[client]
+    client.queue = queue
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        yield format_sse_event(manager.serialize(build_status_payload(task)))
+        history, last_id = await _read_history(task_id, last_event_id, redis)
+        for msg in history:
+            yield format_sse_event(manager.serialize(msg), msg["id"])
+        registry.hub.add(manager, last_id)
+        async for event in _live_events(queue, last_id, keepalive):
+            yield event
+    finally:
+        manager.remove_client(client)
+        registry.remove_task_if_empty(task_id)
+
+
+async def _read_history(
+    task_id: str, last_event_id: str | None, redis: RedisManager | None
+) -> tuple[list[dict[str, Any]], str]:
+    redis_manager = redis or app_state.redis
+    if not redis_manager:  # pragma: no cover
+        raise RuntimeError("Redis not initialized")
+    async with redis_manager.contextual_client(True) as redis_client:
+        return await read_initial_history(
+            redis_client, task_stream_key(task_id), last_event_id
+        )
+
+
+async def _live_events(
+    queue: WsClientQueue, after_id: str, keepalive: float
+) -> AsyncIterator[str]:
+    skip_until: str | None = after_id
+    while True:
+        try:
+            async with asyncio.timeout(keepalive):
+                frames = [await queue.get()]
+        except TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        # write everything already queued at once
+        while not queue.empty():
+            frames.append(queue.get_nowait())
+        events, skip_until, closed = _format_frames(frames, skip_until)
+        if events:
+            yield events
+        if closed:
+            return
+
+
+def _format_frames(
+    frames: list[WsFrame], skip_until: str | None
+) -> tuple[str, str | None, bool]:
+    events: list[str] = []
+    for frame in frames:
+        if is_close_frame(frame):
+            return "".join(events), skip_until, True
+        if skip_until is not None and frame.id is not None:
+            if not stream_id_after(frame.id, skip_until):
+                continue  # already sent as history
+            skip_until = None
+        events.append(format_sse_event(frame.text, frame.id))
+    return "".join(events), skip_until, False
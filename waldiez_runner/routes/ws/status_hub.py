@@ -0,0 +1,241 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-try-statements,broad-exception-caught
+
+"""Process-wide listener for the status transitions of all watched tasks."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from waldiez_runner.dependencies import RedisManager, app_state
+from waldiez_runner.tasks.status_watcher import (
+    ParsedStatus,
+    parse_status_message,
+)
+
+from .manager import WsTaskManager
+
+LOG = logging.getLogger(__name__)
+
+STATUS_CHANNEL_PATTERN = "task:*:status"
+
+
+def task_status_channel(task_id: str) -> str:
+    """Get the Redis pub/sub channel with a task's status transitions.
+
+    Parameters
+    ----------
+    task_id : str
+        The task ID.
+
+    Returns
+    -------
+    str
+        The channel.
+    """
+    return f"task:{task_id}:status"
+
+
+def build_status_update(task_id: str, parsed: ParsedStatus) -> dict[str, Any]:
+    """Build the status frame of a status transition.
+
+    Parameters
+    ----------
+    task_id : str
+        The task ID.
+    parsed : ParsedStatus
+        The parsed status message.
+
+    Returns
+    -------
+    dict[str, Any]
+        The status payload.
+    """
+    updated_at = datetime.now(timezone.utc)
+    return {
+        "type": "status",
+        "timestamp": int(time.time() * 1_000_000),
+        "data": {
+            "task_id": task_id,
+            "status": parsed["status"].value,
+            "updated_at": updated_at.isoformat(timespec="milliseconds").replace(
+                "+00:00", "Z"
+            ),
+            "results": parsed.get("results"),
+            "input_request_id": parsed.get("input_request_id"),
+        },
+    }
+
+
+class WsStatusHub:
+    """Push the status transitions of the watched tasks to their clients.
+
+    A single background listener pattern-subscribes to every task's
+    status channel and forwards the transitions of the tasks with
+    viewers as ``status`` frames. On a terminal status (completed,
+    failed or cancelled), the task's clients are closed normally once
+    their queued frames (and any output that arrives within
+    ``close_delay``) are sent. The listener stops when there are no
+    tasks left and is restarted on the next ``add``.
+    """
+
+    def __init__(
+        self,
+        poll_timeout: float = 1.0,
+        retry_delay: float = 1.0,
+        close_delay: float = 1.0,
+        redis: RedisManager | None = None,
+    ) -> None:
+        """Initialize the status hub.
+
+        Parameters
+        ----------
+        poll_timeout : float, optional
+            How long each read waits for a message, by default 1.0.
+        retry_delay : float, optional
+            Seconds to wait after a failed read, by default 1.0.
+        close_delay : float, optional
+            Seconds to wait for the last output after a terminal status
+            before closing the clients, by default 1.0.
+        redis : RedisManager | None, optional
+            The Redis manager to use, by default the app's one.
+        """
+        self.poll_timeout = poll_timeout
+        self.retry_delay = retry_delay
+        self.close_delay = close_delay
+        self.redis = redis
+        self.managers: dict[str, WsTaskManager] = {}
+        self._listener: asyncio.Task[None] | None = None
+
+    def add(self, manager: WsTaskManager) -> asyncio.Task[None]:
+        """Start forwarding a task's status transitions to its manager.
+
+        Parameters
+        ----------
+        manager : WsTaskManager
+            The task's manager.
+
+        Returns
+        -------
+        asyncio.Task[None]
+            The shared listener task.
+        """
+        self.managers[task_status_channel(manager.task_id)] = manager
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(
+                self._run(), name="ws-status-hub"
+            )
+        return self._listener
+
+    def remove(self, task_id: str) -> None:
+        """Stop forwarding a task's status transitions.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+        """
+        self.managers.pop(task_status_channel(task_id), None)
+
+    def has(self, task_id: str) -> bool:
+        """Check if a task's status transitions are forwarded.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+
+        Returns
+        -------
+        bool
+            True if the task is watched, False otherwise.
+        """
+        return task_status_channel(task_id) in self.managers
+
+    def is_running(self) -> bool:
+        """Check if the shared listener is running.
+
+        Returns
+        -------
+        bool
+            True if the listener is running, False otherwise.
+        """
+        return self._listener is not None and not self._listener.done()
+
+    async def stop(self) -> None:
+        """Stop the shared listener and forget all tasks."""
+        self.managers.clear()
+        listener = self._listener
+        self._listener = None
+        if listener and not listener.done():
+            listener.cancel()
+            try:
+                await listener
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _run(self) -> None:
+        redis_manager = self.redis or app_state.redis
+        if not redis_manager:  # pragma: no cover
+            raise RuntimeError("Redis not initialized")
+        while self.managers:
+            try:
+                async with redis_manager.contextual_client(
+                    use_single_connection=True
+                ) as redis:
+                    pubsub = redis.pubsub()
+                    await pubsub.psubscribe(STATUS_CHANNEL_PATTERN)
+                    try:
+                        while self.managers:
+                            message = await pubsub.get_message(
+                                ignore_subscribe_messages=True,
+                                timeout=self.poll_timeout,
+                            )
+                            if isinstance(message, dict):
+                                channel = message.get("channel", "")
+                                if isinstance(channel, bytes):
+                                    channel = channel.decode()
+                                self.dispatch(channel, message.get("data", ""))
+                    finally:
+                        await pubsub.close()
+            except (RedisError, OSError) as err:
+                LOG.warning("Status hub read failed: %s", err)
+                await asyncio.sleep(self.retry_delay)
+        LOG.debug("No tasks left to watch, status hub stopped")
+
+    def dispatch(self, channel: str, data: str | bytes) -> None:
+        """Forward a status message to the task's clients.
+
+        Parameters
+        ----------
+        channel : str
+            The task's status channel.
+        data : str | bytes
+            The raw status message.
+        """
+        manager = self.managers.get(channel)
+        if manager is None:
+            return
+        try:
+            parsed = parse_status_message(data)
+            if parsed is None:
+                return
+            manager.enqueue(build_status_update(manager.task_id, parsed))
+        except Exception as err:
+            LOG.error("Status hub dispatch error: %s", err)
+            return
+        if not parsed["status"].is_inactive:
+            return
+        reason = f"Task {parsed['status'].value.lower()}"
+        if self.close_delay > 0:
+            asyncio.get_running_loop().call_later(
+                self.close_delay, manager.close_clients, reason
+            )
+        else:
+            manager.close_clients(reason)
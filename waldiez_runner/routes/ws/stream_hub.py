@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-try-statements,broad-exception-caught
+
+"""Process-wide reader for the output streams of all watched tasks."""
+
+import asyncio
+import logging
+
+from redis.exceptions import RedisError
+
+from waldiez_runner.dependencies import AsyncRedis, RedisManager, app_state
+
+from .listeners import decode_stream_msg
+from .manager import WsTaskManager
+from .status_hub import WsStatusHub
+
+LOG = logging.getLogger(__name__)
+
+
+def task_stream_key(task_id: str) -> str:
+    """Get the Redis stream key with a task's output.
+
+    Parameters
+    ----------
+    task_id : str
+        The task ID.
+
+    Returns
+    -------
+    str
+        The stream key.
+    """
+    return f"task:{task_id}:output"
+
+
+class WsStreamHub:
+    """Read all active task streams with one blocking XREAD.
+
+    Instead of one blocking reader (and one pooled connection) per task,
+    a single background reader issues ``XREAD BLOCK`` over every stream
+    that currently has WebSocket viewers and dispatches the entries to
+    the matching ``WsTaskManager``. Streams can be added and removed at
+    any time; changes are picked up on the next read (at most
+    ``block_ms`` later). The reader stops when there are no streams left
+    and is restarted on the next ``add``. On an error it retries after
+    ``retry_delay``. With a ``status_hub``, the
+    watched tasks also get their status transitions.
+    """
+
+    def __init__(
+        self,
+        block_ms: int = 1000,
+        count: int = 100,
+        retry_delay: float = 1.0,
+        redis: RedisManager | None = None,
+        status_hub: WsStatusHub | None = None,
+    ) -> None:
+        """Initialize the stream hub.
+
+        Parameters
+        ----------
+        block_ms : int, optional
+            How long each XREAD blocks, by default 1000.
+        count : int, optional
+            Max entries per stream per read, by default 100.
+        retry_delay : float, optional
+            Seconds to wait after a failed read, by default 1.0.
+        redis : RedisManager | None, optional
+            The Redis manager to use, by default the app's one.
+        status_hub : WsStatusHub | None, optional
+            Where to also add the watched tasks, by default None.
+        """
+        self.block_ms = block_ms
+        self.count = count
+        self.retry_delay = retry_delay
+        self.redis = redis
+        self.status_hub = status_hub
+        self.managers: dict[str, WsTaskManager] = {}
+        self.last_ids: dict[str, str] = {}
+        self._reader: asyncio.Task[None] | None = None
+
+    def add(
+        self, manager: WsTaskManager, last_id: str = "0"
+    ) -> asyncio.Task[None]:
+        """Start dispatching a task's stream entries to its manager.
+
+        If the task is already watched, its current position is kept.
+
+        Parameters
+        ----------
+        manager : WsTaskManager
+            The task's manager.
+        last_id : str, optional
+            The stream id to read after, by default "0".
+
+        Returns
+        -------
+        asyncio.Task[None]
+            The shared reader task.
+        """
+        stream_key = task_stream_key(manager.task_id)
+        if stream_key not in self.managers:
+            self.managers[stream_key] = manager
+            self.last_ids[stream_key] = last_id
+            LOG.debug("Watching stream %s from %s", stream_key, last_id)
+        if self.status_hub is not None:
+            self.status_hub.add(manager)
+        return self._ensure_reader()
+
+    def remove(self, task_id: str) -> None:
+        """Stop reading a task's stream.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+        """
+        stream_key = task_stream_key(task_id)
+        self.managers.pop(stream_key, None)
+        self.last_ids.pop(stream_key, None)
+        if self.status_hub is not None:
+            self.status_hub.remove(task_id)
+
+    def has(self, task_id: str) -> bool:
+        """Check if a task's stream is being read.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+
+        Returns
+        -------
+        bool
+            True if the stream is being read, False otherwise.
+        """
+        return task_stream_key(task_id) in self.managers
+
+    def is_running(self) -> bool:
+        """Check if the shared reader is running.
+
+        Returns
+        -------
+        bool
+            True if the reader is running, False otherwise.
+        """
+        return self._reader is not None and not self._reader.done()
+
+    async def stop(self) -> None:
+        """Stop the shared reader and forget all streams."""
+        if self.status_hub is not None:
+            await self.status_hub.stop()
+        self.managers.clear()
+        self.last_ids.clear()
+        reader = self._reader
+        self._reader = None
+        if reader and not reader.done():
+            reader.cancel()
+            try:
+                await reader
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def _ensure_reader(self) -> asyncio.Task[None]:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(
+                self._run(), name="ws-stream-hub"
+            )
+        return self._reader
+
+    async def _run(self) -> None:
+        redis_manager = self.redis or app_state.redis
+        if not redis_manager:  # pragma: no cover
+            raise RuntimeError("Redis not initialized")
+        # re-check after closing the connection: a stream
+        # might have been added while we were closing it.
+        while self.last_ids:
+            try:
+                async with redis_manager.contextual_client(
+                    use_single_connection=True
+                ) as redis:
+                    while self.last_ids:
+                        await self._read_once(redis)
+            except Exception as err:
+                # all the viewers depend on this reader: keep it going
+                LOG.error("Stream hub reader error, restarting: %s", err)
+                await asyncio.sleep(self.retry_delay)
+        LOG.debug("No streams left to read, stream hub stopped")
+
+    async def _read_once(self, redis: AsyncRedis) -> None:
+        streams = dict(self.last_ids)
+        try:
+            response = await redis.xread(
+                streams,
+                block=self.block_ms,
+                count=self.count,
+            )
+        except (RedisError, OSError) as err:
+            LOG.warning("Stream hub read failed: %s", err)
+            await asyncio.sleep(self.retry_delay)
+            return
+        for stream_key, entries in response or []:
+            self._dispatch(stream_key, entries)
+
+    def _dispatch(
+        self,
+        stream_key: str,
+        entries: list[tuple[str, dict[str, str]]],
+    ) -> None:
+        manager = self.managers.get(stream_key)
+        if manager is None:
+            # removed while we were reading
+            return
+        # appended in order to the clients' queues, without a task
+        # (or an await) per entry
+        for entry_id, raw in entries:
+            self.last_ids[stream_key] = entry_id
+            try:
+                manager.enqueue(decode_stream_msg(raw, entry_id))
+            except Exception as err:  # pragma: no cover
+                LOG.error("Stream hub dispatch error: %s", err)
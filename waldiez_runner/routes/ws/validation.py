@@ -12,6 +12,13 @@ from typing_extensions import Annotated
 from waldiez_runner.config import (
     MAX_ACTIVE_TASKS,
     MAX_CLIENTS_PER_TASK,
+    TRUTHY,
+    WS_BATCH_MAX_FRAMES,
+    WS_BATCH_WINDOW_MS,
+    WS_MAX_CLIENT_LAG,
+    WS_QUEUE_SIZE,
+    WS_SLOW_CLIENT_POLICY,
+    WS_STREAM_BLOCK_MS,
     Settings,
 )
 from waldiez_runner.dependencies import (
@@ -23,12 +30,29 @@ from waldiez_runner.models import Task
 from waldiez_runner.services import TaskService
 
 from .auth import get_ws_client_id
+from .client_queue import is_slow_client_policy
 from .manager import TooManyClientsException, WsTaskManager
 from .registry import TooManyTasksException, WsTaskRegistry
+from .status_hub import WsStatusHub
+from .stream_hub import WsStreamHub
 
+ws_status_hub = WsStatusHub()
+ws_stream_hub = WsStreamHub(
+    block_ms=WS_STREAM_BLOCK_MS, status_hub=ws_status_hub
+)
 ws_task_registry = WsTaskRegistry(
     max_active_tasks=MAX_ACTIVE_TASKS,
     max_clients_per_task=MAX_CLIENTS_PER_TASK,
+    hub=ws_stream_hub,
+    queue_size=WS_QUEUE_SIZE,
+    slow_client_policy=(
+        WS_SLOW_CLIENT_POLICY
+        if is_slow_client_policy(WS_SLOW_CLIENT_POLICY)
+        else "drop_oldest"
+    ),
+    max_client_lag=WS_MAX_CLIENT_LAG,
+    batch_window=WS_BATCH_WINDOW_MS / 1000,
+    batch_max_frames=WS_BATCH_MAX_FRAMES,
 )
 
 LOG = logging.getLogger(__name__)
@@ -85,7 +109,7 @@ async def validate_websocket_connection(
             code=status.WS_1008_POLICY_VIOLATION, reason=str(err)
         )
 
-    if not task.is_active() and task.status.value.lower() != "pending":
+    if not is_watchable(task):
         LOG.debug("Task is not active: %s", task.status.value)
         raise WebSocketException(
             code=status.WS_1008_POLICY_VIOLATION, reason="Task is not active"
@@ -135,9 +159,44 @@ async def _validate_ws_connection(
         ) from err
 
     try:
-        task_manager.add_client(websocket)
+        task_manager.add_client(
+            websocket, start_writer=False, batch=wants_batches(websocket)
+        )
     except TooManyClientsException as err:
         raise WebSocketException(
             code=status.WS_1008_POLICY_VIOLATION, reason="Too many clients"
         ) from err
     return task, task_manager
+
+
+def is_watchable(task: Task) -> bool:
+    """Check if a task's output can be streamed.
+
+    Parameters
+    ----------
+    task : Task
+        The task.
+
+    Returns
+    -------
+    bool
+        True if the task is active or pending, False otherwise.
+    """
+    return task.is_active() or task.status.value.lower() == "pending"
+
+
+def wants_batches(websocket: WebSocket) -> bool:
+    """Check if a client asked for batched messages (``?batch=1``).
+
+    Parameters
+    ----------
+    websocket : WebSocket
+        The WebSocket connection.
+
+    Returns
+    -------
+    bool
+        True if the client accepts JSON arrays of messages.
+    """
+    value = websocket.query_params.get("batch", "")
+    return value.lower() in TRUTHY
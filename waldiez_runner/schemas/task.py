@@ -131,6 +131,16 @@ class TaskResponse(TaskBase):
         return v.isoformat(timespec="milliseconds").replace("+00:00", "Z")
 
 
+class TaskCursorPage(BaseModel):
+    """A page of tasks of a cursor (keyset) based listing."""
+
+    items: list[TaskResponse]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    size: int
+    total: int | None = None
+
+
 class InputResponse(BaseModel):
     """Input response model."""
 
@@ -2,6 +2,13 @@
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
 """Waldiez runner services."""
 
+from ._external_http import (
+    VerificationCache,
+    close_http_client,
+    get_http_client,
+    new_verification_cache,
+    verification_key,
+)
 from .client_service import ClientService
 from .external_token_service import ExternalTokenResponse, ExternalTokenService
 from .task_service import TaskService
@@ -11,4 +18,9 @@ __all__ = [
     "ExternalTokenResponse",
     "ExternalTokenService",
     "TaskService",
+    "VerificationCache",
+    "close_http_client",
+    "get_http_client",
+    "new_verification_cache",
+    "verification_key",
 ]
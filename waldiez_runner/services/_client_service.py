@@ -7,17 +7,17 @@
 """Clients management service."""
 
 import logging
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from typing import Any
 
-from anyio import to_thread
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import apaginate
-from sqlalchemy import asc, desc, or_, update
+from sqlalchemy import asc, bindparam, desc, or_, update
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql import delete
 
+from waldiez_runner.hashing import HashingPoolBusy, hashing_pool
 from waldiez_runner.models.client import Client
 from waldiez_runner.schemas.client import (
     ClientCreate,
@@ -28,6 +28,15 @@ from waldiez_runner.schemas.client import (
 
 LOG = logging.getLogger(__name__)
 
+# (every authenticated request looks its client up, built once)
+_GET_CLIENT_BY_ID = select(Client).where(Client.id == bindparam("id"))
+_GET_CLIENT_BY_CLIENT_ID = select(Client).where(
+    Client.client_id == bindparam("client_id")
+)
+_GET_CLIENT_BY_IDS = select(Client).where(
+    Client.id == bindparam("id"), Client.client_id == bindparam("client_id")
+)
+
 
 async def create_client(
     session: AsyncSession,
@@ -63,10 +72,16 @@ async def create_client(
 
 
 async def verify_client(
-    session: AsyncSession, client_id: str, client_secret: str
+    session: AsyncSession,
+    client_id: str,
+    client_secret: str,
+    defer_rehash: Callable[[str, str, str], None] | None = None,
 ) -> ClientResponse | None:
     """Verify a client.
 
+    The secret is checked in the hashing pool (not in the shared
+    thread pool).
+
     Parameters
     ----------
     session : AsyncSession
@@ -75,52 +90,96 @@ async def verify_client(
         The client ID.
     client_secret : str
         The client secret.
+    defer_rehash : Callable[[str, str, str], None] | None, optional
+        Schedules the upgrade of an outdated stored hash (called with the
+        client ID, the secret and the stored hash), by default None
+        (upgrade it before returning).
 
     Returns
     -------
     ClientResponse | None
         The client if valid, else None.
+
+    Raises
+    ------
+    HashingPoolBusy
+        If too many secrets are already being verified.
     """
     client = await get_client_in_db(session, None, client_id)
     if not client or client.deleted_at is not None:
         LOG.warning("Client not found")
         return None
-    # noinspection PyTypeChecker
-    valid, new_hash = await to_thread.run_sync(
-        Client.verify, client_secret, client.client_secret
+    valid, needs_rehash = await hashing_pool.verify(
+        client_secret, client.client_secret
     )
     if not valid:
         LOG.warning("Invalid credentials")
         return None
-    if new_hash:
-        # pylint: disable=too-many-try-statements
-        try:
-            # Atomic compare-and-set using the prior hash value
-            result = await session.execute(
-                update(Client)
-                .where(
-                    Client.client_id == client_id,
-                    Client.client_secret == client.client_secret,
-                )
-                .values(
-                    client_secret=new_hash,
-                )
-            )
-            if result.rowcount > 0:  # type: ignore[unused-ignore,attr-defined]
-                await session.commit()
-                await session.refresh(client)
-            else:  # pragma: no cover
-                # Another request already updated it, rollback and continue
-                await session.rollback()
-                LOG.debug("Hash already upgraded")
-
-        except BaseException:  # pylint: disable=broad-exception-caught
-            await session.rollback()
-            LOG.exception("Failed to store upgraded hash")
-
+    if needs_rehash:
+        if defer_rehash is not None:
+            defer_rehash(client_id, client_secret, client.client_secret)
+        elif await rehash_client_secret(
+            session, client_id, client_secret, client.client_secret
+        ):
+            await session.refresh(client)
     return ClientResponse.from_client(client)
 
 
+async def rehash_client_secret(
+    session: AsyncSession,
+    client_id: str,
+    client_secret: str,
+    stored_hash: str,
+) -> bool:
+    """Upgrade a client's outdated secret hash.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        The database session.
+    client_id : str
+        The client ID.
+    client_secret : str
+        The verified client secret.
+    stored_hash : str
+        The outdated hash it was verified against.
+
+    Returns
+    -------
+    bool
+        True if the hash was upgraded, False if it was not (already
+        upgraded, hashing pool busy or failed).
+    """
+    try:
+        new_hash = await hashing_pool.hash(client_secret)
+    except HashingPoolBusy:
+        LOG.debug("Hashing pool busy, hash upgrade skipped")
+        return False
+    # pylint: disable=too-many-try-statements
+    try:
+        # Atomic compare-and-set using the prior hash value
+        result = await session.execute(
+            update(Client)
+            .where(
+                Client.client_id == client_id,
+                Client.client_secret == stored_hash,
+            )
+            .values(
+                client_secret=new_hash,
+            )
+        )
+        if result.rowcount > 0:  # type: ignore[unused-ignore,attr-defined]
+            await session.commit()
+            return True
+        # Another request already updated it, rollback and continue
+        await session.rollback()
+        LOG.debug("Hash already upgraded")
+    except BaseException:  # pylint: disable=broad-exception-caught
+        await session.rollback()
+        LOG.exception("Failed to store upgraded hash")
+    return False
+
+
 async def get_client(
     session: AsyncSession, client_id: str
 ) -> ClientResponse | None:
@@ -351,19 +410,16 @@ async def get_client_in_db(
     """
     if client_id and client_client_id:
         result = await session.execute(
-            select(Client)
-            .where(Client.id == client_id)
-            .where(Client.client_id == client_client_id)
+            _GET_CLIENT_BY_IDS,
+            {"id": client_id, "client_id": client_client_id},
         )
         return result.scalars().first()
     if client_id:
-        result = await session.execute(
-            select(Client).where(Client.id == client_id)
-        )
+        result = await session.execute(_GET_CLIENT_BY_ID, {"id": client_id})
         return result.scalars().first()
     if client_client_id:
         result = await session.execute(
-            select(Client).where(Client.client_id == client_client_id)
+            _GET_CLIENT_BY_CLIENT_ID, {"client_id": client_client_id}
         )
         return result.scalars().first()
     return None
@@ -0,0 +1,233 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Shared HTTP client and result cache for the external verifications.
+
+All the calls to the external token and task permission services go
+through one keep-alive client, so they reuse pooled connections instead
+of opening a new TCP/TLS connection per request. Their results are kept
+for a short time and concurrent identical verifications share a single
+call.
+"""
+
+import asyncio
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, TypeVar
+
+import httpx
+
+from waldiez_runner.config import (
+    EXTERNAL_AUTH_CACHE_SIZE,
+    EXTERNAL_AUTH_CACHE_TTL,
+    EXTERNAL_AUTH_MAX_CONNECTIONS,
+    EXTERNAL_AUTH_MAX_KEEPALIVE,
+    EXTERNAL_AUTH_NEGATIVE_CACHE_TTL,
+)
+
+T = TypeVar("T")
+
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+_HTTP_CLIENT_LOOP: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared client for the external verification services.
+
+    The client (and its connections) belong to the running event loop,
+    a new one is created if it is used from another loop.
+
+    Returns
+    -------
+    httpx.AsyncClient
+        The shared keep-alive client.
+    """
+    # pylint: disable=global-statement
+    global _HTTP_CLIENT, _HTTP_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if (
+        _HTTP_CLIENT is None
+        or _HTTP_CLIENT.is_closed
+        or _HTTP_CLIENT_LOOP is not loop
+    ):
+        _HTTP_CLIENT = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=EXTERNAL_AUTH_MAX_CONNECTIONS,
+                max_keepalive_connections=EXTERNAL_AUTH_MAX_KEEPALIVE,
+            ),
+        )
+        _HTTP_CLIENT_LOOP = loop
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared client (if created)."""
+    # pylint: disable=global-statement
+    global _HTTP_CLIENT, _HTTP_CLIENT_LOOP
+    client, _HTTP_CLIENT, _HTTP_CLIENT_LOOP = _HTTP_CLIENT, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def verification_key(*parts: str) -> str:
+    """Get the cache key of a verification.
+
+    Parameters
+    ----------
+    *parts : str
+        What identifies the verification (service URL, token, user id).
+
+    Returns
+    -------
+    str
+        The parts' SHA-256 hex digest (no token is kept in memory).
+    """
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+class VerificationCache(Generic[T]):
+    """Bounded TTL cache of verification results with single-flight loads.
+
+    Positive results (``is_positive`` returns True) are kept for ``ttl``
+    seconds and negative ones (False) for ``negative_ttl`` seconds. Other
+    results (None, e.g. an unavailable service) and errors raised while
+    loading are never cached. Concurrent loads of the same key wait for
+    the first one.
+    """
+
+    def __init__(
+        self,
+        is_positive: Callable[[T], bool | None],
+        max_size: int = 1024,
+        ttl: float = 30.0,
+        negative_ttl: float = 5.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        is_positive : Callable[[T], bool | None]
+            Whether a result is a positive (True), a negative (False) or
+            a non cacheable (None) one.
+        max_size : int, optional
+            Maximum cached results, by default 1024 (<=0: no cache).
+        ttl : float, optional
+            Seconds to keep a positive result, by default 30.
+        negative_ttl : float, optional
+            Seconds to keep a negative result, by default 5.
+        """
+        self.is_positive = is_positive
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[T, float]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future[T]] = {}
+
+    def __len__(self) -> int:
+        """Get the number of cached results.
+
+        Returns
+        -------
+        int
+            The number of cached results.
+        """
+        return len(self._entries)
+
+    async def get_or_load(
+        self, key: str, load: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Get a cached result or load it (once for concurrent callers).
+
+        Parameters
+        ----------
+        key : str
+            The verification's key.
+        load : Callable[[], Awaitable[T]]
+            Makes the verification.
+
+        Returns
+        -------
+        T
+            The cached or loaded result.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            del self._entries[key]
+        self.misses += 1
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future: asyncio.Future[T] = asyncio.ensure_future(load())
+        self._loading[key] = future
+        # stored even if the caller that started it is gone
+        future.add_done_callback(functools.partial(self._loaded, key))
+        return await asyncio.shield(future)
+
+    def clear(self) -> None:
+        """Drop all the cached results."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get the cache's size and counters.
+
+        Returns
+        -------
+        dict[str, int]
+            The cached results, the hits and the misses.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _loaded(self, key: str, future: "asyncio.Future[T]") -> None:
+        if self._loading.get(key) is future:
+            del self._loading[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self._store(key, future.result())
+
+    def _store(self, key: str, result: T) -> None:
+        positive = self.is_positive(result)
+        if self.max_size <= 0 or positive is None:
+            return
+        ttl = self.ttl if positive else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[key] = (result, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+def new_verification_cache(
+    is_positive: Callable[[T], bool | None],
+) -> VerificationCache[T]:
+    """Create a verification cache with the configured size and TTLs.
+
+    Parameters
+    ----------
+    is_positive : Callable[[T], bool | None]
+        Whether a result is a positive, a negative or a non cacheable one.
+
+    Returns
+    -------
+    VerificationCache[T]
+        The cache.
+    """
+    return VerificationCache(
+        is_positive,
+        max_size=EXTERNAL_AUTH_CACHE_SIZE,
+        ttl=EXTERNAL_AUTH_CACHE_TTL,
+        negative_ttl=EXTERNAL_AUTH_NEGATIVE_CACHE_TTL,
+    )
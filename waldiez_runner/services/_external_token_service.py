@@ -5,6 +5,7 @@
 
 """External token verification service."""
 
+import functools
 import json
 import logging
 from typing import Any
@@ -13,6 +14,13 @@ import httpx
 from fastapi import HTTPException
 from pydantic import BaseModel
 
+from ._external_http import (
+    VerificationCache,
+    get_http_client,
+    new_verification_cache,
+    verification_key,
+)
+
 LOG = logging.getLogger(__name__)
 
 
@@ -29,6 +37,9 @@ async def verify_external_token(
 ) -> tuple[ExternalTokenResponse | None, BaseException | None]:
     """Verify an external token by sending it to a verification endpoint.
 
+    Accepted and rejected tokens are cached for a short time and
+    concurrent verifications of the same token share one request.
+
     Parameters
     ----------
     token : str
@@ -44,13 +55,52 @@ async def verify_external_token(
         A tuple containing the verification response (if successful) and an
         exception (if verification failed)
     """
+    return await external_token_results.get_or_load(
+        verification_key(verify_url, token),
+        functools.partial(_verify_external_token, token, verify_url, secret),
+    )
+
+
+def _is_accepted(
+    result: tuple[ExternalTokenResponse | None, BaseException | None],
+) -> bool | None:
+    """Check if a verification result is worth caching.
+
+    Parameters
+    ----------
+    result : tuple[ExternalTokenResponse | None, BaseException | None]
+        The verification result.
+
+    Returns
+    -------
+    bool | None
+        True if the token was accepted, False if it was rejected,
+        None if the service failed (not cached).
+    """
+    response, exception = result
+    if response is not None:
+        return True
+    if isinstance(exception, HTTPException) and exception.status_code == 401:
+        return False
+    return None
+
+
+external_token_results: VerificationCache[
+    tuple[ExternalTokenResponse | None, BaseException | None]
+] = new_verification_cache(_is_accepted)
+
+
+async def _verify_external_token(
+    token: str, verify_url: str, secret: str
+) -> tuple[ExternalTokenResponse | None, BaseException | None]:
     payload = {"token": token}
     if secret:
         payload["secret"] = secret
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(verify_url, json=payload, timeout=10.0)
+        response = await get_http_client().post(
+            verify_url, json=payload, timeout=10.0
+        )
     except httpx.RequestError as exc:
         LOG.error("Error verifying external token: %s", exc)
         return None, HTTPException(
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Set based checks of the stuck tasks.
+
+A task is stuck if it is still marked as active but has results (its
+runner ended without updating its status). The obvious ones (no or an
+``error`` in their results) are classified in the same query that
+finds them, only the rest need a look in the storage, and the new
+statuses are written with one ``UPDATE`` per status.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Text, and_, case, cast, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.sql.expression import update
+
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_status import TaskStatus
+
+FINAL_STATUSES = [TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.FAILED]
+
+
+async def classify_stuck_tasks(
+    session: AsyncSession,
+    limit: int = 5000,
+) -> tuple[list[str], list[tuple[str, str]]]:
+    """Find the stuck tasks and the ones that obviously failed.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    limit : int, optional
+        The max tasks to get (the oldest first), by default 5000.
+
+    Returns
+    -------
+    tuple[list[str], list[tuple[str, str]]]
+        The IDs of the failed tasks and the (task ID, client ID) of
+        the ones to check in the storage.
+    """
+    # a None set on update is stored as a JSON null
+    no_results = and_(
+        or_(Task.results.is_(None), cast(Task.results, Text) == "null"),
+        Task.results_ref.is_(None),
+    )
+    has_error = Task.results["error"].as_string().isnot(None)
+    failed = case((or_(no_results, has_error), True), else_=False)
+    result = await session.execute(
+        select(Task.id, Task.client_id, failed)
+        .where(
+            Task.status.notin_(FINAL_STATUSES),
+            Task.schedule_type.is_(None),
+            or_(Task.results.isnot(None), Task.results_ref.isnot(None)),
+            Task.deleted_at.is_(None),
+        )
+        .order_by(Task.created_at)
+        .limit(limit)
+    )
+    failed_ids: list[str] = []
+    to_check: list[tuple[str, str]] = []
+    for task_id, client_id, is_failed in result.all():
+        if is_failed:
+            failed_ids.append(str(task_id))
+        else:
+            to_check.append((str(task_id), str(client_id)))
+    return failed_ids, to_check
+
+
+async def update_tasks_status(
+    session: AsyncSession,
+    task_ids: list[str],
+    status: TaskStatus,
+) -> int:
+    """Set the status of the tasks that are still active.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    task_ids : list[str]
+        The tasks' IDs.
+    status : TaskStatus
+        The new status.
+
+    Returns
+    -------
+    int
+        The number of the updated tasks.
+    """
+    if not task_ids:
+        return 0
+    result = await session.execute(
+        update(Task)
+        .where(
+            Task.id.in_(task_ids),
+            # not if it has ended in the meantime
+            Task.status.notin_(FINAL_STATUSES),
+            Task.deleted_at.is_(None),
+        )
+        .values(
+            status=status,
+            input_request_id=None,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+    return int(result.rowcount)  # type: ignore[attr-defined]
@@ -0,0 +1,358 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+# pylint: disable=too-many-try-statements
+"""Task counters kept in Redis.
+
+The number of live tasks per active status (for ``/status``) and the
+number of active tasks per client (for the ``max_jobs`` admission of
+new tasks) are kept in two Redis hashes, so that neither needs a
+database query. A new task takes a client's slot atomically (a Lua
+script compares and increments), so concurrent ``POST /tasks`` requests
+cannot both take the last slot. The status updates move the counts and
+a periodic job resets them to the database's (e.g. after bulk updates,
+deletions or a lost update).
+
+The counters are only used after they have been reconciled once (a
+``synced`` field in the counts' hash). If they are not, or Redis fails,
+the callers fall back to counting in the database.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import redis.asyncio as a_redis
+import sqlalchemy.sql.functions
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_status import TaskStatus
+
+if TYPE_CHECKING:
+    AsyncRedis = a_redis.Redis[str]
+else:
+    AsyncRedis = a_redis.Redis
+
+LOG = logging.getLogger(__name__)
+
+TASK_COUNTS_KEY = "tasks:counts"
+"""Live tasks per active status (and the ``synced`` marker)."""
+CLIENT_ACTIVE_TASKS_KEY = "tasks:active"
+"""Active tasks per client."""
+SYNCED_FIELD = "synced"
+
+ACTIVE_STATUSES = [status for status in TaskStatus if not status.is_inactive]
+
+# KEYS: counts, active; ARGV: client_id, max_jobs (<=0: no limit)
+# -1: not synced, 0: limit reached, 1: slot taken
+_ACQUIRE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], 'synced') == 0 then return -1 end
+local active = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0')
+local max_jobs = tonumber(ARGV[2])
+if max_jobs > 0 and active >= max_jobs then return 0 end
+redis.call('HINCRBY', KEYS[2], ARGV[1], 1)
+redis.call('HINCRBY', KEYS[1], 'PENDING', 1)
+return 1
+"""
+
+# KEYS: counts, active;
+# ARGV: client_id, old status, new status, old active, new active (0/1)
+_TRANSITION_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], 'synced') == 0 then return 0 end
+local function decr(key, field)
+  if tonumber(redis.call('HGET', key, field) or '0') > 0 then
+    redis.call('HINCRBY', key, field, -1)
+  end
+end
+if ARGV[4] == '1' then decr(KEYS[1], ARGV[2]) end
+if ARGV[5] == '1' then redis.call('HINCRBY', KEYS[1], ARGV[3], 1) end
+if ARGV[4] == '1' and ARGV[5] == '0' then decr(KEYS[2], ARGV[1]) end
+if ARGV[4] == '0' and ARGV[5] == '1' then
+  redis.call('HINCRBY', KEYS[2], ARGV[1], 1)
+end
+return 1
+"""
+
+
+async def _eval(redis: AsyncRedis, script: str, *args: Any) -> int:
+    result = await redis.eval(  # type: ignore[no-untyped-call]
+        script, 2, TASK_COUNTS_KEY, CLIENT_ACTIVE_TASKS_KEY, *args
+    )
+    return int(result)
+
+
+async def acquire_task_slot(
+    redis: AsyncRedis,
+    client_id: str,
+    max_jobs: int,
+) -> bool | None:
+    """Take one of a client's ``max_jobs`` slots for a new (pending) task.
+
+    Parameters
+    ----------
+    redis : AsyncRedis
+        The Redis client.
+    client_id : str
+        The client's ID.
+    max_jobs : int
+        The max active tasks per client (<=0: no limit).
+
+    Returns
+    -------
+    bool | None
+        True if a slot was taken, False if the client has no free slot,
+        None if the counters cannot be used.
+    """
+    try:
+        result = await _eval(redis, _ACQUIRE_SCRIPT, client_id, max_jobs)
+    except (RedisError, OSError) as error:
+        LOG.warning("Could not use the task counters: %s", error)
+        return None
+    if result < 0:
+        return None
+    return result == 1
+
+
+async def record_task_transition(
+    redis: AsyncRedis,
+    client_id: str,
+    old_status: TaskStatus | None,
+    new_status: TaskStatus | None,
+) -> None:
+    """Move a task's counts after its status changed.
+
+    Parameters
+    ----------
+    redis : AsyncRedis
+        The Redis client.
+    client_id : str
+        The task's client ID.
+    old_status : TaskStatus | None
+        The task's previous status (None: a new task).
+    new_status : TaskStatus | None
+        The task's new status (None: deleted).
+    """
+    if old_status == new_status:
+        return
+    old_active = old_status is not None and not old_status.is_inactive
+    new_active = new_status is not None and not new_status.is_inactive
+    if not old_active and not new_active:
+        return
+    try:
+        await _eval(
+            redis,
+            _TRANSITION_SCRIPT,
+            client_id,
+            old_status.value if old_status else "",
+            new_status.value if new_status else "",
+            int(old_active),
+            int(new_active),
+        )
+    except (RedisError, OSError) as error:
+        # the next reconciliation fixes it
+        LOG.warning("Could not update the task counters: %s", error)
+
+
+async def release_task_slot(redis: AsyncRedis, client_id: str) -> None:
+    """Give back a slot taken for a task that was not created.
+
+    Parameters
+    ----------
+    redis : AsyncRedis
+        The Redis client.
+    client_id : str
+        The client's ID.
+    """
+    await record_task_transition(
+        redis, client_id, TaskStatus.PENDING, new_status=None
+    )
+
+
+async def get_task_counts(redis: AsyncRedis) -> dict[TaskStatus, int] | None:
+    """Get the live tasks per active status.
+
+    Parameters
+    ----------
+    redis : AsyncRedis
+        The Redis client.
+
+    Returns
+    -------
+    dict[TaskStatus, int] | None
+        The counts, None if the counters cannot be used.
+    """
+    try:
+        counts: dict[str, str] = await redis.hgetall(TASK_COUNTS_KEY)
+    except (RedisError, OSError) as error:
+        LOG.warning("Could not use the task counters: %s", error)
+        return None
+    if SYNCED_FIELD not in counts:
+        return None
+    return {
+        status: max(int(counts.get(status.value, 0)), 0)
+        for status in ACTIVE_STATUSES
+    }
+
+
+async def count_tasks_by_status(
+    session: AsyncSession,
+) -> dict[TaskStatus, int]:
+    """Count the live tasks per active status in the database.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+
+    Returns
+    -------
+    dict[TaskStatus, int]
+        The counts.
+    """
+    result = await session.execute(
+        select(Task.status, sqlalchemy.sql.functions.count(Task.id))
+        .where(Task.status.in_(ACTIVE_STATUSES), Task.deleted_at.is_(None))
+        .group_by(Task.status)
+    )
+    counts = {status: 0 for status in ACTIVE_STATUSES}
+    for status, count in result.all():
+        counts[status] = count
+    return counts
+
+
+async def count_active_tasks_by_client(session: AsyncSession) -> dict[str, int]:
+    """Count the live active tasks per client in the database.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+
+    Returns
+    -------
+    dict[str, int]
+        The counts of the clients with active tasks.
+    """
+    result = await session.execute(
+        select(Task.client_id, sqlalchemy.sql.functions.count(Task.id))
+        .where(Task.status.in_(ACTIVE_STATUSES), Task.deleted_at.is_(None))
+        .group_by(Task.client_id)
+    )
+    return dict(result.all())
+
+
+async def reconcile_task_counters(
+    session: AsyncSession,
+    redis: AsyncRedis,
+) -> dict[TaskStatus, int] | None:
+    """Reset the counters to the database's counts.
+
+    A status update that happens while counting might be lost (or
+    counted twice) until the next reconciliation.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    redis : AsyncRedis
+        The Redis client.
+
+    Returns
+    -------
+    dict[TaskStatus, int] | None
+        The database's counts per status,
+        None if the counters could not be reset.
+    """
+    counts = await count_tasks_by_status(session)
+    per_client = await count_active_tasks_by_client(session)
+    mapping: dict[str, int] = {
+        status.value: count for status, count in counts.items()
+    }
+    mapping[SYNCED_FIELD] = 1
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(TASK_COUNTS_KEY, CLIENT_ACTIVE_TASKS_KEY)
+            pipe.hset(
+                TASK_COUNTS_KEY, mapping=mapping  # type: ignore[arg-type]
+            )
+            if per_client:
+                pipe.hset(
+                    CLIENT_ACTIVE_TASKS_KEY,
+                    mapping=per_client,  # type: ignore[arg-type]
+                )
+            await pipe.execute()
+    except (RedisError, OSError) as error:
+        LOG.warning("Could not reconcile the task counters: %s", error)
+        return None
+    return counts
+
+
+async def admit_task(
+    session: AsyncSession,
+    redis: AsyncRedis | None,
+    client_id: str,
+    max_jobs: int,
+) -> bool | None:
+    """Check (and take) a client's slot for a new task.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session (to reconcile or count if needed).
+    redis : AsyncRedis | None
+        The Redis client, None to only count in the database.
+    client_id : str
+        The client's ID.
+    max_jobs : int
+        The max active tasks per client (<=0: no limit).
+
+    Returns
+    -------
+    bool | None
+        True if a slot was taken (give it back with
+        :func:`release_task_slot` if the task is not created),
+        None if admitted without a slot (counted in the database),
+        False if the client has no free slot.
+    """
+    if redis is not None:
+        acquired = await acquire_task_slot(redis, client_id, max_jobs)
+        if acquired is None and (
+            await reconcile_task_counters(session, redis) is not None
+        ):
+            acquired = await acquire_task_slot(redis, client_id, max_jobs)
+        if acquired is not None:
+            return acquired
+    if max_jobs <= 0:
+        return None
+    active = await count_active_client_tasks(session, client_id)
+    return None if active < max_jobs else False
+
+
+async def count_active_client_tasks(
+    session: AsyncSession,
+    client_id: str,
+) -> int:
+    """Count a client's live active tasks in the database.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    client_id : str
+        The client's ID.
+
+    Returns
+    -------
+    int
+        The number of the client's active tasks.
+    """
+    result = await session.execute(
+        select(sqlalchemy.sql.functions.count(Task.id)).where(
+            Task.client_id == client_id,
+            Task.status.in_(ACTIVE_STATUSES),
+            Task.deleted_at.is_(None),
+        )
+    )
+    return int(result.scalar_one())
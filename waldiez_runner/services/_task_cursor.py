@@ -0,0 +1,233 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Cursor (keyset) based task listing.
+
+A page continues right after (or before) the last row of the previous
+one by comparing ``(order_by, id)`` with the row's values, instead of
+skipping rows with OFFSET, so deep pages cost the same as the first one.
+Task ids are ULIDs (time ordered and unique), so they break the ties.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy.sql.functions
+from sqlalchemy import Select, asc, desc, tuple_
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.future import select
+
+from waldiez_runner.models.common import UTCDateTime
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_status import TaskStatus
+from waldiez_runner.schemas.task import TaskCursorPage
+
+from ._task_service import (
+    SKIP_RESULTS,
+    task_search_filter,
+    task_transformer,
+)
+
+
+def encode_task_cursor(
+    order_by: str, descending: bool, value: Any, task_id: str
+) -> str:
+    """Encode the position of a task in a listing.
+
+    Parameters
+    ----------
+    order_by : str
+        The field the listing is ordered by.
+    descending : bool
+        Whether the listing is in descending order.
+    value : Any
+        The task's value of the field.
+    task_id : str
+        The task's id (the tie-breaker).
+
+    Returns
+    -------
+    str
+        The opaque (URL safe) cursor.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, TaskStatus):
+        value = value.value
+    payload = json.dumps(
+        {"o": order_by, "d": descending, "v": value, "i": task_id},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_task_cursor(
+    cursor: str, order_by: str, descending: bool
+) -> tuple[Any, str]:
+    """Decode a cursor of a listing.
+
+    Parameters
+    ----------
+    cursor : str
+        The opaque cursor.
+    order_by : str
+        The field the listing is ordered by.
+    descending : bool
+        Whether the listing is in descending order.
+
+    Returns
+    -------
+    tuple[Any, str]
+        The task's value of the field and the task's id.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is invalid or not of this ordering.
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        field, is_descending = payload["o"], payload["d"]
+        value, task_id = payload["v"], str(payload["i"])
+    except (binascii.Error, ValueError, TypeError, KeyError) as error:
+        raise ValueError("Invalid cursor") from error
+    if field != order_by or is_descending != descending:
+        raise ValueError("The cursor is of another ordering")
+    try:
+        if isinstance(getattr(Task, field).type, UTCDateTime):
+            value = datetime.fromisoformat(value)
+        elif field == "status":
+            value = TaskStatus(value)
+        elif not isinstance(value, str):
+            raise TypeError(value)
+    except (TypeError, ValueError) as error:
+        raise ValueError("Invalid cursor") from error
+    return value, task_id
+
+
+def _filtered_tasks_query(
+    client_id: str | None,
+    status: TaskStatus | None,
+    search: str | None,
+) -> Select[Any]:
+    """Get the (not deleted) tasks matching the filters."""
+    query = select(Task).where(Task.deleted_at.is_(None))
+    if client_id is not None:
+        query = query.where(Task.client_id == client_id)
+    if status is not None:
+        query = query.where(Task.status == status)
+    if search:
+        query = query.where(task_search_filter(search))
+    return query
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+async def get_tasks_by_cursor(
+    session: AsyncSession,
+    size: int,
+    client_id: str | None = None,
+    after: str | None = None,
+    before: str | None = None,
+    status: TaskStatus | None = None,
+    search: str | None = None,
+    order_by: str | None = None,
+    descending: bool = False,
+    include_total: bool = False,
+) -> TaskCursorPage:
+    """Retrieve a page of tasks after or before a cursor.
+
+    The tasks are ordered by ``(order_by, id)``, and a page continues
+    right after (or before) the row of the cursor, so deep pages cost
+    the same as the first one (no OFFSET). The total is only counted
+    if requested.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    size : int
+        The page size.
+    client_id : str | None
+        The client whose tasks to list, None for all clients' tasks.
+    after : str | None
+        The ``next_cursor`` of the previous page.
+    before : str | None
+        The ``prev_cursor`` of the next page.
+    status : TaskStatus | None
+        The task status to filter the tasks.
+    search : str | None
+        Optional search term.
+    order_by : str | None
+        Optional field to order by, by default created_at.
+    descending : bool
+        Whether to order in descending order. Default is False.
+    include_total : bool
+        Whether to also count all the matching tasks. Default is False.
+
+    Returns
+    -------
+    TaskCursorPage
+        The page of tasks and the cursors of its neighbours.
+
+    Raises
+    ------
+    ValueError
+        If the ordering field or a cursor is invalid, or if both
+        cursors are given.
+    """
+    order_by = order_by or "created_at"
+    if order_by not in Task.__table__.columns:  # pragma: no cover
+        # already checked in the router
+        raise ValueError(f"Invalid field for ordering: {order_by}")
+    if after and before:
+        raise ValueError("Use either 'after' or 'before', not both")
+    query = _filtered_tasks_query(client_id, status, search)
+    total: int | None = None
+    if include_total:
+        count_query = select(sqlalchemy.sql.functions.count()).select_from(
+            query.subquery()
+        )
+        total = int((await session.execute(count_query)).scalar_one())
+    column = getattr(Task, order_by)
+    keys = (column, Task.id) if order_by != "id" else (Task.id,)
+    cursor = after or before
+    # "before" pages are read backwards and then reversed
+    forward = before is None
+    ascending = forward != descending
+    if cursor:
+        value, task_id = decode_task_cursor(cursor, order_by, descending)
+        position = (value, task_id) if order_by != "id" else (task_id,)
+        query = query.where(
+            tuple_(*keys) > tuple_(*position)
+            if ascending
+            else tuple_(*keys) < tuple_(*position)
+        )
+    query = (
+        query.options(SKIP_RESULTS)
+        .order_by(*(asc(key) if ascending else desc(key) for key in keys))
+        .limit(size + 1)
+    )
+    tasks = list((await session.execute(query)).scalars().all())
+    has_more = len(tasks) > size
+    tasks = tasks[:size]
+    if not forward:
+        tasks.reverse()
+
+    def _cursor_of(task: Task) -> str:
+        return encode_task_cursor(
+            order_by, descending, getattr(task, order_by), task.id
+        )
+
+    has_next = has_more if forward else True
+    has_prev = bool(after) if forward else has_more
+    return TaskCursorPage(
+        items=list(task_transformer(tasks, skip_results=True)),
+        next_cursor=_cursor_of(tasks[-1]) if tasks and has_next else None,
+        prev_cursor=_cursor_of(tasks[0]) if tasks and has_prev else None,
+        size=size,
+        total=total,
+    )
@@ -0,0 +1,284 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Monthly partitions of the tasks table (PostgreSQL only).
+
+With ``TASKS_PARTITIONED`` set before the migrations run, the ``tasks``
+table is range partitioned by the month of ``created_at``: one
+``tasks_pYYYYMM`` partition per month and a ``tasks_default`` one for
+anything outside them. The retention of old tasks then detaches and
+drops whole partitions instead of deleting the rows in batches (no
+table bloat, no vacuum pressure). Only the months that have fully
+passed the retention's cutoff are dropped.
+
+The partitions' names and bounds are generated here (never taken from
+the input), so they are safe to use in the DDL statements.
+"""
+
+import logging
+import re
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+LOG = logging.getLogger(__name__)
+
+PARTITION_NAME = re.compile(r"^tasks_p(\d{4})(\d{2})$")
+PARTITIONS_AHEAD = 2
+"""The months after the current one to create partitions for."""
+
+
+def month_start(value: datetime) -> datetime:
+    """Get the start of a datetime's month (in UTC).
+
+    Parameters
+    ----------
+    value : datetime
+        The datetime.
+
+    Returns
+    -------
+    datetime
+        The month's first moment.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(value: datetime) -> datetime:
+    """Get the start of the month after a datetime's one.
+
+    Parameters
+    ----------
+    value : datetime
+        The datetime.
+
+    Returns
+    -------
+    datetime
+        The next month's first moment.
+    """
+    start = month_start(value)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Get the name of a month's partition.
+
+    Parameters
+    ----------
+    month : datetime
+        Any moment in the month.
+
+    Returns
+    -------
+    str
+        The partition's name.
+    """
+    return f"tasks_p{month_start(month):%Y%m}"
+
+
+def partition_bounds(name: str) -> tuple[datetime, datetime] | None:
+    """Get the bounds of a monthly partition from its name.
+
+    Parameters
+    ----------
+    name : str
+        The partition's name.
+
+    Returns
+    -------
+    tuple[datetime, datetime] | None
+        The partition's (inclusive) start and (exclusive) end,
+        None if it is not a monthly partition.
+    """
+    match = PARTITION_NAME.match(name)
+    if not match:
+        return None
+    year, month = int(match.group(1)), int(match.group(2))
+    if not 1 <= month <= 12:
+        return None
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    return start, next_month(start)
+
+
+async def is_tasks_partitioned(session: AsyncSession) -> bool:
+    """Check if the tasks table is partitioned.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+
+    Returns
+    -------
+    bool
+        True if it is (always False if not on PostgreSQL).
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    result = await session.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = to_regclass('tasks'))"
+        )
+    )
+    return bool(result.scalar())
+
+
+async def ensure_task_partitions(
+    session: AsyncSession,
+    months_ahead: int = PARTITIONS_AHEAD,
+    now: datetime | None = None,
+) -> list[str]:
+    """Create the current and the next months' partitions if missing.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    months_ahead : int, optional
+        The months after the current one, by default 2.
+    now : datetime | None, optional
+        The current time, by default now.
+
+    Returns
+    -------
+    list[str]
+        The names of the partitions that could not be created
+        (e.g. the default partition already has rows in their range).
+    """
+    month = month_start(now or datetime.now(timezone.utc))
+    failed: list[str] = []
+    for _ in range(months_ahead + 1):
+        end = next_month(month)
+        name = partition_name(month)
+        try:
+            async with session.begin_nested():
+                await session.execute(
+                    text(
+                        f'CREATE TABLE IF NOT EXISTS "{name}" '
+                        "PARTITION OF tasks FOR VALUES "
+                        f"FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+                    )
+                )
+        except SQLAlchemyError as error:
+            LOG.error("Could not create the partition %s: %s", name, error)
+            failed.append(name)
+        month = end
+    await session.commit()
+    return failed
+
+
+async def detach_old_task_partitions(
+    session: AsyncSession,
+    older_than: datetime,
+) -> list[str]:
+    """Detach the monthly partitions that ended before a cutoff.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    older_than : datetime
+        The cutoff (partitions ending at or before it are detached).
+
+    Returns
+    -------
+    list[str]
+        The detached partitions to drop, including any that were
+        detached earlier but not dropped (e.g. an interrupted run).
+    """
+    result = await session.execute(
+        text(
+            "SELECT c.relname, i.inhrelid IS NOT NULL FROM pg_class c "
+            "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+            "AND i.inhparent = to_regclass('tasks') "
+            "WHERE c.relkind = 'r' AND c.relname ~ '^tasks_p[0-9]{6}$' "
+            "AND c.relnamespace = to_regnamespace(current_schema())"
+        )
+    )
+    to_drop: list[str] = []
+    for name, attached in result.all():
+        bounds = partition_bounds(str(name))
+        if bounds is None or bounds[1] > older_than:
+            continue
+        if attached:
+            await session.execute(
+                text(f'ALTER TABLE tasks DETACH PARTITION "{name}"')
+            )
+        to_drop.append(str(name))
+    await session.commit()
+    return sorted(to_drop)
+
+
+async def stream_partition_tasks(
+    session: AsyncSession,
+    name: str,
+    batch_size: int = 1000,
+) -> AsyncIterator[list[tuple[str, str]]]:
+    """Stream the (task ID, client ID) of a detached partition's tasks.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    name : str
+        The partition's name.
+    batch_size : int, optional
+        The rows per batch, by default 1000.
+
+    Yields
+    ------
+    list[tuple[str, str]]
+        The next batch of (task ID, client ID).
+
+    Raises
+    ------
+    ValueError
+        If the name is not a monthly partition's one.
+    """
+    if partition_bounds(name) is None:
+        raise ValueError(f"Not a tasks partition: {name}")
+    result = await session.stream(
+        text(f'SELECT id, client_id FROM "{name}"').execution_options(
+            yield_per=batch_size
+        )
+    )
+    async for rows in result.partitions(batch_size):
+        yield [(str(row[0]), str(row[1])) for row in rows]
+
+
+async def drop_task_partition(session: AsyncSession, name: str) -> None:
+    """Drop a detached partition (and its tasks' out of row results).
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    name : str
+        The partition's name.
+
+    Raises
+    ------
+    ValueError
+        If the name is not a monthly partition's one.
+    """
+    if partition_bounds(name) is None:
+        raise ValueError(f"Not a tasks partition: {name}")
+    # no foreign key to a partitioned table: no cascade
+    await session.execute(
+        text(
+            "DELETE FROM task_results "
+            f'WHERE task_id IN (SELECT id FROM "{name}")'
+        )
+    )
+    await session.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+    await session.commit()
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2026 Waldiez and contributors.
+
+"""Out of row storage of large task results.
+
+The results of long conversations can be megabytes of JSON. Keeping
+them in the tasks' rows makes every query that reads full rows (and
+every update of a task) move them around, so results larger than
+``TASK_RESULTS_INLINE_MAX_SIZE`` are stored zlib-compressed in the
+``task_results`` table, with only a pointer (``results_ref``) in the
+task's row. They are only loaded when a single task is requested.
+"""
+
+import asyncio
+import json
+import zlib
+from typing import Any
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from waldiez_runner.config import TASK_RESULTS_INLINE_MAX_SIZE
+from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_result import TaskResult
+
+TaskResults = dict[str, Any] | list[dict[str, Any]]
+
+
+def _compress(data: bytes) -> bytes:
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data))
+
+
+async def store_task_results(
+    session: AsyncSession,
+    task_id: str,
+    results: TaskResults | None,
+    inline_max_size: int | None = None,
+) -> tuple[TaskResults | None, str | None]:
+    """Store a task's new results (replacing any out of row ones).
+
+    The caller sets the returned values to the task's ``results`` and
+    ``results_ref`` and commits.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    task_id : str
+        The task's ID.
+    results : TaskResults | None
+        The new results.
+    inline_max_size : int | None, optional
+        The max size (bytes) of the results kept in the row,
+        by default ``TASK_RESULTS_INLINE_MAX_SIZE`` (<=0: always).
+
+    Returns
+    -------
+    tuple[TaskResults | None, str | None]
+        The task's ``results`` and ``results_ref`` values.
+    """
+    if inline_max_size is None:
+        inline_max_size = TASK_RESULTS_INLINE_MAX_SIZE
+    await session.execute(
+        delete(TaskResult).where(TaskResult.task_id == task_id)
+    )
+    if results is None or inline_max_size <= 0:
+        return results, None
+    data = json.dumps(results, separators=(",", ":")).encode("utf-8")
+    if len(data) <= inline_max_size:
+        return results, None
+    stored = TaskResult(
+        task_id=task_id,
+        data=await asyncio.to_thread(_compress, data),
+        size=len(data),
+    )
+    session.add(stored)
+    await session.flush()
+    return None, stored.id
+
+
+async def get_task_results(
+    session: AsyncSession,
+    task: Task,
+) -> TaskResults | None:
+    """Get a task's results, loading them if stored out of the row.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    task : Task
+        The task (with its ``results`` loaded).
+
+    Returns
+    -------
+    TaskResults | None
+        The task's results.
+    """
+    if task.results_ref is None:
+        return task.results
+    result = await session.execute(
+        select(TaskResult.data).where(TaskResult.id == task.results_ref)
+    )
+    data = result.scalar_one_or_none()
+    if data is None:  # pragma: no cover
+        return None
+    return await asyncio.to_thread(_decompress, data)
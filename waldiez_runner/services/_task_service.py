@@ -11,15 +11,36 @@ from typing import Any
 import sqlalchemy.sql.functions
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import apaginate
-from sqlalchemy import Row, String, asc, cast, desc, or_
+from sqlalchemy import ColumnElement, Row, asc, bindparam, desc, or_
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import defer
 from sqlalchemy.sql.expression import delete, update
 
 from waldiez_runner.models.task import Task
+from waldiez_runner.models.task_result import TaskResult
 from waldiez_runner.models.task_status import TaskStatus
 from waldiez_runner.schemas.task import TaskCreate, TaskResponse, TaskUpdate
 
+from ._task_counters import AsyncRedis, record_task_transition
+from ._task_results import store_task_results
+
+# the hot paths' statements are built once, only their parameters change
+# (no construction and no cache key generation per call)
+_GET_TASK = select(Task).where(
+    Task.id == bindparam("task_id"), Task.deleted_at.is_(None)
+)
+_TRIGGER_TASK = (
+    update(Task)
+    .where(Task.id == bindparam("task_id"))
+    .values(triggered_at=bindparam("triggered_at"))
+    # the bound task id cannot be evaluated in the session
+    .execution_options(synchronize_session=False)
+)
+
+# list queries do not load the (possibly large) results at all
+SKIP_RESULTS = defer(Task.results, raiseload=True)
+
 
 def task_transformer(
     items: Sequence[Task],
@@ -32,7 +53,8 @@ def task_transformer(
     items : Sequence[Task]
         List of tasks.
     skip_results : bool, Optional
-        Skip returning the results (avoid large payloads).
+        Skip returning the results (avoid large payloads). The results
+        are not accessed, so they can be deferred (``SKIP_RESULTS``).
 
     Returns
     -------
@@ -41,13 +63,48 @@ def task_transformer(
     """
     entries: list[TaskResponse] = []
     for task in items:
-        entry = TaskResponse.model_validate(task)
-        if skip_results:
-            entry.results = None
-        entries.append(entry)
+        if not skip_results:
+            entries.append(TaskResponse.model_validate(task))
+            continue
+        values = {
+            name: getattr(task, name) if name != "results" else None
+            for name in TaskResponse.model_fields.keys()
+        }
+        entries.append(TaskResponse.model_validate(values))
     return entries
 
 
+def task_search_filter(search: str) -> ColumnElement[bool]:
+    """Get the condition of a task search.
+
+    A task matches if its filename contains the term or its status does
+    (case-insensitive). The filename part can use the trigram index on
+    PostgreSQL, the status part is resolved here to the statuses that
+    contain the term, so it can use the status index instead of casting
+    every row's status to text.
+
+    Parameters
+    ----------
+    search : str
+        The search term.
+
+    Returns
+    -------
+    ColumnElement[bool]
+        The condition.
+    """
+    escaped = (
+        search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+    condition = Task.filename.ilike(f"%{escaped}%", escape="\\")
+    statuses = [
+        status for status in TaskStatus if search.upper() in status.value
+    ]
+    if statuses:
+        return or_(condition, Task.status.in_(statuses))
+    return condition
+
+
 def _task_transformer_skip_results(
     items: Sequence[Task],
 ) -> Sequence[TaskResponse]:
@@ -95,19 +152,15 @@ async def get_client_tasks(
         If an invalid field is provided for ordering.
     """
 
-    query = select(Task).where(
-        Task.client_id == client_id, Task.deleted_at.is_(None)
+    query = (
+        select(Task)
+        .options(SKIP_RESULTS)
+        .where(Task.client_id == client_id, Task.deleted_at.is_(None))
     )
     if status is not None:
         query = query.where(Task.status == status)
     if search:
-        # a simple ilike
-        query = query.where(
-            or_(
-                Task.filename.ilike(f"%{search}%"),
-                cast(Task.status, String).ilike(f"%{search}%"),
-            )
-        )
+        query = query.where(task_search_filter(search))
     if order_by:
         if order_by not in Task.__table__.columns:  # pragma: no cover
             # already checked in the router
@@ -167,17 +220,11 @@ async def get_all_tasks(
         If an invalid field is provided for ordering.
     """
 
-    query = select(Task).where(Task.deleted_at.is_(None))
+    query = select(Task).options(SKIP_RESULTS).where(Task.deleted_at.is_(None))
     if status is not None:
         query = query.where(Task.status == status)
     if search:
-        # a simple ilike
-        query = query.where(
-            or_(
-                Task.filename.ilike(f"%{search}%"),
-                cast(Task.status, String).ilike(f"%{search}%"),
-            )
-        )
+        query = query.where(task_search_filter(search))
     if order_by:
         if order_by not in Task.__table__.columns:  # pragma: no cover
             # already checked in the router
@@ -255,10 +302,23 @@ async def update_task(
     Task | None
         The updated task or None if not found.
     """
+    values = task_update.model_dump(exclude_unset=True)
+    if "results" in values:
+        # do not store results for a missing (or deleted) task
+        live = await session.execute(
+            select(Task.id)
+            .where(Task.id == task_id, Task.deleted_at.is_(None))
+            .with_for_update()
+        )
+        if live.scalar_one_or_none() is None:
+            return None
+        values["results"], values["results_ref"] = await store_task_results(
+            session, task_id, values["results"]
+        )
     query = (
         update(Task)
         .where(Task.id == task_id, Task.deleted_at.is_(None))
-        .values(**task_update.model_dump(exclude_unset=True))
+        .values(**values)
         .returning(Task)
     )
     result = await session.execute(query)
@@ -284,8 +344,7 @@ async def get_task(
     Task | None
         Task instance or None if not found.
     """
-    query = select(Task).where(Task.id == task_id, Task.deleted_at.is_(None))
-    result = await session.execute(query)
+    result = await session.execute(_GET_TASK, {"task_id": task_id})
     return result.scalar_one_or_none()
 
 
@@ -323,6 +382,43 @@ async def get_active_client_tasks(
     return page
 
 
+async def get_active_client_flow_task(
+    session: AsyncSession,
+    client_id: str,
+    flow_id: str,
+) -> Task | None:
+    """Get a client's active task of a flow (if any).
+
+    Parameters
+    ----------
+    session : AsyncSession
+        SQLAlchemy async session.
+    client_id : str
+        Client ID.
+    flow_id : str
+        The flow's ID.
+
+    Returns
+    -------
+    Task | None
+        An active task of the flow, None if there is none.
+    """
+    result = await session.execute(
+        select(Task)
+        .options(SKIP_RESULTS)
+        .where(
+            Task.client_id == client_id,
+            Task.flow_id == flow_id,
+            Task.status.notin_(
+                [TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.FAILED]
+            ),
+            Task.deleted_at.is_(None),
+        )
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
 async def get_old_tasks(
     async_session: AsyncSession,
     older_than: datetime,
@@ -539,6 +635,7 @@ async def update_task_status(
     input_request_id: str | None = None,
     skip_results: bool = False,
     results: dict[str, Any] | list[dict[str, Any]] | None = None,
+    redis: AsyncRedis | None = None,
 ) -> None:
     """Update the status of a task.
 
@@ -558,13 +655,19 @@ async def update_task_status(
     results : dict[str, Any] | list[dict[str, Any]] | None
         The task's results.
         Default is None.
+    redis : AsyncRedis | None
+        The Redis client to also update the task counters.
+        Default is None.
     """
     task = await get_task(session, task_id)
     if task is None:
         return
+    old_status = task.status
     task.status = status
     if not skip_results:
-        task.results = results
+        task.results, task.results_ref = await store_task_results(
+            session, task.id, results
+        )
     if status == TaskStatus.WAITING_FOR_INPUT:
         task.input_request_id = input_request_id
     else:
@@ -572,6 +675,8 @@ async def update_task_status(
     task.updated_at = datetime.now(timezone.utc)
     await session.commit()
     await session.refresh(task)
+    if redis is not None:
+        await record_task_transition(redis, task.client_id, old_status, status)
 
 
 async def trigger(session: AsyncSession, task_id: str) -> None:
@@ -585,9 +690,8 @@ async def trigger(session: AsyncSession, task_id: str) -> None:
         The task's ID.
     """
     await session.execute(
-        update(Task)
-        .where(Task.id == task_id)
-        .values(triggered_at=datetime.now(timezone.utc))
+        _TRIGGER_TASK,
+        {"task_id": task_id, "triggered_at": datetime.now(timezone.utc)},
     )
     await session.commit()
 
@@ -621,6 +725,20 @@ async def update_waiting_for_input_tasks(
     await session.commit()
 
 
+async def _delete_tasks(
+    session: AsyncSession, *where: ColumnElement[bool]
+) -> None:
+    # the out of row results go first: a partitioned tasks table cannot
+    # be referenced by a foreign key, so nothing cascades there
+    await session.execute(
+        delete(TaskResult).where(
+            TaskResult.task_id.in_(select(Task.id).where(*where))
+        )
+    )
+    await session.execute(delete(Task).where(*where))
+    await session.commit()
+
+
 async def delete_task(session: AsyncSession, task_id: str) -> None:
     """Delete a task from the database.
 
@@ -631,9 +749,7 @@ async def delete_task(session: AsyncSession, task_id: str) -> None:
     task_id : str
         Task ID.
     """
-    query = delete(Task).where(Task.id == task_id)
-    await session.execute(query)
-    await session.commit()
+    await _delete_tasks(session, Task.id == task_id)
 
 
 async def delete_tasks(session: AsyncSession, task_ids: list[str]) -> None:
@@ -646,9 +762,7 @@ async def delete_tasks(session: AsyncSession, task_ids: list[str]) -> None:
     task_ids : list[str]
         The task ids.
     """
-    query = delete(Task).where(Task.id.in_(task_ids))
-    await session.execute(query)
-    await session.commit()
+    await _delete_tasks(session, Task.id.in_(task_ids))
 
 
 async def delete_client_tasks(session: AsyncSession, client_id: str) -> None:
@@ -661,9 +775,7 @@ async def delete_client_tasks(session: AsyncSession, client_id: str) -> None:
     client_id : str
         Client ID.
     """
-    query = delete(Task).where(Task.client_id == client_id)
-    await session.execute(query)
-    await session.commit()
+    await _delete_tasks(session, Task.client_id == client_id)
 
 
 async def delete_client_flow_task(
@@ -680,12 +792,11 @@ async def delete_client_flow_task(
     flow_id : str
         Flow ID.
     """
-    query = delete(Task).where(
+    await _delete_tasks(
+        session,
         Task.client_id == client_id,
         Task.flow_id == flow_id,
     )
-    await session.execute(query)
-    await session.commit()
 
 
 async def count_active_tasks(session: AsyncSession) -> int:
@@ -780,7 +891,7 @@ async def get_stuck_tasks(
                 [TaskStatus.COMPLETED, TaskStatus.CANCELLED, TaskStatus.FAILED]
             ),
             Task.schedule_type.is_(None),
-            Task.results.isnot(None),
+            or_(Task.results.isnot(None), Task.results_ref.isnot(None)),
             Task.deleted_at.is_(None),
         )
         .order_by(Task.created_at),
@@ -850,12 +961,7 @@ async def count_client_tasks(
         )
 
     if search:
-        filters.append(
-            or_(
-                Task.filename.ilike(f"%{search}%"),
-                cast(Task.status, String).ilike(f"%{search}%"),
-            )
-        )
+        filters.append(task_search_filter(search))
 
     count_query = (
         select(sqlalchemy.sql.functions.count(Task.id))
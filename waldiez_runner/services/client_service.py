@@ -10,6 +10,7 @@ from ._client_service import (
     get_client,
     get_client_in_db,
     get_clients,
+    rehash_client_secret,
     update_client,
     verify_client,
 )
@@ -25,6 +26,7 @@ class ClientService:
     get_client = staticmethod(get_client)
     get_client_in_db = staticmethod(get_client_in_db)
     get_clients = staticmethod(get_clients)
+    rehash_client_secret = staticmethod(rehash_client_secret)
     update_client = staticmethod(update_client)
     verify_client = staticmethod(verify_client)
 
@@ -6,6 +6,7 @@
 
 from ._external_token_service import (
     ExternalTokenResponse,
+    external_token_results,
     get_user_info,
     verify_external_token,
 )
@@ -18,4 +19,8 @@ class ExternalTokenService:
     verify_external_token = staticmethod(verify_external_token)
 
 
-__all__ = ["ExternalTokenService", "ExternalTokenResponse"]
+__all__ = [
+    "ExternalTokenService",
+    "ExternalTokenResponse",
+    "external_token_results",
+]
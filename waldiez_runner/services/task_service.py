@@ -2,6 +2,24 @@
 # Copyright (c) 2024 - 2026 Waldiez and contributors.
 """Task service."""
 
+from ._stuck_tasks import classify_stuck_tasks, update_tasks_status
+from ._task_counters import (
+    admit_task,
+    count_active_client_tasks,
+    get_task_counts,
+    reconcile_task_counters,
+    record_task_transition,
+    release_task_slot,
+)
+from ._task_cursor import get_tasks_by_cursor
+from ._task_partitions import (
+    detach_old_task_partitions,
+    drop_task_partition,
+    ensure_task_partitions,
+    is_tasks_partitioned,
+    stream_partition_tasks,
+)
+from ._task_results import get_task_results
 from ._task_service import (
     count_active_tasks,
     count_client_tasks,
@@ -11,6 +29,7 @@ from ._task_service import (
     delete_client_tasks,
     delete_task,
     delete_tasks,
+    get_active_client_flow_task,
     get_active_client_tasks,
     get_active_tasks,
     get_all_tasks,
@@ -34,6 +53,9 @@ from ._task_service import (
 class TaskService:
     """Task service."""
 
+    admit_task = staticmethod(admit_task)
+    classify_stuck_tasks = staticmethod(classify_stuck_tasks)
+    count_active_client_tasks = staticmethod(count_active_client_tasks)
     count_active_tasks = staticmethod(count_active_tasks)
     count_client_tasks = staticmethod(count_client_tasks)
     count_pending_tasks = staticmethod(count_pending_tasks)
@@ -42,6 +64,10 @@ class TaskService:
     delete_client_tasks = staticmethod(delete_client_tasks)
     delete_task = staticmethod(delete_task)
     delete_tasks = staticmethod(delete_tasks)
+    detach_old_task_partitions = staticmethod(detach_old_task_partitions)
+    drop_task_partition = staticmethod(drop_task_partition)
+    ensure_task_partitions = staticmethod(ensure_task_partitions)
+    get_active_client_flow_task = staticmethod(get_active_client_flow_task)
     get_active_client_tasks = staticmethod(get_active_client_tasks)
     get_active_tasks = staticmethod(get_active_tasks)
     get_all_tasks = staticmethod(get_all_tasks)
@@ -50,13 +76,22 @@ class TaskService:
     get_pending_tasks = staticmethod(get_pending_tasks)
     get_stuck_tasks = staticmethod(get_stuck_tasks)
     get_task = staticmethod(get_task)
+    get_task_counts = staticmethod(get_task_counts)
+    get_task_results = staticmethod(get_task_results)
+    get_tasks_by_cursor = staticmethod(get_tasks_by_cursor)
+    is_tasks_partitioned = staticmethod(is_tasks_partitioned)
     mark_active_tasks_as_failed = staticmethod(mark_active_tasks_as_failed)
+    reconcile_task_counters = staticmethod(reconcile_task_counters)
+    record_task_transition = staticmethod(record_task_transition)
+    release_task_slot = staticmethod(release_task_slot)
     soft_delete_client_tasks = staticmethod(soft_delete_client_tasks)
     soft_delete_tasks_by_ids = staticmethod(soft_delete_tasks_by_ids)
+    stream_partition_tasks = staticmethod(stream_partition_tasks)
     task_transformer = staticmethod(task_transformer)
     trigger = staticmethod(trigger)
     update_task = staticmethod(update_task)
     update_task_status = staticmethod(update_task_status)
+    update_tasks_status = staticmethod(update_tasks_status)
     update_waiting_for_input_tasks = staticmethod(
         update_waiting_for_input_tasks
     )
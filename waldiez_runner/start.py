@@ -18,7 +18,14 @@ from typing import Any
 import uvicorn
 
 from waldiez_runner._logging import LogLevel
-from waldiez_runner.config import ENV_PREFIX
+from waldiez_runner.config import (
+    ENV_PREFIX,
+    WS_MAX_QUEUE,
+    WS_MAX_SIZE,
+    WS_PER_MESSAGE_DEFLATE,
+    WS_PING_INTERVAL,
+    WS_PING_TIMEOUT,
+)
 
 LOG = logging.getLogger(__name__)
 UVICORN_RELOAD_EXCLUDES = [
@@ -78,7 +85,12 @@ def start_uvicorn(
         log_config=logging_config,
         proxy_headers=True,
         forwarded_allow_ips="*",
-        ws_ping_timeout=None,
+        # detect half-open WebSocket connections
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
+        ws_max_size=WS_MAX_SIZE,
+        ws_max_queue=WS_MAX_QUEUE,
         ws="websockets",
         # ws="wsproto",
     )
@@ -22,12 +22,14 @@ from .schedule import (
     cleanup_old_tasks,
     cleanup_processed_requests,
     heartbeat,
+    reconcile_task_counters,
     trim_old_stream_entries,
 )
 
 LOG = logging.getLogger(__name__)
 
 OLD_TASKS_ARE_DELETED_AFTER = 30  # days
+EVERY_MINUTE = "* * * * *"
 EVERY_HOUR = "0 * * * *"
 EVERY_DAY = "0 0 * * *"
 EVERY_5_MINUTES = "*/5 * * * *"
@@ -44,7 +46,7 @@ async def on_worker_startup(state: TaskiqState) -> None:
         Taskiq state.
     """
     settings = SettingsManager.load_settings(force_reload=False)
-    db_manager: DatabaseManager = DatabaseManager(settings)
+    db_manager: DatabaseManager = DatabaseManager(settings, role="worker")
     state.db = db_manager
     if db_manager.is_sqlite and db_manager.engine is not None:
         # make sure the tables are created
@@ -82,6 +84,10 @@ async def on_worker_startup(state: TaskiqState) -> None:
         redis_source,
         EVERY_15_MINUTES,
     )
+    await reconcile_task_counters.schedule_by_cron(  # type: ignore
+        redis_source,
+        EVERY_MINUTE,
+    )
     await trim_old_stream_entries.schedule_by_cron(  # type: ignore
         redis_source,
         EVERY_DAY,
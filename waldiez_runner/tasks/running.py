@@ -77,6 +77,7 @@ async def run_task(
                 task_id=task.id,
                 status=TaskStatus.FAILED,
                 results=[{"error": str(error)}],
+                redis=await redis_manager.client(),
             )
         await remove_tmp_dir(temp_dir=temp_dir)
         return
@@ -114,6 +115,7 @@ async def run_task(
                         task_id=task.id,
                         status=status,
                         results=results,
+                        redis=await redis_manager.client(),
                     )
             except BaseException as e:
                 await remove_tmp_dir(temp_dir=temp_dir)
@@ -7,16 +7,16 @@
 import asyncio
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 
-from fastapi_pagination import Page, Params
 from sqlalchemy.ext.asyncio import AsyncSession
 from taskiq import TaskiqDepends
 from typing_extensions import Annotated
 
 from waldiez_runner.config import Settings
 from waldiez_runner.dependencies import DatabaseManager, RedisManager, Storage
-from waldiez_runner.models import Task, TaskStatus
+from waldiez_runner.models import TaskStatus
 from waldiez_runner.services import TaskService
 
 from .__base__ import broker
@@ -99,6 +99,10 @@ async def cleanup_old_tasks(
 ) -> None:
     """Cleanup tasks created before the configured number of days.
 
+    If the tasks table is partitioned by month, whole partitions are
+    dropped instead, so a task is kept until its month has fully passed
+    the retention (up to a month longer).
+
     Parameters
     ----------
     storage : Storage
@@ -109,8 +113,20 @@ async def cleanup_old_tasks(
         The settings instance.
     """
     days_before = settings.keep_task_for_days
-    if days_before > 0:
-        async with db_manager.session() as session:
+    async with db_manager.session() as session:
+        partitioned = await TaskService.is_tasks_partitioned(session)
+        if partitioned:
+            # the next months' partitions, even without a retention
+            await TaskService.ensure_task_partitions(session)
+        if days_before <= 0:
+            return
+        if partitioned:
+            await _drop_old_task_partitions(
+                db_session=session,
+                storage=storage,
+                days_before=days_before,
+            )
+        else:
             await _purge_tasks(
                 db_session=session,
                 storage=storage,
@@ -162,11 +178,49 @@ async def _purge_tasks(
     LOG.info("Cleaned up %s old tasks.", total_deleted)
 
 
+async def _drop_old_task_partitions(
+    db_session: AsyncSession,
+    storage: Storage,
+    days_before: int,
+    max_concurrency: int = 8,
+) -> None:
+    """Drop the monthly partitions of the tasks older than the retention."""
+    sem = asyncio.Semaphore(max_concurrency)
+    older_than = datetime.now(timezone.utc) - timedelta(days=days_before)
+    partitions = await TaskService.detach_old_task_partitions(
+        db_session, older_than=older_than
+    )
+
+    async def _rm(client_id: str, task_id: str) -> None:
+        async with sem:
+            try:
+                await storage.delete_folder(os.path.join(client_id, task_id))
+            except BaseException as e:  # pragma: no cover
+                LOG.error("Error deleting task storage: %s", e)
+
+    total_deleted = 0
+    for partition in partitions:
+        # detached: no new rows, the ids are streamed (not all loaded)
+        async for rows in TaskService.stream_partition_tasks(
+            db_session, partition
+        ):
+            await asyncio.gather(
+                *(_rm(client_id, task_id) for task_id, client_id in rows)
+            )
+            total_deleted += len(rows)
+        await TaskService.drop_task_partition(db_session, partition)
+        LOG.info("Dropped the tasks partition %s.", partition)
+    LOG.info("Cleaned up %s old tasks.", total_deleted)
+
+
 @broker.task
 async def check_stuck_tasks(
     db_manager: Annotated[DatabaseManager, TaskiqDepends(get_db_manager)],
     storage: Annotated[Storage, TaskiqDepends(get_storage)],
-) -> None:
+    redis_manager: Annotated[RedisManager, TaskiqDepends(get_redis_manager)],
+    max_concurrency: int = 8,
+    limit: int = 5000,
+) -> dict[str, float]:
     """Task to check tasks that are marked as active but have results.
 
     Parameters
@@ -175,30 +229,96 @@ async def check_stuck_tasks(
         Database session manager dependency.
     storage : Storage
         Storage implementation dependency.
+    redis_manager : RedisManager
+        Redis connection manager (for the task counters).
+    max_concurrency : int, optional
+        The max concurrent storage checks, by default 8.
+    limit : int, optional
+        The max tasks to check per run, by default 5000.
+
+    Returns
+    -------
+    dict[str, float]
+        The run's metrics: the checked, failed and completed tasks
+        and the run's duration in seconds.
     """
-    stuck_tasks: list[Task] = []
-    page = 1
-    while page < 50:
-        params = Params(page=page, size=100)
-        async with db_manager.session() as db_session:
-            tasks: Page[Task] = await TaskService.get_stuck_tasks(
-                db_session,
-                params=params,
-            )
-        if not tasks.items:
-            break
-        stuck_tasks.extend(tasks.items)
-        page += 1
-    for task in stuck_tasks:
-        new_status = await check_stuck_task_status(task, storage)
-        async with db_manager.session() as db_session:
-            await TaskService.update_task_status(
-                db_session,
-                task_id=task.id,
-                status=new_status,
-                skip_results=True,
+    started = time.monotonic()
+    async with db_manager.session() as db_session:
+        failed, to_check = await TaskService.classify_stuck_tasks(
+            db_session, limit=limit
+        )
+    completed, without_files = await _check_stuck_tasks_storage(
+        storage, to_check, max_concurrency
+    )
+    failed.extend(without_files)
+    async with db_manager.session() as db_session:
+        updated_failed = await TaskService.update_tasks_status(
+            db_session, failed, TaskStatus.FAILED
+        )
+        updated_completed = await TaskService.update_tasks_status(
+            db_session, completed, TaskStatus.COMPLETED
+        )
+        if updated_failed or updated_completed:
+            # the bulk updates do not move the counters
+            await TaskService.reconcile_task_counters(
+                db_session, await redis_manager.client()
             )
-    LOG.info("Checked stuck tasks.")
+    metrics: dict[str, float] = {
+        "checked": len(failed) + len(completed),
+        "failed": updated_failed,
+        "completed": updated_completed,
+        "duration": round(time.monotonic() - started, 3),
+    }
+    LOG.info("Checked stuck tasks: %s", metrics)
+    return metrics
+
+
+async def _check_stuck_tasks_storage(
+    storage: Storage,
+    to_check: list[tuple[str, str]],
+    max_concurrency: int,
+) -> tuple[list[str], list[str]]:
+    """Check the stuck tasks' files (the completed and the failed ones)."""
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _check(task_id: str, client_id: str) -> TaskStatus:
+        async with sem:
+            return await check_stuck_task_status(task_id, client_id, storage)
+
+    statuses = await asyncio.gather(
+        *(_check(task_id, client_id) for task_id, client_id in to_check)
+    )
+    completed: list[str] = []
+    failed: list[str] = []
+    for (task_id, _), status in zip(to_check, statuses):
+        if status == TaskStatus.COMPLETED:
+            completed.append(task_id)
+        else:
+            failed.append(task_id)
+    return completed, failed
+
+
+@broker.task
+async def reconcile_task_counters(
+    db_manager: Annotated[DatabaseManager, TaskiqDepends(get_db_manager)],
+    redis_manager: Annotated[RedisManager, TaskiqDepends(get_redis_manager)],
+) -> None:
+    """Reset the task counters (in Redis) to the database's counts.
+
+    Parameters
+    ----------
+    db_manager : DatabaseManager
+        Database session manager dependency.
+    redis_manager : RedisManager
+        Redis connection manager.
+    """
+    async with (
+        db_manager.session() as db_session,
+        redis_manager.contextual_client() as redis,
+    ):
+        counts = await TaskService.reconcile_task_counters(db_session, redis)
+    if counts is not None:
+        LOG.debug("Reconciled task counters: %s", counts)
 
 
 @broker.task
@@ -228,33 +348,31 @@ async def trim_old_stream_entries(
         )
 
 
-async def check_stuck_task_status(task: Task, storage: Storage) -> TaskStatus:
-    """Check the status of a task.
+async def check_stuck_task_status(
+    task_id: str, client_id: str, storage: Storage
+) -> TaskStatus:
+    """Check the status of a stuck task by its stored files.
 
     Parameters
     ----------
-    task : Task
-        The task to check.
+    task_id : str
+        The task's ID.
+    client_id : str
+        The task's client ID.
     storage : Storage
         The storage backend instance to use.
 
     Returns
     -------
     TaskStatus
-        The status of the task.
+        COMPLETED if the task has stored files, else FAILED.
     """
-    if task.results is None:
-        return TaskStatus.FAILED
-    if isinstance(task.results, dict) and "error" in task.results:
-        return TaskStatus.FAILED
     try:
-        files = await storage.list_files(
-            os.path.join(task.client_id, str(task.id))
-        )
+        files = await storage.list_files(os.path.join(client_id, task_id))
     except BaseException as e:  # pragma: no cover
         LOG.error(
             "Error while checking task status for task %s: %s",
-            task.id,
+            task_id,
             e,
         )
         return TaskStatus.FAILED
@@ -180,6 +180,7 @@ async def watch_status_and_cancel_if_needed(
                         status=parsed["status"],
                         input_request_id=parsed.get("input_request_id"),
                         results=parsed.get("results"),
+                        redis=redis,
                     )
             except Exception as e:
                 LOG.warning("Failed to update task %s in DB: %s", task_id, e)